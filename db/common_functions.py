@@ -12,23 +12,43 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from multiprocessing.managers import BaseManager
 import os.path
 import sqlite3
 import sys
+import threading
 import time
 import traceback
+from urllib.request import pathname2url
 
+# The database writer of this process (and of the processes forked from
+# it), if any; see *start_database_writer*
+_database_writer = None
 
-def connect_to_database(db_path="../db/io.db", timeout=5, detect_types=0):
+
+def connect_to_database(db_path="../db/io.db", timeout=5, detect_types=0,
+                        read_only=False):
     """
     :param db_path: str, the path to the database, relative to the
         current working directory, defaults to "../db/io.db"
     :param timeout: int, number of seconds the connection should wait for the
-        database lock to go away before raising an exception, defaults to 5
+        database lock to go away before raising an exception (SQLite's busy
+        timeout, i.e. SQLite retries with short, increasing sleeps in the
+        meantime), defaults to 5
     :param detect_types: int, type detection parameter, defaults to 0
+    :param read_only: boolean, whether to open the database in read-only
+        mode (e.g. in worker processes that only query inputs), defaults to
+        False
     :return: the sqlite3 database connection object
 
     Connect to a database and return the connection object.
+
+    Writable connections switch the database to write-ahead logging (WAL)
+    mode if it isn't in WAL mode already; the mode persists in the database
+    file. In WAL mode, readers (e.g.
+    the UI and the workers getting scenario inputs) don't block the writer
+    and the writer doesn't block readers, so only concurrent writers wait
+    for each other.
     """
 
     if not os.path.isfile(db_path):
@@ -39,16 +59,40 @@ def connect_to_database(db_path="../db/io.db", timeout=5, detect_types=0):
             )
         )
 
-    conn = sqlite3.connect(db_path, timeout=timeout, detect_types=detect_types)
+    if read_only:
+        conn = sqlite3.connect(
+            "file:{}?mode=ro".format(pathname2url(os.path.abspath(db_path))),
+            timeout=timeout, detect_types=detect_types, uri=True
+        )
+    else:
+        conn = sqlite3.connect(
+            db_path, timeout=timeout, detect_types=detect_types
+        )
 
     # Enforce foreign keys (default = not enforced)
     conn.execute("PRAGMA foreign_keys=ON;")
 
+    # Use write-ahead logging; synchronous=NORMAL is safe in WAL mode (a
+    # power loss can roll back the last transactions but can't corrupt the
+    # database) and avoids an fsync on every commit
+    if not read_only:
+        # The journal mode persists in the database file (new databases are
+        # created in WAL mode, see *create_database.py*), so we only need to
+        # switch older databases; switching needs an exclusive lock, so
+        # spin on the lock if other connections are using the database
+        (journal_mode,) = conn.execute("PRAGMA journal_mode;").fetchone()
+        if journal_mode.lower() != "wal":
+            spin_on_database_lock(
+                conn=conn, cursor=conn.cursor(),
+                sql="PRAGMA journal_mode=WAL;", data=(), many=False
+            )
+        conn.execute("PRAGMA synchronous=NORMAL;")
+
     return conn
 
 
 def spin_on_database_lock(conn, cursor, sql, data, many=True,
-                          max_attempts=61, interval=10, quiet=True):
+                          max_attempts=61, interval=1, quiet=True):
     """
     :param conn: the connection object
     :param cursor: the cursor object
@@ -56,16 +100,17 @@ def spin_on_database_lock(conn, cursor, sql, data, many=True,
     :param data: the data to bind to the SQL statement
     :param many: boolean for whether to use executemany or execute; the
         default is True (i.e. use executemany)
-    :param max_attempts: how long to wait for the database lock to be
-        released; the default is 600 seconds, but that can be overridden
-    :param interval: how frequently to poll the database for whether
-        the lock has been released; the default is 10 seconds, but that can
-        be overridden
+    :param max_attempts: how many times to try to execute the statement
+        before giving up; the default is 61, but that can be overridden
+    :param interval: the maximum number of seconds to sleep between
+        attempts; the default is 1 second, but that can be overridden
     :param quiet: boolean; set to False to see the SQL query
 
-    If the database is locked, wait for the lock to be released for a
-    certain amount of time and occasionally retry to execute the SQL
-    statement until the timeout.
+    Each attempt already waits for the database lock to be released for
+    the connection's busy timeout (see *connect_to_database*). If the
+    database is still locked, sleep with exponential backoff (starting at
+    50 milliseconds and capped at *interval* seconds) and retry to execute
+    the SQL statement until the maximum number of attempts is reached.
 
     To lock the database deliberately, run the following:
         PRAGMA locking_mode = EXCLUSIVE;
@@ -90,14 +135,15 @@ def spin_on_database_lock(conn, cursor, sql, data, many=True,
             conn.commit()
         except sqlite3.OperationalError as e:
             if "locked" in str(e):
-                print("Database is locked, sleeping for {} seconds, "
-                      "then retrying.".format(interval))
-                if i == max_attempts:
-                    print("Database still locked after {} seconds. "
-                          "Exiting.".format(max_attempts * interval))
+                if i == max_attempts - 1:
+                    print("Database still locked after {} attempts. "
+                          "Exiting.".format(max_attempts))
                     sys.exit(1)
                 else:
-                    time.sleep(interval)
+                    sleep = min(interval, 0.05 * 2 ** i)
+                    print("Database is locked, sleeping for {} seconds, "
+                          "then retrying.".format(sleep))
+                    time.sleep(sleep)
             else:
                 print("Error while running the following query:\n", sql)
                 traceback.print_exc()
@@ -106,3 +152,617 @@ def spin_on_database_lock(conn, cursor, sql, data, many=True,
         else:
             # print("...done.")
             break
+
+
+class SingleTransactionConnection(object):
+    """
+    Wrap a database connection so that commits requested by the wrapped
+    code (e.g. by *spin_on_database_lock*) are deferred until
+    *commit_transaction* is called. This lets us import a batch of results
+    (e.g. all results for a subproblem/stage) in a single transaction
+    instead of committing after every statement. All other attributes are
+    passed through to the underlying connection.
+
+    When used as a context manager, the transaction is committed when the
+    block exits normally and rolled back if the block raises an exception
+    (including the *SystemExit* raised by *spin_on_database_lock* on
+    non-lock errors), so a failed import doesn't leave a half-written
+    transaction open on the connection.
+    """
+    def __init__(self, conn):
+        """
+        :param conn: the connection object to wrap
+        """
+        self.connection = conn
+
+    def commit(self):
+        """
+        Defer the commit until *commit_transaction* is called.
+        """
+        pass
+
+    def commit_transaction(self):
+        """
+        Commit the current transaction on the underlying connection.
+        """
+        self.connection.commit()
+
+    def rollback_transaction(self):
+        """
+        Roll back the current transaction on the underlying connection.
+        """
+        self.connection.rollback()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        if exc_type is None:
+            self.commit_transaction()
+        else:
+            self.rollback_transaction()
+        # Don't suppress the exception
+        return False
+
+    def __getattr__(self, name):
+        return getattr(self.connection, name)
+
+
+class DatabaseWriter(object):
+    """
+    Execute database write jobs (e.g. importing a scenario's results or
+    updating its run status) one at a time. The writer lives in a separate
+    server process (see *start_database_writer*) and the processes sharing
+    it submit their jobs to it via *submit_database_write*; each request is
+    served in its own thread of the server process and requests wait for
+    the writer in the order in which they arrive. Since only one job writes
+    to the database at a time, the writers never have to wait for each
+    other's locks.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+
+    def run(self, function, kwargs):
+        """
+        :param function: the (module-level) function to run
+        :param kwargs: dictionary of the keyword arguments to call the
+            function with
+        :return: the function's return value
+
+        Run a write job once the writer is free. A job that exits (e.g.
+        via *spin_on_database_lock*) raises a RuntimeError in the submitting
+        process instead of stopping the writer.
+        """
+        with self._lock:
+            try:
+                return function(**kwargs)
+            except SystemExit as e:
+                raise RuntimeError(
+                    "Database write job {} exited with code {}.".format(
+                        function.__name__, e.code)
+                )
+
+
+class DatabaseWriterManager(BaseManager):
+    pass
+
+
+DatabaseWriterManager.register("DatabaseWriter", DatabaseWriter)
+
+
+def start_database_writer():
+    """
+    :return: the started DatabaseWriterManager; call its *shutdown* method
+        to stop the writer
+
+    Start a database writer process and make it the database writer of this
+    process. Other processes (e.g. the workers running scenarios in
+    parallel) need to be given the writer explicitly (see
+    *get_database_writer* and *set_database_writer*), as processes that are
+    not forked don't inherit it.
+    """
+    manager = DatabaseWriterManager()
+    manager.start()
+    set_database_writer(manager.DatabaseWriter())
+
+    return manager
+
+
+def stop_database_writer(manager):
+    """
+    :param manager: the DatabaseWriterManager returned by
+        *start_database_writer*
+
+    Stop the database writer process; database writes are executed
+    directly again.
+    """
+    set_database_writer(None)
+    manager.shutdown()
+
+
+def get_database_writer():
+    """
+    :return: the database writer (a proxy of the DatabaseWriter in the
+        writer process) of this process, or None if there's no writer
+    """
+    return _database_writer
+
+
+def set_database_writer(database_writer):
+    """
+    :param database_writer: the database writer proxy (see
+        *get_database_writer*), or None to execute database writes directly
+
+    Make the database writer the writer of this process, e.g. in a worker
+    process, so that the process submits its database writes to it.
+    """
+    global _database_writer
+
+    _database_writer = database_writer
+
+
+def submit_database_write(function, **kwargs):
+    """
+    :param function: the (module-level) function that writes to the
+        database
+    :param kwargs: the keyword arguments to call the function with
+    :return: the function's return value
+
+    Submit a database write job to the database writer if one was started
+    and wait for it to be completed; otherwise, run it directly. Jobs run in
+    the writer process, so what they print goes to the writer's output.
+    """
+    if _database_writer is None:
+        return function(**kwargs)
+    else:
+        return _database_writer.run(function, kwargs)
+
+
+class DatabaseWriteRecorder(object):
+    """
+    Stand-in for a database connection and its cursor that runs queries on
+    the wrapped (e.g. read-only) connection but records the statements that
+    write to the database instead of executing them. Code written for a
+    connection (e.g. the results import of the modules, which uses
+    *spin_on_database_lock*) can run unchanged in a worker process on the
+    recorder, and only the recorded statements are then sent to the
+    database writer (see *submit_database_write*), which executes them in a
+    single transaction (see *execute_database_writes*).
+
+    When used as a context manager, the recorded statements are submitted
+    when the block exits normally and discarded if the block raises an
+    exception.
+
+    Statements starting with SELECT, or PRAGMA statements that don't set a
+    value, are queries; all other statements are recorded. The queries
+    don't see the recorded writes, so code that queries what it has just
+    written can't run on the recorder.
+    """
+    def __init__(self, conn, db_path, results_shard_scenario_id=None):
+        """
+        :param conn: the connection object to run the queries on
+        :param db_path: str, the path to the database to write to
+        :param results_shard_scenario_id: int, the ID of the scenario whose
+            results shard to write to instead of the database; defaults to
+            None, i.e. write to the database
+        """
+        self.connection = conn
+        self.db_path = db_path
+        self.results_shard_scenario_id = results_shard_scenario_id
+        self.statements = []
+        self._query_cursor = None
+
+    @staticmethod
+    def is_query(sql):
+        """
+        :param sql: the SQL statement
+        :return: boolean; whether the statement only queries the database
+        """
+        statement = sql.strip().upper()
+        return statement.startswith("SELECT") or \
+            (statement.startswith("PRAGMA") and "=" not in statement)
+
+    def cursor(self):
+        return self
+
+    def execute(self, sql, parameters=()):
+        if self.is_query(sql):
+            self._query_cursor = self.connection.execute(sql, parameters)
+            return self._query_cursor
+        self.statements.append((sql, parameters, False))
+        return self
+
+    def executemany(self, sql, seq_of_parameters):
+        self.statements.append((sql, list(seq_of_parameters), True))
+        return self
+
+    def fetchone(self):
+        return self._query_cursor.fetchone()
+
+    def fetchall(self):
+        return self._query_cursor.fetchall()
+
+    def commit(self):
+        """
+        Statements are only executed once they are submitted.
+        """
+        pass
+
+    def submit(self):
+        """
+        Submit the recorded statements to the database writer (or execute
+        them directly if no writer was started) in a single transaction.
+        """
+        if self.statements:
+            submit_database_write(
+                execute_database_writes, db_path=self.db_path,
+                statements=self.statements,
+                results_shard_scenario_id=self.results_shard_scenario_id
+            )
+        self.statements = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        if exc_type is None:
+            self.submit()
+        else:
+            self.statements = []
+        return False
+
+
+def execute_database_writes(db_path, statements,
+                            results_shard_scenario_id=None):
+    """
+    :param db_path: str, the path to the database
+    :param statements: list of (sql, data, many) tuples, e.g. recorded with
+        a *DatabaseWriteRecorder*
+    :param results_shard_scenario_id: int, the ID of the scenario whose
+        results shard to write to instead of the database; defaults to None
+
+    Execute the statements in a single transaction, which is rolled back if
+    any of them fails.
+    """
+    if results_shard_scenario_id is None:
+        conn = connect_to_database(db_path=db_path)
+    else:
+        conn = connect_to_results_shard(
+            db_path=db_path, scenario_id=results_shard_scenario_id
+        )
+    c = conn.cursor()
+    try:
+        with SingleTransactionConnection(conn=conn) as transaction_conn:
+            for (sql, data, many) in statements:
+                spin_on_database_lock(
+                    conn=transaction_conn, cursor=c, sql=sql, data=data,
+                    many=many
+                )
+    finally:
+        conn.close()
+
+
+def get_results_shard_path(db_path, scenario_id):
+    """
+    :param db_path: str, the path to the database
+    :param scenario_id: int, the scenario ID
+    :return: str, the path to the scenario's results shard
+
+    The results shards of a database are kept in a directory next to the
+    database named after it, e.g. the results of scenario 1 in ../db/io.db
+    are imported into ../db/io_results/scenario_1.db.
+    """
+    return os.path.join(
+        "{}_results".format(os.path.splitext(db_path)[0]),
+        "scenario_{}.db".format(scenario_id)
+    )
+
+
+def get_database_path(conn):
+    """
+    :param conn: the database connection object
+    :return: str, the path to the main database of the connection
+    """
+    for (seq, name, path) in conn.execute("PRAGMA database_list;"):
+        if name == "main":
+            return path
+
+
+def get_scenarios_with_results_shards(db_path):
+    """
+    :param db_path: str, the path to the database
+    :return: sorted list of the IDs of the scenarios whose results are in a
+        results shard
+    """
+    shard_directory = os.path.dirname(get_results_shard_path(db_path, 0))
+    if not os.path.isdir(shard_directory):
+        return []
+
+    scenario_ids = []
+    for f in os.listdir(shard_directory):
+        (name, extension) = os.path.splitext(f)
+        if extension == ".db" and name.startswith("scenario_") \
+                and name[len("scenario_"):].isdigit():
+            scenario_ids.append(int(name[len("scenario_"):]))
+
+    return sorted(scenario_ids)
+
+
+def connect_to_results_shard(db_path, scenario_id, read_only=False):
+    """
+    :param db_path: str, the path to the database
+    :param scenario_id: int, the scenario ID
+    :param read_only: boolean, whether to open the shard and the database
+        in read-only mode, defaults to False
+    :return: the sqlite3 connection object to the scenario's results shard
+
+    Connect to the results shard of a scenario and attach the database to
+    it. Since SQLite resolves unqualified table names in the main database
+    (the shard) before the attached ones, the results tables are the
+    shard's while all other tables (inputs, scenarios, etc.) are the
+    database's, so the results import and processing code can run on the
+    shard connection unchanged.
+
+    Foreign keys are not enforced, as the results tables' references to the
+    scenarios table would otherwise fail (SQLite doesn't enforce foreign
+    keys across databases).
+    """
+    conn = connect_to_database(
+        db_path=get_results_shard_path(db_path, scenario_id),
+        read_only=read_only
+    )
+    conn.execute("PRAGMA foreign_keys=OFF;")
+    if read_only:
+        conn.execute(
+            "ATTACH DATABASE ? AS io;",
+            ("file:{}?mode=ro".format(pathname2url(os.path.abspath(db_path))),)
+        )
+    else:
+        conn.execute("ATTACH DATABASE ? AS io;", (db_path,))
+
+    return conn
+
+
+def create_results_shard(conn, scenario_id):
+    """
+    :param conn: the database connection object
+    :param scenario_id: int, the scenario ID
+    :return: the sqlite3 connection object to the new results shard (see
+        *connect_to_results_shard*)
+
+    Create an empty results shard for a scenario with the results tables
+    and views of the database, replacing the scenario's existing shard if
+    any.
+    """
+    db_path = get_database_path(conn)
+    delete_results_shard(db_path=db_path, scenario_id=scenario_id)
+
+    shard_path = get_results_shard_path(db_path, scenario_id)
+    os.makedirs(os.path.dirname(shard_path), exist_ok=True)
+    sqlite3.connect(shard_path).close()
+
+    shard_conn = connect_to_results_shard(
+        db_path=db_path, scenario_id=scenario_id
+    )
+    # Create the views after the tables they select from
+    for (sql, ) in conn.execute(
+        """SELECT sql FROM sqlite_master
+        WHERE type IN ('table', 'view') AND name LIKE 'results%'
+        ORDER BY type = 'view', rowid;"""
+    ).fetchall():
+        shard_conn.execute(sql)
+    shard_conn.commit()
+
+    return shard_conn
+
+
+def delete_results_shard(db_path, scenario_id):
+    """
+    :param db_path: str, the path to the database
+    :param scenario_id: int, the scenario ID
+    :return: boolean; whether the scenario had a results shard
+
+    Delete the results shard of a scenario (and its write-ahead log) if it
+    exists.
+    """
+    shard_path = get_results_shard_path(db_path, scenario_id)
+    shard_exists = os.path.isfile(shard_path)
+    for path in [shard_path, shard_path + "-wal", shard_path + "-shm"]:
+        if os.path.isfile(path):
+            os.remove(path)
+
+    return shard_exists
+
+
+def attach_results_shards(conn, scenario_ids=None):
+    """
+    :param conn: the database connection object
+    :param scenario_ids: list of the IDs of the scenarios whose results
+        will be queried; defaults to None, i.e. all scenarios
+    :return: list of the IDs of the scenarios whose shards are attached
+
+    Attach the results shards of the requested scenarios (if any) to the
+    connection, so that queries of the results tables include the results
+    imported into shards (see the *--shard_results* option of
+    import_scenario_results.py) along with the results in the database.
+
+    For each results table, we create a temporary view with the same name
+    that combines the rows of the database's table and of the shards'
+    tables; temporary objects take precedence over the main database's for
+    unqualified names, so existing queries don't need to change. The
+    database's results views are recreated as temporary views, so that they
+    select from the combined tables too. The views are only visible to this
+    connection.
+
+    SQLite limits the number of databases that can be attached to a
+    connection (10 by default). If there are more shards to attach than
+    the limit allows, we instead copy the shards' results into temporary
+    tables (see *copy_results_shards*), which the temporary views combine
+    with the database's tables. This takes longer and uses more memory than
+    attaching them, so only the shards of the scenarios being compared
+    should be requested when possible.
+    """
+    db_path = get_database_path(conn)
+    sharded_scenario_ids = get_scenarios_with_results_shards(db_path)
+    if scenario_ids is not None:
+        sharded_scenario_ids = [
+            scenario_id for scenario_id in sharded_scenario_ids
+            if scenario_id in [int(s) for s in scenario_ids]
+        ]
+
+    attached = [
+        name for (seq, name, path) in conn.execute("PRAGMA database_list;")
+    ]
+    to_attach = [
+        scenario_id for scenario_id in sharded_scenario_ids
+        if "shard_{}".format(scenario_id) not in attached
+    ]
+    copied = get_copied_results_shards(conn)
+    to_attach = [
+        scenario_id for scenario_id in to_attach if scenario_id not in copied
+    ]
+    if not to_attach:
+        return sharded_scenario_ids
+
+    max_attached = conn.getlimit(sqlite3.SQLITE_LIMIT_ATTACHED) \
+        if hasattr(conn, "getlimit") else 10
+    n_attached = len([name for name in attached if name not in
+                      ["main", "temp"]])
+    if n_attached + len(to_attach) > max_attached:
+        copy_results_shards(
+            conn=conn, scenario_ids=to_attach,
+            batch_size=max_attached - n_attached
+        )
+    else:
+        for scenario_id in to_attach:
+            conn.execute(
+                "ATTACH DATABASE ? AS shard_{};".format(scenario_id),
+                (get_results_shard_path(db_path, scenario_id),)
+            )
+    shards = [
+        name for (seq, name, path) in conn.execute("PRAGMA database_list;")
+        if name.startswith("shard_")
+    ]
+    if get_copied_results_shards(conn):
+        shards.append("temp")
+
+    results_objects = conn.execute(
+        """SELECT type, name, sql FROM main.sqlite_master
+        WHERE type IN ('table', 'view') AND name LIKE 'results%'
+        ORDER BY type = 'view', rowid;"""
+    ).fetchall()
+
+    for (object_type, name, sql) in results_objects:
+        conn.execute("DROP VIEW IF EXISTS temp.{};".format(name))
+        if object_type == "table":
+            columns = ", ".join(
+                column[1] for column in
+                conn.execute("PRAGMA main.table_info({});".format(name))
+            )
+            conn.execute(
+                "CREATE TEMP VIEW {} AS {};".format(
+                    name,
+                    " UNION ALL ".join(
+                        "SELECT {} FROM {}.{}{}".format(
+                            columns, db, "shards_" if db == "temp" else "",
+                            name
+                        )
+                        for db in ["main"] + shards
+                    )
+                )
+            )
+        else:
+            conn.execute(sql.replace("CREATE VIEW", "CREATE TEMP VIEW", 1))
+
+    return sharded_scenario_ids
+
+
+def copy_results_shards(conn, scenario_ids, batch_size):
+    """
+    :param conn: the database connection object
+    :param scenario_ids: list of the IDs of the scenarios whose shards to
+        copy
+    :param batch_size: int, the number of databases that can be attached to
+        the connection
+
+    Copy the results of the shards of the requested scenarios into
+    temporary tables, named like the results tables with a *shards_*
+    prefix, when there are more shards than can be attached to the
+    connection at once (see *attach_results_shards*). The shards are
+    attached in batches and detached once their results are copied. The
+    tables are only visible to this connection and dropped when it's
+    closed.
+    """
+    if batch_size < 1:
+        raise ValueError(
+            "Cannot attach the results shards to the database connection, "
+            "as it already has as many attached databases as SQLite "
+            "allows."
+        )
+
+    db_path = get_database_path(conn)
+    columns_by_table = dict()
+    for (name, ) in conn.execute(
+        """SELECT name FROM main.sqlite_master
+        WHERE type = 'table' AND name LIKE 'results%'
+        ORDER BY rowid;"""
+    ).fetchall():
+        columns_by_table[name] = ", ".join(
+            column[1] for column in
+            conn.execute("PRAGMA main.table_info({});".format(name))
+        )
+        conn.execute(
+            """CREATE TEMP TABLE IF NOT EXISTS shards_{} AS
+            SELECT {} FROM main.{} WHERE 0 = 1;""".format(
+                name, columns_by_table[name], name
+            )
+        )
+    conn.execute(
+        """CREATE TEMP TABLE IF NOT EXISTS copied_results_shards (
+        scenario_id INTEGER PRIMARY KEY
+        );"""
+    )
+
+    for i in range(0, len(scenario_ids), batch_size):
+        batch = scenario_ids[i:i + batch_size]
+        for scenario_id in batch:
+            conn.execute(
+                "ATTACH DATABASE ? AS copied_shard_{};".format(scenario_id),
+                (get_results_shard_path(db_path, scenario_id),)
+            )
+        for (name, columns) in columns_by_table.items():
+            for scenario_id in batch:
+                conn.execute(
+                    """INSERT INTO temp.shards_{}
+                    SELECT {} FROM copied_shard_{}.{};""".format(
+                        name, columns, scenario_id, name
+                    )
+                )
+        conn.executemany(
+            "INSERT INTO temp.copied_results_shards VALUES (?);",
+            [(scenario_id, ) for scenario_id in batch]
+        )
+        # Databases can't be detached during a transaction
+        conn.commit()
+        for scenario_id in batch:
+            conn.execute(
+                "DETACH DATABASE copied_shard_{};".format(scenario_id)
+            )
+
+
+def get_copied_results_shards(conn):
+    """
+    :param conn: the database connection object
+    :return: list of the IDs of the scenarios whose shards were copied into
+        temporary tables (see *copy_results_shards*)
+    """
+    if conn.execute(
+        """SELECT name FROM temp.sqlite_master
+        WHERE type = 'table' AND name = 'copied_results_shards';"""
+    ).fetchone() is None:
+        return []
+
+    return [
+        scenario_id for (scenario_id, ) in
+        conn.execute("SELECT scenario_id FROM temp.copied_results_shards;")
+    ]
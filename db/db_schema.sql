@@ -283,6 +283,11 @@ FOREIGN KEY (temporal_scenario_id, period)
 FOREIGN KEY (month) REFERENCES mod_months (month)
 );
 
+-- Covering index for the timepoint lookups by period
+CREATE INDEX inputs_temporal_period_idx
+ON inputs_temporal
+(temporal_scenario_id, period, subproblem_id, stage_id, timepoint);
+
 -- Horizons (with balancing types)
 -- How timepoints are organized for operational-decision purposes
 -- Each timepoint can belong to more than one balancing_type-horizon (e.g.
@@ -700,6 +705,11 @@ FOREIGN KEY (project_specified_capacity_scenario_id) REFERENCES
 subscenarios_project_specified_capacity (project_specified_capacity_scenario_id)
 );
 
+-- Index for the operational period joins by project and period
+CREATE INDEX inputs_project_specified_capacity_project_period_idx
+ON inputs_project_specified_capacity
+(project, period, project_specified_capacity_scenario_id);
+
 DROP TABLE IF EXISTS subscenarios_project_specified_fixed_cost;
 CREATE TABLE subscenarios_project_specified_fixed_cost (
 project_specified_fixed_cost_scenario_id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -1035,6 +1045,12 @@ subscenarios_project_variable_generator_profiles
 (project, variable_generator_profile_scenario_id)
 );
 
+-- Covering index for the profile lookups by project and timepoint
+CREATE INDEX inputs_project_variable_generator_profiles_lookup_idx
+ON inputs_project_variable_generator_profiles
+(variable_generator_profile_scenario_id, project, stage_id, timepoint,
+cap_factor);
+
 -- Hydro operational characteristics
 DROP TABLE IF EXISTS subscenarios_project_hydro_operational_chars;
 CREATE TABLE subscenarios_project_hydro_operational_chars (
@@ -1106,6 +1122,12 @@ FOREIGN KEY (project, exogenous_availability_scenario_id)
         (project, exogenous_availability_scenario_id)
 );
 
+-- Covering index for the timepoint-level availability lookups by project
+CREATE INDEX inputs_project_availability_exogenous_lookup_idx
+ON inputs_project_availability_exogenous
+(exogenous_availability_scenario_id, project, stage_id, timepoint,
+availability_derate);
+
 DROP TABLE IF EXISTS subscenarios_project_availability_endogenous;
 CREATE TABLE subscenarios_project_availability_endogenous (
 project VARCHAR(64),
@@ -3847,6 +3869,48 @@ project_operational_periods
 USING (temporal_scenario_id, project, period)
 ;
 
+-- Optional materialization of the project_operational_timepoints view for a
+-- scenario (see db/utilities/project_operational_timepoints.py), as the view
+-- is expensive to query for large portfolios. The subscenario IDs the rows
+-- were materialized with are recorded in
+-- scenario_project_operational_timepoints_subscenarios, so the rows are not
+-- used if the scenario's subscenario IDs no longer match exactly.
+DROP TABLE IF EXISTS scenario_project_operational_timepoints;
+CREATE TABLE scenario_project_operational_timepoints (
+scenario_id INTEGER,
+project_portfolio_scenario_id INTEGER,
+project_operational_chars_scenario_id INTEGER,
+project_specified_capacity_scenario_id INTEGER,
+project_new_cost_scenario_id INTEGER,
+temporal_scenario_id INTEGER,
+operational_type VARCHAR(32),
+variable_generator_profile_scenario_id INTEGER,
+subproblem_id INTEGER,
+stage_id INTEGER,
+project VARCHAR(64),
+timepoint INTEGER,
+FOREIGN KEY (scenario_id) REFERENCES scenarios (scenario_id)
+);
+
+-- Covering index for the per-subproblem/stage lookups
+CREATE INDEX scenario_project_operational_timepoints_idx
+ON scenario_project_operational_timepoints
+(scenario_id, subproblem_id, stage_id, operational_type, project, timepoint,
+project_portfolio_scenario_id, project_operational_chars_scenario_id,
+temporal_scenario_id, project_specified_capacity_scenario_id,
+project_new_cost_scenario_id, variable_generator_profile_scenario_id);
+
+DROP TABLE IF EXISTS scenario_project_operational_timepoints_subscenarios;
+CREATE TABLE scenario_project_operational_timepoints_subscenarios (
+scenario_id INTEGER PRIMARY KEY,
+project_portfolio_scenario_id INTEGER,
+project_operational_chars_scenario_id INTEGER,
+project_specified_capacity_scenario_id INTEGER,
+project_new_cost_scenario_id INTEGER,
+temporal_scenario_id INTEGER,
+FOREIGN KEY (scenario_id) REFERENCES scenarios (scenario_id)
+);
+
 
 -- ratio of hrs that are (not) spinup/lookahead in each period-subproblem-stage
 DROP VIEW IF EXISTS spinup_or_lookahead_ratios;
@@ -0,0 +1,324 @@
+# Copyright 2016-2020 Blue Marble Analytics LLC. All rights reserved.
+
+"""
+The *benchmark_results_queries.py* script times the standard plot queries
+against a large synthetic results database, first without and then with the
+secondary results indexes (see *results_indexes.py*). The queries are the
+ones the plots in the viz package run, without the joins to the inputs
+tables.
+
+>>> python benchmark_results_queries.py --scenarios 20 --timepoints 8760
+
+The synthetic database is created from the database schema in a temporary
+directory unless a path is specified with *--database*; an existing file at
+that path is overwritten.
+"""
+
+from argparse import ArgumentParser
+import os
+import sqlite3
+import sys
+import tempfile
+import timeit
+
+from db.utilities.results_indexes import create_results_indexes
+
+
+# The plot queries, as (description, sql) tuples; the scenario_id,
+# load_zone, timepoints, period, and stage_id are filled in for each run
+PLOT_QUERIES = [
+    ("dispatch plot: dispatch by technology",
+     """SELECT timepoint, technology, power_mw
+     FROM results_project_dispatch_by_technology
+     WHERE scenario_id = {scenario_id}
+     AND load_zone = '{load_zone}'
+     AND timepoint IN ({timepoints});"""),
+    ("dispatch plot: variable curtailment",
+     """SELECT scheduled_curtailment_mw
+     FROM results_project_curtailment_variable
+     WHERE scenario_id = {scenario_id}
+     AND load_zone = '{load_zone}'
+     AND timepoint IN ({timepoints});"""),
+    ("dispatch plot: imports/exports",
+     """SELECT net_imports_mw
+     FROM results_transmission_imports_exports
+     WHERE scenario_id = {scenario_id}
+     AND load_zone = '{load_zone}'
+     AND timepoint IN ({timepoints});"""),
+    ("dispatch plot: load balance",
+     """SELECT load_mw, unserved_energy_mw
+     FROM results_system_load_balance
+     WHERE scenario_id = {scenario_id}
+     AND load_zone = '{load_zone}'
+     AND timepoint IN ({timepoints});"""),
+    ("energy plot",
+     """SELECT period, technology, sum(energy_mwh) AS energy_mwh
+     FROM results_project_dispatch_by_technology_period
+     WHERE scenario_id = {scenario_id}
+     AND load_zone = '{load_zone}'
+     AND stage_id = {stage_id}
+     AND spinup_or_lookahead = 0
+     GROUP BY period, technology;"""),
+    ("capacity factor plot",
+     """SELECT project, period, technology,
+     sum(power_mw * timepoint_weight * number_of_hours_in_timepoint)
+     AS energy_mwh
+     FROM results_project_dispatch
+     WHERE scenario_id = {scenario_id}
+     AND stage_id = {stage_id}
+     AND load_zone = '{load_zone}'
+     GROUP BY project, period, technology;"""),
+    ("curtailment heatmap plot",
+     """SELECT month, hour_of_day, sum(scheduled_curtailment_mw)
+     FROM results_project_curtailment_variable
+     WHERE scenario_id = {scenario_id}
+     AND load_zone = '{load_zone}'
+     AND period = {period}
+     AND stage_id = {stage_id}
+     GROUP BY month, hour_of_day;"""),
+    ("capacity by load zone plot",
+     """SELECT period, load_zone, technology, sum(capacity_mw)
+     FROM results_project_capacity
+     WHERE scenario_id = {scenario_id}
+     AND period = {period}
+     AND subproblem_id = 1
+     AND stage_id = {stage_id}
+     GROUP BY period, load_zone, technology;""")
+]
+
+TECHNOLOGIES = ["Nuclear", "Coal", "CCGT", "CT", "Hydro", "Wind", "Solar",
+                "Battery"]
+
+
+def parse_arguments(args):
+    """
+    :param args: the script arguments specified by the user
+    :return: the parsed known argument values (<class 'argparse.Namespace'>
+    Python object)
+
+    Parse the known arguments.
+    """
+    parser = ArgumentParser(add_help=True)
+
+    parser.add_argument("--database",
+                        help="Where to create the synthetic database. "
+                             "Defaults to a temporary directory.")
+    parser.add_argument("--scenarios", type=int, default=10,
+                        help="The number of scenarios. Defaults to 10.")
+    parser.add_argument("--load_zones", type=int, default=5,
+                        help="The number of load zones. Defaults to 5.")
+    parser.add_argument("--projects_per_technology", type=int, default=2,
+                        help="The number of projects of each technology in "
+                             "each load zone. Defaults to 2.")
+    parser.add_argument("--periods", type=int, default=2,
+                        help="The number of periods. Defaults to 2.")
+    parser.add_argument("--timepoints", type=int, default=2190,
+                        help="The number of timepoints per period. "
+                             "Defaults to 2190.")
+    parser.add_argument("--repeats", type=int, default=5,
+                        help="The number of times each query is run; the "
+                             "fastest run is reported. Defaults to 5.")
+
+    parsed_arguments = parser.parse_known_args(args=args)[0]
+
+    return parsed_arguments
+
+
+def create_synthetic_results_database(
+    db_path, scenarios, load_zones, projects_per_technology, periods,
+    timepoints
+):
+    """
+    :param db_path: the path of the database to create
+    :param scenarios: the number of scenarios
+    :param load_zones: the number of load zones
+    :param projects_per_technology: the number of projects of each
+        technology in each load zone
+    :param periods: the number of periods
+    :param timepoints: the number of timepoints per period
+    :return: the database connection object
+
+    Create the database from the schema and populate the results tables
+    that the plot queries use with synthetic results.
+    """
+    if os.path.exists(db_path):
+        os.remove(db_path)
+    conn = sqlite3.connect(db_path)
+    with open(os.path.join(os.path.dirname(os.path.dirname(__file__)),
+                           "db_schema.sql"), "r") as db_schema_script:
+        conn.executescript(db_schema_script.read())
+
+    zones = ["Zone{}".format(z) for z in range(1, load_zones+1)]
+    prj_tech_zone = [
+        ("{}_{}_{}".format(zone, tech, n), tech, zone)
+        for zone in zones for tech in TECHNOLOGIES
+        for n in range(1, projects_per_technology+1)
+    ]
+    period_tmps = [
+        (period, period * 10000 + tmp, (tmp // 730) % 12 + 1, tmp % 24)
+        for period in range(2030, 2030 + 10 * periods, 10)
+        for tmp in range(1, timepoints+1)
+    ]
+
+    for scenario_id in range(1, scenarios+1):
+        conn.executemany(
+            """INSERT INTO results_project_capacity
+            (scenario_id, project, period, subproblem_id, stage_id,
+            technology, load_zone, capacity_mw)
+            VALUES (?, ?, ?, 1, 1, ?, ?, 100);""",
+            [(scenario_id, prj, period, tech, zone)
+             for (prj, tech, zone) in prj_tech_zone
+             for period in range(2030, 2030 + 10 * periods, 10)]
+        )
+        conn.executemany(
+            """INSERT INTO results_project_dispatch
+            (scenario_id, project, period, subproblem_id, stage_id,
+            timepoint, timepoint_weight, number_of_hours_in_timepoint,
+            spinup_or_lookahead, load_zone, technology, power_mw)
+            VALUES (?, ?, ?, 1, 1, ?, 1, 1, 0, ?, ?, 50);""",
+            [(scenario_id, prj, period, tmp, zone, tech)
+             for (prj, tech, zone) in prj_tech_zone
+             for (period, tmp, month, hour) in period_tmps]
+        )
+        conn.executemany(
+            """INSERT INTO results_project_dispatch_by_technology
+            (scenario_id, subproblem_id, stage_id, period, timepoint,
+            timepoint_weight, number_of_hours_in_timepoint,
+            spinup_or_lookahead, load_zone, technology, power_mw)
+            VALUES (?, 1, 1, ?, ?, 1, 1, 0, ?, ?, ?);""",
+            [(scenario_id, period, tmp, zone, tech,
+              50 * projects_per_technology)
+             for zone in zones for tech in TECHNOLOGIES
+             for (period, tmp, month, hour) in period_tmps]
+        )
+        conn.executemany(
+            """INSERT INTO results_project_dispatch_by_technology_period
+            (scenario_id, subproblem_id, stage_id, period, load_zone,
+            technology, spinup_or_lookahead, energy_mwh)
+            VALUES (?, 1, 1, ?, ?, ?, 0, ?);""",
+            [(scenario_id, period, zone, tech,
+              50 * projects_per_technology * timepoints)
+             for zone in zones for tech in TECHNOLOGIES
+             for period in range(2030, 2030 + 10 * periods, 10)]
+        )
+        conn.executemany(
+            """INSERT INTO results_project_curtailment_variable
+            (scenario_id, subproblem_id, stage_id, period, timepoint,
+            timepoint_weight, number_of_hours_in_timepoint,
+            spinup_or_lookahead, month, hour_of_day, load_zone,
+            scheduled_curtailment_mw)
+            VALUES (?, 1, 1, ?, ?, 1, 1, 0, ?, ?, ?, 5);""",
+            [(scenario_id, period, tmp, month, hour, zone)
+             for zone in zones
+             for (period, tmp, month, hour) in period_tmps]
+        )
+        conn.executemany(
+            """INSERT INTO results_transmission_imports_exports
+            (scenario_id, load_zone, period, subproblem_id, stage_id,
+            timepoint, timepoint_weight, number_of_hours_in_timepoint,
+            spinup_or_lookahead, imports_mw, exports_mw, net_imports_mw)
+            VALUES (?, ?, ?, 1, 1, ?, 1, 1, 0, 10, 10, 0);""",
+            [(scenario_id, zone, period, tmp)
+             for zone in zones
+             for (period, tmp, month, hour) in period_tmps]
+        )
+        conn.executemany(
+            """INSERT INTO results_system_load_balance
+            (scenario_id, load_zone, period, subproblem_id, stage_id,
+            timepoint, timepoint_weight, number_of_hours_in_timepoint,
+            spinup_or_lookahead, load_mw, overgeneration_mw,
+            unserved_energy_mw)
+            VALUES (?, ?, ?, 1, 1, ?, 1, 1, 0, 1000, 0, 0);""",
+            [(scenario_id, zone, period, tmp)
+             for zone in zones
+             for (period, tmp, month, hour) in period_tmps]
+        )
+        conn.commit()
+
+    return conn
+
+
+def time_plot_queries(conn, scenario_id, load_zone, period, timepoints,
+                      repeats):
+    """
+    :param conn: the database connection object
+    :param scenario_id: the scenario ID to query
+    :param load_zone: the load zone to query
+    :param period: the period to query
+    :param timepoints: list of the timepoints to query (e.g. one week)
+    :param repeats: the number of times each query is run
+    :return: list of the fastest query time in seconds for each plot query
+    """
+    query_times = []
+    for (description, query) in PLOT_QUERIES:
+        sql = query.format(
+            scenario_id=scenario_id, load_zone=load_zone, period=period,
+            stage_id=1, timepoints=",".join(str(tmp) for tmp in timepoints)
+        )
+        query_times.append(
+            min(timeit.repeat(lambda: conn.execute(sql).fetchall(),
+                              number=1, repeat=repeats))
+        )
+
+    return query_times
+
+
+def main(args=None):
+    if args is None:
+        args = sys.argv[1:]
+
+    parsed_args = parse_arguments(args=args)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = parsed_args.database if parsed_args.database is not None \
+            else os.path.join(tmp_dir, "results_benchmark.db")
+
+        print("Creating synthetic results database {}...".format(db_path))
+        start = timeit.default_timer()
+        conn = create_synthetic_results_database(
+            db_path=db_path,
+            scenarios=parsed_args.scenarios,
+            load_zones=parsed_args.load_zones,
+            projects_per_technology=parsed_args.projects_per_technology,
+            periods=parsed_args.periods,
+            timepoints=parsed_args.timepoints
+        )
+        print("...populated in {:.2f}s".format(
+            timeit.default_timer() - start))
+
+        # Query the middle scenario, the last load zone, and the first
+        # week of the last period
+        query_args = dict(
+            scenario_id=(parsed_args.scenarios + 1) // 2,
+            load_zone="Zone{}".format(parsed_args.load_zones),
+            period=2030 + 10 * (parsed_args.periods - 1),
+            timepoints=[
+                (2030 + 10 * (parsed_args.periods - 1)) * 10000 + tmp
+                for tmp in range(1, min(168, parsed_args.timepoints) + 1)
+            ],
+            repeats=parsed_args.repeats
+        )
+
+        times_without_indexes = time_plot_queries(conn=conn, **query_args)
+
+        start = timeit.default_timer()
+        create_results_indexes(conn=conn)
+        conn.commit()
+        print("Results indexes created in {:.2f}s".format(
+            timeit.default_timer() - start))
+
+        times_with_indexes = time_plot_queries(conn=conn, **query_args)
+
+        conn.close()
+
+    print("{:<40} {:>12} {:>12}".format(
+        "query", "no indexes", "indexes"))
+    for ((description, query), t_without, t_with) in zip(
+        PLOT_QUERIES, times_without_indexes, times_with_indexes
+    ):
+        print("{:<40} {:>11.2f}ms {:>11.2f}ms".format(
+            description, t_without * 1000, t_with * 1000))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+# Copyright 2016-2020 Blue Marble Analytics LLC. All rights reserved.
+
+"""
+The *project_operational_timepoints.py* script materializes the
+*project_operational_timepoints* view for one or all scenarios into the
+indexed *scenario_project_operational_timepoints* table. Querying the view
+requires cross-joining the project portfolio with all timepoints and
+recursively computing the operational periods of new projects, which is
+slow for large portfolios; *get_scenario_inputs.py* uses the materialized
+rows instead whenever they were materialized with exactly the scenario's
+current subscenario IDs (recorded in the
+*scenario_project_operational_timepoints_subscenarios* table).
+
+>>> python project_operational_timepoints.py --database PATH/TO/DB --scenario SCENARIO_NAME
+
+If no scenario is specified, the view is materialized for all scenarios.
+Re-run the script for a scenario if the project or temporal inputs of its
+subscenarios have changed; run it with the *--delete* flag to remove the
+materialized rows.
+"""
+
+from argparse import ArgumentParser
+import sys
+
+from db.common_functions import connect_to_database, spin_on_database_lock
+from gridpath.auxiliary.db_interface import \
+    get_project_operational_timepoints_subscenario_ids
+from gridpath.auxiliary.scenario_chars import SubScenarios
+
+
+def parse_arguments(args):
+    """
+    :param args: the script arguments specified by the user
+    :return: the parsed known argument values (<class 'argparse.Namespace'>
+    Python object)
+
+    Parse the known arguments.
+    """
+    parser = ArgumentParser(add_help=True)
+
+    # Database name and location options
+    parser.add_argument("--database", default="../io.db",
+                        help="The database file path relative to the current "
+                             "working directory. Defaults to ../io.db ")
+    parser.add_argument("--scenario",
+                        help="The scenario to materialize the project "
+                             "operational timepoints for. If not specified, "
+                             "all scenarios are materialized.")
+    parser.add_argument("--delete", default=False, action="store_true",
+                        help="Delete the materialized rows instead.")
+    parser.add_argument("--quiet", default=False, action="store_true",
+                        help="Don't print output.")
+
+    parsed_arguments = parser.parse_known_args(args=args)[0]
+
+    return parsed_arguments
+
+
+def delete_project_operational_timepoints(conn, scenario_id):
+    """
+    :param conn: the database connection object
+    :param scenario_id: the scenario ID
+
+    Delete the materialized project operational timepoints of a scenario
+    and the record of the subscenario IDs they were materialized with.
+    """
+    c = conn.cursor()
+    for tbl in ["scenario_project_operational_timepoints_subscenarios",
+                "scenario_project_operational_timepoints"]:
+        spin_on_database_lock(
+            conn=conn, cursor=c,
+            sql="""DELETE FROM {}
+            WHERE scenario_id = ?;""".format(tbl),
+            data=(scenario_id,), many=False
+        )
+
+
+def materialize_project_operational_timepoints(conn, scenario_id):
+    """
+    :param conn: the database connection object
+    :param scenario_id: the scenario ID
+
+    Insert the scenario's rows of the project_operational_timepoints view
+    (i.e. those of its project portfolio, operational characteristics,
+    capacity, and temporal subscenarios) into the
+    scenario_project_operational_timepoints table, replacing any previously
+    materialized rows, and record the subscenario IDs. The IDs are recorded
+    last, so the rows aren't used if the materialization fails part way.
+    """
+    subscenarios = SubScenarios(conn=conn, scenario_id=scenario_id)
+
+    delete_project_operational_timepoints(conn=conn, scenario_id=scenario_id)
+
+    c = conn.cursor()
+    sql = """
+        INSERT INTO scenario_project_operational_timepoints
+        (scenario_id, project_portfolio_scenario_id,
+        project_operational_chars_scenario_id,
+        project_specified_capacity_scenario_id, project_new_cost_scenario_id,
+        temporal_scenario_id, operational_type,
+        variable_generator_profile_scenario_id, subproblem_id, stage_id,
+        project, timepoint)
+        SELECT ?, project_portfolio_scenario_id,
+        project_operational_chars_scenario_id,
+        project_specified_capacity_scenario_id, project_new_cost_scenario_id,
+        temporal_scenario_id, operational_type,
+        variable_generator_profile_scenario_id, subproblem_id, stage_id,
+        project, timepoint
+        FROM project_operational_timepoints
+        WHERE project_portfolio_scenario_id = {}
+        AND project_operational_chars_scenario_id = {}
+        AND temporal_scenario_id = {}
+        AND (project_specified_capacity_scenario_id = {}
+             OR project_new_cost_scenario_id = {})
+        ORDER BY subproblem_id, stage_id, project, timepoint;
+        """.format(
+        subscenarios.PROJECT_PORTFOLIO_SCENARIO_ID,
+        subscenarios.PROJECT_OPERATIONAL_CHARS_SCENARIO_ID,
+        subscenarios.TEMPORAL_SCENARIO_ID,
+        subscenarios.PROJECT_SPECIFIED_CAPACITY_SCENARIO_ID,
+        subscenarios.PROJECT_NEW_COST_SCENARIO_ID
+    )
+    spin_on_database_lock(
+        conn=conn, cursor=c, sql=sql, data=(scenario_id,), many=False
+    )
+
+    spin_on_database_lock(
+        conn=conn, cursor=c,
+        sql="""INSERT INTO scenario_project_operational_timepoints_subscenarios
+        (scenario_id, project_portfolio_scenario_id,
+        project_operational_chars_scenario_id,
+        project_specified_capacity_scenario_id, project_new_cost_scenario_id,
+        temporal_scenario_id)
+        VALUES (?, ?, ?, ?, ?, ?);""",
+        data=(scenario_id, ) +
+        get_project_operational_timepoints_subscenario_ids(
+            subscenarios=subscenarios
+        ),
+        many=False
+    )
+
+
+def main(args=None):
+    if args is None:
+        args = sys.argv[1:]
+
+    parsed_args = parse_arguments(args=args)
+
+    conn = connect_to_database(db_path=parsed_args.database)
+    c = conn.cursor()
+
+    if parsed_args.scenario is None:
+        scenarios = c.execute(
+            """SELECT scenario_id, scenario_name FROM scenarios;"""
+        ).fetchall()
+    else:
+        scenarios = c.execute(
+            """SELECT scenario_id, scenario_name FROM scenarios
+            WHERE scenario_name = ?;""", (parsed_args.scenario,)
+        ).fetchall()
+        if not scenarios:
+            raise ValueError("Scenario {} not found in the database.".format(
+                parsed_args.scenario))
+
+    for (scenario_id, scenario_name) in scenarios:
+        if not parsed_args.quiet:
+            print("...{}".format(scenario_name))
+        if parsed_args.delete:
+            delete_project_operational_timepoints(
+                conn=conn, scenario_id=scenario_id
+            )
+        else:
+            materialize_project_operational_timepoints(
+                conn=conn, scenario_id=scenario_id
+            )
+
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
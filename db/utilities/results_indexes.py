@@ -0,0 +1,159 @@
+# Copyright 2016-2020 Blue Marble Analytics LLC. All rights reserved.
+
+"""
+The *results_indexes.py* script creates (or drops) secondary indexes on the
+results tables. The primary keys of the results tables lead with the
+scenario ID followed by the project or by the subproblem and stage, while
+the plots and the UI usually filter by load zone and timepoint or period,
+so these queries scan all of a scenario's results without the secondary
+indexes.
+
+The indexes are not part of the database schema. They are created after
+the first results import (see *import_scenario_results.py*) and then kept,
+so that later imports update them on each insert; re-creating them scans
+the results of all scenarios. Imports with the *--bulk_import* option
+drop the indexes before the import and re-create them afterwards. To
+bulk-load results into the database in some other way, drop the indexes
+first:
+
+>>> python results_indexes.py --database PATH/TO/DB --drop
+
+and re-create them afterwards:
+
+>>> python results_indexes.py --database PATH/TO/DB
+"""
+
+from argparse import ArgumentParser
+import sys
+
+from db.common_functions import connect_to_database, spin_on_database_lock
+
+
+# The secondary indexes on the results tables, as (table, columns) tuples,
+# based on the queries of the plots in the viz package
+RESULTS_INDEXES = [
+    # Dispatch plot
+    ("results_project_dispatch_by_technology",
+     ["scenario_id", "load_zone", "timepoint"]),
+    ("results_project_curtailment_variable",
+     ["scenario_id", "load_zone", "timepoint"]),
+    ("results_project_curtailment_hydro",
+     ["scenario_id", "load_zone", "timepoint"]),
+    ("results_transmission_imports_exports",
+     ["scenario_id", "load_zone", "timepoint"]),
+    ("results_system_load_balance",
+     ["scenario_id", "load_zone", "timepoint"]),
+    # Curtailment heatmap plots
+    ("results_project_curtailment_variable",
+     ["scenario_id", "load_zone", "period", "stage_id"]),
+    ("results_project_curtailment_hydro",
+     ["scenario_id", "load_zone", "period", "stage_id"]),
+    # Energy plot
+    ("results_project_dispatch_by_technology_period",
+     ["scenario_id", "load_zone", "stage_id", "spinup_or_lookahead"]),
+    # Capacity factor plot
+    ("results_project_dispatch",
+     ["scenario_id", "load_zone", "stage_id"]),
+    # Capacity plots
+    ("results_project_capacity",
+     ["scenario_id", "period", "subproblem_id", "stage_id"])
+]
+
+
+def get_index_name(table, columns):
+    """
+    :param table: the table name
+    :param columns: list of the indexed columns
+    :return: the index name
+    """
+    return "{}_{}_idx".format(table, "_".join(columns))
+
+
+def get_existing_tables(conn):
+    """
+    :param conn: the database connection object
+    :return: list of the tables in the database
+    """
+    return [
+        tbl[0] for tbl in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type='table';"
+        ).fetchall()
+    ]
+
+
+def create_results_indexes(conn):
+    """
+    :param conn: the database connection object
+
+    Create the secondary indexes on the results tables if they don't exist
+    yet.
+    """
+    c = conn.cursor()
+    existing_tables = get_existing_tables(conn=conn)
+    for (table, columns) in RESULTS_INDEXES:
+        if table in existing_tables:
+            sql = """
+                CREATE INDEX IF NOT EXISTS {} ON {} ({});
+                """.format(
+                get_index_name(table, columns), table, ", ".join(columns)
+            )
+            spin_on_database_lock(conn=conn, cursor=c, sql=sql, data=(),
+                                  many=False)
+
+
+def drop_results_indexes(conn):
+    """
+    :param conn: the database connection object
+
+    Drop the secondary indexes on the results tables.
+    """
+    c = conn.cursor()
+    for (table, columns) in RESULTS_INDEXES:
+        sql = """
+            DROP INDEX IF EXISTS {};
+            """.format(get_index_name(table, columns))
+        spin_on_database_lock(conn=conn, cursor=c, sql=sql, data=(),
+                              many=False)
+
+
+def parse_arguments(args):
+    """
+    :param args: the script arguments specified by the user
+    :return: the parsed known argument values (<class 'argparse.Namespace'>
+    Python object)
+
+    Parse the known arguments.
+    """
+    parser = ArgumentParser(add_help=True)
+
+    # Database name and location options
+    parser.add_argument("--database", default="../io.db",
+                        help="The database file path relative to the current "
+                             "working directory. Defaults to ../io.db ")
+    parser.add_argument("--drop", default=False, action="store_true",
+                        help="Drop the results indexes instead of creating "
+                             "them.")
+
+    parsed_arguments = parser.parse_known_args(args=args)[0]
+
+    return parsed_arguments
+
+
+def main(args=None):
+    if args is None:
+        args = sys.argv[1:]
+
+    parsed_args = parse_arguments(args=args)
+
+    conn = connect_to_database(db_path=parsed_args.database)
+
+    if parsed_args.drop:
+        drop_results_indexes(conn=conn)
+    else:
+        create_results_indexes(conn=conn)
+
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -12,7 +12,7 @@ import sys
 import warnings
 
 from db.common_functions import connect_to_database, \
-    spin_on_database_lock
+    spin_on_database_lock, delete_results_shard, get_database_path
 from db.utilities.common_functions import confirm
 
 
@@ -166,13 +166,28 @@ def delete_scenario(conn, scenario_id):
     :param scenario_id: the scenario_id to delete
 
     Delete a scenario fully, i.e. delete from all results tables, status
-    tables, and the scenarios table.
+    tables, the materialized inputs tables, and the scenarios table.
     """
     # Delete results and statuses
     delete_scenario_results_and_status(conn=conn, scenario_id=scenario_id)
 
-    # Delete from scenarios table
+    # Delete materialized project operational timepoints
     c = conn.cursor()
+    if c.execute(
+        """SELECT name FROM sqlite_master
+        WHERE type='table'
+        AND name='scenario_project_operational_timepoints';"""
+    ).fetchone() is not None:
+        for tbl in ["scenario_project_operational_timepoints_subscenarios",
+                    "scenario_project_operational_timepoints"]:
+            spin_on_database_lock(
+                conn=conn, cursor=c,
+                sql="""DELETE FROM {}
+                WHERE scenario_id = ?;""".format(tbl),
+                data=(scenario_id,), many=False
+            )
+
+    # Delete from scenarios table
     sc_id_sql = "DELETE FROM scenarios WHERE scenario_id = ?"
     spin_on_database_lock(conn=conn, cursor=c, sql=sc_id_sql,
                           data=(scenario_id,),
@@ -185,16 +200,23 @@ def delete_scenario_results_and_status(conn, scenario_id):
     :param scenario_id:
     :return:
 
-    Delete scenario results and statuses from relevant tables.
+    Delete scenario results and statuses from relevant tables. If the
+    scenario's results were imported into a results shard, we delete the
+    shard instead of deleting from the results tables.
     """
     c = conn.cursor()
     all_tables = c.execute(
         "SELECT name FROM sqlite_master WHERE type='table';"
     ).fetchall()
 
-    results_tables = [
-        tbl[0] for tbl in all_tables if tbl[0].startswith("results")
-    ]
+    if delete_results_shard(
+        db_path=get_database_path(conn), scenario_id=scenario_id
+    ):
+        results_tables = []
+    else:
+        results_tables = [
+            tbl[0] for tbl in all_tables if tbl[0].startswith("results")
+        ]
     status_tables = [
         tbl[0] for tbl in all_tables if tbl[0].startswith("status")
     ]
@@ -226,8 +248,16 @@ def delete_scenario_results(conn, scenario_id):
     :param scenario_id:
     :return:
 
-    Delete scenario from all results tables.
+    Delete scenario from all results tables. A scenario's results are
+    either in the database or in its results shard (see
+    *import_scenario_results.py*), so if the scenario has a shard, we
+    delete the shard file instead.
     """
+    if delete_results_shard(
+        db_path=get_database_path(conn), scenario_id=scenario_id
+    ):
+        return
+
     c = conn.cursor()
     all_tables = c.execute(
         "SELECT name FROM sqlite_master WHERE type='table';"
@@ -17,28 +17,364 @@ Various auxiliary functions used in other modules
 """
 
 from importlib import import_module
+import numpy as np
 import os.path
 import pandas as pd
 import traceback
 
+from gridpath.auxiliary.dynamic_components import required_subtype_modules
+from gridpath.auxiliary.state_channel import get_state_table
+
+
+# The parsed input tables, by absolute file path and requested column types;
+# each entry also records the file modification time and size at the time of
+# parsing, so that tables are parsed again only if the file changes
+INPUT_TABLE_CACHE = dict()
+
+# The prefix of the names of the arrays with the missing values of the text
+# columns in binary (.npz) input files
+NPZ_MISSING_VALUES_PREFIX = "__missing__"
+
+
+def get_input_table(file_path, columns=None, dtype=None, sep="\t"):
+    """
+    :param file_path: the path to the input (.tab) file
+    :param columns: list of the columns to return; if None, all columns are
+        returned
+    :param dtype: dictionary of the types to parse the respective columns
+        as, e.g. {"cap_factor": float}, as with pd.read_csv's dtype;
+        missing values are left as NaN
+    :param sep: the file delimiter
+    :return: pandas DataFrame with the requested columns
+
+    Get the (typed) data in an input file. If the .tab file does not exist
+    but a binary .npz file with the same name does (see
+    *write_input_table_as_npz*), the data are read from the .npz file. Tables
+    passed in memory from a prior subproblem or stage (see
+    *gridpath.auxiliary.state_channel*) are used instead of the file.
+
+    Many modules read the same input
+    files, e.g. projects.tab is read by the project module and then again by
+    most capacity-type, operational-type, reserve, and policy modules, so each
+    file is parsed only once per (subproblem, stage) and kept in memory. The
+    cached table is keyed by the file path, the requested column types,
+    modification time, and size, so a file that is re-written is parsed
+    again. A copy is returned, so callers can modify the dataframe.
+    """
+    df = _parse_input_table(file_path=file_path, sep=sep, dtype=dtype)
+
+    # Columns not in the file are an error, as with pd.read_csv's usecols
+    if columns is not None:
+        missing_columns = [c for c in columns if c not in df.columns]
+        if missing_columns:
+            raise ValueError(
+                "Columns {} not found in {}.".format(
+                    missing_columns, file_path)
+            )
+        df = df[list(columns)]
+
+    return df.copy()
+
+
+def get_input_table_header(file_path, sep="\t"):
+    """
+    :param file_path: the path to the input (.tab) file
+    :param sep: the file delimiter
+    :return: list of the column names in the input file
+
+    Get the columns of an input file, e.g. to check whether optional columns
+    were specified. The file is parsed (and cached) only once; see
+    *get_input_table*.
+    """
+    return list(_parse_input_table(file_path=file_path, sep=sep).columns)
+
+
+def clear_input_table_cache():
+    """
+    Remove all parsed input tables from memory, e.g. once a subproblem or
+    stage has been solved and its inputs are no longer needed.
+    """
+    INPUT_TABLE_CACHE.clear()
+
+
+def input_file_exists(file_path):
+    """
+    :param file_path: the path to the input (.tab) file
+    :return: True if the input file or its binary (.npz) counterpart exists
+        or the table was passed in memory from a prior subproblem or stage
+        (see *gridpath.auxiliary.state_channel*)
+    """
+    return get_state_table(file_path=file_path) is not None \
+        or os.path.exists(file_path) or os.path.exists(
+        get_npz_file_path(file_path)
+    )
+
+
+def get_npz_file_path(file_path):
+    """
+    :param file_path: the path to the input (.tab) file
+    :return: the path to the respective binary (.npz) input file
+    """
+    return os.path.splitext(file_path)[0] + ".npz"
+
+
+def write_input_table_as_npz(file_path):
+    """
+    :param file_path: the path to the input (.tab) file
+
+    Convert a .tab input file into a binary NumPy .npz file with one array
+    per column (in the order of the columns in the file) and remove the .tab
+    file. Text columns are saved as fixed-width unicode arrays, so the file
+    can be loaded without unpickling; since these can't hold NaN, the
+    missing values of a text column are recorded in a boolean mask array,
+    which is saved after the column's array.
+    """
+    df = pd.read_csv(file_path, sep="\t")
+    arrays = dict()
+    for column in df.columns:
+        if df[column].dtype == object:
+            arrays[column] = df[column].fillna("").to_numpy(dtype=str)
+            if df[column].isna().any():
+                arrays[NPZ_MISSING_VALUES_PREFIX + column] = \
+                    df[column].isna().to_numpy()
+        else:
+            arrays[column] = df[column].to_numpy()
+    np.savez(get_npz_file_path(file_path), **arrays)
+    os.remove(file_path)
+
+
+def get_param_dict_from_input_table(
+    file_path, index_positions, param_position
+):
+    """
+    :param file_path: the path to the input (.tab) file
+    :param index_positions: list of the positions of the columns the param
+        is indexed by
+    :param param_position: the position of the column with the param values
+    :return: dictionary of the param values by index, which can be loaded
+        directly into the Pyomo DataPortal
+
+    Get the values of a param from an input file (.tab or .npz, see
+    *get_input_table*), e.g. a timepoint-indexed profile, without going
+    through the DataPortal's text parsing. As with the DataPortal, columns
+    are selected by position rather than by name, values of
+    "." are treated as not specified and are not included, and the other
+    values in a column with "." values are cast to numbers if possible.
+    """
+    df = get_input_table(file_path=file_path)
+
+    return _get_param_dict(
+        index=_get_index(df=df, index_columns=df.columns[index_positions]),
+        values=df.iloc[:, param_position].tolist()
+    )
+
+
+def load_input_table(data_portal, filename, param, index=None, select=None):
+    """
+    :param data_portal: the Pyomo DataPortal
+    :param filename: the path to the input (.tab) file
+    :param param: the param component or tuple of param components to load
+    :param index: the set component to load the index into (optional)
+    :param select: tuple of the names of the columns to load, i.e. the index
+        columns followed by one column for each param; if None, the params
+        are loaded from the last columns of the file and indexed by all
+        other columns
+    :return:
+
+    Load params (and their index set) from an input file (.tab or .npz, see
+    *get_input_table*) directly into the DataPortal's data dictionary.
+    The arguments are the same as those of *DataPortal.load*, but the
+    DataPortal parses the file as text and processes it element by element;
+    here, each param's dictionary is built from the columns of the (cached)
+    dataframe, which is much faster for timepoint-indexed inputs. As with
+    the DataPortal, values of "." are treated as not specified.
+    """
+    params = param if isinstance(param, tuple) else (param,)
+    df = get_input_table(file_path=filename)
+    columns = list(select) if select is not None else list(df.columns)
+    index_columns = columns[:len(columns) - len(params)]
+    param_columns = columns[len(columns) - len(params):]
+
+    index_values = _get_index(df=df, index_columns=index_columns)
+    if index is not None:
+        data_portal[index.name] = {None: index_values}
+    for (p, column) in zip(params, param_columns):
+        data_portal[p.name] = _get_param_dict(
+            index=index_values, values=df[column].tolist()
+        )
+
+
+def _get_index(df, index_columns):
+    """
+    Get the list of the index values (tuples if the index has more than one
+    column) in a dataframe.
+    """
+    if len(index_columns) == 1:
+        return df[index_columns[0]].tolist()
+    return list(zip(*[df[column].tolist() for column in index_columns]))
+
+
+def _get_param_dict(index, values):
+    """
+    Get the dictionary of the specified param values by index, casting text
+    values to numbers if possible.
+    """
+    return {
+        idx: _cast_input_value(value)
+        for (idx, value) in zip(index, values)
+        if value != "."
+    }
+
+
+def _cast_input_value(value):
+    """
+    Cast a text input value to an integer or float if possible.
+    """
+    if not isinstance(value, str):
+        return value
+    for cast_as_type in (int, float):
+        try:
+            return cast_as_type(value)
+        except ValueError:
+            pass
+    return value
+
+
+def _parse_input_table(file_path, sep, dtype=None):
+    """
+    Parse the input file if it is not in the cache or has changed since it
+    was parsed. The returned dataframe is the cached object and must not be
+    modified.
+
+    Text files are parsed with the requested column types. Tables passed in
+    memory and binary (.npz) files are already typed, so the requested
+    types are applied to their values.
+    """
+    state_table = get_state_table(file_path=file_path)
+    if state_table is not None:
+        return _cast_input_table(df=state_table, dtype=dtype)
+
+    if not os.path.exists(file_path) \
+            and os.path.exists(get_npz_file_path(file_path)):
+        return _cast_input_table(
+            df=_parse_npz_input_table(
+                file_path=get_npz_file_path(file_path)
+            ),
+            dtype=dtype
+        )
+
+    file_stat = os.stat(file_path)
+    file_key = (
+        os.path.abspath(file_path),
+        None if dtype is None else tuple(
+            sorted((column, str(t)) for (column, t) in dtype.items())
+        )
+    )
+    file_version = (file_stat.st_mtime_ns, file_stat.st_size, sep)
+
+    if file_key not in INPUT_TABLE_CACHE.keys() \
+            or INPUT_TABLE_CACHE[file_key][0] != file_version:
+        INPUT_TABLE_CACHE[file_key] = (
+            file_version, pd.read_csv(file_path, sep=sep, dtype=dtype)
+        )
+
+    return INPUT_TABLE_CACHE[file_key][1]
+
+
+def _cast_input_table(df, dtype):
+    """
+    Cast the columns of an already typed table to the requested types,
+    leaving missing values as NaN.
+    """
+    if dtype is None:
+        return df
+
+    df = df.copy()
+    for column, column_type in dtype.items():
+        if column in df.columns:
+            df[column] = df[column].astype(column_type).where(
+                df[column].notna()
+            )
+    return df
+
+
+def _parse_npz_input_table(file_path):
+    """
+    Load a binary (.npz) input file if it is not in the cache or has changed
+    since it was loaded. Text columns are converted back to Python strings
+    and their missing values are restored as NaN.
+    """
+    file_stat = os.stat(file_path)
+    file_key = os.path.abspath(file_path)
+    file_version = (file_stat.st_mtime_ns, file_stat.st_size, "npz")
+
+    if file_key not in INPUT_TABLE_CACHE.keys() \
+            or INPUT_TABLE_CACHE[file_key][0] != file_version:
+        with np.load(file_path, allow_pickle=False) as npz_file:
+            columns = dict()
+            for column in npz_file.files:
+                if column.startswith(NPZ_MISSING_VALUES_PREFIX):
+                    continue
+                values = npz_file[column]
+                if values.dtype.kind == "U":
+                    values = values.astype(object)
+                    mask_name = NPZ_MISSING_VALUES_PREFIX + column
+                    if mask_name in npz_file.files:
+                        values[npz_file[mask_name]] = np.nan
+                columns[column] = values
+            df = pd.DataFrame(columns)
+        INPUT_TABLE_CACHE[file_key] = (file_version, df)
+
+    return INPUT_TABLE_CACHE[file_key][1]
+
 
 def get_required_subtype_modules_from_projects_file(
     scenario_directory, subproblem, stage, which_type
 ):
     """
     Get a list of unique types from projects.tab.
+
+    Many modules need the required capacity, operational, or availability
+    types; projects.tab is parsed once and cached (see *get_input_table*).
     """
-    project_df = pd.read_csv(
-        os.path.join(
+    project_df = get_input_table(
+        file_path=os.path.join(
             scenario_directory, str(subproblem), str(stage), "inputs",
             "projects.tab"
         ),
-        sep="\t"
+        columns=[which_type]
     )
 
-    required_modules = project_df[which_type].unique()
+    return project_df[which_type].unique()
 
-    return required_modules
+
+def get_required_subtype_modules(
+    d, scenario_directory, subproblem, stage, which_type
+):
+    """
+    :param d: the dynamic components class object
+    :param scenario_directory: the main scenario directory
+    :param subproblem: the subproblem ID
+    :param stage: the stage ID
+    :param which_type: the type column of projects.tab, e.g.
+        "operational_type"
+    :return: list of the unique types of the subproblem/stage's projects
+
+    The types are determined from projects.tab once per subproblem/stage
+    and kept on the dynamic components, which are passed to all modules, so
+    that the modules building the model, loading its data, and exporting
+    its results don't each determine them again.
+    """
+    types = getattr(d, required_subtype_modules)
+    if which_type not in types:
+        types[which_type] = list(
+            get_required_subtype_modules_from_projects_file(
+                scenario_directory=scenario_directory, subproblem=subproblem,
+                stage=stage, which_type=which_type
+            )
+        )
+
+    return types[which_type]
 
 
 def load_subtype_modules(
@@ -102,6 +438,122 @@ def join_sets(mod, set_name_list):
     return joined_set
 
 
+def group_set_by_dimension(mod, set_name, key_position, member_position):
+    """
+    Group the members of a multi-dimensional set by one of its dimensions,
+    e.g. get the projects that are operational in each timepoint from the
+    2-dimensional (project, timepoint) set PRJ_OPR_TMPS.
+
+    The grouping is built in a single pass over the set the first time it is
+    requested for a model instance and then cached on the instance, so that
+    indexed-set initialization rules can look up their members directly
+    instead of scanning the full set once per index.
+
+    :param mod: the Pyomo model instance
+    :param set_name: the name of the multi-dimensional set to group
+    :param key_position: the position of the dimension to group by
+    :param member_position: the position of the dimension to collect
+    :return: dictionary with the key-dimension values as keys and the list of
+        respective member-dimension values (in set order) as values; keys
+        with no members are not included
+    """
+    cache_name = "_{}_grouped_{}_by_{}".format(
+        set_name, member_position, key_position
+    )
+    if not hasattr(mod, cache_name):
+        grouped = dict()
+        for idx in getattr(mod, set_name):
+            grouped.setdefault(idx[key_position], []).append(
+                idx[member_position]
+            )
+        setattr(mod, cache_name, grouped)
+
+    return getattr(mod, cache_name)
+
+
+def group_set_by_param_and_dimension(
+    mod, set_name, param_name, key_position, member_position
+):
+    """
+    Group the members of a multi-dimensional set by the value of a param
+    indexed by the member dimension and by another dimension of the set,
+    e.g. get the projects in each load zone that are operational in each
+    timepoint from the (project, timepoint) set PRJ_OPR_TMPS and the
+    project-level load_zone param. Members for which the param is not
+    defined are skipped.
+
+    Like *group_set_by_dimension*, the grouping is built in a single pass
+    over the set and cached on the model instance, so that expressions
+    indexed by (param value, key) only touch their own members.
+
+    :param mod: the Pyomo model instance
+    :param set_name: the name of the multi-dimensional set to group
+    :param param_name: the name of the param indexed by the member dimension
+    :param key_position: the position of the dimension to group by along with
+        the param value
+    :param member_position: the position of the dimension to collect
+    :return: dictionary with (param value, key-dimension value) tuples as keys
+        and the list of respective member-dimension values (in set order) as
+        values; keys with no members are not included
+    """
+    cache_name = "_{}_grouped_{}_by_{}_and_{}".format(
+        set_name, member_position, param_name, key_position
+    )
+    if not hasattr(mod, cache_name):
+        param = getattr(mod, param_name)
+        grouped = dict()
+        for idx in getattr(mod, set_name):
+            member = idx[member_position]
+            if member in param:
+                grouped.setdefault(
+                    (param[member], idx[key_position]), []
+                ).append(member)
+        setattr(mod, cache_name, grouped)
+
+    return getattr(mod, cache_name)
+
+
+def group_set_by_params(mod, set_name, params_by_position):
+    """
+    Group the members of a multi-dimensional set by the values of params
+    indexed by its dimensions, e.g. group the (project, timepoint) set
+    CRBN_PRJ_OPR_TMPS by (carbon_cap_zone[project], period[timepoint]).
+
+    Like *group_set_by_dimension*, the grouping is built in a single pass
+    over the set and cached on the model instance, so that expressions
+    indexed by the param values only touch their own members.
+
+    :param mod: the Pyomo model instance
+    :param set_name: the name of the multi-dimensional set to group
+    :param params_by_position: list of (param name, position) tuples; each
+        param is indexed by the set dimension in the respective position
+    :return: dictionary with tuples of param values as keys and the list of
+        respective set members (in set order) as values; keys with no
+        members are not included
+    """
+    cache_name = "_{}_grouped_by_{}".format(
+        set_name,
+        "_and_".join(
+            "{}_{}".format(param_name, position)
+            for (param_name, position) in params_by_position
+        )
+    )
+    if not hasattr(mod, cache_name):
+        params = [
+            (getattr(mod, param_name), position)
+            for (param_name, position) in params_by_position
+        ]
+        grouped = dict()
+        for idx in getattr(mod, set_name):
+            grouped.setdefault(
+                tuple(param[idx[position]] for (param, position) in params),
+                []
+            ).append(idx)
+        setattr(mod, cache_name, grouped)
+
+    return getattr(mod, cache_name)
+
+
 def subset_init_by_param_value(mod, set_name, param_name, param_value):
     """
     Initialize subset based on a param value.
@@ -0,0 +1,236 @@
+# Copyright 2016-2020 Blue Marble Analytics LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Profile of the model build by GridPath module (see the *--profile_build*
+option of run_scenario.py and import_scenario_results.py).
+
+We time each module's *add_model_components*, *load_model_data*,
+*fix_variables*, *export_results*, and *import_results_into_database*
+methods. When creating the problem instance, Pyomo reports how long it
+took to construct each component to its construction-timing logger (see
+Pyomo's *report_timing*); we collect these reports and attribute each
+component to the module whose *add_model_components* method added it, so
+that we can tell which modules' sets, params, variables, constraints, and
+expressions are large or slow to construct.
+
+The profile of each subproblem/stage is written to its logs directory as a
+JSON file with the module summaries and component details, and as CSV
+files for tracking the build performance across releases.
+"""
+
+from contextlib import contextmanager
+from csv import writer
+import json
+import logging
+import os
+import time
+
+
+CONSTRUCTION_LOGGER = "pyomo.common.timing.construction"
+
+# The module steps we time and the component types we summarize
+MODULE_STEPS = [
+    "add_model_components", "load_model_data", "construct_components",
+    "fix_variables", "export_results", "import_results_into_database"
+]
+COMPONENT_TYPES = ["Set", "Param", "Var", "Constraint", "Expression"]
+
+# Components that Pyomo adds to the model rather than a module
+NO_MODULE = "(none)"
+
+
+class BuildProfile(object):
+    """
+    The timing of the module steps and of the construction of the model
+    components of a subproblem/stage.
+    """
+    def __init__(self):
+        self.module_names = list()
+        self.step_times = dict()
+        self.component_modules = dict()
+        self.components = dict()
+
+    def add_step_time(self, module_name, step, seconds):
+        """
+        :param module_name: the module name
+        :param step: the step (module method), e.g. "load_model_data"
+        :param seconds: the time the step took
+        """
+        if module_name not in self.module_names:
+            self.module_names.append(module_name)
+        key = (module_name, step)
+        self.step_times[key] = self.step_times.get(key, 0) + seconds
+
+    def add_component(self, name, ctype, size, seconds):
+        """
+        :param name: the component name
+        :param ctype: the component type, e.g. "Constraint"
+        :param size: the number of indices (or of elements for sets)
+        :param seconds: the time it took to construct the component
+
+        Record the construction of a component; components constructed more
+        than once (e.g. in repeated instance builds) are summed.
+        """
+        if name not in self.components.keys():
+            self.components[name] = {
+                "component": name,
+                "module": self.component_modules.get(name, NO_MODULE),
+                "type": ctype,
+                "size": size,
+                "construction_seconds": 0
+            }
+        self.components[name]["size"] = size
+        self.components[name]["construction_seconds"] += seconds
+
+    def get_module_summaries(self):
+        """
+        :return: list of dictionaries with the time of each step and the
+            number, total size, and construction time of the components of
+            each type by module
+        """
+        module_names = list(self.module_names)
+        if any(c["module"] == NO_MODULE for c in self.components.values()):
+            module_names.append(NO_MODULE)
+
+        summaries = list()
+        for module_name in module_names:
+            module_components = [
+                c for c in self.components.values()
+                if c["module"] == module_name
+            ]
+            summary = {"module": module_name}
+            for step in MODULE_STEPS:
+                summary["{}_seconds".format(step)] = sum(
+                    c["construction_seconds"] for c in module_components
+                ) if step == "construct_components" \
+                    else self.step_times.get((module_name, step), 0)
+            for ctype in COMPONENT_TYPES:
+                type_components = [
+                    c for c in module_components if c["type"] == ctype
+                ]
+                summary["n_{}".format(ctype.lower())] = len(type_components)
+                summary["{}_size".format(ctype.lower())] = sum(
+                    c["size"] for c in type_components
+                )
+            summaries.append(summary)
+
+        return summaries
+
+    def write(self, logs_directory, file_name):
+        """
+        :param logs_directory: the subproblem/stage logs directory
+        :param file_name: the base name of the profile files, e.g.
+            "build_profile"
+
+        Write the module summaries and the component details to a JSON file
+        and to CSV files <file_name>_modules.csv and
+        <file_name>_components.csv.
+        """
+        modules = self.get_module_summaries()
+        components = sorted(
+            self.components.values(),
+            key=lambda c: c["construction_seconds"], reverse=True
+        )
+        with open(os.path.join(logs_directory, "{}.json".format(file_name)),
+                  "w") as f:
+            json.dump({"modules": modules, "components": components}, f,
+                      indent=2)
+
+        for (rows, suffix) in [(modules, "modules"),
+                               (components, "components")]:
+            with open(os.path.join(logs_directory, "{}_{}.csv".format(
+                    file_name, suffix)), "w", newline="") as f:
+                csv_writer = writer(f, delimiter=",")
+                if rows:
+                    csv_writer.writerow(rows[0].keys())
+                for row in rows:
+                    csv_writer.writerow(row.values())
+
+
+@contextmanager
+def profile_module_step(build_profile, module, step, model=None):
+    """
+    :param build_profile: the BuildProfile object or None if not profiling
+    :param module: the module (Python <class 'module'> object)
+    :param step: the step (module method), e.g. "add_model_components"
+    :param model: the model, if the module adds components to it
+
+    Time a module's step; the components the module adds to the model are
+    attributed to it.
+    """
+    if build_profile is None:
+        yield
+        return
+
+    components_before = set(model.component_map().keys()) \
+        if model is not None else set()
+    start = time.perf_counter()
+    yield
+    build_profile.add_step_time(
+        module.__name__, step, time.perf_counter() - start
+    )
+    if model is not None:
+        for name in model.component_map().keys():
+            if name not in components_before:
+                build_profile.component_modules[name] = module.__name__
+
+
+@contextmanager
+def profile_construction(build_profile):
+    """
+    :param build_profile: the BuildProfile object or None if not profiling
+
+    Collect the construction times Pyomo reports while the problem instance
+    is created.
+    """
+    if build_profile is None:
+        yield
+        return
+
+    logger = logging.getLogger(CONSTRUCTION_LOGGER)
+    (level, propagate) = (logger.level, logger.propagate)
+    handler = ConstructionTimingHandler(build_profile=build_profile)
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    try:
+        yield
+    finally:
+        logger.removeHandler(handler)
+        logger.setLevel(level)
+        logger.propagate = propagate
+
+
+class ConstructionTimingHandler(logging.Handler):
+    """
+    Logging handler that records the construction timers Pyomo reports.
+    """
+    def __init__(self, build_profile):
+        logging.Handler.__init__(self, level=logging.INFO)
+        self.build_profile = build_profile
+
+    def emit(self, record):
+        timer = record.msg
+        component = getattr(timer, "obj", None)
+        if component is None:
+            return
+        try:
+            size = len(component)
+        except TypeError:
+            size = 1
+        self.build_profile.add_component(
+            name=component.name, ctype=component.ctype.__name__,
+            size=size, seconds=timer.timer
+        )
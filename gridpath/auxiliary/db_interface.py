@@ -1,7 +1,8 @@
 from db.common_functions import spin_on_database_lock
 
 
-def get_required_capacity_types_from_database(conn, scenario_id):
+def get_required_capacity_types_from_database(conn, scenario_id,
+                                              subscenarios=None):
     """
     Get the required type modules based on the database inputs
     for the specified scenario_id. Required modules are the unique set of
@@ -9,15 +10,22 @@ def get_required_capacity_types_from_database(conn, scenario_id):
 
     :param conn: database connection
     :param scenario_id: int, user-specified scenario ID
+    :param subscenarios: SubScenarios object with all subscenario info; if
+        specified, the subscenario IDs are taken from it instead of the
+        scenarios table
     :return: List of the required type modules
     """
     c = conn.cursor()
 
-    project_portfolio_scenario_id = c.execute(
-        """SELECT project_portfolio_scenario_id 
-        FROM scenarios 
-        WHERE scenario_id = {}""".format(scenario_id)
-    ).fetchone()[0]
+    if subscenarios is not None:
+        project_portfolio_scenario_id = \
+            subscenarios.PROJECT_PORTFOLIO_SCENARIO_ID
+    else:
+        project_portfolio_scenario_id = c.execute(
+            """SELECT project_portfolio_scenario_id 
+            FROM scenarios 
+            WHERE scenario_id = {}""".format(scenario_id)
+        ).fetchone()[0]
 
     required_capacity_type_modules = [
         p[0] for p in c.execute(
@@ -101,7 +109,7 @@ def get_scenario_id_and_name(scenario_id_arg, scenario_name_arg, c, script):
             return scenario_id_arg, scenario_name_arg
 
 
-def setup_results_import(conn, cursor, table, scenario_id, subproblem, stage):
+def delete_prior_results(conn, cursor, table, scenario_id, subproblem, stage):
     """
     :param conn: the connection object
     :param cursor: the cursor object
@@ -110,11 +118,9 @@ def setup_results_import(conn, cursor, table, scenario_id, subproblem, stage):
     :param subproblem:
     :param stage:
 
-    Prepare for results import: 1) delete prior results and 2) create a
-    temporary table we'll insert into first (for sorting before inserting
-    into the final table)
+    Delete prior results for the scenario, subproblem, and stage from a
+    results table.
     """
-    # Delete prior results
     del_sql = """
         DELETE FROM {} 
         WHERE scenario_id = ?
@@ -124,6 +130,26 @@ def setup_results_import(conn, cursor, table, scenario_id, subproblem, stage):
     spin_on_database_lock(conn=conn, cursor=cursor, sql=del_sql,
                           data=(scenario_id, subproblem, stage), many=False)
 
+
+def setup_results_import(conn, cursor, table, scenario_id, subproblem, stage):
+    """
+    :param conn: the connection object
+    :param cursor: the cursor object
+    :param table: the results table we'll be inserting into
+    :param scenario_id:
+    :param subproblem:
+    :param stage:
+
+    Prepare for results import: 1) delete prior results and 2) create a
+    temporary table we'll insert into first (for sorting before inserting
+    into the final table)
+    """
+    # Delete prior results
+    delete_prior_results(
+        conn=conn, cursor=cursor, table=table, scenario_id=scenario_id,
+        subproblem=subproblem, stage=stage
+    )
+
     # Create temporary table, which we'll use to sort the results before
     # inserting them into our persistent table
     drop_tbl_sql = \
@@ -218,3 +244,99 @@ def determine_table_subset_by_start_and_column(conn, tbl_start, cols):
                 table_subset.append(table)
 
     return table_subset
+
+
+def get_project_operational_timepoints_subscenario_ids(subscenarios):
+    """
+    :param subscenarios: SubScenarios object with all subscenario info
+    :return: tuple of the project portfolio, operational chars, specified
+        capacity, new cost, and temporal subscenario IDs (None if not
+        specified)
+
+    The subscenario IDs the project_operational_timepoints view is
+    materialized with (see db/utilities/project_operational_timepoints.py).
+    """
+    return tuple(
+        None if subscenario_id == "NULL" else subscenario_id
+        for subscenario_id in [
+            subscenarios.PROJECT_PORTFOLIO_SCENARIO_ID,
+            subscenarios.PROJECT_OPERATIONAL_CHARS_SCENARIO_ID,
+            subscenarios.PROJECT_SPECIFIED_CAPACITY_SCENARIO_ID,
+            subscenarios.PROJECT_NEW_COST_SCENARIO_ID,
+            subscenarios.TEMPORAL_SCENARIO_ID
+        ]
+    )
+
+
+def get_project_operational_timepoints_sql(
+    conn, scenario_id, subscenarios, subproblem, stage
+):
+    """
+    :param conn: database connection
+    :param scenario_id: the scenario ID
+    :param subscenarios: SubScenarios object with all subscenario info
+    :param subproblem: the subproblem ID
+    :param stage: the stage ID
+    :return: SQL query string
+
+    Get the query for the operational project-timepoints of a scenario's
+    subproblem and stage (with the columns of the
+    project_operational_timepoints view). If the view has been materialized
+    for the scenario with exactly its current subscenario IDs (see
+    db/utilities/project_operational_timepoints.py), we query the indexed
+    scenario_project_operational_timepoints table instead of the view.
+    """
+    # NOTE: There can be cases where a resource is both in specified capacity
+    # table and in new build table, but depending on capacity type you'd only
+    # use one of them, so filtering with OR is not 100% correct.
+    subscenario_filter = """project_portfolio_scenario_id = {}
+            AND project_operational_chars_scenario_id = {}
+            AND temporal_scenario_id = {}
+            AND (project_specified_capacity_scenario_id = {}
+                 OR project_new_cost_scenario_id = {})""".format(
+        subscenarios.PROJECT_PORTFOLIO_SCENARIO_ID,
+        subscenarios.PROJECT_OPERATIONAL_CHARS_SCENARIO_ID,
+        subscenarios.TEMPORAL_SCENARIO_ID,
+        subscenarios.PROJECT_SPECIFIED_CAPACITY_SCENARIO_ID,
+        subscenarios.PROJECT_NEW_COST_SCENARIO_ID
+    )
+
+    c = conn.cursor()
+    materialized = c.execute(
+        """SELECT name
+        FROM sqlite_master
+        WHERE type = 'table'
+        AND name = 'scenario_project_operational_timepoints_subscenarios';"""
+    ).fetchone() is not None and c.execute(
+        """SELECT project_portfolio_scenario_id,
+        project_operational_chars_scenario_id,
+        project_specified_capacity_scenario_id, project_new_cost_scenario_id,
+        temporal_scenario_id
+        FROM scenario_project_operational_timepoints_subscenarios
+        WHERE scenario_id = ?;""", (scenario_id,)
+    ).fetchone() == get_project_operational_timepoints_subscenario_ids(
+        subscenarios=subscenarios
+    )
+
+    if materialized:
+        source = """scenario_project_operational_timepoints
+            WHERE scenario_id = {}
+            AND""".format(scenario_id)
+    else:
+        source = """project_operational_timepoints
+            WHERE"""
+
+    sql = """SELECT project_portfolio_scenario_id,
+            project_operational_chars_scenario_id,
+            project_specified_capacity_scenario_id,
+            project_new_cost_scenario_id, temporal_scenario_id,
+            operational_type, variable_generator_profile_scenario_id,
+            subproblem_id, stage_id, project, timepoint
+            FROM {}
+            {}
+            AND subproblem_id = {}
+            AND stage_id = {}""".format(
+        source, subscenario_filter, subproblem, stage
+    )
+
+    return sql
@@ -53,6 +53,12 @@ local_capacity_balance_provision_components = \
 cost_components = "cost_components"
 revenue_components = "revenue_components"
 
+results_format = "results_format"
+
+rolling_horizon = "rolling_horizon"
+
+required_subtype_modules = "required_subtype_modules"
+
 
 class DynamicComponents(object):
     """
@@ -127,3 +133,23 @@ class DynamicComponents(object):
         # Modules will add component names to this list
         setattr(self, cost_components, list())
         setattr(self, revenue_components, list())
+
+        # ### Results ### #
+        # The format of the results files in addition to CSV ("csv" for CSV
+        # only or "parquet"); set based on the solve arguments
+        setattr(self, results_format, "csv")
+
+        # ### Rolling horizon ### #
+        # Whether the problem instance is kept and re-solved across the
+        # subproblems/stages of a scenario run; if so, modules declare their
+        # time-series params (e.g. load, profiles, reserve requirements, and
+        # linked timepoint params) mutable, so that their values can be
+        # updated on the instance; set based on the solve arguments
+        setattr(self, rolling_horizon, False)
+
+        # ### Subtype modules ### #
+        # The capacity, operational, and availability types required by the
+        # projects of the subproblem/stage, by type column of projects.tab;
+        # determined from the inputs when first needed and then shared by
+        # all modules (see *get_required_subtype_modules*)
+        setattr(self, required_subtype_modules, dict())
@@ -0,0 +1,362 @@
+# Copyright 2016-2020 Blue Marble Analytics LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+A content-addressed cache of the model input files. Many scenarios share
+most of their subscenario IDs, so most modules write the same input files
+for them. When a module writes its inputs, we record which subscenario IDs
+it looked up on the *SubScenarios* object and which existing input files
+it modified (many modules add columns to projects.tab); the files it wrote
+are saved in the cache under the hash of their contents, and the cache
+entry is keyed by the module, the subproblem and stage, the values of the
+subscenario IDs the module used, and the contents of the files it modified.
+The next time the module's inputs are needed with the same key, the cached
+files are hard-linked into the inputs directory instead of querying the
+database and writing them again.
+
+The cache assumes that the data of a subscenario ID in the database don't
+change; delete the cache directory if you modify existing subscenarios in
+place.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import uuid
+
+
+class RecordingSubScenarios(object):
+    """
+    Wrap a SubScenarios object and record the subscenario IDs that are
+    looked up on it.
+    """
+    def __init__(self, subscenarios):
+        """
+        :param subscenarios: the SubScenarios object to wrap
+        """
+        self.subscenarios = subscenarios
+        self.accessed = dict()
+
+    def __getattr__(self, name):
+        value = getattr(self.subscenarios, name)
+        if not callable(value):
+            self.accessed[name] = value
+        return value
+
+
+class InputCache(object):
+    """
+    The input cache for the inputs directory of a subproblem/stage.
+
+    Cached files are hard-linked into the inputs directory, so the linked
+    files must never be modified in place. Since we can't know in advance
+    which files a module whose inputs are not in the cache will modify, the
+    files linked from the cache are replaced with copies before such a
+    module is called.
+    """
+    def __init__(self, cache_directory, inputs_directory):
+        """
+        :param cache_directory: the cache directory
+        :param inputs_directory: the subproblem/stage inputs directory
+        """
+        self.objects_directory = os.path.join(cache_directory, "objects")
+        self.entries_directory = os.path.join(cache_directory, "entries")
+        self.inputs_directory = inputs_directory
+
+        # The content hashes of the files in the inputs directory and the
+        # files that are currently linked from the cache
+        self.file_hashes = dict()
+        self.linked_files = set()
+
+        self.n_hits = 0
+        self.n_misses = 0
+
+    def write_module_inputs(
+        self, module, scenario_directory, scenario_id, subscenarios,
+        subproblem, stage, conn
+    ):
+        """
+        :param module: the module (Python <class 'module'> object)
+        :param scenario_directory: the scenario directory
+        :param scenario_id: the scenario ID
+        :param subscenarios: SubScenarios object with all subscenario info
+        :param subproblem: the subproblem
+        :param stage: the stage
+        :param conn: database connection
+
+        Link the module's input files from the cache if they are cached;
+        otherwise, call the module's *write_model_inputs* method and add the
+        files it wrote to the cache.
+        """
+        outputs = self.get_cached_outputs(
+            module_name=module.__name__, subscenarios=subscenarios,
+            subproblem=subproblem, stage=stage
+        )
+        if outputs is not None:
+            for (f, file_hash) in outputs.items():
+                self.link_object(file_hash=file_hash, f=f)
+            self.n_hits += 1
+            return
+
+        # Hash the existing files before the module possibly modifies them
+        # and make sure it can't modify files linked from the cache
+        self.break_links()
+        for f in os.listdir(self.inputs_directory):
+            self.get_file_hash(f)
+        files_before = self.get_files_state()
+
+        recording_subscenarios = RecordingSubScenarios(subscenarios)
+        module.write_model_inputs(
+            scenario_directory=scenario_directory,
+            scenario_id=scenario_id,
+            subscenarios=recording_subscenarios,
+            subproblem=subproblem,
+            stage=stage,
+            conn=conn,
+        )
+
+        changed_files = [
+            f for (f, state) in self.get_files_state().items()
+            if files_before.get(f) != state
+        ]
+        modified_inputs = {
+            f: self.file_hashes[f] for f in changed_files
+            if f in files_before.keys()
+        }
+        outputs = dict()
+        for f in changed_files:
+            self.file_hashes.pop(f, None)
+            outputs[f] = self.get_file_hash(f)
+            self.save_object(file_hash=outputs[f], f=f)
+
+        self.save_entry(
+            module_name=module.__name__,
+            subscenario_values=recording_subscenarios.accessed,
+            modified_inputs=modified_inputs,
+            subproblem=subproblem, stage=stage, outputs=outputs
+        )
+        self.n_misses += 1
+
+    def get_cached_outputs(self, module_name, subscenarios, subproblem,
+                           stage):
+        """
+        :param module_name: the module name
+        :param subscenarios: SubScenarios object with all subscenario info
+        :param subproblem: the subproblem
+        :param stage: the stage
+        :return: dictionary of the cached output files with their content
+            hash if the module's inputs are cached; None otherwise
+
+        A module's cache entries are grouped by their signature, i.e. the
+        names of the subscenario IDs the module used and of the input files
+        it modified; we check each signature's entry for the current values
+        of the subscenario IDs and contents of the files.
+        """
+        module_directory = os.path.join(self.entries_directory, module_name)
+        if not os.path.exists(module_directory):
+            return None
+
+        for signature_hash in sorted(os.listdir(module_directory)):
+            signature_file = os.path.join(
+                module_directory, signature_hash, "signature.json"
+            )
+            if not os.path.exists(signature_file):
+                continue
+            with open(signature_file) as f:
+                signature = json.load(f)
+            if not all(
+                os.path.exists(os.path.join(self.inputs_directory, f))
+                for f in signature["modified_inputs"]
+            ):
+                continue
+
+            key = get_entry_key(
+                module_name=module_name,
+                subscenario_values={
+                    name: getattr(subscenarios, name)
+                    for name in signature["subscenarios"]
+                },
+                modified_inputs={
+                    f: self.get_file_hash(f)
+                    for f in signature["modified_inputs"]
+                },
+                subproblem=subproblem, stage=stage
+            )
+            entry_file = os.path.join(
+                module_directory, signature_hash,
+                "{}.json".format(get_hash(key))
+            )
+            if os.path.exists(entry_file):
+                with open(entry_file) as f:
+                    outputs = json.load(f)
+                if all(os.path.exists(self.get_object_path(file_hash))
+                       for file_hash in outputs.values()):
+                    return outputs
+
+        return None
+
+    def save_entry(self, module_name, subscenario_values, modified_inputs,
+                   subproblem, stage, outputs):
+        """
+        :param module_name: the module name
+        :param subscenario_values: dictionary of the subscenario IDs the
+            module used with their values
+        :param modified_inputs: dictionary of the existing input files the
+            module modified with their content hash before it modified them
+        :param subproblem: the subproblem
+        :param stage: the stage
+        :param outputs: dictionary of the files the module wrote with their
+            content hash
+
+        Save the cache entry of a module's inputs.
+        """
+        signature = {
+            "subscenarios": sorted(subscenario_values.keys()),
+            "modified_inputs": sorted(modified_inputs.keys())
+        }
+        signature_directory = os.path.join(
+            self.entries_directory, module_name, get_hash(signature)
+        )
+        os.makedirs(signature_directory, exist_ok=True)
+        signature_file = os.path.join(signature_directory, "signature.json")
+        if not os.path.exists(signature_file):
+            write_json_atomically(signature, signature_file)
+
+        key = get_entry_key(
+            module_name=module_name, subscenario_values=subscenario_values,
+            modified_inputs=modified_inputs, subproblem=subproblem,
+            stage=stage
+        )
+        write_json_atomically(
+            outputs,
+            os.path.join(signature_directory,
+                         "{}.json".format(get_hash(key)))
+        )
+
+    def get_object_path(self, file_hash):
+        """
+        :param file_hash: the content hash of a file
+        :return: the path of the cached file
+        """
+        return os.path.join(self.objects_directory, file_hash[:2], file_hash)
+
+    def save_object(self, file_hash, f):
+        """
+        :param file_hash: the content hash of the input file
+        :param f: the input file name
+
+        Copy an input file into the cache unless a file with the same
+        contents is already cached. We copy rather than link the file, as
+        later modules may still modify it.
+        """
+        object_path = self.get_object_path(file_hash)
+        if not os.path.exists(object_path):
+            os.makedirs(os.path.dirname(object_path), exist_ok=True)
+            tmp_path = "{}.{}.tmp".format(object_path, uuid.uuid4().hex)
+            shutil.copyfile(os.path.join(self.inputs_directory, f), tmp_path)
+            os.replace(tmp_path, object_path)
+
+    def link_object(self, file_hash, f):
+        """
+        :param file_hash: the content hash of the cached file
+        :param f: the input file name
+
+        Hard-link a cached file into the inputs directory, replacing the
+        file if it exists; copy it if hard links are not supported.
+        """
+        path = os.path.join(self.inputs_directory, f)
+        if os.path.exists(path):
+            os.remove(path)
+        try:
+            os.link(self.get_object_path(file_hash), path)
+            self.linked_files.add(f)
+        except OSError:
+            shutil.copyfile(self.get_object_path(file_hash), path)
+        self.file_hashes[f] = file_hash
+
+    def break_links(self):
+        """
+        Replace the files linked from the cache with copies.
+        """
+        for f in self.linked_files:
+            path = os.path.join(self.inputs_directory, f)
+            tmp_path = "{}.{}.tmp".format(path, uuid.uuid4().hex)
+            shutil.copyfile(path, tmp_path)
+            os.replace(tmp_path, path)
+        self.linked_files = set()
+
+    def get_file_hash(self, f):
+        """
+        :param f: the input file name
+        :return: the content hash of the input file
+        """
+        if f not in self.file_hashes.keys():
+            sha = hashlib.sha256()
+            with open(os.path.join(self.inputs_directory, f), "rb") as fh:
+                for chunk in iter(lambda: fh.read(1 << 20), b""):
+                    sha.update(chunk)
+            self.file_hashes[f] = sha.hexdigest()
+
+        return self.file_hashes[f]
+
+    def get_files_state(self):
+        """
+        :return: dictionary of the input file names with their inode,
+            modification time, and size
+        """
+        state = dict()
+        for f in os.listdir(self.inputs_directory):
+            stat = os.stat(os.path.join(self.inputs_directory, f))
+            state[f] = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+        return state
+
+
+def get_entry_key(module_name, subscenario_values, modified_inputs,
+                  subproblem, stage):
+    """
+    :return: the cache entry key (a dictionary)
+    """
+    return {
+        "module": module_name,
+        "subproblem": str(subproblem),
+        "stage": str(stage),
+        "subscenarios": subscenario_values,
+        "modified_inputs": modified_inputs
+    }
+
+
+def get_hash(obj):
+    """
+    :param obj: a JSON-serializable object
+    :return: the hash of the object's canonical JSON representation
+    """
+    return hashlib.sha256(
+        json.dumps(obj, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
+
+
+def write_json_atomically(obj, path):
+    """
+    :param obj: a JSON-serializable object
+    :param path: the file path
+
+    Write a JSON file via a temporary file, so that concurrent readers
+    (e.g. other scenarios' workers) never see a partially written file.
+    """
+    tmp_path = "{}.{}.tmp".format(path, uuid.uuid4().hex)
+    with open(tmp_path, "w") as f:
+        json.dump(obj, f, sort_keys=True, default=str)
+    os.replace(tmp_path, path)
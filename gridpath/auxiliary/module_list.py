@@ -18,8 +18,9 @@ This module contains:
 1) the list of all GridPath modules;
 2) the modules included in each optional feature;
 3) the 'cross-feature' modules;
-4) the method for determining the user-requested features for the scenarios;
-5) the method for loading modules.
+4) the modules whose inputs don't depend on the subproblem or stage;
+5) the method for determining the user-requested features for the scenarios;
+6) the method for loading modules.
 """
 
 from __future__ import print_function
@@ -321,6 +322,61 @@ def cross_feature_modules_list():
     return cross_modules
 
 
+def subproblem_invariant_input_modules_list():
+    """
+    :return: list of the modules whose database inputs are the same for
+        all subproblems and stages
+
+    The inputs these modules query from the database don't depend on the
+    subproblem or stage (e.g. the projects, zones, and periods), so when
+    writing inputs for many subproblems, they can be queried once and the
+    resulting files linked into the other subproblem/stage input
+    directories. Modules that delegate to type modules (e.g. operational
+    types) are not included, as some of those write time-varying inputs.
+    Modules that write timepoint-indexed inputs (e.g. the market prices and
+    volumes) are not included either, as timepoint inputs are specific to
+    the subproblem/stage.
+    """
+    invariant_modules = [
+        "temporal.investment.periods",
+        "geography.load_zones",
+        "geography.load_following_up_balancing_areas",
+        "geography.load_following_down_balancing_areas",
+        "geography.regulation_up_balancing_areas",
+        "geography.regulation_down_balancing_areas",
+        "geography.frequency_response_balancing_areas",
+        "geography.spinning_reserves_balancing_areas",
+        "geography.rps_zones",
+        "geography.carbon_cap_zones",
+        "geography.prm_zones",
+        "geography.local_capacity_zones",
+        "geography.markets",
+        "system.load_balance.market_participation",
+        "system.reliability.prm.prm_requirement",
+        "system.reliability.prm.elcc_surface",
+        "system.reliability.local_capacity.local_capacity_requirement",
+        "project",
+        "project.capacity.capacity_groups",
+        "project.fuels",
+        "project.operations",
+        "project.operations.recs",
+        "project.operations.carbon_cap",
+        "project.operations.tuning_costs",
+        "project.reliability.prm",
+        "project.reliability.prm.prm_simple",
+        "project.reliability.prm.elcc_surface",
+        "project.reliability.local_capacity",
+        "project.reliability.local_capacity.local_capacity_contribution",
+        "transmission",
+        "transmission.operations.costs",
+        "transmission.operations.carbon_emissions",
+        "transmission.operations.simultaneous_flow_limits",
+        "objective.transmission.carbon_imports_tuning_costs",
+        "objective.system.reliability.prm.dynamic_elcc_tuning_penalties"
+    ]
+    return invariant_modules
+
+
 def determine_modules(
         features=None, scenario_directory=None, multi_stage=None,
 ):
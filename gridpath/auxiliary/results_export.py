@@ -0,0 +1,241 @@
+# Copyright 2016-2020 Blue Marble Analytics LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Functions for exporting results tables. Rather than evaluating and writing
+one row at a time, the values of each model component are extracted in bulk
+into a NumPy array and each results table is assembled from these columns
+and written in a single pass. Results are always written as CSV files (with
+the csv module, so values are formatted as before), as the results
+summaries and the database import read them; if requested, a Parquet copy
+of each table is written as well. The results of the linked timepoints,
+which become inputs to the next subproblem, are exported the same way.
+"""
+
+import csv
+import numpy as np
+import os.path
+import pandas as pd
+from pyomo.environ import Var, value
+
+from gridpath.auxiliary.dynamic_components import results_format
+from gridpath.auxiliary.state_channel import write_state_table
+
+
+RESULTS_FORMATS = ["csv", "parquet"]
+
+
+def get_component_values(component, index, mask=None):
+    """
+    :param component: the Pyomo component (variable, expression, or param)
+    :param index: list of the indices to get the component values for
+    :param mask: optional list or array of booleans; if specified, values are
+        only reported for the indices for which the mask is True
+    :return: NumPy object array of the component values; the value is None
+        (i.e. empty in the results file) for masked indices
+
+    Get the values of a component for a list of indices. Variable values
+    are extracted in a single pass over the variable; expressions are
+    evaluated once per index. The values are kept as Pyomo returns them
+    (e.g. integer params are not converted to floats), so they are written
+    to the results files as before. As with *value*, a ValueError is raised
+    if an unmasked variable has no value.
+    """
+    if mask is None:
+        mask = np.ones(len(index), dtype=bool)
+
+    if component.ctype is Var:
+        component_values = component.extract_values()
+        values = [
+            component_values.get(idx) if in_mask else None
+            for (idx, in_mask) in zip(index, mask)
+        ]
+        for (idx, v, in_mask) in zip(index, values, mask):
+            if in_mask and v is None:
+                raise ValueError(
+                    "No value for uninitialized NumericValue object "
+                    "{}".format(component[idx].name)
+                )
+    else:
+        values = [
+            value(component[idx]) if in_mask else None
+            for (idx, in_mask) in zip(index, mask)
+        ]
+
+    # Fill the array element by element, as NumPy would otherwise try to
+    # unpack tuple values
+    array = np.empty(len(values), dtype=object)
+    array[:] = values
+    return array
+
+
+def get_clipped_component_values(component, index, lower=0, upper=None):
+    """
+    :param component: the Pyomo component (variable, expression, or param)
+    :param index: list of the indices to get the component values for
+    :param lower: the lower bound of the values
+    :param upper: optional upper bound of the values
+    :return: list of the component values within the bounds
+
+    Get the values of a component for a list of indices, limiting them to
+    the bounds (e.g. to remove small negative solver tolerances before the
+    values are passed to the next subproblem). Values within the bounds are
+    kept as is.
+    """
+    values = get_component_values(component, index)
+    if upper is not None:
+        values = [min(v, upper) for v in values]
+
+    return [max(v, lower) for v in values]
+
+
+def get_constraint_duals(constraint, dual_suffix):
+    """
+    :param constraint: the Pyomo constraint
+    :param dual_suffix: the instance's dual suffix with the duals the solver
+        returned
+    :return: list of the constraint indices (as tuples) that have a dual,
+        NumPy float array of their duals, and the number of indices without
+        a dual
+
+    Look up the duals of all indices of a constraint in a single pass over
+    the constraint. Indices with no dual (e.g. if the solver did not return
+    duals, as with CPLEX when solving MIPs) are left out.
+    """
+    indices = [idx if isinstance(idx, tuple) else (idx,)
+               for idx in constraint.keys()]
+    duals = np.array(
+        [dual_suffix.get(constraint_data)
+         for constraint_data in constraint.values()],
+        dtype=float
+    )
+
+    has_dual = ~np.isnan(duals)
+    n_missing = int(len(duals) - has_dual.sum())
+    if n_missing > 0:
+        indices = [idx for (idx, keep) in zip(indices, has_dual) if keep]
+        duals = duals[has_dual]
+
+    return indices, duals, n_missing
+
+
+def get_project_timepoint_columns(mod, index):
+    """
+    :param mod: the Pyomo model instance
+    :param index: list of (project, timepoint) tuples
+    :return: list of (column name, values) tuples
+
+    Get the project and timepoint descriptor columns shared by the dispatch
+    results tables: project, period, balancing_type_project, horizon,
+    timepoint, timepoint_weight, number_of_hours_in_timepoint, technology,
+    and load_zone.
+    """
+    projects = [prj for (prj, tmp) in index]
+    tmps = [tmp for (prj, tmp) in index]
+    balancing_types = [mod.balancing_type_project[prj] for prj in projects]
+
+    return [
+        ("project", projects),
+        ("period", [mod.period[tmp] for tmp in tmps]),
+        ("balancing_type_project", balancing_types),
+        ("horizon", [mod.horizon[tmp, bt]
+                     for (tmp, bt) in zip(tmps, balancing_types)]),
+        ("timepoint", tmps),
+        ("timepoint_weight", [mod.tmp_weight[tmp] for tmp in tmps]),
+        ("number_of_hours_in_timepoint", [mod.hrs_in_tmp[tmp]
+                                          for tmp in tmps]),
+        ("technology", [mod.technology[prj] for prj in projects]),
+        ("load_zone", [mod.load_zone[prj] for prj in projects])
+    ]
+
+
+def write_results_table(
+    scenario_directory, subproblem, stage, file_name, columns, d
+):
+    """
+    :param scenario_directory: the scenario directory
+    :param subproblem: the subproblem
+    :param stage: the stage
+    :param file_name: the results file name (with the .csv extension)
+    :param columns: list of (column name, values) tuples in column order
+    :param d: the dynamic components, which include the requested results
+        format
+    :return:
+
+    Write a results table to the subproblem/stage results directory as a CSV
+    file and, if the results format is "parquet," as a Parquet file too.
+    The CSV file is written with the csv module as the row-by-row exporters
+    did, so values are formatted the same way (e.g. integers aren't written
+    as floats) and missing values (None) are written as empty fields.
+    """
+    results_file = os.path.join(
+        scenario_directory, str(subproblem), str(stage), "results", file_name
+    )
+
+    with open(results_file, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow([column for (column, values) in columns])
+        writer.writerows(zip(*[values for (column, values) in columns]))
+
+    if getattr(d, results_format) == "parquet":
+        pd.DataFrame(
+            {column: values for (column, values) in columns}
+        ).to_parquet(os.path.splitext(results_file)[0] + ".parquet",
+                     index=False)
+
+
+def write_linked_timepoint_params(
+    file_path, index, tmp_linked_tmp_dict, columns
+):
+    """
+    :param file_path: the path to the linked timepoint params file in the
+        next subproblem's inputs directory
+    :param index: list of the (project, timepoint, ...) indices to link
+    :param tmp_linked_tmp_dict: dictionary of the linked timepoint ID by
+        timepoint
+    :param columns: list of (column name, values) tuples in column order
+        following the project and linked timepoint columns
+    :return:
+
+    Write the results of the linked timepoints as a state table for the
+    next subproblem.
+    """
+    rows = [
+        [idx[0], tmp_linked_tmp_dict[idx[1]]] + list(values)
+        for (idx, values)
+        in zip(index, zip(*[values for (column, values) in columns]))
+    ]
+    write_state_table(
+        file_path=file_path,
+        columns=["project", "linked_timepoint"]
+        + [column for (column, values) in columns],
+        rows=rows
+    )
+
+
+def check_results_format_dependencies(requested_results_format):
+    """
+    :param requested_results_format: the requested results format
+
+    Check that a Parquet engine is installed if Parquet results were
+    requested, so that we don't find out only once the problem is solved.
+    """
+    if requested_results_format == "parquet":
+        try:
+            pd.io.parquet.get_engine("auto")
+        except ImportError:
+            raise ImportError(
+                "Parquet results were requested but neither pyarrow nor "
+                "fastparquet is installed."
+            )
@@ -0,0 +1,348 @@
+# Copyright 2016-2020 Blue Marble Analytics LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Reuse of the problem instance across the subproblems and stages of a
+scenario run (see the *--rolling_horizon* option of run_scenario.py).
+
+In a rolling-horizon run, the subproblems usually have the same structure
+(projects, number of timepoints, horizons, etc.) and only differ in their
+time-series inputs: the load, the variable generator profiles, the reserve
+requirements, the hydro budgets, and the linked timepoint params exported
+by the previous subproblem. Constructing the problem instance is the most
+expensive step of the model build, so in rolling-horizon mode modules
+declare these params mutable and we keep the last instance; if the next
+subproblem only differs in the values of the mutable params and in the
+IDs of its timepoints and horizons, we update the instance and re-solve it
+instead of constructing a new one.
+
+The abstract model is still created and the input data still loaded for
+each subproblem, and we construct the sets and params of the new model
+(but not its variables, constraints, and expressions) to tell whether the
+structure changed. The members of the sets loaded from the input data are
+matched with the members of the respective sets of the instance by
+position, e.g. the first timepoint of the new subproblem with the first
+timepoint of the instance. The structure is unchanged if the model has the
+same components, the sets have the same number of members, each ID is
+matched with the same new ID in all of these sets, all the other sets have
+the same members once relabeled with the new IDs, and the non-mutable
+params have the same values except for IDs (e.g. the previous timepoint of
+each timepoint). We then relabel the instance with the new IDs. Components that are
+initialized with a rule (e.g. the constraints) are assumed to only depend
+on the sets and params, and not on the values of the IDs.
+
+The instance is not reused if IDs that change are also used for other
+members that don't change in the same way (e.g. if timepoints and months
+are both numbered from 1). A warning with the reason is issued when the
+instance can't be reused.
+"""
+
+import warnings
+
+from pyomo.common.collections import ComponentSet
+from pyomo.core.base.component import ComponentData
+from pyomo.core.base.indexed_component import IndexedComponent
+from pyomo.core.base.set import _FiniteSetData
+from pyomo.environ import Param, RangeSet, Set, Suffix, Var
+
+
+class RollingHorizonState(object):
+    """
+    The problem instance constructed for a previous subproblem/stage.
+    """
+    def __init__(self):
+        self.instance = None
+        self.vars_fixed_at_construction = ComponentSet()
+
+    def set_instance(self, instance):
+        """
+        :param instance: the newly constructed problem instance
+
+        Keep the instance for reuse by the next subproblems/stages. This
+        must be called before any variables are fixed.
+        """
+        self.instance = instance
+        self.vars_fixed_at_construction = ComponentSet(
+            v for v in instance.component_data_objects(Var) if v.fixed
+        )
+
+    def update_instance(self, model, data_portal):
+        """
+        :param model: the abstract model of the next subproblem/stage
+        :param data_portal: the DataPortal object with the data of the next
+            subproblem/stage
+        :return: the kept instance updated for the next subproblem/stage,
+            or None if there is no instance to reuse or the structure
+            changed
+
+        If the structure of the next subproblem/stage is unchanged, relabel
+        the kept instance with the new IDs, set its params to their new
+        values (mutable params with a default are reset to the default for
+        the indices that no longer have data), unfix the variables fixed for
+        the previous subproblem/stage, and clear the imported suffixes (e.g.
+        the duals) of the previous solution.
+        """
+        if self.instance is None:
+            return None
+
+        if list(model.component_map().keys()) \
+                != list(self.instance.component_map().keys()):
+            return self.reject("the model components changed")
+
+        sets_and_params = construct_sets_and_params(
+            model=model, data=data_portal.data()
+        )
+        relabeling = get_relabeling(
+            instance=self.instance, sets_and_params=sets_and_params,
+            data=data_portal.data()
+        )
+        if relabeling is None:
+            return self.reject(
+                "the sets changed or their members can't be matched by "
+                "position"
+            )
+        if not check_params_are_unchanged(
+            instance=self.instance, sets_and_params=sets_and_params,
+            relabeling=relabeling
+        ):
+            return self.reject("the non-mutable params changed")
+
+        relabel_instance(
+            instance=self.instance, sets_and_params=sets_and_params,
+            relabeling=relabeling
+        )
+
+        for v in self.instance.component_data_objects(Var):
+            if v.fixed and v not in self.vars_fixed_at_construction:
+                v.unfix()
+        for suffix in self.instance.component_objects(Suffix):
+            if suffix.import_enabled():
+                suffix.clear_all_values()
+
+        return self.instance
+
+    @staticmethod
+    def reject(reason):
+        """
+        :param reason: str, why the instance can't be reused
+        :return: None
+
+        Warn that the kept instance can't be reused.
+        """
+        warnings.warn(
+            "The problem instance of the previous subproblem/stage can't be "
+            "reused, as {}; constructing a new instance.".format(reason)
+        )
+        return None
+
+
+def construct_sets_and_params(model, data):
+    """
+    :param model: the abstract model
+    :param data: dictionary of the data by component name
+    :return: a copy of the model with only its sets and params constructed
+    """
+    sets_and_params = model.clone()
+    for component in sets_and_params.component_map().values():
+        if component.ctype in (Set, RangeSet, Param):
+            component.construct(data.get(component.name))
+
+    return sets_and_params
+
+
+def get_relabeling(instance, sets_and_params, data):
+    """
+    :param instance: the problem instance
+    :param sets_and_params: the model of the next subproblem/stage with its
+        sets and params constructed (see *construct_sets_and_params*)
+    :param data: dictionary of the data of the next subproblem/stage by
+        component name
+    :return: dictionary of the new ID of each set member (or member
+        dimension) of the instance, or None if the sets can't be matched
+
+    Match the members of the sets loaded from the data (and of the range
+    sets) by position, as their order is the order of the input files.
+    The other sets are derived from these and may be constructed in a
+    different order, so they must have the same members once relabeled,
+    regardless of their order. Only the sets that store their members are
+    checked (i.e. not the products, unions, etc. of other sets).
+    """
+    relabeling = dict()
+    relabeled_from = dict()
+
+    def add_pair(old, new):
+        if isinstance(old, tuple) or isinstance(new, tuple):
+            if not isinstance(old, tuple) or not isinstance(new, tuple) \
+                    or len(old) != len(new):
+                return False
+            return all(add_pair(o, n) for (o, n) in zip(old, new))
+        return relabeling.setdefault(old, new) == new \
+            and relabeled_from.setdefault(new, old) == old
+
+    set_pairs = list()
+    for s in instance.component_objects((Set, RangeSet)):
+        new_s = sets_and_params.component(s.name)
+        if len(s) != len(new_s):
+            return None
+        matched_by_position = s.ctype is RangeSet or s.name in data.keys()
+        if matched_by_position:
+            for (key, new_key) in zip(s.keys(), new_s.keys()):
+                if not add_pair(key, new_key):
+                    return None
+        set_pairs.append((s, new_s, matched_by_position))
+
+    for (s, new_s, matched_by_position) in set_pairs:
+        for key in s.keys():
+            new_key = relabel(key, relabeling)
+            if new_key not in new_s.keys():
+                return None
+            (set_data, new_set_data) = (s[key], new_s[new_key])
+            if not isinstance(set_data, _FiniteSetData) \
+                    and s.ctype is not RangeSet:
+                continue
+            if len(set_data) != len(new_set_data):
+                return None
+            if matched_by_position:
+                for (member, new_member) in zip(set_data, new_set_data):
+                    if not add_pair(member, new_member):
+                        return None
+
+    for (s, new_s, matched_by_position) in set_pairs:
+        if matched_by_position:
+            continue
+        for key in s.keys():
+            set_data = s[key]
+            if isinstance(set_data, _FiniteSetData) and set(
+                relabel(member, relabeling) for member in set_data
+            ) != set(new_s[relabel(key, relabeling)]):
+                return None
+
+    return relabeling
+
+
+def relabel(index, relabeling):
+    """
+    :param index: a set member or component index
+    :param relabeling: dictionary of the new IDs (see *get_relabeling*)
+    :return: the relabeled set member or index
+    """
+    if isinstance(index, tuple):
+        return tuple(relabeling.get(i, i) for i in index)
+    return relabeling.get(index, index)
+
+
+def check_params_are_unchanged(instance, sets_and_params, relabeling):
+    """
+    :param instance: the problem instance
+    :param sets_and_params: the model of the next subproblem/stage with its
+        sets and params constructed (see *construct_sets_and_params*)
+    :param relabeling: dictionary of the new IDs (see *get_relabeling*)
+    :return: boolean; whether only the values of the mutable params changed
+
+    The values of the mutable params can change, except that params
+    without a default must have a value for the same (relabeled) indices.
+    The values of the other params must be the same, or the new IDs of the
+    previous values if the values are IDs.
+    """
+    for p in instance.component_objects(Param):
+        new_p = sets_and_params.component(p.name)
+        values = get_param_values(p)
+        new_values = get_param_values(new_p)
+        if p.mutable:
+            if p.default() is Param.NoValue \
+                    and set(relabel(idx, relabeling) for idx in values) \
+                    != set(new_values.keys()):
+                return False
+        else:
+            if p.default() != new_p.default() \
+                    or len(values) != len(new_values):
+                return False
+            for (idx, param_value) in values.items():
+                new_idx = relabel(idx, relabeling)
+                if new_idx not in new_values.keys():
+                    return False
+                new_value = new_values[new_idx]
+                if new_value != param_value and \
+                        new_value != relabel(param_value, relabeling):
+                    return False
+
+    return True
+
+
+def relabel_instance(instance, sets_and_params, relabeling):
+    """
+    :param instance: the problem instance
+    :param sets_and_params: the model of the next subproblem/stage with its
+        sets and params constructed (see *construct_sets_and_params*)
+    :param relabeling: dictionary of the new IDs (see *get_relabeling*)
+
+    Replace the set members of the instance with the new ones, relabel the
+    indices of its indexed components, and set its params to the new
+    values.
+    """
+    # Set members
+    for s in instance.component_objects(Set):
+        new_s = sets_and_params.component(s.name)
+        for key in s.keys():
+            set_data = s[key]
+            new_set_data = new_s[relabel(key, relabeling)]
+            if isinstance(set_data, _FiniteSetData) \
+                    and list(set_data) != list(new_set_data):
+                set_data.clear()
+                set_data.update(new_set_data)
+
+    # Indices of the indexed components
+    if any(old != new for (old, new) in relabeling.items()):
+        for component in instance.component_objects():
+            if not isinstance(component, IndexedComponent) \
+                    or not component.is_indexed():
+                continue
+            relabeled_data = dict()
+            for (idx, component_data) in component._data.items():
+                new_idx = relabel(idx, relabeling)
+                relabeled_data[new_idx] = component_data
+                if isinstance(component_data, ComponentData):
+                    component_data._index = new_idx
+            component._data.clear()
+            component._data.update(relabeled_data)
+
+    # Param values
+    for p in instance.component_objects(Param):
+        new_values = get_param_values(sets_and_params.component(p.name))
+        if p.mutable:
+            for idx in get_param_values(p).keys():
+                if idx not in new_values.keys():
+                    p[idx] = p.default()
+            for (idx, param_value) in new_values.items():
+                p[idx] = param_value
+        else:
+            # Immutable params can't be set once constructed, and only
+            # changed if their values are IDs
+            for (idx, param_value) in new_values.items():
+                if p.is_indexed():
+                    p._data[idx] = param_value
+                else:
+                    p._value = param_value
+
+
+def get_param_values(p):
+    """
+    :param p: the Param component
+    :return: dictionary of the values of the param by index, for the
+        indices with a value (or default value) stored
+    """
+    if p.is_indexed():
+        return p.extract_values()
+    return {None: p.value} if p._data else {}
+
@@ -0,0 +1,336 @@
+# Copyright 2016-2020 Blue Marble Analytics LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Run records of the subproblems and stages of a scenario, used to re-run a
+scenario incrementally (see the *--incremental* option of run_scenario.py).
+
+When a subproblem/stage has been solved and its results saved, we write a
+run record in its results directory with:
+
+* the fingerprint of its inputs: the contents of the files in its inputs
+  directory (including any inputs linked from the previous subproblem), of
+  the scenario-level files (e.g. features.csv), and of the pass-through
+  inputs (fixed commitment) exported by the previous stages of the
+  subproblem;
+* the solver and solver options, and the results format;
+* the solver status, termination condition, and objective function value;
+* the results files; and
+* the inputs it passed downstream, i.e. the pass-through inputs it exported
+  for the next stages and the inputs it exported to the linked next
+  subproblem.
+
+The run record is written last and is deleted when a subproblem/stage is
+re-run, so its presence means that the results are complete. In
+incremental mode, a subproblem/stage is skipped if its run record matches
+the current inputs and options and the inputs it passed downstream are
+still in place; otherwise, it is re-run, which in turn changes the inputs
+of the downstream subproblems/stages as needed.
+"""
+
+from csv import reader, writer
+import hashlib
+import json
+import os
+import uuid
+
+
+RUN_RECORD_FILE = "run_record.json"
+
+# The scenario-level files that affect every subproblem/stage
+SCENARIO_FILES = [
+    "features.csv", "scenario_description.csv", "linked_subproblems_map.csv"
+]
+
+
+def get_results_directory(scenario_directory, subproblem, stage):
+    """
+    :param scenario_directory: the main scenario directory
+    :param subproblem: the horizon subproblem
+    :param stage: the stage subproblem
+    :return: the results directory of the subproblem/stage
+    """
+    return os.path.join(
+        scenario_directory, str(subproblem), str(stage), "results"
+    )
+
+
+def get_file_hash(path):
+    """
+    :param path: the file path
+    :return: the hash of the file contents
+    """
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+def get_pass_through_rows_hash(scenario_directory, subproblem, stages):
+    """
+    :param scenario_directory: the main scenario directory
+    :param subproblem: the horizon subproblem
+    :param stages: list of the stages whose pass-through inputs to include
+    :return: dictionary of the hash of the rows of each pass-through inputs
+        file for the stages
+
+    The pass-through inputs files of a subproblem (e.g.
+    fixed_commitment.tab) have a row for each project, timepoint, and stage
+    that exported them. The stages append their rows in run order, so we
+    hash the sorted rows to be independent of the order.
+    """
+    pass_through_directory = os.path.join(
+        scenario_directory, str(subproblem), "pass_through_inputs"
+    )
+    if not os.path.exists(pass_through_directory):
+        return {}
+
+    hashes = dict()
+    for f in sorted(os.listdir(pass_through_directory)):
+        with open(os.path.join(pass_through_directory, f)) as fh:
+            rows = list(reader(fh, delimiter="\t"))
+        stage_column = rows[0].index("stage")
+        stage_rows = sorted(
+            row for row in rows[1:] if row[stage_column] in stages
+        )
+        hashes[f] = get_hash(stage_rows)
+
+    return hashes
+
+
+def remove_pass_through_rows(scenario_directory, subproblem, stages):
+    """
+    :param scenario_directory: the main scenario directory
+    :param subproblem: the horizon subproblem
+    :param stages: list of the stages whose rows to remove
+
+    Remove the rows that a stage and the stages after it exported to the
+    pass-through inputs files of their subproblem in a prior run before
+    re-running the stage: the stages append their rows, and the model
+    treats all projects in the pass-through inputs as already committed, so
+    the file must only have the rows of the previous stages.
+    """
+    pass_through_directory = os.path.join(
+        scenario_directory, str(subproblem), "pass_through_inputs"
+    )
+    if not os.path.exists(pass_through_directory):
+        return
+
+    for f in os.listdir(pass_through_directory):
+        path = os.path.join(pass_through_directory, f)
+        with open(path) as fh:
+            rows = list(reader(fh, delimiter="\t"))
+        stage_column = rows[0].index("stage")
+        with open(path, "w", newline="") as fh:
+            writer(fh, delimiter="\t", lineterminator="\n").writerows(
+                [rows[0]] + [row for row in rows[1:]
+                             if row[stage_column] not in stages]
+            )
+
+
+def get_inputs_fingerprint(scenario_directory, subproblem, stage, stages):
+    """
+    :param scenario_directory: the main scenario directory
+    :param subproblem: the horizon subproblem
+    :param stage: the stage
+    :param stages: list of all stages of the subproblem
+    :return: the fingerprint (hash) of the subproblem/stage inputs
+    """
+    inputs_directory = os.path.join(
+        scenario_directory, str(subproblem), str(stage), "inputs"
+    )
+    previous_stages = stages[:stages.index(stage)] if stage in stages else []
+
+    return get_hash({
+        "scenario_files": {
+            f: get_file_hash(os.path.join(scenario_directory, f))
+            for f in SCENARIO_FILES
+            if os.path.exists(os.path.join(scenario_directory, f))
+        },
+        "inputs": {
+            f: get_file_hash(os.path.join(inputs_directory, f))
+            for f in sorted(os.listdir(inputs_directory))
+        },
+        "pass_through_inputs": get_pass_through_rows_hash(
+            scenario_directory, subproblem, previous_stages
+        )
+    })
+
+
+def get_linked_inputs_directory(scenario_directory, subproblem, stage):
+    """
+    :param scenario_directory: the main scenario directory
+    :param subproblem: the horizon subproblem
+    :param stage: the stage
+    :return: the inputs directory of the linked next subproblem (same stage)
+        if the subproblems are linked and it exists; None otherwise
+    """
+    if subproblem == "" or not os.path.exists(
+        os.path.join(scenario_directory, "linked_subproblems_map.csv")
+    ):
+        return None
+    linked_inputs_directory = os.path.join(
+        scenario_directory, str(int(subproblem) + 1), str(stage), "inputs"
+    )
+    if os.path.exists(linked_inputs_directory):
+        return linked_inputs_directory
+    return None
+
+
+def get_files_state(directory):
+    """
+    :param directory: a directory or None
+    :return: dictionary of the files in the directory with their inode,
+        modification time, and size
+    """
+    if directory is None:
+        return {}
+    state = dict()
+    for f in os.listdir(directory):
+        stat = os.stat(os.path.join(directory, f))
+        state[f] = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+    return state
+
+
+def get_downstream_inputs(
+    scenario_directory, subproblem, stage, linked_files
+):
+    """
+    :param scenario_directory: the main scenario directory
+    :param subproblem: the horizon subproblem
+    :param stage: the stage
+    :param linked_files: list of the files the subproblem/stage exported to
+        the inputs directory of the linked next subproblem
+    :return: dictionary of the hashes of the inputs the subproblem/stage
+        passed downstream
+    """
+    linked_inputs_directory = get_linked_inputs_directory(
+        scenario_directory, subproblem, stage
+    )
+    return {
+        "pass_through_inputs": get_pass_through_rows_hash(
+            scenario_directory, subproblem, [stage]
+        ),
+        "linked_inputs": {
+            f: get_file_hash(os.path.join(linked_inputs_directory, f))
+            for f in sorted(linked_files)
+            if os.path.exists(os.path.join(linked_inputs_directory, f))
+        }
+    }
+
+
+def delete_run_record(scenario_directory, subproblem, stage):
+    """
+    :param scenario_directory: the main scenario directory
+    :param subproblem: the horizon subproblem
+    :param stage: the stage
+
+    Delete the run record before (re-)running a subproblem/stage, so that a
+    run that fails before completing is never mistaken for a complete one.
+    """
+    path = os.path.join(
+        get_results_directory(scenario_directory, subproblem, stage),
+        RUN_RECORD_FILE
+    )
+    if os.path.exists(path):
+        os.remove(path)
+
+
+def write_run_record(scenario_directory, subproblem, stage, record):
+    """
+    :param scenario_directory: the main scenario directory
+    :param subproblem: the horizon subproblem
+    :param stage: the stage
+    :param record: dictionary with the inputs fingerprint, options, solver
+        results, and downstream inputs of the subproblem/stage
+
+    Write the run record with the list of the results files.
+    """
+    results_directory = get_results_directory(
+        scenario_directory, subproblem, stage
+    )
+    record["results_files"] = sorted(
+        f for f in os.listdir(results_directory) if f != RUN_RECORD_FILE
+    )
+    path = os.path.join(results_directory, RUN_RECORD_FILE)
+    tmp_path = "{}.{}.tmp".format(path, uuid.uuid4().hex)
+    with open(tmp_path, "w") as f:
+        json.dump(record, f, indent=2, sort_keys=True, default=str)
+    os.replace(tmp_path, path)
+
+
+def read_run_record(scenario_directory, subproblem, stage):
+    """
+    :param scenario_directory: the main scenario directory
+    :param subproblem: the horizon subproblem
+    :param stage: the stage
+    :return: the run record of the subproblem/stage, or None if it doesn't
+        exist
+    """
+    path = os.path.join(
+        get_results_directory(scenario_directory, subproblem, stage),
+        RUN_RECORD_FILE
+    )
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def check_run_is_current(
+    scenario_directory, subproblem, stage, record, inputs_fingerprint,
+    options
+):
+    """
+    :param scenario_directory: the main scenario directory
+    :param subproblem: the horizon subproblem
+    :param stage: the stage
+    :param record: the run record of the subproblem/stage or None
+    :param inputs_fingerprint: the fingerprint of the current inputs
+    :param options: dictionary of the current solver and results options
+    :return: boolean; whether the subproblem/stage can be skipped
+
+    A subproblem/stage can be skipped if it was solved with the same inputs
+    and options, its results are complete, and the inputs it passed
+    downstream are unchanged.
+    """
+    if record is None \
+            or record["solver_status"] != "ok" \
+            or record["inputs_fingerprint"] != inputs_fingerprint \
+            or record["options"] != options:
+        return False
+
+    results_directory = get_results_directory(
+        scenario_directory, subproblem, stage
+    )
+    if not all(os.path.exists(os.path.join(results_directory, f))
+               for f in record["results_files"]):
+        return False
+
+    downstream_inputs = get_downstream_inputs(
+        scenario_directory, subproblem, stage,
+        linked_files=record["downstream_inputs"]["linked_inputs"].keys()
+    )
+    return downstream_inputs == record["downstream_inputs"]
+
+
+def get_hash(obj):
+    """
+    :param obj: a JSON-serializable object
+    :return: the hash of the object's canonical JSON representation
+    """
+    return hashlib.sha256(
+        json.dumps(obj, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
@@ -0,0 +1,124 @@
+# Copyright 2016-2020 Blue Marble Analytics LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+In-process channel for the state passed between the subproblems and stages
+of a scenario run, i.e. the linked timepoint params a subproblem exports to
+the next linked subproblem and the fixed commitment a stage exports to the
+next stages of its subproblem.
+
+This state is passed through tab-delimited files (in the next subproblem's
+inputs directory and in the subproblem's pass_through_inputs directory
+respectively). When the subproblems and stages are run within a single
+run_scenario invocation, the channel is opened and the tables are also kept
+in memory by file path, so the next subproblem or stage gets the exported
+data directly rather than parsing the files again (see
+*gridpath.auxiliary.auxiliary.get_input_table*). Writing the files is then
+optional and only needed as an audit trail (see the *--no_state_files*
+option of run_scenario.py).
+
+When the channel is closed (e.g. when running a single subproblem or stage
+with the files from a prior run), the tables are only written to and read
+from the files.
+"""
+
+from csv import writer
+import os.path
+import pandas as pd
+
+
+class StateChannel(object):
+    """
+    The tables exported for the next subproblems and stages, by file path.
+    """
+    def __init__(self):
+        self.is_open = False
+        self.write_files = True
+        self.tables = dict()
+
+
+STATE_CHANNEL = StateChannel()
+
+
+def open_state_channel(write_files=True):
+    """
+    :param write_files: boolean; whether to also write the tables to files
+
+    Start keeping the exported tables in memory, e.g. at the beginning of a
+    scenario run.
+    """
+    STATE_CHANNEL.is_open = True
+    STATE_CHANNEL.write_files = write_files
+    STATE_CHANNEL.tables.clear()
+
+
+def close_state_channel():
+    """
+    Stop keeping the exported tables in memory and remove the ones kept,
+    e.g. at the end of a scenario run.
+    """
+    STATE_CHANNEL.is_open = False
+    STATE_CHANNEL.write_files = True
+    STATE_CHANNEL.tables.clear()
+
+
+def write_state_table(file_path, columns, rows, append=False):
+    """
+    :param file_path: the path to the tab-delimited file
+    :param columns: list of the column names
+    :param rows: list of the rows (lists of values in column order)
+    :param append: boolean; whether to append the rows to the existing table
+        (the file must exist with a header) rather than replace it
+
+    Export a table for the next subproblems or stages. If the channel is
+    open, the table is kept in memory; the file is written if the channel is
+    closed or if files were requested as an audit trail.
+    """
+    if STATE_CHANNEL.is_open:
+        key = os.path.abspath(file_path)
+        if append:
+            if key not in STATE_CHANNEL.tables.keys():
+                STATE_CHANNEL.tables[key] = pd.read_csv(file_path, sep="\t")
+            STATE_CHANNEL.tables[key] = pd.concat(
+                [STATE_CHANNEL.tables[key],
+                 pd.DataFrame([list(row) for row in rows], columns=columns)],
+                ignore_index=True
+            )
+        else:
+            STATE_CHANNEL.tables[key] = pd.DataFrame(
+                [list(row) for row in rows], columns=columns
+            )
+
+        if not STATE_CHANNEL.write_files:
+            return
+
+    with open(file_path, "a" if append else "w", newline="") as f:
+        table_writer = writer(f, delimiter="\t", lineterminator="\n")
+        if not append:
+            table_writer.writerow(columns)
+        table_writer.writerows(rows)
+
+
+def get_state_table(file_path):
+    """
+    :param file_path: the path to the tab-delimited file
+    :return: the table kept in memory for the file path as a pandas
+        DataFrame or None if the channel is closed or has no such table
+
+    The returned dataframe is the one kept in the channel and must not be
+    modified.
+    """
+    if not STATE_CHANNEL.is_open:
+        return None
+    return STATE_CHANNEL.tables.get(os.path.abspath(file_path))
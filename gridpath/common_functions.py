@@ -126,6 +126,90 @@ def get_db_parser():
     return parser
 
 
+def get_input_format_parser():
+    """
+    Create ArgumentParser object which has the arguments for the format of
+    the model input files written from the database.
+
+    :return:
+    """
+
+    parser = ArgumentParser(add_help=False)
+    parser.add_argument("--input_format", default="tab",
+                        choices=["tab", "npz"],
+                        help="The format of the timepoint-indexed profile "
+                             "input files (variable generator profiles, "
+                             "loads, and reserve requirements): tab-delimited "
+                             "text (default) or binary NumPy (npz) files, "
+                             "which are faster to load for large models. "
+                             "All other inputs are written as .tab files.")
+
+    return parser
+
+
+def get_parallel_inputs_parser():
+    """
+    Create ArgumentParser object which has the arguments for writing the
+    model inputs of scenarios with many subproblems/stages.
+
+    :return:
+    """
+
+    parser = ArgumentParser(add_help=False)
+    parser.add_argument("--link_subproblem_invariant_inputs", default=False,
+                        action="store_true",
+                        help="Query the inputs that don't depend on the "
+                             "subproblem or stage (e.g. projects, zones) "
+                             "only once and link the files into the other "
+                             "subproblem/stage input directories.")
+    parser.add_argument("--n_parallel_get_inputs", default=1, type=int,
+                        help="Write the inputs of the subproblems/stages "
+                             "in this many parallel processes, each with "
+                             "its own read-only database connection. "
+                             "Defaults to 1.")
+    parser.add_argument("--input_cache_directory",
+                        help="Link the input files of each module from this "
+                             "content-addressed cache directory if they were "
+                             "written before for the same subscenario IDs "
+                             "and subproblem/stage, and add them to the "
+                             "cache otherwise. Delete the cache if you "
+                             "modify subscenario data in place.")
+
+    return parser
+
+
+def get_results_import_parser():
+    """
+    Create ArgumentParser object which has the arguments for importing the
+    scenario results into the database.
+
+    :return:
+    """
+
+    parser = ArgumentParser(add_help=False)
+    parser.add_argument("--shard_results", default=False,
+                        action="store_true",
+                        help="Import the results into a separate SQLite "
+                             "file for the scenario (in the <database "
+                             "name>_results directory next to the database) "
+                             "instead of into the database's results "
+                             "tables. The UI and plots query the shards "
+                             "along with the database; deleting the "
+                             "scenario's results deletes the file.")
+    parser.add_argument("--bulk_import", default=False,
+                        action="store_true",
+                        help="Drop the secondary indexes on the results "
+                             "tables before importing the results and "
+                             "re-create them afterwards, rather than update "
+                             "them on each insert. Re-creating the indexes "
+                             "scans the results of all scenarios, so only "
+                             "use this to load a large amount of results "
+                             "when no other results are being imported or "
+                             "queried.")
+
+    return parser
+
+
 def get_solve_parser():
     """
     Create ArgumentParser object which has the common set of arguments for
@@ -158,6 +242,11 @@ def get_solve_parser():
                              "your PATH. The solver specified with the "
                              "--solver option must be the same as the solver "
                              "for which you are providing an executable.")
+    parser.add_argument("--solver_threads", type=int,
+                        help="Limit the solver to this many threads. This "
+                             "is ignored if the number of threads is set in "
+                             "the scenario's solver options and for solvers "
+                             "with no known threads option.")
     parser.add_argument("--mute_solver_output", default=False,
                         action="store_true",
                         help="Don't print solver output.")
@@ -169,6 +258,62 @@ def get_solve_parser():
                         help="Save temporary solver files.")
     parser.add_argument("--symbolic", default=False, action="store_true",
                         help="Use symbolic labels in solver files.")
+    parser.add_argument("--persistent_solver", default=False,
+                        action="store_true",
+                        help="Use the Pyomo persistent interface of the "
+                             "solver (e.g. gurobi_persistent), if available, "
+                             "reuse it for all subproblems, and warm-start "
+                             "each subproblem with the previous solution "
+                             "(timepoints are matched by position). APPSI "
+                             "interfaces (e.g. appsi_highs) are reused but "
+                             "don't support warm starts.")
+    parser.add_argument("--n_parallel_subproblems", default=1, type=int,
+                        help="Run this many independent subproblems in "
+                             "parallel processes. Ignored if the "
+                             "subproblems are linked. Defaults to 1.")
+    parser.add_argument("--incremental", default=False, action="store_true",
+                        help="Skip the subproblems and stages that were "
+                             "already solved with the same inputs (including "
+                             "any pass-through and linked inputs) and solver "
+                             "options and whose results are complete, e.g. "
+                             "to resume a failed run.")
+    parser.add_argument("--no_state_files", default=False,
+                        action="store_true",
+                        help="Pass the inputs a subproblem or stage exports "
+                             "to the next ones (linked timepoint params and "
+                             "fixed commitment) in memory only, without "
+                             "also writing them to files. Ignored in "
+                             "incremental mode, as the skipped subproblems "
+                             "and stages don't export them again.")
+    parser.add_argument("--rolling_horizon", default=False,
+                        action="store_true",
+                        help="Keep the problem instance across subproblems "
+                             "and stages and, if the next one only differs "
+                             "in its time-series inputs (load, profiles, "
+                             "reserve requirements, hydro budgets, and "
+                             "linked timepoint params) and in the IDs of its "
+                             "timepoints and horizons, update these on the "
+                             "instance and re-solve it rather than build a "
+                             "new instance.")
+    parser.add_argument("--skip_domain_checks", default=False,
+                        action="store_true",
+                        help="Don't check that each param value is within "
+                             "the param's domain when creating the problem "
+                             "instance. Only use with inputs that have "
+                             "passed validation (see validate_inputs.py).")
+    parser.add_argument("--profile_build", default=False,
+                        action="store_true",
+                        help="Time each module's steps of the model build "
+                             "and results export and the construction of "
+                             "each model component, and write the profile "
+                             "to the logs directory.")
+    parser.add_argument("--results_format", default="csv",
+                        choices=["csv", "parquet"],
+                        help="Write the results tables as CSV files only "
+                             "(default) or also as Parquet files (requires "
+                             "pyarrow or fastparquet). CSV files are always "
+                             "written, as they are used to summarize results "
+                             "and import them into the database.")
     # Flag for test runs (various changes in behavior)
     parser.add_argument("--testing", default=False, action="store_true",
                         help="Flag for test suite runs. Results not saved.")
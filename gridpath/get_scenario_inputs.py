@@ -23,24 +23,58 @@ The main() function of this script can also be called with the
 
 from argparse import ArgumentParser
 import csv
+from multiprocessing import Pool
 import os.path
 import pandas as pd
+import shutil
 import sys
 
 from db.common_functions import connect_to_database
 from gridpath.auxiliary.db_interface import get_scenario_id_and_name
+from gridpath.auxiliary.auxiliary import write_input_table_as_npz
+from gridpath.auxiliary.input_cache import InputCache
 from gridpath.common_functions import determine_scenario_directory, \
-    create_directory_if_not_exists, get_db_parser, get_required_e2e_arguments_parser
-from gridpath.auxiliary.module_list import determine_modules, load_modules
+    create_directory_if_not_exists, get_db_parser, \
+    get_required_e2e_arguments_parser, get_input_format_parser, \
+    get_parallel_inputs_parser
+from gridpath.auxiliary.module_list import determine_modules, load_modules, \
+    subproblem_invariant_input_modules_list
 from gridpath.auxiliary.scenario_chars import OptionalFeatures, SubScenarios, \
     SubProblems, SolverOptions
 
 
+# The timepoint-indexed profile input files that can be written in the
+# binary .npz format; the reserve requirement files are identified by their
+# suffix
+PROFILE_INPUT_FILES = [
+    "variable_generator_profiles.tab", "project_availability_exogenous.tab",
+    "load_mw.tab", "market_prices.tab", "market_volume.tab"
+]
+PROFILE_INPUT_FILE_SUFFIXES = ["_tmp_requirement.tab"]
+
+
 def write_model_inputs(scenario_directory, subproblems, loaded_modules,
-                       scenario_id, subscenarios, conn):
+                       scenario_id, subscenarios, conn, input_format="tab",
+                       link_invariant_inputs=False, n_parallel=1,
+                       db_path=None, modules_to_use=None,
+                       input_cache_directory=None):
     """
     For each module, load the inputs from the database and write out the inputs
     into .tab files, which will be used to construct the optimization problem.
+    If the input format is "npz," the timepoint-indexed profile files are
+    then saved as binary NumPy .npz files instead (see
+    *convert_profile_inputs_to_npz*).
+
+    If requested, the subproblem-invariant inputs are only queried for the
+    first subproblem/stage and then linked into the input directories of the
+    other subproblems/stages (see *determine_linked_inputs*). If more than
+    one parallel process is requested, the inputs for the (remaining)
+    subproblems/stages are written in a pool of worker processes, each with
+    its own read-only database connection.
+
+    If an input cache directory is specified, the modules' input files are
+    linked from the cache when they are cached and added to the cache
+    otherwise (see *gridpath.auxiliary.input_cache*).
 
     :param scenario_directory: local scenario directory
     :param subproblems: SubProblems object with info on the subproblem/stage
@@ -49,12 +83,88 @@ def write_model_inputs(scenario_directory, subproblems, loaded_modules,
         objects)
     :param subscenarios: SubScenarios object with all subscenario info
     :param conn: database connection
+    :param input_format: the format of the profile input files ("tab" or
+        "npz")
+    :param link_invariant_inputs: boolean; whether to query the
+        subproblem-invariant inputs only once and link them into the other
+        input directories
+    :param n_parallel: the number of processes to write inputs with
+    :param db_path: the database path (needed for parallel processes)
+    :param modules_to_use: list of the names of the modules to use (needed
+        for parallel processes, as modules can't be passed between processes)
+    :param input_cache_directory: the input cache directory, or None to
+        not use the cache
 
 
     :return:
     """
+    subproblem_stages = get_subproblem_stages(subproblems=subproblems)
+
+    # Delete auxiliary files that may have existed before to avoid phantom
+    # files/inputs
+    delete_prior_aux_files(scenario_directory=scenario_directory)
+
+    skipped_modules = []
+    linked_inputs = []
+    linked_inputs_directory = None
+    if link_invariant_inputs and len(subproblem_stages) > 1:
+        # Write all inputs for the first subproblem/stage, keeping track of
+        # which modules write which files
+        (subproblem, stage) = subproblem_stages.pop(0)
+        file_writers = write_subproblem_stage_inputs(
+            scenario_directory=scenario_directory,
+            subproblem=subproblem, stage=stage,
+            loaded_modules=loaded_modules,
+            scenario_id=scenario_id, subscenarios=subscenarios, conn=conn,
+            input_format=input_format, track_file_writers=True,
+            input_cache_directory=input_cache_directory
+        )
+        skipped_modules, linked_inputs = determine_linked_inputs(
+            file_writers=file_writers
+        )
+        linked_inputs_directory = os.path.join(
+            scenario_directory, str(subproblem), str(stage), "inputs"
+        )
+
+    if n_parallel > 1 and len(subproblem_stages) > 1:
+        with Pool(processes=n_parallel) as pool:
+            pool.starmap(
+                write_subproblem_stage_inputs_from_database,
+                [(db_path, modules_to_use, scenario_directory, subproblem,
+                  stage, scenario_id, subscenarios, input_format,
+                  skipped_modules, linked_inputs, linked_inputs_directory,
+                  input_cache_directory)
+                 for (subproblem, stage) in subproblem_stages],
+                chunksize=1
+            )
+    else:
+        for (subproblem, stage) in subproblem_stages:
+            write_subproblem_stage_inputs(
+                scenario_directory=scenario_directory,
+                subproblem=subproblem, stage=stage,
+                loaded_modules=loaded_modules,
+                scenario_id=scenario_id, subscenarios=subscenarios,
+                conn=conn, input_format=input_format,
+                skipped_modules=skipped_modules,
+                linked_inputs=linked_inputs,
+                linked_inputs_directory=linked_inputs_directory,
+                input_cache_directory=input_cache_directory
+            )
+
+
+def get_subproblem_stages(subproblems):
+    """
+    :param subproblems: SubProblems object with info on the subproblem/stage
+        structure
+    :return: list of (subproblem, stage) tuples
+
+    Get the subproblem and stage names used for the input directories: if
+    there are no subproblems or no stages, the respective name is an empty
+    string, as the input directory is not nested.
+    """
     subproblems_list = subproblems.SUBPROBLEMS
 
+    subproblem_stages = []
     for subproblem in subproblems_list:
         stages = subproblems.SUBPROBLEM_STAGE_DICT[subproblem]
 
@@ -69,35 +179,236 @@ def write_model_inputs(scenario_directory, subproblems, loaded_modules,
             else:
                 subproblem = ""
                 stage = ""
-            inputs_directory = os.path.join(
-                scenario_directory, str(subproblem), str(stage), "inputs"
-            )
-            if not os.path.exists(inputs_directory):
-                os.makedirs(inputs_directory)
-
-            # Delete auxiliary and input files that may have existed before to
-            # avoid phantom files/inputs
-            delete_prior_aux_files(scenario_directory=scenario_directory)
-            delete_prior_inputs(inputs_directory=inputs_directory)
-
-            # Write model input .tab files for each of the loaded_modules if
-            # appropriate. Note that all input files are saved in the
-            # input_directory, even the non-temporal inputs that are not
-            # dependent on the subproblem or stage. This simplifies the file
-            # structure at the expense of unnecessarily duplicating
-            # non-temporal input files such as projects.tab.
-            for m in loaded_modules:
-                if hasattr(m, "write_model_inputs"):
-                    m.write_model_inputs(
-                        scenario_directory=scenario_directory,
-                        scenario_id=scenario_id,
-                        subscenarios=subscenarios,
-                        subproblem=subproblem,
-                        stage=stage,
-                        conn=conn,
-                    )
-                else:
-                    pass
+            subproblem_stages.append((subproblem, stage))
+
+    return subproblem_stages
+
+
+def write_subproblem_stage_inputs(
+    scenario_directory, subproblem, stage, loaded_modules, scenario_id,
+    subscenarios, conn, input_format="tab", skipped_modules=(),
+    linked_inputs=(), linked_inputs_directory=None, track_file_writers=False,
+    input_cache_directory=None
+):
+    """
+    :param scenario_directory: local scenario directory
+    :param subproblem: the subproblem
+    :param stage: the stage
+    :param loaded_modules: list of imported modules (Python <class 'module'>
+        objects)
+    :param scenario_id: the scenario ID
+    :param subscenarios: SubScenarios object with all subscenario info
+    :param conn: database connection
+    :param input_format: the format of the profile input files ("tab" or
+        "npz")
+    :param skipped_modules: names of the modules whose inputs are linked
+        rather than written
+    :param linked_inputs: the input files to link from the linked inputs
+        directory
+    :param linked_inputs_directory: the directory to link inputs from
+    :param track_file_writers: boolean; whether to keep track of which
+        modules write (or modify) which files
+    :param input_cache_directory: the input cache directory, or None to
+        not use the cache
+    :return: if tracking file writers, dictionary of the input files with
+        the set of names of the modules that wrote them; None otherwise
+
+    Write the model inputs for a subproblem/stage.
+    """
+    inputs_directory = os.path.join(
+        scenario_directory, str(subproblem), str(stage), "inputs"
+    )
+    if not os.path.exists(inputs_directory):
+        os.makedirs(inputs_directory)
+
+    # Delete input files that may have existed before to avoid phantom
+    # files/inputs
+    delete_prior_inputs(inputs_directory=inputs_directory)
+
+    # Link the inputs that are the same for all subproblems/stages
+    for f in linked_inputs:
+        link_input_file(
+            source=os.path.join(linked_inputs_directory, f),
+            destination=os.path.join(inputs_directory, f)
+        )
+
+    # Write model input .tab files for each of the loaded_modules if
+    # appropriate. Note that all input files are saved in the
+    # input_directory, even the non-temporal inputs that are not
+    # dependent on the subproblem or stage. This simplifies the file
+    # structure at the expense of unnecessarily duplicating
+    # non-temporal input files such as projects.tab.
+    input_cache = None if input_cache_directory is None \
+        else InputCache(cache_directory=input_cache_directory,
+                        inputs_directory=inputs_directory)
+    file_writers = dict()
+    for m in loaded_modules:
+        if hasattr(m, "write_model_inputs") \
+                and m.__name__ not in skipped_modules:
+            if track_file_writers:
+                files_before = get_input_files_state(inputs_directory)
+            if input_cache is not None:
+                input_cache.write_module_inputs(
+                    module=m,
+                    scenario_directory=scenario_directory,
+                    scenario_id=scenario_id,
+                    subscenarios=subscenarios,
+                    subproblem=subproblem,
+                    stage=stage,
+                    conn=conn,
+                )
+            else:
+                m.write_model_inputs(
+                    scenario_directory=scenario_directory,
+                    scenario_id=scenario_id,
+                    subscenarios=subscenarios,
+                    subproblem=subproblem,
+                    stage=stage,
+                    conn=conn,
+                )
+            if track_file_writers:
+                for (f, state) in \
+                        get_input_files_state(inputs_directory).items():
+                    if files_before.get(f) != state:
+                        file_writers.setdefault(f, set()).add(m.__name__)
+        else:
+            pass
+
+    if input_format == "npz":
+        convert_profile_inputs_to_npz(inputs_directory=inputs_directory)
+
+    if track_file_writers:
+        return file_writers
+
+
+def write_subproblem_stage_inputs_from_database(
+    db_path, modules_to_use, scenario_directory, subproblem, stage,
+    scenario_id, subscenarios, input_format, skipped_modules, linked_inputs,
+    linked_inputs_directory, input_cache_directory
+):
+    """
+    :param db_path: the database path
+    :param modules_to_use: list of the names of the modules to use
+    :return:
+
+    Write the model inputs for a subproblem/stage in a worker process: the
+    modules are imported in the worker and the inputs are queried with the
+    worker's own read-only database connection. See
+    *write_subproblem_stage_inputs* for the other parameters.
+    """
+    conn = connect_to_database(db_path=db_path, read_only=True)
+    try:
+        write_subproblem_stage_inputs(
+            scenario_directory=scenario_directory,
+            subproblem=subproblem, stage=stage,
+            loaded_modules=load_modules(modules_to_use=modules_to_use),
+            scenario_id=scenario_id, subscenarios=subscenarios, conn=conn,
+            input_format=input_format, skipped_modules=skipped_modules,
+            linked_inputs=linked_inputs,
+            linked_inputs_directory=linked_inputs_directory,
+            input_cache_directory=input_cache_directory
+        )
+    finally:
+        conn.close()
+
+
+def get_input_files_state(inputs_directory):
+    """
+    :param inputs_directory: local directory where the inputs are saved
+    :return: dictionary of the input file names with their modification
+        time and size
+    """
+    state = dict()
+    for f in os.listdir(inputs_directory):
+        stat = os.stat(os.path.join(inputs_directory, f))
+        state[f] = (stat.st_mtime_ns, stat.st_size)
+
+    return state
+
+
+def determine_linked_inputs(file_writers):
+    """
+    :param file_writers: dictionary of the input files written for the first
+        subproblem/stage with the set of names of the modules that wrote
+        them
+    :return: the names of the modules to skip and the list of input files
+        to link instead
+
+    Determine which modules can be skipped for the remaining
+    subproblems/stages and which of the files written for the first
+    subproblem/stage can be linked instead. A module can only be skipped if
+    its inputs are subproblem-invariant and all the files it writes can be
+    linked; a file can only be linked if all modules that write it (many
+    modules add columns to projects.tab, for example) are skipped, so that
+    linked files are never modified. Profile inputs are never linked.
+    """
+    invariant_modules = [
+        "gridpath." + m for m in subproblem_invariant_input_modules_list()
+    ]
+    skipped_modules = set(
+        m for writers in file_writers.values() for m in writers
+        if m in invariant_modules
+    )
+
+    while True:
+        linked_inputs = [
+            f for (f, writers) in file_writers.items()
+            if writers <= skipped_modules and not is_profile_input_file(f)
+        ]
+        still_skipped_modules = set(
+            m for m in skipped_modules
+            if all(f in linked_inputs
+                   for (f, writers) in file_writers.items() if m in writers)
+        )
+        if still_skipped_modules == skipped_modules:
+            break
+        skipped_modules = still_skipped_modules
+
+    # Invariant modules that didn't write any files can be skipped too
+    skipped_modules |= set(
+        m for m in invariant_modules
+        if not any(m in writers for writers in file_writers.values())
+    )
+
+    return sorted(skipped_modules), sorted(linked_inputs)
+
+
+def link_input_file(source, destination):
+    """
+    :param source: the input file to link
+    :param destination: the path of the link
+
+    Hard-link an input file into another input directory; copy it if
+    hard links are not supported.
+    """
+    try:
+        os.link(source, destination)
+    except OSError:
+        shutil.copyfile(source, destination)
+
+
+def is_profile_input_file(file_name):
+    """
+    :param file_name: the input file name
+    :return: boolean; whether the file is a timepoint-indexed profile input
+        file that can be written in the binary .npz format
+    """
+    return file_name in PROFILE_INPUT_FILES or any(
+        file_name.endswith(suffix) for suffix in PROFILE_INPUT_FILE_SUFFIXES
+    )
+
+
+def convert_profile_inputs_to_npz(inputs_directory):
+    """
+    :param inputs_directory: local directory where the inputs are saved
+
+    Save the timepoint-indexed profile input files as binary .npz files,
+    which the modules load directly into param dictionaries without parsing
+    text; this is much faster for models with many projects and timepoints.
+    """
+    for f in os.listdir(inputs_directory):
+        if is_profile_input_file(f):
+            write_input_table_as_npz(os.path.join(inputs_directory, f))
 
 
 def delete_prior_aux_files(scenario_directory):
@@ -120,12 +431,13 @@ def delete_prior_aux_files(scenario_directory):
 
 def delete_prior_inputs(inputs_directory):
     """
-    Delete all .tab files that may exist in the specified directory
+    Delete all .tab and .npz files that may exist in the specified directory
     :param inputs_directory: local directory where .tab files are saved
     :return:
     """
     prior_input_tab_files = [
-        f for f in os.listdir(inputs_directory) if f.endswith('.tab')
+        f for f in os.listdir(inputs_directory)
+        if f.endswith('.tab') or f.endswith('.npz')
     ]
 
     for f in prior_input_tab_files:
@@ -142,7 +454,8 @@ def parse_arguments(args):
     """
     parser = ArgumentParser(
         add_help=True,
-        parents=[get_db_parser(), get_required_e2e_arguments_parser()]
+        parents=[get_db_parser(), get_required_e2e_arguments_parser(),
+                 get_input_format_parser(), get_parallel_inputs_parser()]
     )
     parsed_arguments = parser.parse_known_args(args=args)[0]
 
@@ -337,7 +650,14 @@ def main(args=None):
         loaded_modules=loaded_modules,
         scenario_id=scenario_id,
         subscenarios=subscenarios,
-        conn=conn)
+        conn=conn,
+        input_format=parsed_arguments.input_format,
+        link_invariant_inputs=parsed_arguments.link_subproblem_invariant_inputs,
+        n_parallel=parsed_arguments.n_parallel_get_inputs,
+        input_cache_directory=parsed_arguments.input_cache_directory,
+        db_path=db_path,
+        modules_to_use=modules_to_use
+    )
 
     # Save the list of optional features to a file (will be used to determine
     # modules without database connection)
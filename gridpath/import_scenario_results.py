@@ -26,28 +26,41 @@ import os.path
 import pandas as pd
 import sys
 
+from gridpath.auxiliary.build_profile import BuildProfile, \
+    profile_module_step
 from gridpath.auxiliary.db_interface import get_scenario_id_and_name
 from gridpath.common_functions import determine_scenario_directory, \
-    get_db_parser, get_required_e2e_arguments_parser
-from db.common_functions import connect_to_database, spin_on_database_lock
+    get_db_parser, get_required_e2e_arguments_parser, \
+    get_results_import_parser, create_logs_directory_if_not_exists
+from db.common_functions import connect_to_database, spin_on_database_lock, \
+    submit_database_write, DatabaseWriteRecorder, create_results_shard, \
+    connect_to_results_shard
+from db.utilities.results_indexes import create_results_indexes, \
+    drop_results_indexes
 from db.utilities.scenario import delete_scenario_results
 from gridpath.auxiliary.module_list import determine_modules, load_modules
 from gridpath.auxiliary.scenario_chars import SubProblems
 
 
 def import_results_into_database(
-    loaded_modules, scenario_id, subproblems, cursor, db,
-    scenario_directory, quiet
+    loaded_modules, scenario_id, subproblems, db, db_path,
+    scenario_directory, quiet, shard_results=False, profile_build=False
 ):
     """
 
     :param loaded_modules:
     :param scenario_id:
     :param subproblems:
-    :param cursor:
-    :param db:
+    :param db: the connection to query the database (or the results shard)
+        with; it can be read-only, as the writes are submitted to the
+        database writer
+    :param db_path: the path to the database
     :param scenario_directory:
     :param quiet: boolean
+    :param shard_results: boolean; whether to import the results into the
+        scenario's results shard
+    :param profile_build: boolean; whether to time each module's import and
+        write the profile to the subproblem/stage logs directory
     :return:
     """
 
@@ -80,79 +93,164 @@ def import_results_into_database(
                 results_directory = os.path.join(scenario_directory,
                                                  "results")
 
-            # Import results_scenario data
-            c = db.cursor()
-            with open(os.path.join(results_directory,
-                                   "termination_condition.txt"),
-                      "r") as f:
-                termination_condition = f.read()
-
-            termination_condition_sql = """
-                INSERT INTO results_scenario
-                (scenario_id, subproblem_id, stage_id, 
-                solver_termination_condition)
-                VALUES (?, ?, ?, ?)
-            ;"""
-            termination_condition_data = \
-                (scenario_id, subproblem, stage, termination_condition)
-            spin_on_database_lock(
-                conn=db, cursor=c, sql=termination_condition_sql,
-                data=termination_condition_data, many=False
-            )
-
-            with open(os.path.join(results_directory, "solver_status.txt"),
-                      "r") as status_f:
-                solver_status = status_f.read()
-
-            # Only import other results if solver status was "ok"
-            # When the problem is infeasible, the solver status is "warning"
-            # If there's no solution, variables remain uninitialized,
-            # throwing an error at some point during results-export,
-            # so we don't attempt to import missing results into the database
-            if solver_status == "ok":
-                # Import the objective function value
+            # Parse the results files for the subproblem/stage here and
+            # record the database writes of the modules; at the end of the
+            # block, the writes are submitted to the database writer (or
+            # executed directly if there's no writer) and executed in a
+            # single transaction; nothing is written if the import fails
+            with DatabaseWriteRecorder(
+                conn=db, db_path=db_path,
+                results_shard_scenario_id=scenario_id if shard_results
+                else None
+            ) as stage_db:
+
+                # Import results_scenario data
+                c = stage_db.cursor()
                 with open(os.path.join(results_directory,
-                                       "objective_function_value.txt"),
+                                       "termination_condition.txt"),
                           "r") as f:
-                    objective_function = f.read()
-
-                obj_sql = """
-                    UPDATE results_scenario
-                    SET objective_function_value = ?
-                    WHERE scenario_id = ?
-                    AND subproblem_id = ?
-                    AND stage_id = ?
-                ;"""
+                    termination_condition = f.read()
 
-                obj_data = \
-                    (objective_function, scenario_id, subproblem,  stage)
+                termination_condition_sql = """
+                    INSERT INTO results_scenario
+                    (scenario_id, subproblem_id, stage_id, 
+                    solver_termination_condition)
+                    VALUES (?, ?, ?, ?)
+                ;"""
+                termination_condition_data = \
+                    (scenario_id, subproblem, stage, termination_condition)
                 spin_on_database_lock(
-                    conn=db, cursor=c, sql=obj_sql,
-                    data=obj_data, many=False
+                    conn=stage_db, cursor=c, sql=termination_condition_sql,
+                    data=termination_condition_data, many=False
                 )
 
-                for m in loaded_modules:
-                    if hasattr(m, "import_results_into_database"):
-                        m.import_results_into_database(
-                            scenario_id=scenario_id,
-                            subproblem=subproblem,
-                            stage=stage,
-                            c=cursor,
-                            db=db,
-                            results_directory=results_directory,
-                            quiet=quiet
-                        )
-                    else:
-                        pass
-            else:
-                if not quiet:
-                    print("""
-                    Solver status for subproblem {}, stage {} was '{}', 
-                    not 'ok', so there are no results to import. 
-                    Termination condition was '{}'.
-                    """.format(subproblem, stage, solver_status,
-                               termination_condition)
-                          )
+                with open(os.path.join(results_directory, "solver_status.txt"),
+                          "r") as status_f:
+                    solver_status = status_f.read()
+
+                # Only import other results if solver status was "ok"
+                # When the problem is infeasible, the solver status is "warning"
+                # If there's no solution, variables remain uninitialized,
+                # throwing an error at some point during results-export,
+                # so we don't attempt to import missing results into the database
+                build_profile = BuildProfile() if profile_build else None
+                if solver_status == "ok":
+                    # Import the objective function value
+                    with open(os.path.join(results_directory,
+                                           "objective_function_value.txt"),
+                              "r") as f:
+                        objective_function = f.read()
+
+                    obj_sql = """
+                        UPDATE results_scenario
+                        SET objective_function_value = ?
+                        WHERE scenario_id = ?
+                        AND subproblem_id = ?
+                        AND stage_id = ?
+                    ;"""
+
+                    obj_data = \
+                        (objective_function, scenario_id, subproblem,  stage)
+                    spin_on_database_lock(
+                        conn=stage_db, cursor=c, sql=obj_sql,
+                        data=obj_data, many=False
+                    )
+
+                    for m in loaded_modules:
+                        if hasattr(m, "import_results_into_database"):
+                            with profile_module_step(
+                                build_profile, m, "import_results_into_database"
+                            ):
+                                m.import_results_into_database(
+                                    scenario_id=scenario_id,
+                                    subproblem=subproblem,
+                                    stage=stage,
+                                    c=c,
+                                    db=stage_db,
+                                    results_directory=results_directory,
+                                    quiet=quiet
+                                )
+                        else:
+                            pass
+                else:
+                    if not quiet:
+                        print("""
+                        Solver status for subproblem {}, stage {} was '{}', 
+                        not 'ok', so there are no results to import. 
+                        Termination condition was '{}'.
+                        """.format(subproblem, stage, solver_status,
+                                   termination_condition)
+                              )
+
+            if build_profile is not None:
+                build_profile.write(
+                    logs_directory=create_logs_directory_if_not_exists(
+                        os.path.dirname(results_directory), "", ""),
+                    file_name="import_profile"
+                )
+
+
+def prepare_results_import(db_path, scenario_id, shard_results,
+                           bulk_import):
+    """
+    :param db_path: the path to the database
+    :param scenario_id: the scenario ID
+    :param shard_results: boolean; whether to import the results into a
+        new results shard for the scenario instead of into the database
+    :param bulk_import: boolean; whether to drop the secondary indexes on
+        the results tables during the import
+
+    Delete all previous results of the scenario and create its results
+    shard if requested. For bulk imports, also drop the secondary indexes
+    on the results tables, so that they don't have to be updated on every
+    insert; otherwise, they are kept, as re-creating them scans the results
+    of all scenarios and other scenarios' results may be imported or
+    queried at the same time. This is a database write job (see
+    *submit_database_write*).
+    """
+    conn = connect_to_database(db_path=db_path)
+
+    # Each module also makes sure results are deleted, but this step ensures
+    # that if a scenario_id was run with different modules before, we also
+    # delete previously imported "phantom" results; this also deletes the
+    # scenario's results shard if it has one
+    delete_scenario_results(conn=conn, scenario_id=scenario_id)
+
+    if shard_results:
+        results_conn = create_results_shard(conn=conn, scenario_id=scenario_id)
+    else:
+        results_conn = conn
+
+    if bulk_import:
+        drop_results_indexes(conn=results_conn)
+
+    if results_conn is not conn:
+        results_conn.close()
+    conn.close()
+
+
+def finish_results_import(db_path, scenario_id, shard_results):
+    """
+    :param db_path: the path to the database
+    :param scenario_id: the scenario ID
+    :param shard_results: boolean; whether the results were imported into
+        the scenario's results shard
+
+    Create the secondary indexes on the results tables if they don't exist,
+    i.e. after a bulk import, for a new results shard, or for the first
+    import into the database. This is a database write job (see
+    *submit_database_write*).
+    """
+    if shard_results:
+        conn = connect_to_results_shard(
+            db_path=db_path, scenario_id=scenario_id
+        )
+    else:
+        conn = connect_to_database(db_path=db_path)
+
+    create_results_indexes(conn=conn)
+
+    conn.close()
 
 
 def parse_arguments(args):
@@ -167,8 +265,13 @@ def parse_arguments(args):
     """
     parser = ArgumentParser(
         add_help=True,
-        parents=[get_db_parser(), get_required_e2e_arguments_parser()]
+        parents=[get_db_parser(), get_required_e2e_arguments_parser(),
+                 get_results_import_parser()]
     )
+    parser.add_argument("--profile_build", default=False,
+                        action="store_true",
+                        help="Time each module's results import and write "
+                             "the profile to the logs directory.")
     parsed_arguments = parser.parse_known_args(args=args)[0]
 
     return parsed_arguments
@@ -190,7 +293,11 @@ def main(args=None):
     scenario_location = parsed_arguments.scenario_location
     quiet = parsed_arguments.quiet
 
-    conn = connect_to_database(db_path=db_path)
+    # The database is only queried here; the writes are submitted to the
+    # database writer if one was started (e.g. when running several
+    # scenarios in parallel), so that only the writes, and not the parsing
+    # of the results files, wait for the writer
+    conn = connect_to_database(db_path=db_path, read_only=True)
     c = conn.cursor()
 
     if not parsed_arguments.quiet:
@@ -217,29 +324,55 @@ def main(args=None):
     if scenario_id_saved != scenario_id:
         raise AssertionError("ERROR: saved scenario_id does not match")
 
-    # Delete all previous results for this scenario_id
-    # Each module also makes sure results are deleted, but this step ensures
-    # that if a scenario_id was run with different modules before, we also
-    # delete previously imported "phantom" results
-    delete_scenario_results(conn=conn, scenario_id=scenario_id)
+    # Delete all previous results for this scenario_id and, for bulk
+    # imports, drop the results indexes; they are re-created after the
+    # import, even if it fails
+    shard_results = parsed_arguments.shard_results
+    submit_database_write(
+        prepare_results_import, db_path=db_path, scenario_id=scenario_id,
+        shard_results=shard_results,
+        bulk_import=parsed_arguments.bulk_import
+    )
+
+    # If requested, import the results into a new results shard for the
+    # scenario instead of into the database; the input tables are queried
+    # from the database, which is attached to the shard connection
+    if shard_results:
+        results_conn = connect_to_results_shard(
+            db_path=db_path, scenario_id=scenario_id, read_only=True
+        )
+    else:
+        results_conn = conn
 
     # Go through modules
     modules_to_use = determine_modules(scenario_directory=scenario_directory)
     loaded_modules = load_modules(modules_to_use)
 
     # Import appropriate results into database
-    import_results_into_database(
-        loaded_modules=loaded_modules,
-        scenario_id=scenario_id,
-        subproblems=subproblems,
-        cursor=c,
-        db=conn,
-        scenario_directory=scenario_directory,
-        quiet=quiet
-    )
-
-    # Close the database connection
-    conn.close()
+    try:
+        import_results_into_database(
+            loaded_modules=loaded_modules,
+            scenario_id=scenario_id,
+            subproblems=subproblems,
+            db=results_conn,
+            db_path=db_path,
+            scenario_directory=scenario_directory,
+            quiet=quiet,
+            shard_results=shard_results,
+            profile_build=parsed_arguments.profile_build
+        )
+    finally:
+        # Create the secondary indexes on the results tables if they don't
+        # exist
+        submit_database_write(
+            finish_results_import, db_path=db_path, scenario_id=scenario_id,
+            shard_results=shard_results
+        )
+
+        # Close the database connection(s)
+        if results_conn is not conn:
+            results_conn.close()
+        conn.close()
 
 
 if __name__ == "__main__":
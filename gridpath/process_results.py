@@ -25,9 +25,11 @@ The main() function of this script can also be called with the
 from __future__ import print_function
 
 from argparse import ArgumentParser
+import os.path
 import sys
 
-from db.common_functions import connect_to_database
+from db.common_functions import connect_to_database, \
+    connect_to_results_shard, get_results_shard_path, DatabaseWriteRecorder
 from gridpath.common_functions import determine_scenario_directory, \
     get_db_parser, get_required_e2e_arguments_parser
 from gridpath.auxiliary.db_interface import get_scenario_id_and_name
@@ -87,7 +89,9 @@ def main(args=None):
     scenario_name_arg = parsed_arguments.scenario
     scenario_location = parsed_arguments.scenario_location
 
-    conn = connect_to_database(db_path=db_path)
+    # The database is only queried here; the writes are submitted to the
+    # database writer if one was started (see *import_scenario_results.py*)
+    conn = connect_to_database(db_path=db_path, read_only=True)
     c = conn.cursor()
 
     if not parsed_arguments.quiet:
@@ -111,13 +115,32 @@ def main(args=None):
     # Subscenarios
     subscenarios = SubScenarios(conn=conn, scenario_id=scenario_id)
 
-    process_results(
-        loaded_modules=loaded_modules, db=conn, cursor=c,
-        scenario_id=scenario_id, subscenarios=subscenarios,
-        quiet=parsed_arguments.quiet
-    )
-
-    # Close the database connection
+    # Process the results in the scenario's results shard if they were
+    # imported into one
+    if os.path.isfile(get_results_shard_path(db_path, scenario_id)):
+        results_conn = connect_to_results_shard(
+            db_path=db_path, scenario_id=scenario_id, read_only=True
+        )
+        results_shard_scenario_id = scenario_id
+    else:
+        results_conn = conn
+        results_shard_scenario_id = None
+
+    # Record the database writes of the modules and execute them in a
+    # single transaction
+    with DatabaseWriteRecorder(
+        conn=results_conn, db_path=db_path,
+        results_shard_scenario_id=results_shard_scenario_id
+    ) as results_db:
+        process_results(
+            loaded_modules=loaded_modules, db=results_db,
+            cursor=results_db.cursor(), scenario_id=scenario_id,
+            subscenarios=subscenarios, quiet=parsed_arguments.quiet
+        )
+
+    # Close the database connection(s)
+    if results_conn is not conn:
+        results_conn.close()
     conn.close()
 
 
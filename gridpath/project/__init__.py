@@ -23,7 +23,7 @@ import os.path
 import pandas as pd
 from pyomo.environ import Set, Param, Any
 
-from gridpath.auxiliary.auxiliary import cursor_to_df
+from gridpath.auxiliary.auxiliary import cursor_to_df, get_input_table_header
 from gridpath.auxiliary.validations import write_validation_to_database, \
     validate_dtypes, get_expected_dtypes, validate_values, validate_columns, \
     validate_missing_inputs
@@ -150,11 +150,10 @@ def load_model_data(m, d, data_portal, scenario_directory, subproblem, stage):
     )
 
     # Technology column is optional (default param value is 'unspecified')
-    header = pd.read_csv(
+    header = get_input_table_header(
         os.path.join(scenario_directory, str(subproblem), str(stage),
-                     "inputs", "projects.tab"),
-        sep="\t", header=None, nrows=1
-    ).values[0]
+                     "inputs", "projects.tab")
+    )
 
     if "technology" in header:
         data_portal.load(
@@ -15,7 +15,7 @@
 from pyomo.environ import Expression
 
 from db.common_functions import spin_on_database_lock
-from gridpath.auxiliary.auxiliary import get_required_subtype_modules_from_projects_file, \
+from gridpath.auxiliary.auxiliary import get_required_subtype_modules, \
     load_subtype_modules
 
 
@@ -27,9 +27,10 @@ def add_model_components(m, d, scenario_directory, subproblem, stage):
     :return:
     """
     # Import needed availability type modules
-    required_availability_modules = get_required_subtype_modules_from_projects_file(
-        scenario_directory=scenario_directory, subproblem=subproblem,
-        stage=stage, which_type="availability_type"
+    required_availability_modules = get_required_subtype_modules(
+        d=d, scenario_directory=scenario_directory,
+        subproblem=subproblem, stage=stage,
+        which_type="availability_type"
     )
     imported_availability_modules = \
         load_availability_type_modules(required_availability_modules)
@@ -77,7 +78,9 @@ def write_model_inputs(
     # Load in the required capacity type modules
 
     required_availability_type_modules = \
-        get_required_availability_type_modules(scenario_id, c)
+        get_required_availability_type_modules(
+            scenario_id, c, subscenarios=subscenarios
+        )
 
     imported_availability_type_modules = load_availability_type_modules(
         required_availability_type_modules)
@@ -104,9 +107,10 @@ def load_model_data(m, d, data_portal, scenario_directory, subproblem, stage):
     :param stage:
     :return:
     """
-    required_availability_modules = get_required_subtype_modules_from_projects_file(
-        scenario_directory=scenario_directory, subproblem=subproblem,
-        stage=stage, which_type="availability_type"
+    required_availability_modules = get_required_subtype_modules(
+        d=d, scenario_directory=scenario_directory,
+        subproblem=subproblem, stage=stage,
+        which_type="availability_type"
     )
     imported_availability_modules = \
         load_availability_type_modules(
@@ -134,9 +138,10 @@ def export_results(scenario_directory, subproblem, stage, m, d):
     """
 
     # Module-specific capacity results
-    required_availability_modules = get_required_subtype_modules_from_projects_file(
-        scenario_directory=scenario_directory, subproblem=subproblem,
-        stage=stage, which_type="availability_type"
+    required_availability_modules = get_required_subtype_modules(
+        d=d, scenario_directory=scenario_directory,
+        subproblem=subproblem, stage=stage,
+        which_type="availability_type"
     )
     imported_availability_modules = \
         load_availability_type_modules(
@@ -240,7 +245,7 @@ def load_availability_type_modules(required_availability_types):
     )
 
 
-def get_required_availability_type_modules(scenario_id, c):
+def get_required_availability_type_modules(scenario_id, c, subscenarios=None):
     """
     :param scenario_id: user-specified scenario ID
     :param c: database cursor
@@ -259,17 +264,23 @@ def get_required_availability_type_modules(scenario_id, c):
     will also be stored in the DynamicComponents class object.
     """
 
-    project_portfolio_scenario_id = c.execute(
-        """SELECT project_portfolio_scenario_id 
-        FROM scenarios 
-        WHERE scenario_id = {}""".format(scenario_id)
-    ).fetchone()[0]
-
-    project_availability_scenario_id = c.execute(
-        """SELECT project_availability_scenario_id 
-        FROM scenarios 
-        WHERE scenario_id = {}""".format(scenario_id)
-    ).fetchone()[0]
+    if subscenarios is not None:
+        project_portfolio_scenario_id = \
+            subscenarios.PROJECT_PORTFOLIO_SCENARIO_ID
+        project_availability_scenario_id = \
+            subscenarios.PROJECT_AVAILABILITY_SCENARIO_ID
+    else:
+        project_portfolio_scenario_id = c.execute(
+            """SELECT project_portfolio_scenario_id 
+            FROM scenarios 
+            WHERE scenario_id = {}""".format(scenario_id)
+        ).fetchone()[0]
+
+        project_availability_scenario_id = c.execute(
+            """SELECT project_availability_scenario_id 
+            FROM scenarios 
+            WHERE scenario_id = {}""".format(scenario_id)
+        ).fetchone()[0]
 
     required_availability_type_modules = [
         p[0] for p in c.execute(
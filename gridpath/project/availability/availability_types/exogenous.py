@@ -26,7 +26,10 @@ import csv
 import os.path
 from pyomo.environ import Param, Set, PercentFraction
 
-from gridpath.auxiliary.auxiliary import cursor_to_df
+from gridpath.auxiliary.auxiliary import cursor_to_df, input_file_exists, \
+    load_input_table
+from gridpath.auxiliary.db_interface import \
+    get_project_operational_timepoints_sql
 from gridpath.auxiliary.validations import write_validation_to_database, \
     get_expected_dtypes, validate_dtypes, validate_values, \
     validate_missing_inputs
@@ -135,8 +138,9 @@ def load_module_specific_data(
         "project_availability_exogenous.tab"
     )
 
-    if os.path.exists(availability_file):
-        data_portal.load(
+    if input_file_exists(availability_file):
+        load_input_table(
+            data_portal=data_portal,
             filename=availability_file,
             param=m.avl_exog_derate
         )
@@ -167,14 +171,7 @@ def get_inputs_from_database(
         -- and temporal scenario id
         FROM 
             (SELECT project, stage_id, timepoint
-            FROM project_operational_timepoints
-            WHERE project_portfolio_scenario_id = {}
-            AND project_operational_chars_scenario_id = {}
-            AND temporal_scenario_id = {}
-            AND (project_specified_capacity_scenario_id = {}
-                 OR project_new_cost_scenario_id = {})
-            AND subproblem_id = {}
-            AND stage_id = {}
+            FROM ({}) as project_operational_timepoints_tbl
             ) as projects_periods_timepoints_tbl
         -- Of the projects in the portfolio, select only those that are in 
         -- this project_availability_scenario_id and have 'exogenous' as 
@@ -197,15 +194,13 @@ def get_inputs_from_database(
             inputs_project_availability_exogenous
         USING (exogenous_availability_scenario_id, project, stage_id, 
         timepoint)
+        ORDER BY project, timepoint
         ;
     """.format(
-        subscenarios.PROJECT_PORTFOLIO_SCENARIO_ID,
-        subscenarios.PROJECT_OPERATIONAL_CHARS_SCENARIO_ID,
-        subscenarios.TEMPORAL_SCENARIO_ID,
-        subscenarios.PROJECT_SPECIFIED_CAPACITY_SCENARIO_ID,
-        subscenarios.PROJECT_NEW_COST_SCENARIO_ID,
-        subproblem,
-        stage,
+        get_project_operational_timepoints_sql(
+            conn=conn, scenario_id=scenario_id, subscenarios=subscenarios,
+            subproblem=subproblem, stage=stage
+        ),
         subscenarios.PROJECT_AVAILABILITY_SCENARIO_ID,
         "exogenous",
     )
@@ -21,18 +21,20 @@ project capacity can then be used to constrain operations, contribute to
 reliability constraints, etc.
 """
 
-import csv
 import os.path
 import pandas as pd
-from pyomo.environ import Set, Expression, value
+from pyomo.environ import Set, Expression
 
-from gridpath.auxiliary.auxiliary import get_required_subtype_modules_from_projects_file, \
-    join_sets
+from gridpath.auxiliary.auxiliary import get_required_subtype_modules, \
+    get_required_subtype_modules_from_projects_file, \
+    join_sets, group_set_by_dimension
 from gridpath.project.capacity.common_functions import \
     load_gen_storage_capacity_type_modules
 from gridpath.auxiliary.dynamic_components import \
     capacity_type_operational_period_sets, \
     storage_only_capacity_type_operational_period_sets
+from gridpath.auxiliary.results_export import get_component_values, \
+    write_results_table
 
 
 def add_model_components(m, d, scenario_directory, subproblem, stage):
@@ -115,9 +117,10 @@ def add_model_components(m, d, scenario_directory, subproblem, stage):
     # Dynamic Inputs
     ###########################################################################
 
-    required_capacity_modules = get_required_subtype_modules_from_projects_file(
-        scenario_directory=scenario_directory, subproblem=subproblem,
-        stage=stage, which_type="capacity_type"
+    required_capacity_modules = get_required_subtype_modules(
+        d=d, scenario_directory=scenario_directory,
+        subproblem=subproblem, stage=stage,
+        which_type="capacity_type"
     )
 
     # Import needed capacity type modules
@@ -208,20 +211,16 @@ def add_model_components(m, d, scenario_directory, subproblem, stage):
 # Set Rules
 ###############################################################################
 
-# TODO: the creation of the OPR_PRJS_IN_TMPS is by far
-#  the most time-consuming step in instantiating the problem; is there
-#  any way to speed it up? It is perhaps inefficient to iterate over all
-#  (g, t) for every timepoint, but how do we get around having to do that?
-#  Also, this is a more general problem with all the indexed sets,
-#  but the larger timepoints-based sets are more of a problem
 def op_gens_by_tmp(mod, tmp):
     """
-    Figure out which generators are operational in each timepoins.
+    Figure out which generators are operational in each timepoint. The
+    (project, timepoint) set is grouped by timepoint in a single pass the
+    first time this rule is called, so we don't have to iterate over all
+    (g, t) for every timepoint.
     """
-    gens = list(
-        g for (g, t) in mod.PRJ_OPR_TMPS if t == tmp
-    )
-    return gens
+    return group_set_by_dimension(
+        mod=mod, set_name="PRJ_OPR_TMPS", key_position=1, member_position=0
+    ).get(tmp, [])
 
 
 def operational_periods_by_project(prj, project_operational_periods):
@@ -239,9 +238,10 @@ def operational_periods_by_project(prj, project_operational_periods):
 def load_model_data(m, d, data_portal, scenario_directory, subproblem, stage):
     """
     """
-    required_capacity_modules = get_required_subtype_modules_from_projects_file(
-        scenario_directory=scenario_directory, subproblem=subproblem,
-        stage=stage, which_type="capacity_type"
+    required_capacity_modules = get_required_subtype_modules(
+        d=d, scenario_directory=scenario_directory,
+        subproblem=subproblem, stage=stage,
+        which_type="capacity_type"
     )
 
     # Import needed capacity type modules
@@ -270,28 +270,29 @@ def export_results(scenario_directory, subproblem, stage, m, d):
     """
 
     # Total capacity for all projects
-    with open(os.path.join(scenario_directory, str(subproblem), str(stage), "results",
-                           "capacity_all.csv"), "w", newline="") as f:
-        writer = csv.writer(f)
-        writer.writerow(["project", "period",
-                         "capacity_type", "technology", "load_zone",
-                         "capacity_mw", "capacity_mwh"])
-        for (prj, p) in m.PRJ_OPR_PRDS:
-            writer.writerow([
-                prj,
-                p,
-                m.capacity_type[prj],
-                m.technology[prj],
-                m.load_zone[prj],
-                value(m.Capacity_MW[prj, p]),
-                value(m.Energy_Capacity_MWh[prj, p])
-                if (prj, p) in m.STOR_OPR_PRDS else None
-            ])
+    index = list(m.PRJ_OPR_PRDS)
+    projects = [prj for (prj, p) in index]
+    write_results_table(
+        scenario_directory, subproblem, stage, "capacity_all.csv",
+        [
+            ("project", projects),
+            ("period", [p for (prj, p) in index]),
+            ("capacity_type", [m.capacity_type[prj] for prj in projects]),
+            ("technology", [m.technology[prj] for prj in projects]),
+            ("load_zone", [m.load_zone[prj] for prj in projects]),
+            ("capacity_mw", get_component_values(m.Capacity_MW, index)),
+            ("capacity_mwh",
+             get_component_values(m.Energy_Capacity_MWh, index,
+                                  [idx in m.STOR_OPR_PRDS for idx in index]))
+        ],
+        d
+    )
 
     # Module-specific capacity results
-    required_capacity_modules = get_required_subtype_modules_from_projects_file(
-        scenario_directory=scenario_directory, subproblem=subproblem,
-        stage=stage, which_type="capacity_type"
+    required_capacity_modules = get_required_subtype_modules(
+        d=d, scenario_directory=scenario_directory,
+        subproblem=subproblem, stage=stage,
+        which_type="capacity_type"
     )
 
     # Import needed capacity type modules
@@ -69,7 +69,9 @@ def write_model_inputs(scenario_directory, scenario_id, subscenarios, subproblem
     # Load in the required capacity type modules
 
     required_capacity_type_modules = \
-        get_required_capacity_types_from_database(conn, scenario_id)
+        get_required_capacity_types_from_database(
+            conn, scenario_id, subscenarios=subscenarios
+        )
     imported_capacity_type_modules = load_gen_storage_capacity_type_modules(
         required_capacity_type_modules)
 
@@ -64,26 +64,78 @@ def project_operational_periods(project_vintages_set,
                )
 
 
-def project_vintages_operational_in_period(
-        project_vintage_set, operational_periods_by_project_vintage_set,
-        period):
+def project_vintages_operational_by_period(
+        mod, project_vintages_set, operational_periods_by_project_vintage_set
+):
     """
-    :param project_vintage_set: possible project-vintages when capacity
-        could be built
-    :param operational_periods_by_project_vintage_set: the periods when
-        project capacity of a particular vintage could be operational
-    :param period: the period we're in
-    :return: all vintages that could be operational in a period
-
-    Get the project vintages that COULD be operational in each period.
+    :param mod: the Pyomo model instance
+    :param project_vintages_set: the name of the set of possible
+        project-vintages when capacity could be built
+    :param operational_periods_by_project_vintage_set: the name of the
+        indexed set of the periods when project capacity of a particular
+        vintage could be operational
+    :return: dictionary with the periods as keys and the list of
+        project-vintages that could be operational in the period as values
+
+    Like *vintages_operational_by_project_period*, the index is built in a
+    single pass over the project-vintages and cached on the model instance.
     """
-    project_vintages = list()
-    for (prj, v) in project_vintage_set:
-        if period in operational_periods_by_project_vintage_set[prj, v]:
-            project_vintages.append((prj, v))
-        else:
-            pass
-    return project_vintages
+    return _index_project_vintages_by_operational_period(
+        mod=mod, project_vintages_set=project_vintages_set,
+        operational_periods_by_project_vintage_set=
+        operational_periods_by_project_vintage_set
+    )[1]
+
+
+def vintages_operational_by_project_period(
+        mod, project_vintages_set, operational_periods_by_project_vintage_set
+):
+    """
+    :param mod: the Pyomo model instance
+    :param project_vintages_set: the name of the set of possible
+        project-vintages when capacity could be built
+    :param operational_periods_by_project_vintage_set: the name of the
+        indexed set of the periods when project capacity of a particular
+        vintage could be operational
+    :return: dictionary with (project, period) tuples as keys and the list
+        of the project's vintages that could be operational in the period as
+        values
+
+    The index is built in a single pass over the project-vintages the first
+    time it is requested for a model instance and then cached on the
+    instance, so that the capacity expressions and constraints of each
+    project and period only touch that project's vintages instead of
+    scanning all project-vintages operational in the period.
+    """
+    return _index_project_vintages_by_operational_period(
+        mod=mod, project_vintages_set=project_vintages_set,
+        operational_periods_by_project_vintage_set=
+        operational_periods_by_project_vintage_set
+    )[0]
+
+
+def _index_project_vintages_by_operational_period(
+        mod, project_vintages_set, operational_periods_by_project_vintage_set
+):
+    """
+    Index the project-vintages by (project, operational period) and by
+    operational period in one pass and cache both indexes on the model
+    instance.
+    """
+    cache_name = "_{}_by_operational_period".format(project_vintages_set)
+    if not hasattr(mod, cache_name):
+        operational_periods = getattr(
+            mod, operational_periods_by_project_vintage_set
+        )
+        by_project_period = dict()
+        by_period = dict()
+        for (prj, v) in getattr(mod, project_vintages_set):
+            for p in operational_periods[prj, v]:
+                by_project_period.setdefault((prj, p), []).append(v)
+                by_period.setdefault(p, []).append((prj, v))
+        setattr(mod, cache_name, (by_project_period, by_period))
+
+    return getattr(mod, cache_name)
 
 
 def update_capacity_results_table(
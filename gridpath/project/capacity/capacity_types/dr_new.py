@@ -41,7 +41,7 @@ from pyomo.environ import Set, Param, Var, NonNegativeReals, value, \
     Reals, Expression, Constraint
 
 from db.common_functions import spin_on_database_lock
-from gridpath.auxiliary.auxiliary import cursor_to_df
+from gridpath.auxiliary.auxiliary import cursor_to_df, get_input_table
 from gridpath.auxiliary.db_interface import setup_results_import
 from gridpath.auxiliary.dynamic_components import \
     capacity_type_operational_period_sets, \
@@ -362,11 +362,10 @@ def load_module_specific_data(
         projects = list()
         max_fraction = dict()
 
-        df = pd.read_csv(
+        df = get_input_table(
             os.path.join(scenario_directory, str(subproblem), str(stage),
                          "inputs", "projects.tab"),
-            sep="\t",
-            usecols=["project", "capacity_type", "minimum_duration_hours"]
+            columns=["project", "capacity_type", "minimum_duration_hours"]
         )
         for r in zip(df["project"],
                      df["capacity_type"],
@@ -43,7 +43,8 @@ from gridpath.auxiliary.validations import write_validation_to_database, \
     validate_idxs
 from gridpath.project.capacity.capacity_types.common_methods import \
     operational_periods_by_project_vintage, project_operational_periods, \
-    project_vintages_operational_in_period, update_capacity_results_table
+    project_vintages_operational_by_period, update_capacity_results_table, \
+    vintages_operational_by_project_period
 
 
 def add_model_components(m, d, scenario_directory, subproblem, stage):
@@ -246,12 +247,19 @@ def gen_new_bin_operational_periods(mod):
 
 
 def gen_new_bin_vintages_operational_in_period(mod, p):
-    return project_vintages_operational_in_period(
-        project_vintage_set=mod.GEN_NEW_BIN_VNTS,
+    return project_vintages_operational_by_period(
+        mod=mod, project_vintages_set="GEN_NEW_BIN_VNTS",
         operational_periods_by_project_vintage_set=
-        mod.OPR_PRDS_BY_GEN_NEW_BIN_VINTAGE,
-        period=p
-    )
+        "OPR_PRDS_BY_GEN_NEW_BIN_VINTAGE"
+    ).get(p, [])
+
+
+def gen_new_bin_vintages_operational_in_project_period(mod, g, p):
+    return vintages_operational_by_project_period(
+        mod=mod, project_vintages_set="GEN_NEW_BIN_VNTS",
+        operational_periods_by_project_vintage_set=
+        "OPR_PRDS_BY_GEN_NEW_BIN_VINTAGE"
+    ).get((g, p), [])
 
 
 # Constraint Formulation Rules
@@ -272,9 +280,8 @@ def only_build_once_rule(mod, g, p):
     """
 
     return sum(
-        mod.GenNewBin_Build[g, v] for (gen, v)
-        in mod.GEN_NEW_BIN_VNTS_OPR_IN_PERIOD[p]
-        if gen == g
+        mod.GenNewBin_Build[g, v] for v in
+        gen_new_bin_vintages_operational_in_project_period(mod, g, p)
     ) <= 1
 
 
@@ -294,8 +301,7 @@ def capacity_rule(mod, g, p):
     return sum(
         mod.GenNewBin_Build[g, v]
         * mod.gen_new_bin_build_size_mw[g]
-        for (gen, v) in mod.GEN_NEW_BIN_VNTS_OPR_IN_PERIOD[p]
-        if gen == g
+        for v in gen_new_bin_vintages_operational_in_project_period(mod, g, p)
     )
 
 
@@ -317,8 +323,7 @@ def capacity_cost_rule(mod, g, p):
         mod.GenNewBin_Build[g, v]
         * mod.gen_new_bin_build_size_mw[g]
         * mod.gen_new_bin_annualized_real_cost_per_mw_yr[g, v]
-        for (gen, v) in mod.GEN_NEW_BIN_VNTS_OPR_IN_PERIOD[p]
-        if gen == g
+        for v in gen_new_bin_vintages_operational_in_project_period(mod, g, p)
     )
 
 
@@ -47,7 +47,8 @@ from gridpath.auxiliary.validations import write_validation_to_database, \
     validate_idxs, validate_row_monotonicity, validate_column_monotonicity
 from gridpath.project.capacity.capacity_types.common_methods import \
     operational_periods_by_project_vintage, project_operational_periods, \
-    project_vintages_operational_in_period, update_capacity_results_table
+    project_vintages_operational_by_period, update_capacity_results_table, \
+    vintages_operational_by_project_period
 
 
 def add_model_components(m, d, scenario_directory, subproblem, stage):
@@ -318,12 +319,19 @@ def gen_new_lin_operational_periods(mod):
 
 
 def gen_new_lin_vintages_operational_in_period(mod, p):
-    return project_vintages_operational_in_period(
-        project_vintage_set=mod.GEN_NEW_LIN_VNTS,
+    return project_vintages_operational_by_period(
+        mod=mod, project_vintages_set="GEN_NEW_LIN_VNTS",
         operational_periods_by_project_vintage_set=
-        mod.OPR_PRDS_BY_GEN_NEW_LIN_VINTAGE,
-        period=p
-    )
+        "OPR_PRDS_BY_GEN_NEW_LIN_VINTAGE"
+    ).get(p, [])
+
+
+def gen_new_lin_vintages_operational_in_project_period(mod, g, p):
+    return vintages_operational_by_project_period(
+        mod=mod, project_vintages_set="GEN_NEW_LIN_VNTS",
+        operational_periods_by_project_vintage_set=
+        "OPR_PRDS_BY_GEN_NEW_LIN_VINTAGE"
+    ).get((g, p), [])
 
 
 # Expression Rules
@@ -346,9 +354,8 @@ def gen_new_lin_capacity_rule(mod, g, p):
     in 2050, the capacity would be undefined (i.e. 0 for the purposes of the
     objective function).
     """
-    return sum(mod.GenNewLin_Build_MW[g, v] for (gen, v)
-               in mod.GEN_NEW_LIN_VNTS_OPR_IN_PERIOD[p]
-               if gen == g)
+    return sum(mod.GenNewLin_Build_MW[g, v] for v in
+               gen_new_lin_vintages_operational_in_project_period(mod, g, p))
 
 
 # Constraint Formulation Rules
@@ -406,9 +413,8 @@ def capacity_cost_rule(mod, g, p):
     """
     return sum(mod.GenNewLin_Build_MW[g, v]
                * mod.gen_new_lin_annualized_real_cost_per_mw_yr[g, v]
-               for (gen, v)
-               in mod.GEN_NEW_LIN_VNTS_OPR_IN_PERIOD[p]
-               if gen == g)
+               for v in
+               gen_new_lin_vintages_operational_in_project_period(mod, g, p))
 
 
 def new_capacity_rule(mod, g, p):
@@ -33,7 +33,7 @@ import os.path
 import pandas as pd
 from pyomo.environ import Set, Param, NonNegativeReals
 
-from gridpath.auxiliary.auxiliary import cursor_to_df
+from gridpath.auxiliary.auxiliary import cursor_to_df, get_input_table
 from gridpath.auxiliary.dynamic_components import \
     capacity_type_operational_period_sets
 from gridpath.auxiliary.validations import get_projects, get_expected_dtypes, \
@@ -160,11 +160,10 @@ def load_module_specific_data(
 
         gen_spec_projects = list()
 
-        df = pd.read_csv(
+        df = get_input_table(
             os.path.join(scenario_directory, str(subproblem), str(stage), "inputs",
                          "projects.tab"),
-            sep="\t",
-            usecols=["project", "capacity_type"]
+            columns=["project", "capacity_type"]
         )
 
         for row in zip(df["project"],
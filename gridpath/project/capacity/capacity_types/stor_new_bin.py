@@ -45,7 +45,8 @@ from gridpath.auxiliary.validations import write_validation_to_database, \
     validate_idxs
 from gridpath.project.capacity.capacity_types.common_methods import \
     operational_periods_by_project_vintage, project_operational_periods, \
-    project_vintages_operational_in_period, update_capacity_results_table
+    project_vintages_operational_by_period, update_capacity_results_table, \
+    vintages_operational_by_project_period
 
 
 def add_model_components(m, d, scenario_directory, subproblem, stage):
@@ -276,12 +277,19 @@ def stor_new_bin_operational_periods(mod):
 
 
 def stor_new_bin_vintages_operational_in_period(mod, p):
-    return project_vintages_operational_in_period(
-        project_vintage_set=mod.STOR_NEW_BIN_VNTS,
+    return project_vintages_operational_by_period(
+        mod=mod, project_vintages_set="STOR_NEW_BIN_VNTS",
         operational_periods_by_project_vintage_set=
-        mod.OPR_PRDS_BY_STOR_NEW_BIN_VINTAGE,
-        period=p
-    )
+        "OPR_PRDS_BY_STOR_NEW_BIN_VINTAGE"
+    ).get(p, [])
+
+
+def stor_new_bin_vintages_operational_in_project_period(mod, g, p):
+    return vintages_operational_by_project_period(
+        mod=mod, project_vintages_set="STOR_NEW_BIN_VNTS",
+        operational_periods_by_project_vintage_set=
+        "OPR_PRDS_BY_STOR_NEW_BIN_VINTAGE"
+    ).get((g, p), [])
 
 
 # Constraint Formulation Rules
@@ -302,9 +310,8 @@ def only_build_once_rule(mod, g, p):
     # Sum of all binary build decisions of vintages operational in the
     # current period should be less than or equal to 1
     return sum(
-        mod.StorNewBin_Build[g, v] for (gen, v)
-        in mod.STOR_NEW_BIN_VNTS_OPR_IN_PRD[p]
-        if gen == g
+        mod.StorNewBin_Build[g, v] for v in
+        stor_new_bin_vintages_operational_in_project_period(mod, g, p)
     ) <= 1
 
 
@@ -323,9 +330,8 @@ def capacity_rule(mod, g, p):
     return sum(
         mod.StorNewBin_Build[g, v]
         * mod.stor_new_bin_build_size_mw[g]
-        for (gen, v)
-        in mod.STOR_NEW_BIN_VNTS_OPR_IN_PRD[p]
-        if gen == g
+        for v in
+        stor_new_bin_vintages_operational_in_project_period(mod, g, p)
     )
 
 
@@ -341,9 +347,8 @@ def energy_capacity_rule(mod, g, p):
     return sum(
         mod.StorNewBin_Build[g, v]
         * mod.stor_new_bin_build_size_mwh[g]
-        for (gen, v)
-        in mod.STOR_NEW_BIN_VNTS_OPR_IN_PRD[p]
-        if gen == g
+        for v in
+        stor_new_bin_vintages_operational_in_project_period(mod, g, p)
     )
 
 
@@ -362,9 +367,8 @@ def capacity_cost_rule(mod, g, p):
            * mod.stor_new_bin_annualized_real_cost_per_mw_yr[g, v]
            + mod.stor_new_bin_build_size_mwh[g]
            * mod.stor_new_bin_annualized_real_cost_per_mwh_yr[g, v])
-        for (gen, v)
-        in mod.STOR_NEW_BIN_VNTS_OPR_IN_PRD[p]
-        if gen == g
+        for v in
+        stor_new_bin_vintages_operational_in_project_period(mod, g, p)
     )
 
 
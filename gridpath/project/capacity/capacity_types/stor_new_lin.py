@@ -46,7 +46,8 @@ from gridpath.auxiliary.validations import write_validation_to_database, \
     validate_idxs, validate_row_monotonicity, validate_column_monotonicity
 from gridpath.project.capacity.capacity_types.common_methods import \
     operational_periods_by_project_vintage, project_operational_periods, \
-    project_vintages_operational_in_period, update_capacity_results_table
+    project_vintages_operational_by_period, update_capacity_results_table, \
+    vintages_operational_by_project_period
 
 
 def add_model_components(m, d, scenario_directory, subproblem, stage):
@@ -481,12 +482,19 @@ def stor_new_lin_operational_periods(mod):
 
 
 def stor_new_lin_vintages_operational_in_period(mod, p):
-    return project_vintages_operational_in_period(
-        project_vintage_set=mod.STOR_NEW_LIN_VNTS,
+    return project_vintages_operational_by_period(
+        mod=mod, project_vintages_set="STOR_NEW_LIN_VNTS",
         operational_periods_by_project_vintage_set=
-        mod.OPR_PRDS_BY_STOR_NEW_LIN_VINTAGE,
-        period=p
-    )
+        "OPR_PRDS_BY_STOR_NEW_LIN_VINTAGE"
+    ).get(p, [])
+
+
+def stor_new_lin_vintages_operational_in_project_period(mod, g, p):
+    return vintages_operational_by_project_period(
+        mod=mod, project_vintages_set="STOR_NEW_LIN_VNTS",
+        operational_periods_by_project_vintage_set=
+        "OPR_PRDS_BY_STOR_NEW_LIN_VINTAGE"
+    ).get((g, p), [])
 
 
 # Expression Rules
@@ -510,8 +518,8 @@ def power_rule(mod, g, p):
     0 for the purposes of the objective function).
     """
     return sum(mod.StorNewLin_Build_MW[g, v]
-               for (gen, v) in mod.STOR_NEW_LIN_VNTS_OPR_IN_PRD[p]
-               if gen == g)
+               for v in
+               stor_new_lin_vintages_operational_in_project_period(mod, g, p))
 
 
 def energy_rule(mod, g, p):
@@ -532,8 +540,8 @@ def energy_rule(mod, g, p):
     0 for the purposes of the objective function).
     """
     return sum(mod.StorNewLin_Build_MWh[g, v]
-               for (gen, v) in mod.STOR_NEW_LIN_VNTS_OPR_IN_PRD[p]
-               if gen == g)
+               for v in
+               stor_new_lin_vintages_operational_in_project_period(mod, g, p))
 
 
 # Constraint Formulation Rules
@@ -646,8 +654,8 @@ def capacity_cost_rule(mod, g, p):
                 * mod.stor_new_lin_annualized_real_cost_per_mw_yr[g, v]
                 + mod.StorNewLin_Build_MWh[g, v]
                 * mod.stor_new_lin_annualized_real_cost_per_mwh_yr[g, v])
-               for (gen, v) in mod.STOR_NEW_LIN_VNTS_OPR_IN_PRD[p]
-               if gen == g)
+               for v in
+               stor_new_lin_vintages_operational_in_project_period(mod, g, p))
 
 
 def new_capacity_rule(mod, g, p):
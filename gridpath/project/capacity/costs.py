@@ -28,7 +28,7 @@ import os.path
 from pyomo.environ import Expression, value
 
 from db.common_functions import spin_on_database_lock
-from gridpath.auxiliary.auxiliary import get_required_subtype_modules_from_projects_file
+from gridpath.auxiliary.auxiliary import get_required_subtype_modules
 from gridpath.project.capacity.common_functions import \
     load_gen_storage_capacity_type_modules
 from gridpath.auxiliary.db_interface import setup_results_import
@@ -57,9 +57,10 @@ def add_model_components(m, d, scenario_directory, subproblem, stage):
     # Dynamic Inputs
     ###########################################################################
 
-    required_capacity_modules = get_required_subtype_modules_from_projects_file(
-        scenario_directory=scenario_directory, subproblem=subproblem,
-        stage=stage, which_type="capacity_type"
+    required_capacity_modules = get_required_subtype_modules(
+        d=d, scenario_directory=scenario_directory,
+        subproblem=subproblem, stage=stage,
+        which_type="capacity_type"
     )
 
     imported_capacity_modules = load_gen_storage_capacity_type_modules(
@@ -20,6 +20,8 @@ import csv
 import os.path
 import pandas as pd
 
+from gridpath.auxiliary.auxiliary import get_input_table
+
 
 # TODO: use this in capacity and operational type project subset
 #  determinations
@@ -39,10 +41,10 @@ def determine_project_subset(
     project_subset = list()
 
     dynamic_components = \
-        pd.read_csv(
+        get_input_table(
             os.path.join(scenario_directory, str(subproblem), str(stage),
                          "inputs", "projects.tab"),
-            sep="\t", usecols=["project", column]
+            columns=["project", column]
         )
 
     for row in zip(dynamic_components["project"],
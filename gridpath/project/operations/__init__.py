@@ -42,7 +42,8 @@ import pandas as pd
 from pyomo.environ import Set, Param, Any, NonNegativeReals, Reals, \
     PositiveReals
 
-from gridpath.auxiliary.auxiliary import cursor_to_df
+from gridpath.auxiliary.auxiliary import cursor_to_df, get_input_table, \
+    get_input_table_header
 from gridpath.auxiliary.dynamic_components import headroom_variables, \
     footroom_variables
 from gridpath.auxiliary.validations import write_validation_to_database, \
@@ -454,10 +455,9 @@ def record_dynamic_components(d, scenario_directory, subproblem, stage):
     'footroom_variables' dictionary.
     """
 
-    project_df = pd.read_csv(
+    project_df = get_input_table(
         os.path.join(scenario_directory, str(subproblem), str(stage), "inputs",
-                     "projects.tab"),
-        sep="\t"
+                     "projects.tab")
     )
 
     # Reserve variables
@@ -628,14 +628,14 @@ def load_model_data(m, d, data_portal, scenario_directory, subproblem, stage):
 
     # Get column names as a few columns will be optional;
     # won't load data if fuel column does not exist
-    headers = pd.read_csv(projects_file, nrows=0, sep="\t").columns
+    headers = get_input_table_header(projects_file)
     if os.path.exists(hr_curves_file) and "fuel" in headers:
 
         hr_df = pd.read_csv(hr_curves_file, sep="\t")
         projects = set(hr_df["project"].unique())
         
         periods_df = pd.read_csv(periods_file, sep="\t")
-        pr_df = pd.read_csv(projects_file, sep="\t", usecols=["project", "fuel"])
+        pr_df = get_input_table(projects_file, columns=["project", "fuel"])
         pr_df = pr_df[(pr_df["fuel"] != ".") & (pr_df["project"].isin(projects))]
 
         periods = set(periods_df["period"])
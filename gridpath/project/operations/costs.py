@@ -25,13 +25,15 @@ operational type modules.
 import csv
 import os.path
 from pyomo.environ import Set, Var, Expression, Constraint, \
-    NonNegativeReals, value
+    NonNegativeReals
 
 from db.common_functions import spin_on_database_lock
-from gridpath.auxiliary.auxiliary import get_required_subtype_modules_from_projects_file
+from gridpath.auxiliary.auxiliary import get_required_subtype_modules
 from gridpath.project.operations.common_functions import \
     load_operational_type_modules
 from gridpath.auxiliary.db_interface import setup_results_import
+from gridpath.auxiliary.results_export import get_component_values, \
+    write_results_table
 import gridpath.project.operations.operational_types as op_type
 
 
@@ -177,9 +179,10 @@ def add_model_components(m, d, scenario_directory, subproblem, stage):
     # Dynamic Inputs
     ###########################################################################
 
-    required_operational_modules = get_required_subtype_modules_from_projects_file(
-        scenario_directory=scenario_directory, subproblem=subproblem,
-        stage=stage, which_type="operational_type"
+    required_operational_modules = get_required_subtype_modules(
+        d=d, scenario_directory=scenario_directory,
+        subproblem=subproblem, stage=stage,
+        which_type="operational_type"
     )
 
     imported_operational_modules = load_operational_type_modules(
@@ -463,38 +466,49 @@ def export_results(scenario_directory, subproblem, stage, m, d):
     :return:
     Nothing
     """
-    with open(os.path.join(scenario_directory, str(subproblem), str(stage),
-                           "results",
-                           "costs_operations.csv"), "w", newline="") as f:
-        writer = csv.writer(f)
-        writer.writerow(
-            ["project", "period", "horizon", "timepoint", "timepoint_weight",
-             "number_of_hours_in_timepoint", "load_zone", "technology",
-             "variable_om_cost", "fuel_cost", "startup_cost", "shutdown_cost",
-             "operational_violation_cost", "curtailment_cost"]
-        )
-        for (p, tmp) in m.PRJ_OPR_TMPS:
-            writer.writerow([
-                p,
-                m.period[tmp],
-                m.horizon[tmp, m.balancing_type_project[p]],
-                tmp,
-                m.tmp_weight[tmp],
-                m.hrs_in_tmp[tmp],
-                m.load_zone[p],
-                m.technology[p],
-                value(m.Variable_OM_Cost[p, tmp])
-                if p in m.VAR_OM_COST_ALL_PRJS else None,
-                value(m.Fuel_Cost[p, tmp]) if p in m.FUEL_PRJS else None,
-                value(m.Startup_Cost[p, tmp])
-                if p in m.STARTUP_COST_PRJS else None,
-                value(m.Shutdown_Cost[p, tmp])
-                if p in m.SHUTDOWN_COST_PRJS else None,
-                value(m.Operational_Violation_Cost[p, tmp])
-                if p in m.VIOL_ALL_PRJ_OPR_TMPS else None,
-                value(m.Curtailment_Cost[p, tmp])
-                if p in m.CURTAILMENT_COST_PRJS else None,
-            ])
+    index = list(m.PRJ_OPR_TMPS)
+    projects = [p for (p, tmp) in index]
+    tmps = [tmp for (p, tmp) in index]
+
+    # The cost components are only defined (and reported) for the projects
+    # or project-timepoints in the respective subsets
+    def mask(project_set):
+        return [p in project_set for p in projects]
+
+    write_results_table(
+        scenario_directory, subproblem, stage, "costs_operations.csv",
+        [
+            ("project", projects),
+            ("period", [m.period[tmp] for tmp in tmps]),
+            ("horizon", [m.horizon[tmp, m.balancing_type_project[p]]
+                         for (p, tmp) in index]),
+            ("timepoint", tmps),
+            ("timepoint_weight", [m.tmp_weight[tmp] for tmp in tmps]),
+            ("number_of_hours_in_timepoint",
+             [m.hrs_in_tmp[tmp] for tmp in tmps]),
+            ("load_zone", [m.load_zone[p] for p in projects]),
+            ("technology", [m.technology[p] for p in projects]),
+            ("variable_om_cost",
+             get_component_values(m.Variable_OM_Cost, index,
+                                  mask(m.VAR_OM_COST_ALL_PRJS))),
+            ("fuel_cost",
+             get_component_values(m.Fuel_Cost, index, mask(m.FUEL_PRJS))),
+            ("startup_cost",
+             get_component_values(m.Startup_Cost, index,
+                                  mask(m.STARTUP_COST_PRJS))),
+            ("shutdown_cost",
+             get_component_values(m.Shutdown_Cost, index,
+                                  mask(m.SHUTDOWN_COST_PRJS))),
+            ("operational_violation_cost",
+             get_component_values(
+                 m.Operational_Violation_Cost, index,
+                 [idx in m.VIOL_ALL_PRJ_OPR_TMPS for idx in index])),
+            ("curtailment_cost",
+             get_component_values(m.Curtailment_Cost, index,
+                                  mask(m.CURTAILMENT_COST_PRJS)))
+        ],
+        d
+    )
 
 
 # Database
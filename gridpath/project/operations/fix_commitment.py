@@ -19,14 +19,13 @@ stage.
 """
 
 from builtins import zip
-from csv import writer
 import os.path
-from pandas import read_csv
 from pyomo.environ import Set, Param, NonNegativeReals, Expression
 
 
-from gridpath.auxiliary.auxiliary import get_required_subtype_modules_from_projects_file, \
-    check_for_integer_subdirectories
+from gridpath.auxiliary.auxiliary import get_required_subtype_modules, \
+    check_for_integer_subdirectories, get_input_table
+from gridpath.auxiliary.state_channel import write_state_table
 from gridpath.project.operations.common_functions import \
     load_operational_type_modules
 
@@ -93,9 +92,10 @@ def add_model_components(m, d, scenario_directory, subproblem, stage):
 
     # Dynamic Inputs
 
-    required_operational_modules = get_required_subtype_modules_from_projects_file(
-        scenario_directory=scenario_directory, subproblem=subproblem,
-        stage=stage, which_type="operational_type"
+    required_operational_modules = get_required_subtype_modules(
+        d=d, scenario_directory=scenario_directory,
+        subproblem=subproblem, stage=stage,
+        which_type="operational_type"
     )
 
     imported_operational_modules = load_operational_type_modules(
@@ -166,9 +166,10 @@ def fix_variables(m, d, scenario_directory, subproblem, stage):
     :return:
     """
 
-    required_operational_modules = get_required_subtype_modules_from_projects_file(
-        scenario_directory=scenario_directory, subproblem=subproblem,
-        stage=stage, which_type="operational_type"
+    required_operational_modules = get_required_subtype_modules(
+        d=d, scenario_directory=scenario_directory,
+        subproblem=subproblem, stage=stage,
+        which_type="operational_type"
     )
 
     imported_operational_modules = load_operational_type_modules(
@@ -202,10 +203,12 @@ def load_model_data(m, d, data_portal, scenario_directory, subproblem, stage):
         os.path.join(scenario_directory, subproblem)
     )
 
-    fixed_commitment_df = read_csv(
+    # The fixed commitment exported by the previous stages; if they were
+    # run in this process, it is passed in memory rather than read from the
+    # file (see gridpath.auxiliary.state_channel)
+    fixed_commitment_df = get_input_table(
         os.path.join(scenario_directory, subproblem,
                      "pass_through_inputs", "fixed_commitment.tab"),
-        sep='\t',
         dtype={"stage": str}
     )
 
@@ -217,11 +220,10 @@ def load_model_data(m, d, data_portal, scenario_directory, subproblem, stage):
         final commitment stage.
         """
         fnl_commit_prjs = list()
-        df = read_csv(
+        df = get_input_table(
             os.path.join(scenario_directory, str(subproblem), str(stage),
                          "inputs", "projects.tab"),
-            sep="\t",
-            usecols=["project", "last_commitment_stage"],
+            columns=["project", "last_commitment_stage"],
             dtype={"last_commitment_stage": str}
         )
 
@@ -243,8 +245,8 @@ def load_model_data(m, d, data_portal, scenario_directory, subproblem, stage):
     if len(fxd_commit_prjs) > 0:
         # For projects whose final commitment was in a prior stage, get the
         # fixed commitment of the previous stage (by project and timepoint)
-        fixed_commitment_df["stage_index"] = fixed_commitment_df.apply(
-            lambda row: stages.index(row["stage"]), axis=1)
+        fixed_commitment_df["stage_index"] = \
+            fixed_commitment_df["stage"].map(stages.index)
         relevant_commitment_df = fixed_commitment_df[
             fixed_commitment_df["stage_index"] == stages.index(stage) - 1
         ]
@@ -265,7 +267,9 @@ def export_pass_through_inputs(scenario_directory, subproblem, stage, m):
     """
     This function exports the commitment for all final commitment projects,
     i.e. projects for which the current stage or any of the previous stages
-    is the final commitment stage.
+    is the final commitment stage. The rows are appended to the
+    pass-through inputs of the subproblem (see
+    gridpath.auxiliary.state_channel).
 
     :param scenario_directory:
     :param subproblem:
@@ -274,25 +278,23 @@ def export_pass_through_inputs(scenario_directory, subproblem, stage, m):
     :return:
     """
 
-    df = read_csv(
+    df = get_input_table(
         os.path.join(scenario_directory, str(subproblem), str(stage),
                      "inputs", "projects.tab"),
-        sep="\t",
-        usecols=["project", "last_commitment_stage"]
+        columns=["project", "last_commitment_stage"]
     )
 
     final_commitment_stage_dict = dict(
         zip(df["project"], df["last_commitment_stage"])
     )
 
-    with open(os.path.join(scenario_directory, subproblem,
-                           "pass_through_inputs", "fixed_commitment.tab"),
-              "a") as fixed_commitment_file:
-        fixed_commitment_writer = writer(fixed_commitment_file,
-                                         delimiter="\t",
-                                         lineterminator="\n")
-        for (g, tmp) in m.FNL_COMMIT_PRJ_OPR_TMPS:
-            fixed_commitment_writer.writerow(
-                [g, tmp, stage, final_commitment_stage_dict[g],
-                 m.Commitment[g, tmp].expr.value]
-            )
+    write_state_table(
+        file_path=os.path.join(scenario_directory, subproblem,
+                               "pass_through_inputs", "fixed_commitment.tab"),
+        columns=["project", "timepoint", "stage", "final_commitment_stage",
+                 "commitment"],
+        rows=[[g, tmp, stage, final_commitment_stage_dict[g],
+               m.Commitment[g, tmp].expr.value]
+              for (g, tmp) in m.FNL_COMMIT_PRJ_OPR_TMPS],
+        append=True
+    )
@@ -22,14 +22,14 @@ If an operational type module method is not specified in an operational type
 module, these defaults are used.
 """
 
-import csv
 import os.path
+import pandas as pd
 
 from db.common_functions import spin_on_database_lock
-from gridpath.auxiliary.auxiliary import get_required_subtype_modules_from_projects_file
+from gridpath.auxiliary.auxiliary import get_required_subtype_modules
 from gridpath.project.operations.common_functions import \
     load_operational_type_modules
-from gridpath.auxiliary.db_interface import setup_results_import
+from gridpath.auxiliary.db_interface import delete_prior_results
 
 
 def add_model_components(m, d, scenario_directory, subproblem, stage):
@@ -40,9 +40,10 @@ def add_model_components(m, d, scenario_directory, subproblem, stage):
     :return:
     """
     # Import needed operational modules
-    required_operational_modules = get_required_subtype_modules_from_projects_file(
-        scenario_directory=scenario_directory, subproblem=subproblem,
-        stage=stage, which_type="operational_type"
+    required_operational_modules = get_required_subtype_modules(
+        d=d, scenario_directory=scenario_directory,
+        subproblem=subproblem, stage=stage,
+        which_type="operational_type"
     )
 
     imported_operational_modules = load_operational_type_modules(
@@ -68,9 +69,10 @@ def load_model_data(m, d, data_portal, scenario_directory, subproblem, stage):
     :return:
     """
     # Import needed operational modules
-    required_operational_modules = get_required_subtype_modules_from_projects_file(
-        scenario_directory=scenario_directory, subproblem=subproblem,
-        stage=stage, which_type="operational_type"
+    required_operational_modules = get_required_subtype_modules(
+        d=d, scenario_directory=scenario_directory,
+        subproblem=subproblem, stage=stage,
+        which_type="operational_type"
     )
 
     imported_operational_modules = load_operational_type_modules(
@@ -103,9 +105,10 @@ def export_results(scenario_directory, subproblem, stage, m, d):
 
     # Export module-specific results
     # Operational type modules
-    required_operational_modules = get_required_subtype_modules_from_projects_file(
-        scenario_directory=scenario_directory, subproblem=subproblem,
-        stage=stage, which_type="operational_type"
+    required_operational_modules = get_required_subtype_modules(
+        d=d, scenario_directory=scenario_directory,
+        subproblem=subproblem, stage=stage,
+        which_type="operational_type"
     )
 
     imported_operational_modules = load_operational_type_modules(
@@ -125,7 +128,7 @@ def export_results(scenario_directory, subproblem, stage, m, d):
 
 
 # TODO: move this into SubScenarios class?
-def get_required_opchar_modules(scenario_id, c):
+def get_required_opchar_modules(scenario_id, c, subscenarios=None):
     """
     Get the required operational type submodules based on the database inputs
     for the specified scenario_id. Required modules are the unique set of
@@ -141,20 +144,29 @@ def get_required_opchar_modules(scenario_id, c):
 
     :param scenario_id: user-specified scenario ID
     :param c: database cursor
+    :param subscenarios: SubScenarios object with all subscenario info; if
+        specified, the subscenario IDs are taken from it instead of the
+        scenarios table
     :return: List of the required operational type submodules
     """
 
-    project_portfolio_scenario_id = c.execute(
-        """SELECT project_portfolio_scenario_id 
-        FROM scenarios 
-        WHERE scenario_id = {}""".format(scenario_id)
-    ).fetchone()[0]
-
-    project_opchars_scenario_id = c.execute(
-        """SELECT project_operational_chars_scenario_id 
-        FROM scenarios 
-        WHERE scenario_id = {}""".format(scenario_id)
-    ).fetchone()[0]
+    if subscenarios is not None:
+        project_portfolio_scenario_id = \
+            subscenarios.PROJECT_PORTFOLIO_SCENARIO_ID
+        project_opchars_scenario_id = \
+            subscenarios.PROJECT_OPERATIONAL_CHARS_SCENARIO_ID
+    else:
+        project_portfolio_scenario_id = c.execute(
+            """SELECT project_portfolio_scenario_id 
+            FROM scenarios 
+            WHERE scenario_id = {}""".format(scenario_id)
+        ).fetchone()[0]
+
+        project_opchars_scenario_id = c.execute(
+            """SELECT project_operational_chars_scenario_id 
+            FROM scenarios 
+            WHERE scenario_id = {}""".format(scenario_id)
+        ).fetchone()[0]
 
     required_opchar_modules = [
         p[0] for p in c.execute(
@@ -218,7 +230,9 @@ def write_model_inputs(scenario_directory, scenario_id, subscenarios, subproblem
     # Load in the required operational modules
     c = conn.cursor()
 
-    required_opchar_modules = get_required_opchar_modules(scenario_id, c)
+    required_opchar_modules = get_required_opchar_modules(
+        scenario_id, c, subscenarios=subscenarios
+    )
     imported_operational_modules = load_operational_type_modules(
         required_opchar_modules)
 
@@ -247,75 +261,62 @@ def import_results_into_database(
     """
     if not quiet:
         print("project dispatch all")
-    # dispatch_all.csv
-    # Delete prior results and create temporary import table for ordering
-    setup_results_import(
+    # Delete prior results
+    delete_prior_results(
         conn=db, cursor=c,
         table="results_project_dispatch",
         scenario_id=scenario_id, subproblem=subproblem, stage=stage
     )
 
-    # Load results into the temporary table
-    results = []
-    with open(os.path.join(results_directory, "dispatch_all.csv"), "r") as \
-            dispatch_file:
-        reader = csv.reader(dispatch_file)
-
-        next(reader)  # skip header
-        for row in reader:
-            project = row[0]
-            period = row[1]
-            horizon = row[2]
-            timepoint = row[3]
-            operational_type = row[4]
-            balancing_type = row[5]
-            timepoint_weight = row[6]
-            number_of_hours_in_timepoint = row[7]
-            load_zone = row[8]
-            technology = row[9]
-            power_mw = row[10]
-
-            results.append(
-                (scenario_id, project, period, subproblem, stage, timepoint,
-                 operational_type, balancing_type,
-                 horizon, timepoint_weight, number_of_hours_in_timepoint,
-                 load_zone, technology, power_mw)
-            )
-    insert_temp_sql = """
-        INSERT INTO temp_results_project_dispatch{}
-        (scenario_id, project, period, subproblem_id, stage_id, timepoint,
-        operational_type, balancing_type,
-        horizon, timepoint_weight,
-        number_of_hours_in_timepoint,
-        load_zone, technology, power_mw)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?);
-        """.format(scenario_id)
-    spin_on_database_lock(conn=db, cursor=c, sql=insert_temp_sql, data=results)
-
-    # Insert sorted results into permanent results table
-    insert_sql = """
-        INSERT INTO results_project_dispatch
-        (scenario_id, project, period, subproblem_id, stage_id, timepoint,
-        operational_type, balancing_type,
-        horizon, timepoint_weight, number_of_hours_in_timepoint,
-        load_zone, technology, power_mw)
-        SELECT
-        scenario_id, project, period, subproblem_id, stage_id, timepoint,
-        operational_type, balancing_type,
-        horizon, timepoint_weight, number_of_hours_in_timepoint,
-        load_zone, technology, power_mw
-        FROM temp_results_project_dispatch{}
-        ORDER BY scenario_id, project, subproblem_id, stage_id, timepoint;
-        """.format(scenario_id)
-    spin_on_database_lock(conn=db, cursor=c, sql=insert_sql, data=(),
-                          many=False)
-
     # Load in the required operational modules
     required_opchar_modules = get_required_opchar_modules(scenario_id, c)
     imported_operational_modules = \
         load_operational_type_modules(required_opchar_modules)
 
-    # Import module-specific results
+    # Read dispatch_all.csv and merge in the module-specific dispatch
+    # results, so that the full set of columns for each project and timepoint
+    # is inserted at once rather than updating the rows with the
+    # module-specific columns afterwards
+    # Values are read as strings and missing values are None (NULL)
+    dispatch_df = pd.read_csv(
+        os.path.join(results_directory, "dispatch_all.csv"), dtype=str
+    )
+    optype_dfs = [
+        imported_operational_modules[op_m].
+        get_module_specific_dispatch_results(
+            results_directory=results_directory
+        )
+        for op_m in required_opchar_modules
+        if hasattr(imported_operational_modules[op_m],
+                   "get_module_specific_dispatch_results")
+    ]
+    if optype_dfs:
+        dispatch_df = dispatch_df.merge(
+            pd.concat(optype_dfs, sort=False),
+            how="left", on=["project", "timepoint"]
+        )
+
+    # Sort the results as we want them stored in the results table
+    dispatch_df = dispatch_df.sort_values(
+        by=["project", "timepoint"],
+        key=lambda col: col.astype(int) if col.name == "timepoint" else col
+    )
+    dispatch_df = dispatch_df.astype(object).where(dispatch_df.notna(), None)
+
+    columns = ["scenario_id", "subproblem_id", "stage_id"] + \
+        list(dispatch_df.columns)
+    results = [
+        (scenario_id, subproblem, stage) + tuple(row)
+        for row in dispatch_df.itertuples(index=False, name=None)
+    ]
+    insert_sql = """
+        INSERT INTO results_project_dispatch
+        ({})
+        VALUES ({});
+        """.format(", ".join(columns), ", ".join(["?"] * len(columns)))
+    spin_on_database_lock(conn=db, cursor=c, sql=insert_sql, data=results)
+
+    # Import other module-specific results
     for op_m in required_opchar_modules:
         if hasattr(imported_operational_modules[op_m],
                    "import_module_specific_results_to_database"):
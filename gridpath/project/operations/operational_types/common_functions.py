@@ -18,11 +18,12 @@ import numpy as np
 import pandas as pd
 import warnings
 
-from db.common_functions import spin_on_database_lock
 from gridpath.project.common_functions import \
-    check_if_boundary_type_and_first_timepoint, get_column_row_value, \
-    check_boundary_type
-from gridpath.auxiliary.auxiliary import cursor_to_df
+    check_if_boundary_type_and_first_timepoint, check_boundary_type
+from gridpath.auxiliary.auxiliary import cursor_to_df, get_input_table, \
+    get_input_table_header
+from gridpath.auxiliary.db_interface import \
+    get_project_operational_timepoints_sql
 from gridpath.auxiliary.validations import write_validation_to_database, \
     validate_req_cols, validate_missing_inputs, validate_values, \
     validate_column_monotonicity
@@ -183,93 +184,35 @@ def determine_relevant_timepoints(mod, g, tmp, min_time):
     return relevant_tmps, relevant_linked_tmps
 
 
-def update_dispatch_results_table(
-     db, c, results_directory, scenario_id, subproblem, stage, results_file
-):
-    results = []
-    with open(os.path.join(results_directory, results_file), "r") as \
-            dispatch_file:
-        reader = csv.reader(dispatch_file)
-
-        header = next(reader)
-
-        for row in reader:
-            project = row[0]
-            period = row[1]
-            balancing_type = row[2]
-            horizon = row[3]
-            timepoint = row[4]
-            timepoint_weight = row[5]
-            n_hours_in_tmp = row[6]
-            technology = row[7]
-            load_zone = row[8]
-            power = row[9]
-            scheduled_curtailment_mw = get_column_row_value(
-                header, "scheduled_curtailment_mw", row)
-            subhourly_curtailment_mw = get_column_row_value(
-                header,"subhourly_curtailment_mw", row)
-            subhourly_energy_delivered_mw = get_column_row_value(
-                header, "subhourly_energy_delivered_mw", row)
-            total_curtailment_mw = get_column_row_value(
-                header, "total_curtailment_mw", row)
-            committed_mw = get_column_row_value(header, "committed_mw", row)
-            committed_units = get_column_row_value(header, "committed_units", row)
-            started_units = get_column_row_value(header, "started_units", row)
-            stopped_units = get_column_row_value(header, "stopped_units", row)
-            synced_units = get_column_row_value(header, "synced_units", row)
-            auxiliary_consumption = get_column_row_value(
-                header, "auxiliary_consumption_mw", row)
-            gross_power = get_column_row_value(header, "gross_power_mw", row)
-            ramp_up_violation = get_column_row_value(
-                header, "ramp_up_violation", row
-            )
-            ramp_down_violation = get_column_row_value(
-                header, "ramp_down_violation", row
-            )
-            min_up_time_violation = get_column_row_value(
-                header, "min_up_time_violation", row
-            )
-            min_down_time_violation = get_column_row_value(
-                header, "min_down_time_violation", row
-            )
-
-            results.append(
-                (scheduled_curtailment_mw, subhourly_curtailment_mw,
-                 subhourly_energy_delivered_mw, total_curtailment_mw,
-                 committed_mw, committed_units, started_units,
-                 stopped_units, synced_units, auxiliary_consumption,
-                 gross_power, ramp_up_violation, ramp_down_violation,
-                 min_up_time_violation, min_down_time_violation,
-                 scenario_id, project, period, subproblem, stage, timepoint)
-            )
-
-    # Update the results table with the module-specific results
-    update_sql = """
-        UPDATE results_project_dispatch
-        SET scheduled_curtailment_mw = ?,
-        subhourly_curtailment_mw = ?,
-        subhourly_energy_delivered_mw = ?,
-        total_curtailment_mw = ?,
-        committed_mw = ?,
-        committed_units = ?,
-        started_units = ?,
-        stopped_units = ?,
-        synced_units = ?,
-        auxiliary_consumption_mw = ?,
-        gross_power_mw = ?,
-        ramp_up_violation = ?,
-        ramp_down_violation = ?,
-        min_up_time_violation = ?,
-        min_down_time_violation = ?
-        WHERE scenario_id = ?
-        AND project = ?
-        AND period = ?
-        AND subproblem_id = ?
-        AND stage_id = ?
-        AND timepoint = ?;
-        """
-
-    spin_on_database_lock(conn=db, cursor=c, sql=update_sql, data=results)
+# The operational-type-specific columns of the project dispatch results table
+OPTYPE_DISPATCH_RESULTS_COLUMNS = [
+    "scheduled_curtailment_mw", "subhourly_curtailment_mw",
+    "subhourly_energy_delivered_mw", "total_curtailment_mw", "committed_mw",
+    "committed_units", "started_units", "stopped_units", "synced_units",
+    "auxiliary_consumption_mw", "gross_power_mw", "ramp_up_violation",
+    "ramp_down_violation", "min_up_time_violation", "min_down_time_violation"
+]
+
+
+def get_dispatch_results_df(results_directory, results_file):
+    """
+    :param results_directory: the subproblem/stage results directory
+    :param results_file: the operational-type-specific dispatch results file
+    :return: dataframe with the project and timepoint columns and the
+        operational-type-specific dispatch columns found in the results file
+
+    Read the operational-type-specific dispatch results, which get merged
+    into the project dispatch results on import. Values are read as strings,
+    as they would be with the csv module, and missing values are None.
+    """
+    df = pd.read_csv(
+        os.path.join(results_directory, results_file), dtype=str
+    )
+    columns = ["project", "timepoint"] + [
+        c for c in OPTYPE_DISPATCH_RESULTS_COLUMNS if c in df.columns
+    ]
+
+    return df[columns].astype(object).where(df[columns].notna(), None)
 
 
 def get_optype_inputs_as_df(
@@ -291,26 +234,23 @@ def get_optype_inputs_as_df(
     type and only the columns required or optional for the operational type.
     """
 
+    projects_file = os.path.join(
+        scenario_directory, str(subproblem), str(stage), "inputs",
+        "projects.tab"
+    )
+
     # Figure out which headers we have
-    header = pd.read_csv(
-        os.path.join(
-            scenario_directory, subproblem, stage, "inputs", "projects.tab"
-        ),
-        sep="\t", header=None, nrows=1
-    ).values[0]
+    header = get_input_table_header(projects_file)
 
     # Get the columns for the optional params (it's OK if they don't exist)
     used_columns = [c for c in optional_columns if c in header]
 
-    # Read in the appropriate columns for the operational type from
-    # projects.tab
-    df = pd.read_csv(
-        os.path.join(scenario_directory, str(subproblem), str(stage),
-                     "inputs", "projects.tab"),
-        sep="\t",
-        usecols=["project", "operational_type"]
-            + required_columns + used_columns
-
+    # Get the appropriate columns for the operational type from
+    # projects.tab (the file is only parsed once for all operational types)
+    df = get_input_table(
+        projects_file,
+        columns=["project", "operational_type"]
+        + required_columns + used_columns
     )
 
     # Filter for the operational type
@@ -511,11 +451,10 @@ def load_var_profile_inputs(
 
     # Determine projects of this op_type and other var op_types
     # TODO: re-factor getting projects of certain op-type?
-    prj_df = pd.read_csv(
-        os.path.join(scenario_directory, subproblem, stage,
+    prj_df = get_input_table(
+        os.path.join(scenario_directory, str(subproblem), str(stage),
                      "inputs", "projects.tab"),
-        sep="\t",
-        usecols=["project", "operational_type"]
+        columns=["project", "operational_type"]
     )
     op_type_prjs = prj_df[prj_df["operational_type"] == op_type]["project"]
     other_var_op_type_prjs = prj_df[prj_df["operational_type"].isin(
@@ -524,11 +463,10 @@ def load_var_profile_inputs(
 
     # Read in the cap factors, filter for projects with the correct op_type
     # and convert to dictionary
-    cf_df = pd.read_csv(
-        os.path.join(scenario_directory, subproblem, stage, "inputs",
-                     "variable_generator_profiles.tab"),
-        sep="\t",
-        usecols=["project", "timepoint", "cap_factor"],
+    cf_df = get_input_table(
+        os.path.join(scenario_directory, str(subproblem), str(stage),
+                     "inputs", "variable_generator_profiles.tab"),
+        columns=["project", "timepoint", "cap_factor"],
         dtype={"cap_factor": float}
     )
     op_type_cf_df = cf_df[cf_df["project"].isin(op_type_prjs)]
@@ -575,9 +513,6 @@ def get_var_profile_inputs_from_database(
     stage = 1 if stage == "" else stage
 
     c = conn.cursor()
-    # NOTE: There can be cases where a resource is both in specified capacity
-    # table and in new build table, but depending on capacity type you'd only
-    # use one of them, so filtering with OR is not 100% correct.
 
     sql = """
         SELECT project, timepoint, cap_factor
@@ -587,15 +522,8 @@ def get_var_profile_inputs_from_database(
         FROM 
             (SELECT project, stage_id, timepoint, 
             variable_generator_profile_scenario_id
-            FROM project_operational_timepoints
-            WHERE project_portfolio_scenario_id = {}
-            AND project_operational_chars_scenario_id = {}
-            AND operational_type = '{}'
-            AND temporal_scenario_id = {}
-            AND (project_specified_capacity_scenario_id = {}
-                 OR project_new_cost_scenario_id = {})
-            AND subproblem_id = {}
-            AND stage_id = {}
+            FROM ({}) as project_operational_timepoints_tbl
+            WHERE operational_type = '{}'
             ) as projects_periods_timepoints_tbl
         -- Now that we have the relevant projects and timepoints, get the 
         -- respective cap factors (and no others) from 
@@ -604,16 +532,14 @@ def get_var_profile_inputs_from_database(
             inputs_project_variable_generator_profiles
         USING (variable_generator_profile_scenario_id, project, 
         stage_id, timepoint)
+        ORDER BY project, timepoint
         ;
         """.format(
-        subscenarios.PROJECT_PORTFOLIO_SCENARIO_ID,
-        subscenarios.PROJECT_OPERATIONAL_CHARS_SCENARIO_ID,
-        op_type,
-        subscenarios.TEMPORAL_SCENARIO_ID,
-        subscenarios.PROJECT_SPECIFIED_CAPACITY_SCENARIO_ID,
-        subscenarios.PROJECT_NEW_COST_SCENARIO_ID,
-        subproblem,
-        stage
+        get_project_operational_timepoints_sql(
+            conn=conn, scenario_id=scenario_id, subscenarios=subscenarios,
+            subproblem=subproblem, stage=stage
+        ),
+        op_type
     )
 
     variable_profiles = c.execute(sql)
@@ -685,11 +611,10 @@ def load_hydro_opchars(data_portal, scenario_directory, subproblem,
     min = dict()
     max = dict()
 
-    prj_hor_opchar_df = pd.read_csv(
+    prj_hor_opchar_df = get_input_table(
         os.path.join(scenario_directory, str(subproblem), str(stage), "inputs",
                      "hydro_conventional_horizon_params.tab"),
-        sep="\t",
-        usecols=["project", "horizon", "average_power_fraction",
+        columns=["project", "horizon", "average_power_fraction",
                  "min_power_fraction", "max_power_fraction"]
     )
     for row in zip(prj_hor_opchar_df["project"],
@@ -914,7 +839,7 @@ def check_for_tmps_to_link(
     subproblem and pass that; otherwise, pass empty list.
     """
     try:
-        map_df = pd.read_csv(
+        map_df = get_input_table(
             os.path.join(scenario_directory, "linked_subproblems_map.csv"),
             sep=","
         )
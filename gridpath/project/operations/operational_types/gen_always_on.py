@@ -34,14 +34,16 @@ Costs for this operational type include fuel costs and variable O&M costs.
 
 from __future__ import division
 
-import csv
 import os.path
 from pyomo.environ import Param, Set, Var, NonNegativeReals,PercentFraction, \
-    Constraint, Expression, value
+    Constraint, Expression
 
-from gridpath.auxiliary.auxiliary import subset_init_by_param_value
+from gridpath.auxiliary.auxiliary import subset_init_by_param_value, \
+    input_file_exists, load_input_table
 from gridpath.auxiliary.dynamic_components import headroom_variables, \
-    footroom_variables
+    footroom_variables, rolling_horizon
+from gridpath.auxiliary.results_export import \
+    get_clipped_component_values, write_linked_timepoint_params
 from gridpath.project.common_functions import \
     check_if_boundary_type_and_first_timepoint, check_if_first_timepoint, \
     check_boundary_type
@@ -237,17 +239,20 @@ def add_model_components(m, d, scenario_directory, subproblem, stage):
 
     m.gen_always_on_linked_power = Param(
         m.GEN_ALWAYS_ON_LINKED_TMPS,
-        within=NonNegativeReals
+        within=NonNegativeReals,
+        mutable=getattr(d, rolling_horizon)
     )
 
     m.gen_always_on_linked_upwards_reserves = Param(
         m.GEN_ALWAYS_ON_LINKED_TMPS,
-        within=NonNegativeReals
+        within=NonNegativeReals,
+        mutable=getattr(d, rolling_horizon)
     )
 
     m.gen_always_on_linked_downwards_reserves = Param(
         m.GEN_ALWAYS_ON_LINKED_TMPS,
-        within=NonNegativeReals
+        within=NonNegativeReals,
+        mutable=getattr(d, rolling_horizon)
     )
 
     # Variables
@@ -550,8 +555,9 @@ def load_module_specific_data(mod, data_portal,
             scenario_directory, str(subproblem), str(stage), "inputs",
             "gen_always_on_linked_timepoint_params.tab"
         )
-    if os.path.exists(linked_inputs_filename):
-        data_portal.load(
+    if input_file_exists(linked_inputs_filename):
+        load_input_table(
+            data_portal=data_portal,
             filename=linked_inputs_filename,
             index=mod.GEN_ALWAYS_ON_LINKED_TMPS,
             param=(
@@ -590,32 +596,27 @@ def export_module_specific_results(
         next_subproblem = str(int(subproblem) + 1)
 
         # Export params by project and timepoint
-        with open(os.path.join(
+        index = [(p, tmp) for (p, tmp) in sorted(mod.GEN_ALWAYS_ON_OPR_TMPS)
+                 if tmp in tmps_to_link]
+        write_linked_timepoint_params(
+            file_path=os.path.join(
                 scenario_directory, next_subproblem, stage, "inputs",
                 "gen_always_on_linked_timepoint_params.tab"
-        ), "w", newline=""
-        ) as f:
-            writer = csv.writer(f, delimiter="\t", lineterminator="\n")
-            writer.writerow(
-                ["project", "linked_timepoint",
-                 "linked_provide_power",
-                 "linked_upward_reserves",
-                 "linked_downward_reserves"]
-            )
-            for (p, tmp) in sorted(mod.GEN_ALWAYS_ON_OPR_TMPS):
-                if tmp in tmps_to_link:
-                    writer.writerow([
-                        p,
-                        tmp_linked_tmp_dict[tmp],
-                        max(value(mod.GenAlwaysOn_Provide_Power_MW[p, tmp]),
-                            0),
-                        max(value(mod.GenAlwaysOn_Upwards_Reserves_MW[p, tmp]),
-                            0),
-                        max(value(mod.GenAlwaysOn_Downwards_Reserves_MW[p,
-                                                                        tmp]),
-                            0
-                            )
-                    ])
+            ),
+            index=index,
+            tmp_linked_tmp_dict=tmp_linked_tmp_dict,
+            columns=[
+                ("linked_provide_power",
+                 get_clipped_component_values(
+                     mod.GenAlwaysOn_Provide_Power_MW, index)),
+                ("linked_upward_reserves",
+                 get_clipped_component_values(
+                     mod.GenAlwaysOn_Upwards_Reserves_MW, index)),
+                ("linked_downward_reserves",
+                 get_clipped_component_values(
+                     mod.GenAlwaysOn_Downwards_Reserves_MW, index))
+            ]
+        )
 
 
 # Database
@@ -47,16 +47,20 @@ Morales-Espana et al. (2013).
 
 from __future__ import division
 
-import csv
 import os.path
 from pyomo.environ import Var, Set, Param, Constraint, NonNegativeReals, \
-    Binary, PercentFraction, Boolean, Expression, value
+    Binary, PercentFraction, Boolean, Expression
 
-from gridpath.auxiliary.auxiliary import subset_init_by_param_value
+from gridpath.auxiliary.auxiliary import subset_init_by_param_value, \
+    input_file_exists, load_input_table
 from gridpath.auxiliary.dynamic_components import headroom_variables, \
-    footroom_variables
+    footroom_variables, rolling_horizon
+from gridpath.auxiliary.results_export import \
+    get_clipped_component_values, get_component_values, \
+    get_project_timepoint_columns, write_linked_timepoint_params, \
+    write_results_table
 from gridpath.project.operations.operational_types.common_functions import \
-    determine_relevant_timepoints, update_dispatch_results_table, \
+    determine_relevant_timepoints, get_dispatch_results_df, \
     load_optype_module_specific_data, load_startup_chars, \
     check_for_tmps_to_link, validate_opchars
 from gridpath.project.common_functions import \
@@ -793,62 +797,74 @@ def add_model_components(m, d, scenario_directory, subproblem, stage):
 
     m.gen_commit_bin_linked_commit = Param(
         m.GEN_COMMIT_BIN_LINKED_TMPS,
-        within=PercentFraction
+        within=PercentFraction,
+        mutable=getattr(d, rolling_horizon)
     )
 
     m.gen_commit_bin_linked_startup = Param(
         m.GEN_COMMIT_BIN_LINKED_TMPS,
-        within=PercentFraction
+        within=PercentFraction,
+        mutable=getattr(d, rolling_horizon)
     )
 
     m.gen_commit_bin_linked_shutdown = Param(
         m.GEN_COMMIT_BIN_LINKED_TMPS,
-        within=PercentFraction
+        within=PercentFraction,
+        mutable=getattr(d, rolling_horizon)
     )
 
     m.gen_commit_bin_linked_power_above_pmin = Param(
         m.GEN_COMMIT_BIN_LINKED_TMPS,
-        within=NonNegativeReals
+        within=NonNegativeReals,
+        mutable=getattr(d, rolling_horizon)
     )
 
     m.gen_commit_bin_linked_upwards_reserves = Param(
         m.GEN_COMMIT_BIN_LINKED_TMPS,
-        within=NonNegativeReals
+        within=NonNegativeReals,
+        mutable=getattr(d, rolling_horizon)
     )
 
     m.gen_commit_bin_linked_downwards_reserves = Param(
         m.GEN_COMMIT_BIN_LINKED_TMPS,
-        within=NonNegativeReals
+        within=NonNegativeReals,
+        mutable=getattr(d, rolling_horizon)
     )
 
     m.gen_commit_bin_linked_ramp_up_rate_mw_per_tmp = Param(
         m.GEN_COMMIT_BIN_LINKED_TMPS,
-        within=NonNegativeReals
+        within=NonNegativeReals,
+        mutable=getattr(d, rolling_horizon)
     )
 
     m.gen_commit_bin_linked_ramp_down_rate_mw_per_tmp = Param(
         m.GEN_COMMIT_BIN_LINKED_TMPS,
-        within=NonNegativeReals
+        within=NonNegativeReals,
+        mutable=getattr(d, rolling_horizon)
     )
 
     m.gen_commit_bin_linked_provide_power_startup_by_st_mw = Param(
         m.GEN_COMMIT_BIN_LINKED_TMPS_STR_TYPES,
-        within=NonNegativeReals
+        within=NonNegativeReals,
+        mutable=getattr(d, rolling_horizon)
     )
 
     m.gen_commit_bin_linked_startup_ramp_rate_by_st_mw_per_tmp = Param(
         m.GEN_COMMIT_BIN_LINKED_TMPS_STR_TYPES,
-        within=NonNegativeReals
+        within=NonNegativeReals,
+        mutable=getattr(d, rolling_horizon)
     )
 
     m.gen_commit_bin_linked_provide_power_shutdown_mw = Param(
         m.GEN_COMMIT_BIN_LINKED_TMPS,
-        within=NonNegativeReals
+        within=NonNegativeReals,
+        mutable=getattr(d, rolling_horizon)
     )
 
     m.gen_commit_bin_linked_shutdown_ramp_rate_mw_per_tmp = Param(
         m.GEN_COMMIT_BIN_LINKED_TMPS,
-        within=NonNegativeReals
+        within=NonNegativeReals,
+        mutable=getattr(d, rolling_horizon)
     )
 
     # Variables
@@ -2286,8 +2302,9 @@ def load_module_specific_data(mod, data_portal,
             scenario_directory, str(subproblem), str(stage), "inputs",
             "gen_commit_bin_linked_timepoint_params.tab"
         )
-    if os.path.exists(linked_inputs_filename):
-        data_portal.load(
+    if input_file_exists(linked_inputs_filename):
+        load_input_table(
+            data_portal=data_portal,
             filename=linked_inputs_filename,
             index=mod.GEN_COMMIT_BIN_LINKED_TMPS,
             param=(
@@ -2311,8 +2328,9 @@ def load_module_specific_data(mod, data_portal,
             scenario_directory, str(subproblem), str(stage), "inputs",
             "gen_commit_bin_linked_timepoint_str_type_params.tab"
         )
-    if os.path.exists(linked_startup_inputs_filename):
-        data_portal.load(
+    if input_file_exists(linked_startup_inputs_filename):
+        load_input_table(
+            data_portal=data_portal,
             filename=linked_startup_inputs_filename,
             param=(
                 mod.gen_commit_bin_linked_provide_power_startup_by_st_mw,
@@ -2333,49 +2351,38 @@ def export_module_specific_results(mod, d,
     :param d:
     :return:
     """
-    with open(os.path.join(scenario_directory, str(subproblem), str(stage), "results",
-                           "dispatch_binary_commit.csv"),
-              "w", newline="") as f:
-        writer = csv.writer(f)
-        writer.writerow(["project", "period", "balancing_type_project",
-                         "horizon", "timepoint", "timepoint_weight",
-                         "number_of_hours_in_timepoint", "technology",
-                         "load_zone", "gross_power_mw",
-                         "auxiliary_consumption_mw", "net_power_mw",
-                         "committed_mw", "committed_units",
-                         "started_units", "stopped_units",
-                         "synced_units", "active_startup_type",
-                         "ramp_up_violation", "ramp_down_violation",
-                         "min_up_time_violation", "min_down_time_violation"
-                         ])
-
-        for (p, tmp) in mod.GEN_COMMIT_BIN_OPR_TMPS:
-            writer.writerow([
-                p,
-                mod.period[tmp],
-                mod.balancing_type_project[p],
-                mod.horizon[tmp, mod.balancing_type_project[p]],
-                tmp,
-                mod.tmp_weight[tmp],
-                mod.hrs_in_tmp[tmp],
-                mod.technology[p],
-                mod.load_zone[p],
-                value(mod.GenCommitBin_Provide_Power_MW[p, tmp]),
-                value(mod.GenCommitBin_Auxiliary_Consumption_MW[p, tmp]),
-                value(mod.GenCommitBin_Provide_Power_MW[p, tmp]) -
-                value(mod.GenCommitBin_Auxiliary_Consumption_MW[p, tmp]),
-                value(mod.GenCommitBin_Pmax_MW[p, tmp])
-                * value(mod.GenCommitBin_Commit[p, tmp]),
-                value(mod.GenCommitBin_Commit[p, tmp]),
-                value(mod.GenCommitBin_Startup[p, tmp]),
-                value(mod.GenCommitBin_Shutdown[p, tmp]),
-                value(mod.GenCommitBin_Synced[p, tmp]),
-                value(mod.GenCommitBin_Active_Startup_Type[p, tmp]),
-                value(mod.GenCommitBin_Ramp_Up_Violation_MW[p, tmp]),
-                value(mod.GenCommitBin_Ramp_Down_Violation_MW[p, tmp]),
-                value(mod.GenCommitBin_Min_Up_Time_Violation[p, tmp]),
-                value(mod.GenCommitBin_Min_Down_Time_Violation[p, tmp])
-            ])
+    index = list(mod.GEN_COMMIT_BIN_OPR_TMPS)
+    power = get_component_values(mod.GenCommitBin_Provide_Power_MW, index)
+    aux = get_component_values(mod.GenCommitBin_Auxiliary_Consumption_MW, index)
+    commit = get_component_values(mod.GenCommitBin_Commit, index)
+    write_results_table(
+        scenario_directory, subproblem, stage, "dispatch_binary_commit.csv",
+        get_project_timepoint_columns(mod, index) + [
+            ("gross_power_mw", power),
+            ("auxiliary_consumption_mw", aux),
+            ("net_power_mw", power - aux),
+            ("committed_mw",
+             get_component_values(mod.GenCommitBin_Pmax_MW, index) * commit),
+            ("committed_units", commit),
+            ("started_units",
+             get_component_values(mod.GenCommitBin_Startup, index)),
+            ("stopped_units",
+             get_component_values(mod.GenCommitBin_Shutdown, index)),
+            ("synced_units",
+             get_component_values(mod.GenCommitBin_Synced, index)),
+            ("active_startup_type",
+             get_component_values(mod.GenCommitBin_Active_Startup_Type, index)),
+            ("ramp_up_violation",
+             get_component_values(mod.GenCommitBin_Ramp_Up_Violation_MW, index)),
+            ("ramp_down_violation",
+             get_component_values(mod.GenCommitBin_Ramp_Down_Violation_MW, index)),
+            ("min_up_time_violation",
+             get_component_values(mod.GenCommitBin_Min_Up_Time_Violation, index)),
+            ("min_down_time_violation",
+             get_component_values(mod.GenCommitBin_Min_Down_Time_Violation, index))
+        ],
+        d
+    )
 
     # Export any results that will be become inputs to a linked subproblem
     export_linked_subproblem_inputs(
@@ -2401,112 +2408,77 @@ def export_linked_subproblem_inputs(
         next_subproblem = str(int(subproblem) + 1)
 
         # Export params by project and timepoint
-        with open(os.path.join(
+        index = [(p, tmp) for (p, tmp) in sorted(mod.GEN_COMMIT_BIN_OPR_TMPS)
+                 if tmp in tmps_to_link]
+        write_linked_timepoint_params(
+            file_path=os.path.join(
                 scenario_directory, next_subproblem, stage, "inputs",
                 "gen_commit_bin_linked_timepoint_params.tab"
-        ), "w", newline=""
-        ) as f:
-            writer = csv.writer(f, delimiter="\t", lineterminator="\n")
-            writer.writerow(
-                ["project", "linked_timepoint", "linked_commit",
-                 "linked_startup", "linked_shutdown",
-                 "linked_provide_power_above_pmin",
-                 "linked_upward_reserves",
-                 "linked_downward_reserves",
-                 "linked_ramp_up_rate_mw_per_tmp",
-                 "linked_ramp_down_rate_mw_per_tmp",
-                 "linked_provide_power_shutdown",
-                 "linked_shutdown_ramp_rate_mw_per_tmp"]
+            ),
+            index=index,
+            tmp_linked_tmp_dict=tmp_linked_tmp_dict,
+            columns=[
+                ("linked_commit",
+                 get_clipped_component_values(
+                     mod.GenCommitBin_Commit, index, upper=1)),
+                ("linked_startup",
+                 get_clipped_component_values(
+                     mod.GenCommitBin_Startup, index, upper=1)),
+                ("linked_shutdown",
+                 get_clipped_component_values(
+                     mod.GenCommitBin_Shutdown, index, upper=1)),
+                ("linked_provide_power_above_pmin",
+                 get_clipped_component_values(
+                     mod.GenCommitBin_Provide_Power_Above_Pmin_MW, index)),
+                ("linked_upward_reserves",
+                 get_clipped_component_values(
+                     mod.GenCommitBin_Upwards_Reserves_MW, index)),
+                ("linked_downward_reserves",
+                 get_clipped_component_values(
+                     mod.GenCommitBin_Downwards_Reserves_MW, index)),
+                ("linked_ramp_up_rate_mw_per_tmp",
+                 get_clipped_component_values(
+                     mod.GenCommitBin_Ramp_Up_Rate_MW_Per_Tmp, index)),
+                ("linked_ramp_down_rate_mw_per_tmp",
+                 get_clipped_component_values(
+                     mod.GenCommitBin_Ramp_Down_Rate_MW_Per_Tmp, index)),
+                ("linked_provide_power_shutdown",
+                 get_clipped_component_values(
+                     mod.GenCommitBin_Provide_Power_Shutdown_MW, index)),
+                ("linked_shutdown_ramp_rate_mw_per_tmp",
+                 get_clipped_component_values(
+                     mod.GenCommitBin_Shutdown_Ramp_Rate_MW_Per_Tmp, index))
+            ]
+        )
+        # Export params by project, timepoint, and startup type
+        # Only write this file if there are data for these results to
+        # avoid throwing an index error when trying to load these inputs
+        # into the next subproblem
+        if mod.GEN_COMMIT_BIN_OPR_TMPS_STR_TYPES:
+            index = [(p, tmp, s) for (p, tmp, s)
+                     in sorted(mod.GEN_COMMIT_BIN_OPR_TMPS_STR_TYPES)
+                     if tmp in tmps_to_link]
+            write_linked_timepoint_params(
+                file_path=os.path.join(
+                    scenario_directory, next_subproblem, stage, "inputs",
+                    "gen_commit_bin_linked_timepoint_str_type_params.tab"
+                ),
+                index=index,
+                tmp_linked_tmp_dict=tmp_linked_tmp_dict,
+                columns=[
+                    ("startup_type", [s for (p, tmp, s) in index]),
+                    ("linked_provide_power_startup",
+                     get_clipped_component_values(
+                         mod.GenCommitBin_Provide_Power_Startup_By_ST_MW,
+                         index)),
+                    ("linked_startup_ramp_rate_mw_per_tmp",
+                     get_clipped_component_values(
+                         mod.GenCommitBin_Startup_Ramp_Rate_By_ST_MW_Per_Tmp,
+                         index))
+                ]
             )
-
-            for (p, tmp) in sorted(mod.GEN_COMMIT_BIN_OPR_TMPS):
-                if tmp in tmps_to_link:
-                    writer.writerow([
-                        p,
-                        tmp_linked_tmp_dict[tmp],
-                        max(
-                            min(value(mod.GenCommitBin_Commit[p, tmp]), 1),
-                            0
-                        ),
-                        max(
-                            min(value(mod.GenCommitBin_Startup[p, tmp]), 1),
-                            0
-                        ),
-                        max(
-                            min(value(mod.GenCommitBin_Shutdown[p, tmp]), 1),
-                            0
-                            ),
-                        max(value(
-                            mod.GenCommitBin_Provide_Power_Above_Pmin_MW[
-                                p, tmp]),
-                            0
-                            ),
-                        max(value(
-                            mod.GenCommitBin_Upwards_Reserves_MW[p, tmp]),
-                            0
-                            ),
-                        max(value(
-                            mod.GenCommitBin_Downwards_Reserves_MW[p, tmp]),
-                            0
-                            ),
-                        max(value(
-                            mod.GenCommitBin_Ramp_Up_Rate_MW_Per_Tmp[
-                                p, tmp]),
-                            0
-                            ),
-                        max(value(
-                            mod.GenCommitBin_Ramp_Down_Rate_MW_Per_Tmp[
-                                p, tmp]),
-                            0
-                            ),
-                        max(value(
-                            mod.GenCommitBin_Provide_Power_Shutdown_MW[
-                                p, tmp]),
-                            0
-                            ),
-                        max(value(
-                            mod.GenCommitBin_Shutdown_Ramp_Rate_MW_Per_Tmp[
-                                p, tmp]),
-                            0
-                            )
-                    ])
-            # Export params by project, timepoint, and startup type
-            # Only write this file if there are data for these results to
-            # avoid throwing an index error when trying to load these inputs
-            # into the next subproblem
-            if mod.GEN_COMMIT_BIN_OPR_TMPS_STR_TYPES:
-                with open(os.path.join(
-                        scenario_directory, next_subproblem, stage, "inputs",
-                        "gen_commit_bin_linked_timepoint_str_type_params.tab"
-                ), "w", newline=""
-                ) as f:
-                    writer = csv.writer(f, delimiter="\t", lineterminator="\n")
-                    writer.writerow(
-                        ["project", "linked_timepoint", "startup_type",
-                         "linked_provide_power_startup",
-                         "linked_startup_ramp_rate_mw_per_tmp"]
-                    )
-                    for (p, tmp, s) in sorted(
-                            mod.GEN_COMMIT_BIN_OPR_TMPS_STR_TYPES):
-                        if tmp in tmps_to_link:
-                            writer.writerow([
-                                p,
-                                tmp_linked_tmp_dict[tmp],
-                                s,
-                                max(value(
-                                    mod.GenCommitBin_Provide_Power_Startup_By_ST_MW[
-                                        p, tmp, s]),
-                                    0
-                                    ),
-                                max(value(
-                                    mod.
-                                    GenCommitBin_Startup_Ramp_Rate_By_ST_MW_Per_Tmp[
-                                        p, tmp, s]),
-                                    0
-                                    )
-                            ])
-            else:
-                pass
+        else:
+            pass
     else:
         pass
 
@@ -2514,25 +2486,16 @@ def export_linked_subproblem_inputs(
 # Database
 ###############################################################################
 
-def import_module_specific_results_to_database(
-        scenario_id, subproblem, stage, c, db, results_directory, quiet
-):
+def get_module_specific_dispatch_results(results_directory):
     """
-    :param scenario_id:
-    :param subproblem:
-    :param stage:
-    :param c:
-    :param db:
     :param results_directory:
-    :param quiet:
-    :return:
-    """
-    if not quiet:
-        print("project dispatch binary commit")
+    :return: dataframe of the module-specific dispatch results
 
-    update_dispatch_results_table(
-        db=db, c=c, results_directory=results_directory,
-        scenario_id=scenario_id, subproblem=subproblem, stage=stage,
+    Get the module-specific dispatch results, which are merged into the
+    project dispatch results before they are imported into the database.
+    """
+    return get_dispatch_results_df(
+        results_directory=results_directory,
         results_file="dispatch_binary_commit.csv"
     )
 
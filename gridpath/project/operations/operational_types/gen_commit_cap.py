@@ -48,16 +48,20 @@ startup and shutdown costs.
 from __future__ import division
 from __future__ import print_function
 
-import csv
 import os.path
 from pyomo.environ import Var, Set, Constraint, Param, NonNegativeReals, \
-    NonPositiveReals, PercentFraction, Reals, value, Expression
+    NonPositiveReals, PercentFraction, Reals, Expression
 
-from gridpath.auxiliary.auxiliary import subset_init_by_param_value
+from gridpath.auxiliary.auxiliary import subset_init_by_param_value, \
+    input_file_exists, load_input_table
 from gridpath.auxiliary.dynamic_components import headroom_variables, \
-    footroom_variables
+    footroom_variables, rolling_horizon
+from gridpath.auxiliary.results_export import \
+    get_clipped_component_values, get_component_values, \
+    get_project_timepoint_columns, write_linked_timepoint_params, \
+    write_results_table
 from gridpath.project.operations.operational_types.common_functions import \
-    determine_relevant_timepoints, update_dispatch_results_table, \
+    determine_relevant_timepoints, get_dispatch_results_df, \
     load_optype_module_specific_data, check_for_tmps_to_link, \
     validate_opchars
 from gridpath.project.common_functions import \
@@ -472,32 +476,38 @@ def add_model_components(m, d, scenario_directory, subproblem, stage):
 
     m.gen_commit_cap_linked_commit_capacity = Param(
         m.GEN_COMMIT_CAP_LINKED_TMPS,
-        within=NonNegativeReals
+        within=NonNegativeReals,
+        mutable=getattr(d, rolling_horizon)
     )
 
     m.gen_commit_cap_linked_power = Param(
         m.GEN_COMMIT_CAP_LINKED_TMPS,
-        within=NonNegativeReals
+        within=NonNegativeReals,
+        mutable=getattr(d, rolling_horizon)
     )
 
     m.gen_commit_cap_linked_upwards_reserves = Param(
         m.GEN_COMMIT_CAP_LINKED_TMPS,
-        within=NonNegativeReals
+        within=NonNegativeReals,
+        mutable=getattr(d, rolling_horizon)
     )
 
     m.gen_commit_cap_linked_downwards_reserves = Param(
         m.GEN_COMMIT_CAP_LINKED_TMPS,
-        within=NonNegativeReals
+        within=NonNegativeReals,
+        mutable=getattr(d, rolling_horizon)
     )
 
     m.gen_commit_cap_linked_startup = Param(
         m.GEN_COMMIT_CAP_LINKED_TMPS,
-        within=NonNegativeReals
+        within=NonNegativeReals,
+        mutable=getattr(d, rolling_horizon)
     )
 
     m.gen_commit_cap_linked_shutdown = Param(
         m.GEN_COMMIT_CAP_LINKED_TMPS,
-        within=NonNegativeReals
+        within=NonNegativeReals,
+        mutable=getattr(d, rolling_horizon)
     )
 
     # Variables
@@ -1407,8 +1417,9 @@ def load_module_specific_data(mod, data_portal, scenario_directory,
             scenario_directory, str(subproblem), str(stage), "inputs",
             "gen_commit_cap_linked_timepoint_params.tab"
         )
-    if os.path.exists(linked_inputs_filename):
-        data_portal.load(
+    if input_file_exists(linked_inputs_filename):
+        load_input_table(
+            data_portal=data_portal,
             filename=linked_inputs_filename,
             index=mod.GEN_COMMIT_CAP_LINKED_TMPS,
             param=(
@@ -1436,40 +1447,25 @@ def export_module_specific_results(
     :param d:
     :return:
     """
-    with open(os.path.join(scenario_directory, str(subproblem), str(stage), "results",
-                           "dispatch_capacity_commit.csv"),
-              "w", newline="") as f:
-        writer = csv.writer(f)
-        writer.writerow(["project", "period", "balancing_type_project",
-                         "horizon", "timepoint", "timepoint_weight",
-                         "number_of_hours_in_timepoint",
-                         "technology", "load_zone",
-                         "gross_power_mw",
-                         "auxiliary_consumption_mw", "net_power_mw",
-                         "committed_mw", "committed_units"
-                         ])
-
-        for (p, tmp) \
-                in mod. \
-                GEN_COMMIT_CAP_OPR_TMPS:
-            writer.writerow([
-                p,
-                mod.period[tmp],
-                mod.balancing_type_project[p],
-                mod.horizon[tmp, mod.balancing_type_project[p]],
-                tmp,
-                mod.tmp_weight[tmp],
-                mod.hrs_in_tmp[tmp],
-                mod.technology[p],
-                mod.load_zone[p],
-                value(mod.GenCommitCap_Provide_Power_MW[p, tmp]),
-                value(mod.GenCommitCap_Auxiliary_Consumption_MW[p, tmp]),
-                value(mod.GenCommitCap_Provide_Power_MW[p, tmp]) -
-                value(mod.GenCommitCap_Auxiliary_Consumption_MW[p, tmp]),
-                value(mod.Commit_Capacity_MW[p, tmp]),
-                value(mod.Commit_Capacity_MW[p, tmp]) /
-                mod.gen_commit_cap_unit_size_mw[p]
-            ])
+    index = list(mod.GEN_COMMIT_CAP_OPR_TMPS)
+    power = get_component_values(mod.GenCommitCap_Provide_Power_MW, index)
+    aux = get_component_values(
+        mod.GenCommitCap_Auxiliary_Consumption_MW, index
+    )
+    committed_mw = get_component_values(mod.Commit_Capacity_MW, index)
+    unit_size = get_component_values(mod.gen_commit_cap_unit_size_mw,
+                                     [p for (p, tmp) in index])
+    write_results_table(
+        scenario_directory, subproblem, stage, "dispatch_capacity_commit.csv",
+        get_project_timepoint_columns(mod, index) + [
+            ("gross_power_mw", power),
+            ("auxiliary_consumption_mw", aux),
+            ("net_power_mw", power - aux),
+            ("committed_mw", committed_mw),
+            ("committed_units", committed_mw / unit_size)
+        ],
+        d
+    )
 
     # If there's a linked_subproblems_map CSV file, check which of the
     # current subproblem TMPS we should export results for to link to the
@@ -1486,61 +1482,51 @@ def export_module_specific_results(
         next_subproblem = str(int(subproblem) + 1)
 
         # Export params by project and timepoint
-        with open(os.path.join(
+        index = [(p, tmp) for (p, tmp) in sorted(mod.GEN_COMMIT_CAP_OPR_TMPS)
+                 if tmp in tmps_to_link]
+        write_linked_timepoint_params(
+            file_path=os.path.join(
                 scenario_directory, next_subproblem, stage, "inputs",
                 "gen_commit_cap_linked_timepoint_params.tab"
-        ), "w", newline=""
-        ) as f:
-            writer = csv.writer(f, delimiter="\t", lineterminator="\n")
-            writer.writerow(
-                ["project", "linked_timepoint",
-                 "linked_commitment",
-                 "linked_provide_power",
-                 "linked_upward_reserves",
-                 "linked_downward_reserves",
-                 "linked_startup",
-                 "linked_shutdown"]
-            )
-            for (p, tmp) in sorted(mod.GEN_COMMIT_CAP_OPR_TMPS):
-                if tmp in tmps_to_link:
-                    writer.writerow([
-                        p,
-                        tmp_linked_tmp_dict[tmp],
-                        max(value(mod.Commit_Capacity_MW[p, tmp]), 0),
-                        max(value(mod.GenCommitCap_Provide_Power_MW[p, tmp]),
-                            0),
-                        max(value(mod.GenCommitCap_Upwards_Reserves_MW[p, tmp]
-                                  ), 0),
-                        max(value(mod.GenCommitCap_Downwards_Reserves_MW[
-                                      p, tmp]), 0),
-                        max(value(mod.GenCommitCap_Startup_MW[p, tmp]), 0),
-                        max(value(mod.GenCommitCap_Shutdown_MW[p, tmp]), 0)
-                    ])
+            ),
+            index=index,
+            tmp_linked_tmp_dict=tmp_linked_tmp_dict,
+            columns=[
+                ("linked_commitment",
+                 get_clipped_component_values(
+                     mod.Commit_Capacity_MW, index)),
+                ("linked_provide_power",
+                 get_clipped_component_values(
+                     mod.GenCommitCap_Provide_Power_MW, index)),
+                ("linked_upward_reserves",
+                 get_clipped_component_values(
+                     mod.GenCommitCap_Upwards_Reserves_MW, index)),
+                ("linked_downward_reserves",
+                 get_clipped_component_values(
+                     mod.GenCommitCap_Downwards_Reserves_MW, index)),
+                ("linked_startup",
+                 get_clipped_component_values(
+                     mod.GenCommitCap_Startup_MW, index)),
+                ("linked_shutdown",
+                 get_clipped_component_values(
+                     mod.GenCommitCap_Shutdown_MW, index))
+            ]
+        )
 
 
 # Database
 ###############################################################################
 
-def import_module_specific_results_to_database(
-        scenario_id, subproblem, stage, c, db, results_directory, quiet
-):
+def get_module_specific_dispatch_results(results_directory):
     """
-
-    :param scenario_id:
-    :param subproblem:
-    :param stage:
-    :param c: 
-    :param db: 
     :param results_directory:
-    :param quiet:
-    :return: 
-    """
-    if not quiet:
-        print("project dispatch capacity commit")
+    :return: dataframe of the module-specific dispatch results
 
-    update_dispatch_results_table(
-        db=db, c=c, results_directory=results_directory,
-        scenario_id=scenario_id, subproblem=subproblem, stage=stage,
+    Get the module-specific dispatch results, which are merged into the
+    project dispatch results before they are imported into the database.
+    """
+    return get_dispatch_results_df(
+        results_directory=results_directory,
         results_file="dispatch_capacity_commit.csv"
     )
 
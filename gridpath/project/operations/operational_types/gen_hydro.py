@@ -26,20 +26,24 @@ Costs for this operational type include variable O&M costs.
 
 from __future__ import print_function
 
-import csv
 import os.path
 from pyomo.environ import Var, Set, Param, Constraint, \
-    Expression, NonNegativeReals, PercentFraction, value
+    Expression, NonNegativeReals, PercentFraction
 
 from db.common_functions import spin_on_database_lock
-from gridpath.auxiliary.auxiliary import subset_init_by_param_value
+from gridpath.auxiliary.auxiliary import subset_init_by_param_value, \
+    input_file_exists, load_input_table
 from gridpath.auxiliary.dynamic_components import headroom_variables, \
-    footroom_variables
+    footroom_variables, rolling_horizon
+from gridpath.auxiliary.results_export import \
+    get_clipped_component_values, get_component_values, \
+    get_project_timepoint_columns, write_linked_timepoint_params, \
+    write_results_table
 from gridpath.project.common_functions import \
     check_if_boundary_type_and_first_timepoint, check_if_first_timepoint, \
     check_boundary_type
 from gridpath.project.operations.operational_types.common_functions import \
-    update_dispatch_results_table, load_optype_module_specific_data, \
+    get_dispatch_results_df, load_optype_module_specific_data, \
     load_hydro_opchars, get_hydro_inputs_from_database, \
     write_tab_file_model_inputs, check_for_tmps_to_link, validate_opchars, \
     validate_hydro_opchars
@@ -240,17 +244,20 @@ def add_model_components(m, d, scenario_directory, subproblem, stage):
 
     m.gen_hydro_max_power_fraction = Param(
         m.GEN_HYDRO_OPR_HRZS,
-        within=PercentFraction
+        within=PercentFraction,
+        mutable=getattr(d, rolling_horizon)
     )
 
     m.gen_hydro_min_power_fraction = Param(
         m.GEN_HYDRO_OPR_HRZS,
-        within=PercentFraction
+        within=PercentFraction,
+        mutable=getattr(d, rolling_horizon)
     )
 
     m.gen_hydro_average_power_fraction = Param(
         m.GEN_HYDRO_OPR_HRZS,
-        within=PercentFraction
+        within=PercentFraction,
+        mutable=getattr(d, rolling_horizon)
     )
 
     # Optional Params
@@ -271,22 +278,26 @@ def add_model_components(m, d, scenario_directory, subproblem, stage):
 
     m.gen_hydro_linked_power = Param(
         m.GEN_HYDRO_LINKED_TMPS,
-        within=NonNegativeReals
+        within=NonNegativeReals,
+        mutable=getattr(d, rolling_horizon)
     )
 
     m.gen_hydro_linked_curtailment = Param(
         m.GEN_HYDRO_LINKED_TMPS,
-        within=NonNegativeReals
+        within=NonNegativeReals,
+        mutable=getattr(d, rolling_horizon)
     )
 
     m.gen_hydro_linked_upwards_reserves = Param(
         m.GEN_HYDRO_LINKED_TMPS,
-        within=NonNegativeReals
+        within=NonNegativeReals,
+        mutable=getattr(d, rolling_horizon)
     )
 
     m.gen_hydro_linked_downwards_reserves = Param(
         m.GEN_HYDRO_LINKED_TMPS,
-        within=NonNegativeReals
+        within=NonNegativeReals,
+        mutable=getattr(d, rolling_horizon)
     )
 
     # Variables
@@ -669,8 +680,9 @@ def load_module_specific_data(m, data_portal,
             scenario_directory, str(subproblem), str(stage), "inputs",
             "gen_hydro_linked_timepoint_params.tab"
         )
-    if os.path.exists(linked_inputs_filename):
-        data_portal.load(
+    if input_file_exists(linked_inputs_filename):
+        load_input_table(
+            data_portal=data_portal,
             filename=linked_inputs_filename,
             index=m.GEN_HYDRO_LINKED_TMPS,
             param=(
@@ -695,31 +707,17 @@ def export_module_specific_results(mod, d,
     :param d:
     :return:
     """
-    with open(os.path.join(scenario_directory, str(subproblem), str(stage), "results",
-                           "dispatch_gen_hydro.csv"),
-              "w", newline="") as f:
-        writer = csv.writer(f)
-        writer.writerow(["project", "period", "balancing_type_project",
-                         "horizon", "timepoint", "timepoint_weight",
-                         "number_of_hours_in_timepoint",
-                         "technology", "load_zone",
-                         "power_mw", "scheduled_curtailment_mw"
-                         ])
-
-        for (p, tmp) in mod.GEN_HYDRO_OPR_TMPS:
-            writer.writerow([
-                p,
-                mod.period[tmp],
-                mod.balancing_type_project[p],
-                mod.horizon[tmp, mod.balancing_type_project[p]],
-                tmp,
-                mod.tmp_weight[tmp],
-                mod.hrs_in_tmp[tmp],
-                mod.technology[p],
-                mod.load_zone[p],
-                value(mod.GenHydro_Provide_Power_MW[p, tmp]),
-                value(mod.GenHydro_Curtail_MW[p, tmp])
-            ])
+    index = list(mod.GEN_HYDRO_OPR_TMPS)
+    write_results_table(
+        scenario_directory, subproblem, stage, "dispatch_gen_hydro.csv",
+        get_project_timepoint_columns(mod, index) + [
+            ("power_mw",
+             get_component_values(mod.GenHydro_Provide_Power_MW, index)),
+            ("scheduled_curtailment_mw",
+             get_component_values(mod.GenHydro_Curtail_MW, index))
+        ],
+        d
+    )
 
     # If there's a linked_subproblems_map CSV file, check which of the
     # current subproblem TMPS we should export results for to link to the
@@ -736,31 +734,30 @@ def export_module_specific_results(mod, d,
         next_subproblem = str(int(subproblem) + 1)
 
         # Export params by project and timepoint
-        with open(os.path.join(
+        index = [(p, tmp) for (p, tmp) in sorted(mod.GEN_HYDRO_OPR_TMPS)
+                 if tmp in tmps_to_link]
+        write_linked_timepoint_params(
+            file_path=os.path.join(
                 scenario_directory, next_subproblem, stage, "inputs",
                 "gen_hydro_linked_timepoint_params.tab"
-        ), "w", newline=""
-        ) as f:
-            writer = csv.writer(f, delimiter="\t", lineterminator="\n")
-            writer.writerow(
-                ["project", "linked_timepoint",
-                 "linked_provide_power",
-                 "linked_provide_curtailment",
-                 "linked_upward_reserves",
-                 "linked_downward_reserves"]
-            )
-            for (p, tmp) in sorted(mod.GEN_HYDRO_OPR_TMPS):
-                if tmp in tmps_to_link:
-                    writer.writerow([
-                        p,
-                        tmp_linked_tmp_dict[tmp],
-                        max(value(mod.GenHydro_Provide_Power_MW[p, tmp]), 0),
-                        max(value(mod.GenHydro_Curtail_MW[p, tmp]), 0),
-                        max(value(mod.GenHydro_Upwards_Reserves_MW[p, tmp]),
-                            0),
-                        max(value(mod.GenHydro_Downwards_Reserves_MW[p, tmp]),
-                            0)
-                    ])
+            ),
+            index=index,
+            tmp_linked_tmp_dict=tmp_linked_tmp_dict,
+            columns=[
+                ("linked_provide_power",
+                 get_clipped_component_values(
+                     mod.GenHydro_Provide_Power_MW, index)),
+                ("linked_provide_curtailment",
+                 get_clipped_component_values(
+                     mod.GenHydro_Curtail_MW, index)),
+                ("linked_upward_reserves",
+                 get_clipped_component_values(
+                     mod.GenHydro_Upwards_Reserves_MW, index)),
+                ("linked_downward_reserves",
+                 get_clipped_component_values(
+                     mod.GenHydro_Downwards_Reserves_MW, index))
+            ]
+        )
 
 
 # Database
@@ -805,26 +802,16 @@ def write_module_specific_model_inputs(
     )
 
 
-def import_module_specific_results_to_database(
-        scenario_id, subproblem, stage, c, db, results_directory, quiet
-):
+def get_module_specific_dispatch_results(results_directory):
     """
-
-    :param scenario_id:
-    :param subproblem:
-    :param stage:
-    :param c: 
-    :param db: 
     :param results_directory:
-    :param quiet:
-    :return: 
-    """
-    if not quiet:
-        print("project dispatch hydro curtailable")
+    :return: dataframe of the module-specific dispatch results
 
-    update_dispatch_results_table(
-        db=db, c=c, results_directory=results_directory,
-        scenario_id=scenario_id, subproblem=subproblem, stage=stage,
+    Get the module-specific dispatch results, which are merged into the
+    project dispatch results before they are imported into the database.
+    """
+    return get_dispatch_results_df(
+        results_directory=results_directory,
         results_file="dispatch_gen_hydro.csv"
     )
 
@@ -22,14 +22,16 @@ output is must-take, i.e. curtailment is not allowed.
 from __future__ import print_function
 
 from builtins import str
-import csv
 import os.path
 from pyomo.environ import Var, Set, Param, Constraint, \
-    Expression, NonNegativeReals, PercentFraction, value
+    Expression, NonNegativeReals, PercentFraction
 
-from gridpath.auxiliary.auxiliary import subset_init_by_param_value
+from gridpath.auxiliary.auxiliary import subset_init_by_param_value, \
+    input_file_exists, load_input_table
 from gridpath.auxiliary.dynamic_components import headroom_variables, \
-    footroom_variables
+    footroom_variables, rolling_horizon
+from gridpath.auxiliary.results_export import \
+    get_clipped_component_values, write_linked_timepoint_params
 from gridpath.project.common_functions import \
     check_if_boundary_type_and_first_timepoint, check_if_first_timepoint, \
     check_boundary_type
@@ -224,17 +226,20 @@ def add_model_components(m, d, scenario_directory, subproblem, stage):
 
     m.gen_hydro_must_take_max_power_fraction = Param(
         m.GEN_HYDRO_MUST_TAKE_OPR_HRZS,
-        within=PercentFraction
+        within=PercentFraction,
+        mutable=getattr(d, rolling_horizon)
     )
 
     m.gen_hydro_must_take_min_power_fraction = Param(
         m.GEN_HYDRO_MUST_TAKE_OPR_HRZS,
-        within=PercentFraction
+        within=PercentFraction,
+        mutable=getattr(d, rolling_horizon)
     )
 
     m.gen_hydro_must_take_average_power_fraction = Param(
         m.GEN_HYDRO_MUST_TAKE_OPR_HRZS,
-        within=PercentFraction
+        within=PercentFraction,
+        mutable=getattr(d, rolling_horizon)
     )
 
     # Optional Params
@@ -255,17 +260,20 @@ def add_model_components(m, d, scenario_directory, subproblem, stage):
 
     m.gen_hydro_must_take_linked_power = Param(
         m.GEN_HYDRO_MUST_TAKE_LINKED_TMPS,
-        within=NonNegativeReals
+        within=NonNegativeReals,
+        mutable=getattr(d, rolling_horizon)
     )
 
     m.gen_hydro_must_take_linked_upwards_reserves = Param(
         m.GEN_HYDRO_MUST_TAKE_LINKED_TMPS,
-        within=NonNegativeReals
+        within=NonNegativeReals,
+        mutable=getattr(d, rolling_horizon)
     )
 
     m.gen_hydro_must_take_linked_downwards_reserves = Param(
         m.GEN_HYDRO_MUST_TAKE_LINKED_TMPS,
-        within=NonNegativeReals
+        within=NonNegativeReals,
+        mutable=getattr(d, rolling_horizon)
     )
 
     # Variables
@@ -598,8 +606,9 @@ def load_module_specific_data(m, data_portal,
             scenario_directory, str(subproblem), str(stage), "inputs",
             "gen_hydro_must_take_linked_timepoint_params.tab"
         )
-    if os.path.exists(linked_inputs_filename):
-        data_portal.load(
+    if input_file_exists(linked_inputs_filename):
+        load_input_table(
+            data_portal=data_portal,
             filename=linked_inputs_filename,
             index=m.GEN_HYDRO_MUST_TAKE_LINKED_TMPS,
             param=(
@@ -640,36 +649,28 @@ def export_module_specific_results(
         next_subproblem = str(int(subproblem) + 1)
 
         # Export params by project and timepoint
-        with open(os.path.join(
+        index = [(p, tmp) for (p, tmp)
+                 in sorted(mod.GEN_HYDRO_MUST_TAKE_OPR_TMPS)
+                 if tmp in tmps_to_link]
+        write_linked_timepoint_params(
+            file_path=os.path.join(
                 scenario_directory, next_subproblem, stage, "inputs",
                 "gen_hydro_must_take_linked_timepoint_params.tab"
-        ), "w", newline=""
-        ) as f:
-            writer = csv.writer(f, delimiter="\t", lineterminator="\n")
-            writer.writerow(
-                ["project", "linked_timepoint",
-                 "linked_provide_power",
-                 "linked_upward_reserves",
-                 "linked_downward_reserves"]
-            )
-            for (p, tmp) in sorted(mod.GEN_HYDRO_MUST_TAKE_OPR_TMPS):
-                if tmp in tmps_to_link:
-                    writer.writerow([
-                        p,
-                        tmp_linked_tmp_dict[tmp],
-                        max(value(mod.GenHydroMustTake_Provide_Power_MW_[
-                                      p, tmp]),
-                            0
-                            ),
-                        max(value(mod.GenHydroMustTake_Upwards_Reserves_MW[
-                                      p, tmp]),
-                            0
-                            ),
-                        max(value(mod.GenHydroMustTake_Downwards_Reserves_MW[
-                                      p, tmp]),
-                            0
-                            )
-                    ])
+            ),
+            index=index,
+            tmp_linked_tmp_dict=tmp_linked_tmp_dict,
+            columns=[
+                ("linked_provide_power",
+                 get_clipped_component_values(
+                     mod.GenHydroMustTake_Provide_Power_MW_, index)),
+                ("linked_upward_reserves",
+                 get_clipped_component_values(
+                     mod.GenHydroMustTake_Upwards_Reserves_MW, index)),
+                ("linked_downward_reserves",
+                 get_clipped_component_values(
+                     mod.GenHydroMustTake_Downwards_Reserves_MW, index))
+            ]
+        )
 
 # Database
 ###############################################################################
@@ -27,16 +27,18 @@ startup and shutdown costs.
 
 """
 
-import csv
 import os
 from pyomo.environ import Set, Var, Constraint, NonNegativeReals, Param, \
-    PercentFraction, Expression, value
+    PercentFraction, Expression
 
-from gridpath.auxiliary.auxiliary import subset_init_by_param_value, cursor_to_df
+from gridpath.auxiliary.auxiliary import subset_init_by_param_value, \
+    cursor_to_df, input_file_exists, load_input_table
 from gridpath.auxiliary.validations import write_validation_to_database, \
     validate_single_input
 from gridpath.auxiliary.dynamic_components import headroom_variables, \
-    footroom_variables
+    footroom_variables, rolling_horizon
+from gridpath.auxiliary.results_export import \
+    get_clipped_component_values, write_linked_timepoint_params
 from gridpath.project.common_functions import \
     check_if_boundary_type_and_first_timepoint, check_if_first_timepoint, \
     check_boundary_type
@@ -197,17 +199,20 @@ def add_model_components(m, d, scenario_directory, subproblem, stage):
 
     m.gen_simple_linked_power = Param(
         m.GEN_SIMPLE_LINKED_TMPS,
-        within=NonNegativeReals
+        within=NonNegativeReals,
+        mutable=getattr(d, rolling_horizon)
     )
 
     m.gen_simple_linked_upwards_reserves = Param(
         m.GEN_SIMPLE_LINKED_TMPS,
-        within=NonNegativeReals
+        within=NonNegativeReals,
+        mutable=getattr(d, rolling_horizon)
     )
 
     m.gen_simple_linked_downwards_reserves = Param(
         m.GEN_SIMPLE_LINKED_TMPS,
-        within=NonNegativeReals
+        within=NonNegativeReals,
+        mutable=getattr(d, rolling_horizon)
     )
 
     # Variables
@@ -483,8 +488,9 @@ def load_module_specific_data(mod, data_portal,
             scenario_directory, str(subproblem), str(stage), "inputs",
             "gen_simple_linked_timepoint_params.tab"
         )
-    if os.path.exists(linked_inputs_filename):
-        data_portal.load(
+    if input_file_exists(linked_inputs_filename):
+        load_input_table(
+            data_portal=data_portal,
             filename=linked_inputs_filename,
             index=mod.GEN_SIMPLE_LINKED_TMPS,
             param=(
@@ -523,31 +529,27 @@ def export_module_specific_results(
         next_subproblem = str(int(subproblem) + 1)
 
         # Export params by project and timepoint
-        with open(os.path.join(
+        index = [(p, tmp) for (p, tmp) in sorted(mod.GEN_SIMPLE_OPR_TMPS)
+                 if tmp in tmps_to_link]
+        write_linked_timepoint_params(
+            file_path=os.path.join(
                 scenario_directory, next_subproblem, stage, "inputs",
                 "gen_simple_linked_timepoint_params.tab"
-        ), "w", newline=""
-        ) as f:
-            writer = csv.writer(f, delimiter="\t", lineterminator="\n")
-            writer.writerow(
-                ["project", "linked_timepoint",
-                 "linked_provide_power",
-                 "linked_upward_reserves",
-                 "linked_downward_reserves"]
-            )
-            for (p, tmp) in sorted(mod.GEN_SIMPLE_OPR_TMPS):
-                if tmp in tmps_to_link:
-                    writer.writerow([
-                        p,
-                        tmp_linked_tmp_dict[tmp],
-                        max(value(mod.GenSimple_Provide_Power_MW[p, tmp]), 0),
-                        max(value(mod.GenSimple_Upwards_Reserves_MW[p,tmp]),
-                            0
-                            ),
-                        max(value(mod.GenSimple_Downwards_Reserves_MW[p, tmp]),
-                            0
-                            )
-                    ])
+            ),
+            index=index,
+            tmp_linked_tmp_dict=tmp_linked_tmp_dict,
+            columns=[
+                ("linked_provide_power",
+                 get_clipped_component_values(
+                     mod.GenSimple_Provide_Power_MW, index)),
+                ("linked_upward_reserves",
+                 get_clipped_component_values(
+                     mod.GenSimple_Upwards_Reserves_MW, index)),
+                ("linked_downward_reserves",
+                 get_clipped_component_values(
+                     mod.GenSimple_Downwards_Reserves_MW, index))
+            ]
+        )
 
 
 # Validation
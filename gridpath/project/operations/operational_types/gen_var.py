@@ -27,22 +27,24 @@ from __future__ import division
 from __future__ import print_function
 
 
-import csv
 import os.path
 from pyomo.environ import Param, Set, Var, Constraint, NonNegativeReals, \
-    Expression, value
+    Expression
 
 from db.common_functions import spin_on_database_lock
 from gridpath.auxiliary.auxiliary import subset_init_by_param_value
 from gridpath.auxiliary.dynamic_components import \
-    footroom_variables, headroom_variables, reserve_variable_derate_params
+    footroom_variables, headroom_variables, reserve_variable_derate_params, \
+    rolling_horizon
+from gridpath.auxiliary.results_export import get_component_values, \
+    get_project_timepoint_columns, write_results_table
 from gridpath.project.operations.reserves.subhourly_energy_adjustment import \
     footroom_subhourly_energy_adjustment_rule, \
     headroom_subhourly_energy_adjustment_rule
 from gridpath.project.common_functions import \
     check_if_first_timepoint, check_boundary_type
 from gridpath.project.operations.operational_types.common_functions import \
-    update_dispatch_results_table, load_var_profile_inputs, \
+    get_dispatch_results_df, load_var_profile_inputs, \
     get_var_profile_inputs_from_database, write_tab_file_model_inputs, \
     validate_opchars, validate_var_profiles, load_optype_module_specific_data
 
@@ -163,7 +165,8 @@ def add_model_components(m, d, scenario_directory, subproblem, stage):
     # TODO: allow cap factors greater than 1, but throw a warning?
     m.gen_var_cap_factor = Param(
         m.GEN_VAR_OPR_TMPS,
-        within=NonNegativeReals
+        within=NonNegativeReals,
+        mutable=getattr(d, rolling_horizon)
     )
 
     # Variables
@@ -460,36 +463,26 @@ def export_module_specific_results(mod, d,
     :param d:
     :return:
     """
-    with open(os.path.join(scenario_directory, str(subproblem), str(stage), "results",
-                           "dispatch_variable.csv"), "w", newline="") as f:
-        writer = csv.writer(f)
-        writer.writerow(["project", "period", "balancing_type_project",
-                         "horizon", "timepoint", "timepoint_weight",
-                         "number_of_hours_in_timepoint",
-                         "technology", "load_zone",
-                         "power_mw", "scheduled_curtailment_mw",
-                         "subhourly_curtailment_mw",
-                         "subhourly_energy_delivered_mw",
-                         "total_curtailment_mw"
-                         ])
-
-        for (p, tmp) in mod.GEN_VAR_OPR_TMPS:
-            writer.writerow([
-                p,
-                mod.period[tmp],
-                mod.balancing_type_project[p],
-                mod.horizon[tmp, mod.balancing_type_project[p]],
-                tmp,
-                mod.tmp_weight[tmp],
-                mod.hrs_in_tmp[tmp],
-                mod.technology[p],
-                mod.load_zone[p],
-                value(mod.GenVar_Provide_Power_MW[p, tmp]),
-                value(mod.GenVar_Scheduled_Curtailment_MW[p, tmp]),
-                value(mod.GenVar_Subhourly_Curtailment_MW[p, tmp]),
-                value(mod.GenVar_Subhourly_Energy_Delivered_MW[p, tmp]),
-                value(mod.GenVar_Total_Curtailment_MW[p, tmp])
-            ])
+    index = list(mod.GEN_VAR_OPR_TMPS)
+    write_results_table(
+        scenario_directory, subproblem, stage, "dispatch_variable.csv",
+        get_project_timepoint_columns(mod, index) + [
+            ("power_mw",
+             get_component_values(mod.GenVar_Provide_Power_MW, index)),
+            ("scheduled_curtailment_mw",
+             get_component_values(mod.GenVar_Scheduled_Curtailment_MW,
+                                  index)),
+            ("subhourly_curtailment_mw",
+             get_component_values(mod.GenVar_Subhourly_Curtailment_MW,
+                                  index)),
+            ("subhourly_energy_delivered_mw",
+             get_component_values(mod.GenVar_Subhourly_Energy_Delivered_MW,
+                                  index)),
+            ("total_curtailment_mw",
+             get_component_values(mod.GenVar_Total_Curtailment_MW, index))
+        ],
+        d
+    )
 
 
 # Database
@@ -534,26 +527,16 @@ def write_module_specific_model_inputs(
     )
 
 
-def import_module_specific_results_to_database(
-        scenario_id, subproblem, stage, c, db, results_directory, quiet
-):
+def get_module_specific_dispatch_results(results_directory):
     """
-    
-    :param scenario_id:
-    :param subproblem:
-    :param stage:
-    :param c: 
-    :param db: 
     :param results_directory:
-    :param quiet:
-    :return: 
-    """
-    if not quiet:
-        print("project dispatch variable")
+    :return: dataframe of the module-specific dispatch results
 
-    update_dispatch_results_table(
-        db=db, c=c, results_directory=results_directory,
-        scenario_id=scenario_id, subproblem=subproblem, stage=stage,
+    Get the module-specific dispatch results, which are merged into the
+    project dispatch results before they are imported into the database.
+    """
+    return get_dispatch_results_df(
+        results_directory=results_directory,
         results_file="dispatch_variable.csv"
     )
 
@@ -26,7 +26,7 @@ from gridpath.auxiliary.auxiliary import subset_init_by_param_value
 from gridpath.auxiliary.validations import write_validation_to_database, \
     get_projects_by_reserve, validate_idxs
 from gridpath.auxiliary.dynamic_components import headroom_variables, \
-    footroom_variables
+    footroom_variables, rolling_horizon
 from gridpath.project.common_functions import \
     check_if_first_timepoint, check_boundary_type
 from gridpath.project.operations.operational_types.common_functions import \
@@ -108,7 +108,8 @@ def add_model_components(m, d, scenario_directory, subproblem, stage):
     # TODO: allow cap factors greater than 1, but throw a warning?
     m.gen_var_must_take_cap_factor = Param(
         m.GEN_VAR_MUST_TAKE_OPR_TMPS,
-        within=NonNegativeReals
+        within=NonNegativeReals,
+        mutable=getattr(d, rolling_horizon)
     )
 
     # Constraints
@@ -33,14 +33,18 @@ Costs for this operational type include variable O&M costs.
 
 from __future__ import division
 
-import csv
 import os.path
 from pyomo.environ import Var, Set, Constraint, Param, Expression, \
-    NonNegativeReals, PercentFraction, value
+    NonNegativeReals, PercentFraction
 
-from gridpath.auxiliary.auxiliary import subset_init_by_param_value
+from gridpath.auxiliary.auxiliary import subset_init_by_param_value, \
+    input_file_exists, load_input_table
 from gridpath.auxiliary.dynamic_components import headroom_variables, \
-    footroom_variables
+    footroom_variables, rolling_horizon
+from gridpath.auxiliary.results_export import \
+    get_clipped_component_values, get_component_values, \
+    get_project_timepoint_columns, write_linked_timepoint_params, \
+    write_results_table
 from gridpath.project.common_functions import \
     check_if_first_timepoint, check_boundary_type
 from gridpath.project.operations.operational_types.common_functions import \
@@ -278,17 +282,20 @@ def add_model_components(m, d, scenario_directory, subproblem, stage):
 
     m.stor_linked_starting_energy_in_storage = Param(
         m.STOR_LINKED_TMPS,
-        within=NonNegativeReals
+        within=NonNegativeReals,
+        mutable=getattr(d, rolling_horizon)
     )
 
     m.stor_linked_discharge = Param(
         m.STOR_LINKED_TMPS,
-        within=NonNegativeReals
+        within=NonNegativeReals,
+        mutable=getattr(d, rolling_horizon)
     )
 
     m.stor_linked_charge = Param(
         m.STOR_LINKED_TMPS,
-        within=NonNegativeReals
+        within=NonNegativeReals,
+        mutable=getattr(d, rolling_horizon)
     )
 
     # Variables
@@ -660,8 +667,9 @@ def load_module_specific_data(mod, data_portal,
             scenario_directory, str(subproblem), str(stage), "inputs",
             "stor_linked_timepoint_params.tab"
         )
-    if os.path.exists(linked_inputs_filename):
-        data_portal.load(
+    if input_file_exists(linked_inputs_filename):
+        load_input_table(
+            data_portal=data_portal,
             filename=linked_inputs_filename,
             index=mod.STOR_LINKED_TMPS,
             param=(
@@ -685,30 +693,19 @@ def export_module_specific_results(mod, d,
     :param d:
     :return:
     """
-    with open(os.path.join(scenario_directory, str(subproblem), str(stage), "results",
-                           "dispatch_stor.csv"), "w", newline="") as f:
-        writer = csv.writer(f)
-        writer.writerow(["project", "period", "balancing_type_project",
-                         "horizon", "timepoint", "timepoint_weight",
-                         "number_of_hours_in_timepoint",
-                         "technology", "load_zone",
-                         "starting_energy_mwh",
-                         "charge_mw", "discharge_mw"])
-        for (p, tmp) in mod.STOR_OPR_TMPS:
-            writer.writerow([
-                p,
-                mod.period[tmp],
-                mod.balancing_type_project[p],
-                mod.horizon[tmp, mod.balancing_type_project[p]],
-                tmp,
-                mod.tmp_weight[tmp],
-                mod.hrs_in_tmp[tmp],
-                mod.technology[p],
-                mod.load_zone[p],
-                value(mod.Stor_Starting_Energy_in_Storage_MWh[p, tmp]),
-                value(mod.Stor_Charge_MW[p, tmp]),
-                value(mod.Stor_Discharge_MW[p, tmp])
-            ])
+    index = list(mod.STOR_OPR_TMPS)
+    write_results_table(
+        scenario_directory, subproblem, stage, "dispatch_stor.csv",
+        get_project_timepoint_columns(mod, index) + [
+            ("starting_energy_mwh",
+             get_component_values(mod.Stor_Starting_Energy_in_Storage_MWh,
+                                  index)),
+            ("charge_mw", get_component_values(mod.Stor_Charge_MW, index)),
+            ("discharge_mw",
+             get_component_values(mod.Stor_Discharge_MW, index))
+        ],
+        d
+    )
 
     # If there's a linked_subproblems_map CSV file, check which of the
     # current subproblem TMPS we should export results for to link to the
@@ -725,30 +722,27 @@ def export_module_specific_results(mod, d,
         next_subproblem = str(int(subproblem) + 1)
 
         # Export params by project and timepoint
-        with open(os.path.join(
+        index = [(p, tmp) for (p, tmp) in sorted(mod.STOR_OPR_TMPS)
+                 if tmp in tmps_to_link]
+        write_linked_timepoint_params(
+            file_path=os.path.join(
                 scenario_directory, next_subproblem, stage, "inputs",
                 "stor_linked_timepoint_params.tab"
-        ), "w", newline=""
-        ) as f:
-            writer = csv.writer(f, delimiter="\t", lineterminator="\n")
-            writer.writerow(
-                ["project", "linked_timepoint",
-                 "linked_starting_energy_in_storage",
-                 "linked_discharge",
-                 "linked_charge"]
-            )
-            for (p, tmp) in sorted(mod.STOR_OPR_TMPS):
-                if tmp in tmps_to_link:
-                    writer.writerow([
-                        p,
-                        tmp_linked_tmp_dict[tmp],
-                        max(value(mod.Stor_Starting_Energy_in_Storage_MWh[
-                                      p, tmp]),
-                            0
-                            ),
-                        max(value(mod.Stor_Discharge_MW[p, tmp]), 0),
-                        max(value(mod.Stor_Charge_MW[p, tmp]), 0)
-                    ])
+            ),
+            index=index,
+            tmp_linked_tmp_dict=tmp_linked_tmp_dict,
+            columns=[
+                ("linked_starting_energy_in_storage",
+                 get_clipped_component_values(
+                     mod.Stor_Starting_Energy_in_Storage_MWh, index)),
+                ("linked_discharge",
+                 get_clipped_component_values(
+                     mod.Stor_Discharge_MW, index)),
+                ("linked_charge",
+                 get_clipped_component_values(
+                     mod.Stor_Charge_MW, index))
+            ]
+        )
 
 
 def validate_module_specific_inputs(scenario_id, subscenarios, subproblem, stage, conn):
@@ -22,7 +22,7 @@ from pyomo.environ import Param, Set, Expression, value
 
 from db.common_functions import spin_on_database_lock
 from gridpath.auxiliary.auxiliary import \
-    get_required_subtype_modules_from_projects_file, cursor_to_df
+    get_required_subtype_modules, cursor_to_df
 from gridpath.auxiliary.db_interface import update_prj_zone_column, \
     determine_table_subset_by_start_and_column
 from gridpath.project.operations.common_functions import \
@@ -106,9 +106,10 @@ def add_model_components(m, d, scenario_directory, subproblem, stage):
     # Dynamic Inputs
     ###########################################################################
 
-    required_operational_modules = get_required_subtype_modules_from_projects_file(
-        scenario_directory=scenario_directory, subproblem=subproblem,
-        stage=stage, which_type="operational_type"
+    required_operational_modules = get_required_subtype_modules(
+        d=d, scenario_directory=scenario_directory,
+        subproblem=subproblem, stage=stage,
+        which_type="operational_type"
     )
 
     imported_operational_modules = load_operational_type_modules(
@@ -20,7 +20,8 @@ import os.path
 import pandas as pd
 from pyomo.environ import Param, PercentFraction, Constraint
 
-from gridpath.auxiliary.auxiliary import get_required_subtype_modules_from_projects_file
+from gridpath.auxiliary.auxiliary import \
+    get_required_subtype_modules, get_input_table_header
 from gridpath.project.operations.common_functions import \
     load_operational_type_modules
 import gridpath.project.operations.operational_types as op_type
@@ -62,9 +63,10 @@ def generic_add_model_components(
             )
 
     # Import needed operational modules
-    required_operational_modules = get_required_subtype_modules_from_projects_file(
-        scenario_directory=scenario_directory, subproblem=subproblem,
-        stage=stage, which_type="operational_type"
+    required_operational_modules = get_required_subtype_modules(
+        d=d, scenario_directory=scenario_directory,
+        subproblem=subproblem, stage=stage,
+        which_type="operational_type"
     )
 
     imported_operational_modules = load_operational_type_modules(
@@ -122,11 +124,10 @@ def generic_load_model_data(
 
     columns_to_import = ("project",)
     params_to_import = ()
-    projects_file_header = pd.read_csv(
+    projects_file_header = get_input_table_header(
         os.path.join(scenario_directory, str(subproblem), str(stage), "inputs",
-                     "projects.tab"),
-        sep="\t", header=None, nrows=1
-    ).values[0]
+                     "projects.tab")
+    )
 
     # Import reserve provision ramp rate limit parameter only if
     # column is present
@@ -25,7 +25,7 @@ from db.common_functions import spin_on_database_lock
 from gridpath.auxiliary.validations import write_validation_to_database, \
     validate_idxs
 from gridpath.auxiliary.auxiliary import check_list_items_are_unique, \
-    find_list_item_position, cursor_to_df
+    find_list_item_position, cursor_to_df, get_input_table_header
 from gridpath.auxiliary.db_interface import setup_results_import
 from gridpath.auxiliary.dynamic_components import \
     reserve_variable_derate_params, \
@@ -276,11 +276,10 @@ def generic_load_model_data(
 
     columns_to_import = ("project", ba_column_name,)
     params_to_import = (getattr(m, reserve_balancing_area_param),)
-    projects_file_header = pd.read_csv(
+    projects_file_header = get_input_table_header(
         os.path.join(scenario_directory, str(subproblem), str(stage), "inputs",
-                     "projects.tab"),
-        sep="\t", header=None, nrows=1
-    ).values[0]
+                     "projects.tab")
+    )
 
     # Import reserve provision headroom/footroom de-rate parameter only if
     # column is present
@@ -305,11 +304,10 @@ def generic_load_model_data(
     # Load reserve provision subhourly energy adjustment (e.g. for storage
     # state of charge adjustment or delivered variable RPS energy adjustment)
     # if specified; otherwise it will default to 0
-    ba_file_header = pd.read_csv(
+    ba_file_header = get_input_table_header(
         os.path.join(scenario_directory, str(subproblem), str(stage), "inputs",
-                     reserve_balancing_areas_input_file),
-        sep="\t", header=None, nrows=1
-    ).values[0]
+                     reserve_balancing_areas_input_file)
+    )
 
     if "reserve_to_energy_adjustment" in ba_file_header:
         data_portal.load(
@@ -17,7 +17,7 @@ import os.path
 import pandas as pd
 from pyomo.environ import Set, Expression, Param
 
-from gridpath.auxiliary.auxiliary import join_sets
+from gridpath.auxiliary.auxiliary import get_input_table, join_sets
 from gridpath.project.reliability.prm.common_functions import \
     load_prm_type_modules
 from gridpath.auxiliary.dynamic_components import prm_cost_group_sets, \
@@ -55,11 +55,10 @@ def add_model_components(m, d, scenario_directory, subproblem, stage):
     )
 
     # Import all possible PRM modules
-    project_df = pd.read_csv(
+    project_df = get_input_table(
         os.path.join(scenario_directory, str(subproblem), str(stage),
                      "inputs", "projects.tab"),
-        sep="\t",
-        usecols=["project", "prm_type"]
+        columns=["project", "prm_type"]
     )
     required_prm_modules = [
         prm_type for prm_type in project_df.prm_type.unique() if
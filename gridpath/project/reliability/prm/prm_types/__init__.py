@@ -20,6 +20,7 @@ import os.path
 import pandas as pd
 from pyomo.environ import Expression
 
+from gridpath.auxiliary.auxiliary import get_input_table
 from gridpath.project.reliability.prm.common_functions import \
     load_prm_type_modules
 
@@ -34,11 +35,10 @@ def add_model_components(m, d, scenario_directory, subproblem, stage):
     :return:
     """
     # Import needed PRM modules
-    project_df = pd.read_csv(
+    project_df = get_input_table(
         os.path.join(scenario_directory, str(subproblem), str(stage),
                      "inputs", "projects.tab"),
-        sep="\t",
-        usecols=["project", "prm_type"]
+        columns=["project", "prm_type"]
     )
     required_prm_modules = [
         prm_type for prm_type in project_df.prm_type.unique() if
@@ -78,11 +78,10 @@ def load_model_data(m, d, data_portal, scenario_directory, subproblem, stage):
     :param stage:
     :return:
     """
-    project_df = pd.read_csv(
+    project_df = get_input_table(
         os.path.join(scenario_directory, str(subproblem), str(stage),
                      "inputs", "projects.tab"),
-        sep="\t",
-        usecols=["project", "prm_type"]
+        columns=["project", "prm_type"]
     )
     required_prm_modules = [
         prm_type for prm_type in project_df.prm_type.unique() if
@@ -116,11 +115,10 @@ def export_results(scenario_directory, subproblem, stage, m, d):
 
     # Export module-specific results
     # Operational type modules
-    project_df = pd.read_csv(
+    project_df = get_input_table(
         os.path.join(scenario_directory, str(subproblem), str(stage),
                      "inputs", "projects.tab"),
-        sep="\t",
-        usecols=["project", "prm_type"]
+        columns=["project", "prm_type"]
     )
     required_prm_modules = [
         prm_type for prm_type in project_df.prm_type.unique() if
@@ -25,16 +25,19 @@ The main() function of this script can also be called with the
 
 from argparse import ArgumentParser
 import datetime
+from functools import partial
 import logging
 import os
 import signal
 import sys
 
 # GridPath modules
-from db.common_functions import connect_to_database, spin_on_database_lock
+from db.common_functions import connect_to_database, spin_on_database_lock, \
+    submit_database_write
 from gridpath.common_functions import get_db_parser, get_solve_parser, \
     get_required_e2e_arguments_parser, create_logs_directory_if_not_exists,\
-    Logging, determine_scenario_directory
+    Logging, determine_scenario_directory, get_input_format_parser, \
+    get_parallel_inputs_parser, get_results_import_parser
 from gridpath import get_scenario_inputs, run_scenario, \
     import_scenario_results, process_results
 from gridpath.auxiliary.db_interface import get_scenario_id_and_name
@@ -52,7 +55,8 @@ def parse_arguments(args):
     parser = ArgumentParser(
         add_help=True,
         parents=[get_db_parser(), get_required_e2e_arguments_parser(),
-                 get_solve_parser()]
+                 get_input_format_parser(), get_parallel_inputs_parser(),
+                 get_solve_parser(), get_results_import_parser()]
     )
 
     parsed_arguments = parser.parse_args(args=args)
@@ -211,13 +215,15 @@ def main(args=None):
     process_id = os.getpid()
     start_time = datetime.datetime.now()
 
-    # Signal-handling directives
-    signal.signal(signal.SIGTERM, sigterm_handler)
-    signal.signal(signal.SIGINT, sigint_handler)
-
     if args is None:
         args = sys.argv[1:]
 
+    # Signal-handling directives; the handlers need the scenario arguments
+    # (which are not the process arguments if we're running in a worker of
+    # run_end_to_end_batch.py)
+    signal.signal(signal.SIGTERM, partial(sigterm_handler, args=args))
+    signal.signal(signal.SIGINT, partial(sigint_handler, args=args))
+
     parsed_args = parse_arguments(args)
 
     # Log the run if requested
@@ -268,14 +274,18 @@ def main(args=None):
     queue_order_id = check_if_in_queue(db_path, scenario)
 
     # Update run status to 'running'
-    update_run_status(db_path, scenario, 1)
+    submit_database_write(
+        update_run_status, db_path=db_path, scenario=scenario, status_id=1
+    )
 
     # Record process ID and process start time in database
     if not parsed_args.quiet:
         print("Process ID is {}".format(process_id))
         print("End-to-end run started on {}".format(start_time))
-    record_process_id_and_start_time(
-        db_path, parsed_args.scenario, process_id, start_time
+    submit_database_write(
+        record_process_id_and_start_time,
+        db_path=db_path, scenario=parsed_args.scenario,
+        process_id=process_id, start_time=start_time
     )
 
     try:
@@ -309,6 +319,9 @@ def main(args=None):
               .format(scenario, end_time))
         sys.exit(1)
 
+    # The results files are parsed here and only the database writes are
+    # submitted to the database writer if one was started (e.g. when running
+    # several scenarios in parallel)
     try:
         import_scenario_results.main(args=args)
     except Exception as e:
@@ -370,9 +383,16 @@ def update_db_for_run_end(
     """
 
     end_time = datetime.datetime.now()
-    remove_from_queue_if_in_queue(db_path, scenario, queue_order_id)
-    update_run_status(db_path, scenario, run_status_id)
-    record_end_time(
+    submit_database_write(
+        remove_from_queue_if_in_queue,
+        db_path=db_path, scenario=scenario, queue_order_id=queue_order_id
+    )
+    submit_database_write(
+        update_run_status,
+        db_path=db_path, scenario=scenario, status_id=run_status_id
+    )
+    submit_database_write(
+        record_end_time,
         db_path=db_path, scenario=scenario,
         process_id=process_id, end_time=end_time
     )
@@ -382,12 +402,15 @@ def update_db_for_run_end(
 
 # TODO: need to make sure that the database can be closed properly, pending
 #  transactions rolled back, etc.
-def exit_gracefully():
+def exit_gracefully(args=None):
     """
+    :param args: the scenario arguments; defaults to the process arguments
+
     Clean up before exit
     """
     print('Exiting gracefully')
-    args = sys.argv[1:]
+    if args is None:
+        args = sys.argv[1:]
     parsed_args = parse_arguments(args)
 
     db_path = parsed_args.database
@@ -407,28 +430,32 @@ def exit_gracefully():
     conn.close()
 
 
-def sigterm_handler(signal, frame):
+def sigterm_handler(signal, frame, args=None):
     """
     Exit when SIGTERM received
     :param signal:
     :param frame:
+    :param args: the scenario arguments
     :return:
     """
     print("SIGTERM received by run_end_to_end.py. Terminating process.")
-    exit_gracefully()
-    sys.exit()
+    exit_gracefully(args=args)
+    # Exit with the conventional non-zero code for a process terminated by
+    # a signal, so the run isn't mistaken for a successful one
+    sys.exit(128 + signal)
 
 
-def sigint_handler(signal, frame):
+def sigint_handler(signal, frame, args=None):
     """
     Exit when SIGINT received
     :param signal:
     :param frame:
+    :param args: the scenario arguments
     :return:
     """
     print("SIGINT received by run_end_to_end.py. Terminating process.")
-    exit_gracefully()
-    sys.exit()
+    exit_gracefully(args=args)
+    sys.exit(128 + signal)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,367 @@
+# Copyright 2016-2020 Blue Marble Analytics LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+This script runs many scenarios end-to-end (see *run_end_to_end.py*)
+without the UI, either a list of scenarios or all scenarios currently in
+the queue, in a pool of parallel worker processes:
+
+>>> gridpath_run_e2e_batch --database PATH/TO/DB --scenarios SCENARIO_1 SCENARIO_2 --n_parallel_scenarios 4
+
+Each scenario is run in a fresh worker process; a worker that dies without
+reporting its result (e.g. because it was killed) counts as a failed run.
+The solver threads are budgeted across the workers: unless
+*--solver_threads* is specified, each scenario's solver may use the total
+number of solver threads (the number of CPUs by default) divided by the
+number of parallel scenarios. The database writes of all workers (results
+imports and run status updates) are submitted to a single database writer
+process, so that the workers don't contend for the database lock.
+
+The scenarios are marked as 'in_queue' when the batch starts; each run then
+updates its status to 'running' and finally to 'complete' or 'run_error'.
+Scenarios that never started (e.g. because the batch was interrupted) are
+set back to 'not_run' unless they are in the UI queue.
+
+All other arguments (e.g. *--scenario_location*, *--solver*, or *--log*) are
+passed through to *run_end_to_end.py* for each scenario.
+
+The main() function of this script can also be called with the
+*gridpath_run_e2e_batch* command when GridPath is installed.
+"""
+
+from argparse import ArgumentParser
+from multiprocessing import Pipe, Process
+from multiprocessing.connection import wait
+import os
+import sys
+import traceback
+
+from db.common_functions import connect_to_database, spin_on_database_lock, \
+    start_database_writer, stop_database_writer, get_database_writer, \
+    set_database_writer
+from gridpath import run_end_to_end
+
+
+def parse_arguments(args):
+    """
+    :param args: the script arguments specified by the user
+    :return: the parsed known argument values (<class 'argparse.Namespace'>
+    Python object) and the list of the remaining arguments, which are passed
+    to run_end_to_end.py
+
+    Parse the known arguments.
+    """
+    # Don't allow abbreviations, so that the run_end_to_end.py arguments
+    # (e.g. --solver) aren't mistaken for ours (e.g. --solver_threads)
+    parser = ArgumentParser(
+        add_help=True, allow_abbrev=False,
+        epilog="All other arguments are passed to run_end_to_end.py for "
+               "each scenario."
+    )
+    parser.add_argument("--database", default="../db/io.db",
+                        help="The database file path relative to the "
+                             "current working directory. Defaults to "
+                             "../db/io.db ")
+    scenarios = parser.add_mutually_exclusive_group(required=True)
+    scenarios.add_argument("--scenarios", nargs="+",
+                           help="The names of the scenarios to run.")
+    scenarios.add_argument("--queued", default=False, action="store_true",
+                           help="Run all scenarios currently in the queue, "
+                                "in queue order.")
+    parser.add_argument("--n_parallel_scenarios", default=1, type=int,
+                        help="Run this many scenarios in parallel worker "
+                             "processes. Defaults to 1.")
+    parser.add_argument("--total_solver_threads", type=int,
+                        help="The number of solver threads to share among "
+                             "the parallel scenarios. Defaults to the "
+                             "number of CPUs.")
+    parser.add_argument("--solver_threads", type=int,
+                        help="The number of threads of each scenario's "
+                             "solver. Overrides the share of the total "
+                             "solver threads.")
+    parser.add_argument("--no_database_writer", default=False,
+                        action="store_true",
+                        help="Don't use a single database writer process; "
+                             "each worker writes to the database directly.")
+    parser.add_argument("--quiet", default=False, action="store_true",
+                        help="Don't print run output.")
+
+    parsed_arguments, e2e_args = parser.parse_known_args(args=args)
+
+    return parsed_arguments, e2e_args
+
+
+def get_scenarios_to_run(conn, scenarios, queued):
+    """
+    :param conn: the database connection object
+    :param scenarios: list of scenario names, or None
+    :param queued: boolean; whether to get the scenarios in the queue
+    :return: list of scenario names
+
+    Get the names of the scenarios to run, checking that they exist.
+    """
+    c = conn.cursor()
+    if queued:
+        return [
+            scenario for (scenario, ) in c.execute(
+                """SELECT scenario_name
+                FROM scenarios
+                WHERE queue_order_id IS NOT NULL
+                ORDER BY queue_order_id;"""
+            ).fetchall()
+        ]
+    else:
+        existing_scenarios = [
+            scenario for (scenario, ) in c.execute(
+                """SELECT scenario_name FROM scenarios;"""
+            ).fetchall()
+        ]
+        missing_scenarios = [
+            scenario for scenario in scenarios
+            if scenario not in existing_scenarios
+        ]
+        if missing_scenarios:
+            raise ValueError(
+                "Scenarios {} not found in the database.".format(
+                    ", ".join(missing_scenarios))
+            )
+        return scenarios
+
+
+def mark_scenarios_as_queued(conn, scenarios):
+    """
+    :param conn: the database connection object
+    :param scenarios: list of scenario names
+
+    Set the run status of the scenarios to 'in_queue' until they start
+    running.
+    """
+    c = conn.cursor()
+    sql = """
+        UPDATE scenarios
+        SET run_status_id = 5
+        WHERE scenario_name = ?;
+        """
+    spin_on_database_lock(
+        conn=conn, cursor=c, sql=sql,
+        data=[(scenario, ) for scenario in scenarios]
+    )
+
+
+def reset_scenarios_not_run(conn, scenarios):
+    """
+    :param conn: the database connection object
+    :param scenarios: list of scenario names
+
+    Set the run status of the scenarios that never started running (e.g.
+    because the batch was interrupted) back to 'not_run' unless they are
+    in the UI queue.
+    """
+    c = conn.cursor()
+    sql = """
+        UPDATE scenarios
+        SET run_status_id = 0
+        WHERE scenario_name = ?
+        AND run_status_id = 5
+        AND queue_order_id IS NULL;
+        """
+    spin_on_database_lock(
+        conn=conn, cursor=c, sql=sql,
+        data=[(scenario, ) for scenario in scenarios]
+    )
+
+
+def determine_solver_threads(
+    solver_threads, total_solver_threads, n_parallel_scenarios
+):
+    """
+    :param solver_threads: the requested number of threads per solver, or
+        None
+    :param total_solver_threads: the total number of solver threads, or None
+        to use the number of CPUs
+    :param n_parallel_scenarios: the number of parallel scenarios
+    :return: the number of threads of each scenario's solver
+
+    Split the total solver thread budget among the parallel scenarios
+    unless the threads per solver were specified.
+    """
+    if solver_threads is not None:
+        return solver_threads
+    if total_solver_threads is None:
+        total_solver_threads = os.cpu_count()
+
+    return max(1, total_solver_threads // n_parallel_scenarios)
+
+
+def run_scenario_end_to_end(scenario, e2e_args):
+    """
+    :param scenario: the scenario name
+    :param e2e_args: the arguments to pass to run_end_to_end.py
+    :return: (scenario, success) tuple
+
+    Run a scenario end-to-end in a worker process. A failed or interrupted
+    run exits via sys.exit after recording its status; we catch the exit so
+    that the worker reports the failure instead of dying. Only an exit with
+    code 0 counts as a success.
+    """
+    try:
+        run_end_to_end.main(args=e2e_args + ["--scenario", scenario])
+        return scenario, True
+    except SystemExit as e:
+        return scenario, e.code == 0
+    except Exception:
+        traceback.print_exc()
+        return scenario, False
+
+
+def run_scenario_in_worker(scenario, e2e_args, database_writer, result_conn):
+    """
+    :param scenario: the scenario name
+    :param e2e_args: the arguments to pass to run_end_to_end.py
+    :param database_writer: the database writer proxy to submit the
+        database writes to, or None to write to the database directly
+    :param result_conn: the connection to send the (scenario, success)
+        tuple to the main process with
+
+    Run a scenario end-to-end in a worker process (see
+    *run_scenarios_in_parallel*).
+    """
+    set_database_writer(database_writer)
+    result_conn.send(run_scenario_end_to_end(scenario, e2e_args))
+    result_conn.close()
+
+
+def run_scenarios_in_parallel(
+    scenarios, e2e_args, n_parallel_scenarios, database_writer=None
+):
+    """
+    :param scenarios: list of scenario names
+    :param e2e_args: the arguments to pass to run_end_to_end.py
+    :param n_parallel_scenarios: the maximum number of scenarios to run at
+        the same time
+    :param database_writer: the database writer proxy the workers submit
+        their database writes to, or None to write to the database
+        directly; the proxy is passed to the workers explicitly, so this
+        works with any multiprocessing start method
+    :return: dictionary of whether each scenario was run successfully
+
+    Run each scenario in a fresh worker process, as run_end_to_end.py
+    redirects the output if logging and modifies the process state. A
+    worker that exits without reporting its result (e.g. because it was
+    killed) counts as a failed run instead of blocking the batch.
+    """
+    success = dict()
+    scenarios_to_start = list(scenarios)
+    # Worker process sentinel: (scenario, process, result connection)
+    running = dict()
+    try:
+        while scenarios_to_start or running:
+            while scenarios_to_start and len(running) < n_parallel_scenarios:
+                scenario = scenarios_to_start.pop(0)
+                (result_conn, worker_conn) = Pipe(duplex=False)
+                process = Process(
+                    target=run_scenario_in_worker,
+                    args=(scenario, e2e_args, database_writer, worker_conn)
+                )
+                process.start()
+                worker_conn.close()
+                running[process.sentinel] = (scenario, process, result_conn)
+
+            for sentinel in wait(list(running.keys())):
+                (scenario, process, result_conn) = running.pop(sentinel)
+                process.join()
+                try:
+                    success[scenario] = result_conn.recv()[1]
+                except EOFError:
+                    print("The worker running scenario {} exited with code "
+                          "{} without reporting a result.".format(
+                            scenario, process.exitcode))
+                    success[scenario] = False
+                result_conn.close()
+    except KeyboardInterrupt:
+        for (scenario, process, result_conn) in running.values():
+            process.terminate()
+        raise
+    finally:
+        for (scenario, process, result_conn) in running.values():
+            process.join()
+
+    return success
+
+
+def main(args=None):
+    """
+    :param args: the script arguments
+    :return: dictionary of whether each scenario was run successfully
+    """
+    if args is None:
+        args = sys.argv[1:]
+
+    parsed_args, e2e_args = parse_arguments(args=args)
+
+    db_path = parsed_args.database
+    conn = connect_to_database(db_path=db_path)
+    scenarios = get_scenarios_to_run(
+        conn=conn, scenarios=parsed_args.scenarios,
+        queued=parsed_args.queued
+    )
+
+    n_parallel_scenarios = max(
+        1, min(parsed_args.n_parallel_scenarios, len(scenarios))
+    )
+    solver_threads = determine_solver_threads(
+        solver_threads=parsed_args.solver_threads,
+        total_solver_threads=parsed_args.total_solver_threads,
+        n_parallel_scenarios=n_parallel_scenarios
+    )
+
+    e2e_args = ["--database", db_path, "--solver_threads",
+                str(solver_threads)] + e2e_args
+    if parsed_args.quiet:
+        e2e_args.append("--quiet")
+
+    if not parsed_args.quiet:
+        print("Running {} scenarios, {} in parallel, with {} solver "
+              "thread(s) each".format(len(scenarios), n_parallel_scenarios,
+                                      solver_threads))
+
+    mark_scenarios_as_queued(conn=conn, scenarios=scenarios)
+
+    database_writer_manager = None if parsed_args.no_database_writer \
+        else start_database_writer()
+
+    try:
+        success = run_scenarios_in_parallel(
+            scenarios=scenarios, e2e_args=e2e_args,
+            n_parallel_scenarios=n_parallel_scenarios,
+            database_writer=get_database_writer()
+        )
+    finally:
+        if database_writer_manager is not None:
+            stop_database_writer(database_writer_manager)
+        reset_scenarios_not_run(conn=conn, scenarios=scenarios)
+        conn.close()
+
+    if not parsed_args.quiet:
+        print("Done. {} of {} scenarios completed successfully.".format(
+            sum(success.values()), len(scenarios)))
+        for scenario in scenarios:
+            if not success.get(scenario, False):
+                print("... {} failed".format(scenario))
+
+    return success
+
+
+if __name__ == "__main__":
+    main()
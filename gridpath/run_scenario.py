@@ -23,20 +23,52 @@ The main() function of this script can also be called with the
 import argparse
 from csv import reader, writer
 import datetime
+from multiprocessing import Pool
 import os.path
 from pyomo.environ import AbstractModel, Suffix, DataPortal, SolverFactory, \
-    SolverStatus, TerminationCondition
+    SolverStatus, TerminationCondition, Var, Param, Any, Component
+from pyomo.solvers.plugins.solvers.persistent_solver import PersistentSolver
 # from pyomo.util.infeasible import log_infeasible_constraints
 from pyutilib.services import TempfileManager
 import sys
+import time
 import warnings
 
-from gridpath.auxiliary.auxiliary import check_for_integer_subdirectories
+from gridpath.auxiliary.auxiliary import check_for_integer_subdirectories, \
+    clear_input_table_cache
+from gridpath.auxiliary.build_profile import BuildProfile, \
+    profile_construction, profile_module_step
 from gridpath.common_functions import determine_scenario_directory, \
     get_scenario_name_parser, get_required_e2e_arguments_parser, get_solve_parser, \
     create_logs_directory_if_not_exists, Logging
-from gridpath.auxiliary.dynamic_components import DynamicComponents
+from gridpath.auxiliary.dynamic_components import DynamicComponents, \
+    results_format, rolling_horizon
+from gridpath.auxiliary.results_export import \
+    check_results_format_dependencies, get_constraint_duals
 from gridpath.auxiliary.module_list import determine_modules, load_modules
+from gridpath.auxiliary.rolling_horizon import RollingHorizonState
+from gridpath.auxiliary.state_channel import open_state_channel, \
+    close_state_channel
+from gridpath.auxiliary.run_records import check_run_is_current, \
+    delete_run_record, get_downstream_inputs, get_files_state, \
+    get_inputs_fingerprint, get_linked_inputs_directory, read_run_record, \
+    remove_pass_through_rows, write_run_record
+
+
+# The name of the option that sets the number of threads for each solver
+SOLVER_THREADS_OPTIONS = {
+    "appsi_highs": "threads",
+    "cbc": "threads",
+    "cplex": "threads",
+    "cplex_direct": "threads",
+    "cplex_persistent": "threads",
+    "gurobi": "Threads",
+    "gurobi_direct": "Threads",
+    "gurobi_persistent": "Threads",
+    "xpress": "threads",
+    "xpress_direct": "threads",
+    "xpress_persistent": "threads"
+}
 
 
 class ScenarioStructure(object):
@@ -51,8 +83,12 @@ class ScenarioStructure(object):
 
     The scenario structure will then be passed to other methods that iterate
     over and solve each subproblem.
+
+    When re-running a scenario incrementally, the pass-through inputs
+    exported by prior runs of the stages are kept, as the stages that are
+    skipped don't export them again.
     """
-    def __init__(self, scenario, scenario_location):
+    def __init__(self, scenario, scenario_location, incremental=False):
         self.main_scenario_directory = determine_scenario_directory(
             scenario_location=scenario_location, scenario_name=scenario
         )
@@ -96,6 +132,10 @@ class ScenarioStructure(object):
                         os.path.join(subproblem_dir, "pass_through_inputs")
                     if not os.path.exists(pass_through_directory):
                         os.makedirs(pass_through_directory)
+                    if incremental and os.path.exists(os.path.join(
+                        pass_through_directory, "fixed_commitment.tab"
+                    )):
+                        continue
                     with open(
                             os.path.join(
                                 pass_through_directory,
@@ -111,13 +151,90 @@ class ScenarioStructure(object):
                              "final_commitment_stage", "commitment"])
 
 
+class PersistentSolverState(object):
+    """
+    When the user requests the persistent-solver mode, this class keeps the
+    Pyomo persistent solver interface (e.g. gurobi_persistent) alive across
+    the subproblems and stages of a scenario run, so that the solver is only
+    created once and problems are passed to it in memory rather than
+    through a problem file. It also keeps the solution of the last solved
+    (sub)problem, which is used to warm-start the next one.
+    """
+    def __init__(self):
+        self.solver = None
+        self.solver_name = None
+        self.previous_solution = dict()
+        self.previous_timepoints = list()
+
+    def record_solution(self, instance):
+        """
+        :param instance: the solved problem instance
+
+        Save the variable values of the solved instance by variable name and
+        index, along with the (ordered) timepoints of the instance.
+        """
+        self.previous_solution = {
+            (v.name, idx): v[idx].value
+            for v in instance.component_objects(Var, active=True)
+            for idx in v
+            if v[idx].value is not None
+        }
+        self.previous_timepoints = list(getattr(instance, "TMPS", []))
+
+    def warm_start(self, instance):
+        """
+        :param instance: the problem instance to be solved
+        :return: the number of variables that were given a starting value
+
+        Set the starting values of the (unfixed) variables of the instance
+        to the values of the same variables (name and index) in the
+        previously solved (sub)problem, if any.
+
+        Subproblems usually have different timepoint IDs, so timepoints in
+        the variable indices are matched by their position in the
+        (sub)problem rather than by ID, i.e. the first timepoint of this
+        subproblem is started from the solution for the first timepoint of
+        the previous one. Other IDs that differ between subproblems (e.g.
+        horizons) are not mapped, so variables indexed by them are not
+        warm-started.
+        """
+        previous_tmp_by_tmp = dict(
+            zip(getattr(instance, "TMPS", []), self.previous_timepoints)
+        )
+
+        n_warm_started = 0
+        for v in instance.component_objects(Var, active=True):
+            for idx in v:
+                if v[idx].fixed:
+                    continue
+                previous_idx = tuple(
+                    previous_tmp_by_tmp.get(i, i) for i in idx
+                ) if isinstance(idx, tuple) \
+                    else previous_tmp_by_tmp.get(idx, idx)
+                if (v.name, previous_idx) in self.previous_solution.keys():
+                    v[idx].value = self.previous_solution[v.name, previous_idx]
+                    n_warm_started += 1
+        return n_warm_started
+
+
 def create_and_solve_problem(scenario_directory, subproblem, stage,
-                             parsed_arguments):
+                             parsed_arguments, loaded_modules,
+                             solver_state=None, build_profile=None,
+                             rolling_horizon_state=None):
     """
     :param scenario_directory: the main scenario directory
     :param subproblem: the horizon subproblem name
     :param stage: the stage subproblem name
     :param parsed_arguments: the user-defined script arguments
+    :param loaded_modules: list of the imported GridPath modules as Python
+        objects (see *set_up_gridpath_modules*)
+    :param solver_state: the PersistentSolverState object if running in
+        persistent-solver mode; None otherwise
+    :param build_profile: the BuildProfile object if profiling the model
+        build; None otherwise
+    :param rolling_horizon_state: the RollingHorizonState object if
+        reusing the problem instance across subproblems and stages; None
+        otherwise
     :return: modules_to_use (list of module names used in scenario),
         loaded_modules (Python objects), dynamic_inputs (the populated
         dynamic components class), instance (the problem instance), results
@@ -129,10 +246,8 @@ def create_and_solve_problem(scenario_directory, subproblem, stage,
     Pyomo optimization components to this class, will load data into the
     components, and will then compile the problem.
 
-    We first need to determine which GridPath modules we need to use. See
-    *determine_modules* method (imported from
-    *gridpath.auxiilary.module_list*) and import those modules (via the
-    *load_modules* method imported from *gridpath.auxiliary.module_list*).
+    The GridPath modules we need to use are determined and imported once per
+    scenario run (see *set_up_gridpath_modules*) and passed to this method.
 
     We then determine the dynamic model components based on the selected
     modules and input data. See *populate_dynamic_components* method.
@@ -144,24 +259,26 @@ def create_and_solve_problem(scenario_directory, subproblem, stage,
     Finally, we compile and solve the problem (*create_problem_instance* and
     *solve* methods respectively). If any variables need to be fixed,
     this is done before solving (see the *fix_variables* method).
+
+    In rolling-horizon mode, the problem instance of the previous
+    subproblem/stage is reused if only its time-series params changed (see
+    *gridpath.auxiliary.rolling_horizon*); the abstract model is still
+    created and the data still loaded to check this.
     """
     # Create pyomo abstract model class
     model = AbstractModel()
     dynamic_components = DynamicComponents()
-
-    # Determine/load modules and dynamic components
-    modules_to_use, loaded_modules = \
-        set_up_gridpath_modules(
-            scenario_directory=scenario_directory,
-            subproblem=subproblem, stage=stage
-        )
+    setattr(dynamic_components, results_format,
+            parsed_arguments.results_format)
+    setattr(dynamic_components, rolling_horizon,
+            rolling_horizon_state is not None)
 
     # Create the abstract model; some components are initialized here
     if not parsed_arguments.quiet:
         print("Building model...")
     create_abstract_model(
         model, dynamic_components, loaded_modules, scenario_directory,
-        subproblem, stage
+        subproblem, stage, build_profile
     )
 
     # Create a dual suffix component
@@ -173,36 +290,62 @@ def create_and_solve_problem(scenario_directory, subproblem, stage,
         print("Loading data...")
     scenario_data = load_scenario_data(
         model, dynamic_components, loaded_modules,
-        scenario_directory, subproblem, stage
+        scenario_directory, subproblem, stage, build_profile
     )
 
-    if not parsed_arguments.quiet:
-        print("Creating problem instance...")
-    instance = create_problem_instance(model, scenario_data)
+    instance = rolling_horizon_state.update_instance(model, scenario_data) \
+        if rolling_horizon_state is not None else None
+    if instance is not None:
+        if not parsed_arguments.quiet:
+            print("Updating the time-series params of the problem "
+                  "instance...")
+    else:
+        if not parsed_arguments.quiet:
+            print("Creating problem instance...")
+        instance = create_problem_instance(
+            model, scenario_data,
+            skip_domain_checks=parsed_arguments.skip_domain_checks,
+            build_profile=build_profile
+        )
+        if rolling_horizon_state is not None:
+            rolling_horizon_state.set_instance(instance)
 
     # Fix variables if modules request so
     instance = fix_variables(
         instance, dynamic_components, scenario_directory, subproblem, stage,
-        loaded_modules
+        loaded_modules, build_profile
     )
 
     # Solve
     if not parsed_arguments.quiet:
         print("Solving...")
-    results = solve(instance, parsed_arguments)
+    results = solve(instance, parsed_arguments, solver_state)
 
     return instance, results, dynamic_components
 
 
-def run_optimization(scenario_directory, subproblem, stage, parsed_arguments):
+def run_optimization(scenario_directory, subproblem, stage, parsed_arguments,
+                     loaded_modules, solver_state=None,
+                     rolling_horizon_state=None):
     """
     :param scenario_directory: the main scenario directory
     :param subproblem: if there are horizon subproblems, the horizon
     :param stage: if there are stage subproblems, the stage
     :param parsed_arguments: the parsed script arguments
+    :param loaded_modules: list of the imported GridPath modules as Python
+        objects
+    :param solver_state: the PersistentSolverState object if running in
+        persistent-solver mode; None otherwise
+    :param rolling_horizon_state: the RollingHorizonState object if
+        reusing the problem instance across subproblems and stages; None
+        otherwise
     :return: return the objective function value (Total_Cost); only used in
         testing
 
+    In incremental mode, skip the (sub)problem if it was already solved with
+    the same inputs and options and its results are complete (see
+    *gridpath.auxiliary.run_records*).
+
     Log each run in the (sub)problem directory if requested by the user.
 
     Create and solve the (sub)problem. See *create_and_solve_problem* method.
@@ -211,23 +354,67 @@ def run_optimization(scenario_directory, subproblem, stage, parsed_arguments):
 
     Summarize results. See *summarize_results()* method.
 
+    Save the run record of the (sub)problem.
+
     Return the objective function (Total_Cost) value; only used in testing mode
 
     """
+    stages = check_for_integer_subdirectories(
+        os.path.join(scenario_directory, subproblem)
+    ) if stage != "" else []
+    inputs_fingerprint = get_inputs_fingerprint(
+        scenario_directory, subproblem, stage, stages
+    )
+    run_options = get_run_options(parsed_arguments)
+
+    if parsed_arguments.incremental:
+        run_record = read_run_record(scenario_directory, subproblem, stage)
+        if check_run_is_current(
+            scenario_directory, subproblem, stage, run_record,
+            inputs_fingerprint, run_options
+        ):
+            if not parsed_arguments.quiet:
+                print("\nSkipping optimization for scenario {}: inputs "
+                      "unchanged and results complete"
+                      .format(scenario_directory.split("/")[-1]))
+                if subproblem != "":
+                    print("--- subproblem {}".format(subproblem))
+                if stage != "":
+                    print("--- stage {}".format(stage))
+            return run_record["objective_function_value"]
+        # The stage will export its pass-through inputs again, and the
+        # later stages will have to be re-run
+        if stage != "":
+            remove_pass_through_rows(
+                scenario_directory, subproblem,
+                stages[stages.index(stage):]
+            )
+
+    delete_run_record(scenario_directory, subproblem, stage)
+
+    # Keep track of the inputs this (sub)problem exports to the next linked
+    # subproblem
+    linked_inputs_directory = get_linked_inputs_directory(
+        scenario_directory, subproblem, stage
+    )
+    linked_inputs_before = get_files_state(linked_inputs_directory)
+
+    # Save sys.stdout so we can return to it later
+    stdout_original = sys.stdout
+    stderr_original = sys.stderr
 
     # If directed to do so, log optimization run
     if parsed_arguments.log:
         logs_directory = create_logs_directory_if_not_exists(
             scenario_directory, subproblem, stage)
 
-        # Save sys.stdout so we can return to it later
-        stdout_original = sys.stdout
-        stderr_original = sys.stderr
-
         # The print statement will call the write() method of any object
         # you assign to sys.stdout (in this case the Logging object). The
         # write method of Logging writes both to sys.stdout and a log file
         # (see auxiliary/auxiliary.py)
+        # Each subproblem/stage has its own logs directory and, when
+        # subproblems are run in parallel, each worker process has its own
+        # sys.stdout, so loggers don't collide
         logger = Logging(
             logs_dir=logs_directory,
             start_time=datetime.datetime.now(), e2e=False, process_id=None
@@ -235,6 +422,76 @@ def run_optimization(scenario_directory, subproblem, stage, parsed_arguments):
         sys.stdout = logger
         sys.stderr = logger
 
+    try:
+        solved_instance, results = solve_and_save_results(
+            scenario_directory, subproblem, stage, parsed_arguments,
+            loaded_modules, solver_state, rolling_horizon_state
+        )
+    finally:
+        # The parsed input tables are only needed for this subproblem/stage
+        clear_input_table_cache()
+
+        # If logging, we need to return sys.stdout to original (i.e. stop
+        # writing to log file), including if the run failed
+        if parsed_arguments.log:
+            sys.stdout = stdout_original
+            sys.stderr = stderr_original
+            logger.log_file.close()
+
+    # Return the objective function value (in 'testing' mode,
+    # the value gets checked against the expected value)
+    # TODO: this will need to have a variable for the name of the objective
+    #  function component once there are multiple possible objective functions
+    if results.solver.termination_condition != "infeasible":
+        objective_function_value = solved_instance.NPV()
+    else:
+        warnings.warn("WARNING: the problem was infeasible!")
+        objective_function_value = None
+
+    # Save the run record last, so that it's only there if the results are
+    # complete
+    linked_files = [
+        f for (f, state) in get_files_state(linked_inputs_directory).items()
+        if linked_inputs_before.get(f) != state
+    ]
+    write_run_record(
+        scenario_directory, subproblem, stage,
+        {
+            "inputs_fingerprint": inputs_fingerprint,
+            "options": run_options,
+            "solver_status": str(results.solver.status),
+            "termination_condition":
+                str(results.solver.termination_condition),
+            "objective_function_value": objective_function_value,
+            "downstream_inputs": get_downstream_inputs(
+                scenario_directory, subproblem, stage, linked_files
+            )
+        }
+    )
+
+    return objective_function_value
+
+
+def solve_and_save_results(scenario_directory, subproblem, stage,
+                           parsed_arguments, loaded_modules, solver_state,
+                           rolling_horizon_state=None):
+    """
+    :param scenario_directory: the main scenario directory
+    :param subproblem: if there are horizon subproblems, the horizon
+    :param stage: if there are stage subproblems, the stage
+    :param parsed_arguments: the parsed script arguments
+    :param loaded_modules: list of the imported GridPath modules as Python
+        objects
+    :param solver_state: the PersistentSolverState object if running in
+        persistent-solver mode; None otherwise
+    :param rolling_horizon_state: the RollingHorizonState object if
+        reusing the problem instance across subproblems and stages; None
+        otherwise
+    :return: the solved instance and the solver results
+
+    Create and solve the (sub)problem, and save and summarize its results.
+    """
+
     # If directed, set temporary file directory to be the logs directory
     # In conjunction with --keepfiles, this will write the solver solution
     # files into the log directory (rather than a hidden temp folder).
@@ -252,34 +509,35 @@ def run_optimization(scenario_directory, subproblem, stage, parsed_arguments):
         if stage != "":
             print("--- stage {}".format(stage))
 
+    # If directed, profile the model build by module
+    build_profile = BuildProfile() if parsed_arguments.profile_build \
+        else None
+
     # Create problem instance and solve it
     solved_instance, results, dynamic_components = \
         create_and_solve_problem(scenario_directory, subproblem, stage,
-                                 parsed_arguments)
+                                 parsed_arguments, loaded_modules,
+                                 solver_state, build_profile,
+                                 rolling_horizon_state)
 
     # Save the scenario results to disk
     save_results(
         scenario_directory, subproblem, stage, solved_instance, results,
-        dynamic_components, parsed_arguments
+        dynamic_components, parsed_arguments, loaded_modules, build_profile
     )
 
-    # Summarize results
-    summarize_results(scenario_directory, subproblem, stage, parsed_arguments)
+    if build_profile is not None:
+        build_profile.write(
+            logs_directory=create_logs_directory_if_not_exists(
+                scenario_directory, subproblem, stage),
+            file_name="build_profile"
+        )
 
-    # If logging, we need to return sys.stdout to original (i.e. stop writing
-    # to log file)
-    if parsed_arguments.log:
-        sys.stdout = stdout_original
-        sys.stderr = stderr_original
+    # Summarize results
+    summarize_results(scenario_directory, subproblem, stage, parsed_arguments,
+                      loaded_modules)
 
-    # Return the objective function value (in 'testing' mode,
-    # the value gets checked against the expected value)
-    # TODO: this will need to have a variable for the name of the objective
-    #  function component once there are multiple possible objective functions
-    if results.solver.termination_condition != "infeasible":
-        return solved_instance.NPV()
-    else:
-        warnings.warn("WARNING: the problem was infeasible!")
+    return solved_instance, results
 
 
 def run_scenario(structure, parsed_arguments):
@@ -293,38 +551,195 @@ def run_scenario(structure, parsed_arguments):
     Check the scenario structure, iterate over all subproblems if they
     exist, and run the subproblem optimization.
 
+    If the user has requested more than one parallel subproblem and the
+    subproblems are not linked (i.e. there is no linked_subproblems_map.csv
+    file), the subproblems are run in a pool of worker processes (see
+    *run_subproblems_in_parallel*); otherwise, they are run one after
+    another.
+
+    The GridPath modules needed for the scenario are determined and
+    imported once here and then passed to all subproblems and stages.
+
+    Unless re-running the scenario incrementally, the inputs the subproblems
+    and stages export to the next ones (linked timepoint params and fixed
+    commitment) are passed in memory for the duration of the run (see
+    *gridpath.auxiliary.state_channel*); the files are also written unless
+    the user requested otherwise.
+
+    If the user requested the rolling-horizon mode, the problem instance is
+    kept across subproblems and stages and reused when only its
+    time-series params change (see *gridpath.auxiliary.rolling_horizon*).
+
     The objective function is returned, but it's only really used if we
     are in 'testing' mode.
     """
+    # Determine/load modules once for the whole scenario
+    modules_to_use, loaded_modules = set_up_gridpath_modules(
+        scenario_directory=structure.main_scenario_directory
+    )
+
+    # If requested, keep a persistent solver interface across subproblems
+    solver_state = PersistentSolverState() \
+        if parsed_arguments.persistent_solver else None
+
+    # If requested, keep the problem instance across subproblems
+    rolling_horizon_state = RollingHorizonState() \
+        if parsed_arguments.rolling_horizon else None
+
+    # Pass the exported state between subproblems and stages in memory
+    if not parsed_arguments.incremental:
+        open_state_channel(write_files=not parsed_arguments.no_state_files)
+    try:
+        objective_values = run_subproblems(
+            structure, parsed_arguments, loaded_modules, solver_state,
+            rolling_horizon_state
+        )
+    finally:
+        close_state_channel()
+
+    return objective_values
+
+
+def run_subproblems(structure, parsed_arguments, loaded_modules,
+                    solver_state, rolling_horizon_state=None):
+    """
+    :param structure: the scenario structure object (i.e. horizon and stage
+        subproblems)
+    :param parsed_arguments:
+    :param loaded_modules: list of the imported GridPath modules as Python
+        objects
+    :param solver_state: the PersistentSolverState object if running in
+        persistent-solver mode; None otherwise
+    :param rolling_horizon_state: the RollingHorizonState object if
+        reusing the problem instance across subproblems and stages; None
+        otherwise
+    :return: the objective function value(s)
+
+    Run the main problem or all subproblems, sequentially or in parallel.
+    """
     # If no subproblem directories (empty list), run main problem
     if not structure.subproblems:
         objective_values = run_optimization(
-            structure.main_scenario_directory, "", "", parsed_arguments)
+            structure.main_scenario_directory, "", "", parsed_arguments,
+            loaded_modules, solver_state, rolling_horizon_state)
+    elif parsed_arguments.n_parallel_subproblems > 1 \
+            and len(structure.subproblems) > 1:
+        if os.path.exists(os.path.join(structure.main_scenario_directory,
+                                       "linked_subproblems_map.csv")):
+            warnings.warn(
+                "WARNING: subproblems are linked and can't be run in "
+                "parallel. Running subproblems sequentially."
+            )
+            objective_values = {
+                subproblem: run_subproblem(
+                    structure, subproblem, parsed_arguments, loaded_modules,
+                    solver_state, rolling_horizon_state)
+                for subproblem in structure.subproblems
+            }
+        else:
+            objective_values = run_subproblems_in_parallel(
+                structure, parsed_arguments
+            )
     else:
         # Create dictionary with which we'll keep track
         # of subproblem objective function values
         objective_values = {}
         for subproblem in structure.subproblems:
-            # If no stages in this subproblem (empty list), run the subproblem
-            if not structure.stages_by_subproblem[subproblem]:
-                objective_values[subproblem] = run_optimization(
-                    structure.main_scenario_directory, subproblem, "",
-                    parsed_arguments)
-            # Otherwise, run the stage problem
-            else:
-                objective_values[subproblem] = {}
-                for stage in structure.stages_by_subproblem[subproblem]:
-                    objective_values[subproblem][stage] = \
-                        run_optimization(
-                            structure.main_scenario_directory,
-                            subproblem, stage,
-                            parsed_arguments)
+            objective_values[subproblem] = run_subproblem(
+                structure, subproblem, parsed_arguments, loaded_modules,
+                solver_state, rolling_horizon_state
+            )
     return objective_values
 
 
+def run_subproblem(structure, subproblem, parsed_arguments,
+                   loaded_modules=None, solver_state=None,
+                   rolling_horizon_state=None):
+    """
+    :param structure: the scenario structure object (i.e. horizon and stage
+        subproblems)
+    :param subproblem: the horizon subproblem
+    :param parsed_arguments:
+    :param loaded_modules: list of the imported GridPath modules as Python
+        objects; if None (e.g. in a parallel worker process, as modules
+        can't be passed between processes), they are determined and
+        imported here once for all stages of the subproblem
+    :param solver_state: the PersistentSolverState object if running in
+        persistent-solver mode; if None and the mode is requested, a new one
+        is created for this subproblem (e.g. in a parallel worker process)
+    :param rolling_horizon_state: the RollingHorizonState object if
+        reusing the problem instance across subproblems and stages; if None
+        and the mode is requested, a new one is created for this subproblem
+        (e.g. in a parallel worker process)
+    :return: the subproblem objective function value or, if the subproblem
+        has stages, a dictionary of the objective function values by stage
+
+    Run the subproblem optimization or, if there are stages, run the stage
+    problems in order.
+    """
+    if loaded_modules is None:
+        modules_to_use, loaded_modules = set_up_gridpath_modules(
+            scenario_directory=structure.main_scenario_directory
+        )
+
+    if solver_state is None and parsed_arguments.persistent_solver:
+        solver_state = PersistentSolverState()
+
+    if rolling_horizon_state is None and parsed_arguments.rolling_horizon:
+        rolling_horizon_state = RollingHorizonState()
+
+    # If no stages in this subproblem (empty list), run the subproblem
+    if not structure.stages_by_subproblem[subproblem]:
+        return run_optimization(
+            structure.main_scenario_directory, subproblem, "",
+            parsed_arguments, loaded_modules, solver_state,
+            rolling_horizon_state)
+    # Otherwise, run the stage problem
+    else:
+        objective_values = {}
+        for stage in structure.stages_by_subproblem[subproblem]:
+            objective_values[stage] = \
+                run_optimization(
+                    structure.main_scenario_directory,
+                    subproblem, stage,
+                    parsed_arguments, loaded_modules, solver_state,
+                    rolling_horizon_state)
+        return objective_values
+
+
+def run_subproblems_in_parallel(structure, parsed_arguments):
+    """
+    :param structure: the scenario structure object (i.e. horizon and stage
+        subproblems)
+    :param parsed_arguments:
+    :return: dictionary of the objective function values by subproblem (and
+        by stage if there are stages)
+
+    Run independent subproblems in a pool of
+    *parsed_arguments.n_parallel_subproblems* worker processes. The stages
+    of each subproblem are run in order within the same worker (see
+    *run_subproblem*). Results are collected in subproblem order.
+    """
+    if not parsed_arguments.quiet:
+        print("Running {} subproblems with {} parallel processes...".format(
+            len(structure.subproblems),
+            parsed_arguments.n_parallel_subproblems)
+        )
+
+    with Pool(processes=parsed_arguments.n_parallel_subproblems) as pool:
+        subproblem_objective_values = pool.starmap(
+            run_subproblem,
+            [(structure, subproblem, parsed_arguments)
+             for subproblem in structure.subproblems],
+            chunksize=1
+        )
+
+    return dict(zip(structure.subproblems, subproblem_objective_values))
+
+
 def save_results(
     scenario_directory, subproblem, stage, instance, results,
-    dynamic_components, parsed_arguments
+    dynamic_components, parsed_arguments, loaded_modules, build_profile=None
 ):
     """
     :param scenario_directory:
@@ -333,6 +748,8 @@ def save_results(
     :param instance: model instance (solution loaded after solving by default)
     :param dynamic_components:
     :param parsed_arguments:
+    :param loaded_modules: list of imported GridPath modules as Python objects
+    :param build_profile: the BuildProfile object if profiling; None otherwise
     :return:
 
     Create a results directory for the (sub)problem.
@@ -374,16 +791,17 @@ def save_results(
                 print("Solution is not optimal.")
         # Continue with results export
         export_results(scenario_directory, subproblem, stage, instance,
-                       dynamic_components)
+                       dynamic_components, loaded_modules, build_profile)
 
         export_pass_through_inputs(scenario_directory, subproblem, stage,
-                                   instance)
+                                   instance, loaded_modules)
 
         save_objective_function_value(
             scenario_directory, subproblem, stage, instance
         )
 
-        save_duals(scenario_directory, subproblem, stage, instance)
+        save_duals(scenario_directory, subproblem, stage, instance,
+                   loaded_modules)
     # If solver status is not ok, don't export results and print some
     # messages for the user
     else:
@@ -408,7 +826,7 @@ def save_results(
 
 def create_abstract_model(
     model, dynamic_components, loaded_modules, scenario_directory, subproblem,
-    stage
+    stage, build_profile=None
 ):
     """
     :param model: the Pyomo AbstractModel object
@@ -417,6 +835,7 @@ def create_abstract_model(
     :param scenario_directory:
     :param subproblem:
     :param stage:
+    :param build_profile: the BuildProfile object if profiling; None otherwise
 
     To create the abstract model, we iterate over all required modules and
     call their *add_model_components* method to add components to the Pyomo
@@ -426,14 +845,18 @@ def create_abstract_model(
     """
     for m in loaded_modules:
         if hasattr(m, 'add_model_components'):
-            m.add_model_components(
-                model, dynamic_components, scenario_directory, subproblem,
-                stage
-            )
+            with profile_module_step(
+                build_profile, m, "add_model_components", model=model
+            ):
+                m.add_model_components(
+                    model, dynamic_components, scenario_directory,
+                    subproblem, stage
+                )
 
 
 def load_scenario_data(model, dynamic_components, loaded_modules,
-                       scenario_directory, subproblem, stage):
+                       scenario_directory, subproblem, stage,
+                       build_profile=None):
     """
     :param model: the Pyomo abstract model object with components added
     :param dynamic_components: the dynamic components class
@@ -442,6 +865,7 @@ def load_scenario_data(model, dynamic_components, loaded_modules,
     :param scenario_directory: the main scenario directory
     :param subproblem: the horizon subproblem
     :param stage: the stage subproblem
+    :param build_profile: the BuildProfile object if profiling; None otherwise
     :return: the DataPortal object populated with the input data
 
     Iterate over all required GridPath modules and call their
@@ -453,31 +877,71 @@ def load_scenario_data(model, dynamic_components, loaded_modules,
     data_portal = DataPortal()
     for m in loaded_modules:
         if hasattr(m, "load_model_data"):
-            m.load_model_data(model, dynamic_components, data_portal,
-                              scenario_directory, subproblem, stage)
+            with profile_module_step(build_profile, m, "load_model_data"):
+                m.load_model_data(model, dynamic_components, data_portal,
+                                  scenario_directory, subproblem, stage)
         else:
             pass
     return data_portal
 
 
-def create_problem_instance(model, loaded_data):
+def create_problem_instance(model, loaded_data, skip_domain_checks=False,
+                            build_profile=None):
     """
     :param model: the AbstractModel Pyomo object with components added
     :param loaded_data: the DataPortal object with the data loaded in and
         linked to the relevant model components
+    :param skip_domain_checks: boolean; whether to skip checking that each
+        param value is within the param's domain
+    :param build_profile: the BuildProfile object if profiling the
+        construction of the components; None otherwise
     :return: the compiled problem instance
 
     Compile the problem based on the abstract model formulation and the data
     loaded into the model components.
+
+    When constructing a param, Pyomo checks every value against the param's
+    domain (its *within* argument), which is slow for params with a value
+    for each timepoint. The check is redundant for inputs that have passed
+    validation (see validate_inputs.py), so it can be skipped with the
+    *--skip_domain_checks* option: the params are constructed with the Any
+    domain and their domains are then restored on the instance. Values
+    outside of a param's domain are not caught in that case, so don't use
+    the option with inputs that have not been validated.
     """
-    # Create problem instance
-    instance = model.create_instance(loaded_data)
+    if not skip_domain_checks:
+        with profile_construction(build_profile):
+            return model.create_instance(loaded_data)
+
+    # Params without a domain already accept any value
+    param_domains = {
+        p.name: p.domain for p in model.component_objects(Param)
+        if not isinstance(p.domain, Component) or p.domain.name != "Any"
+    }
+    for p in model.component_objects(Param):
+        if p.name in param_domains.keys():
+            p.domain = Any
+    try:
+        with profile_construction(build_profile):
+            instance = model.create_instance(loaded_data)
+    finally:
+        for p in model.component_objects(Param):
+            if p.name in param_domains.keys():
+                p.domain = param_domains[p.name]
+
+    # Domains that are components of the model (e.g. sets) were cloned with
+    # the instance, so we restore the instance's copy of the component
+    for (param_name, domain) in param_domains.items():
+        if isinstance(domain, Component) and domain.parent_block() is model:
+            domain = instance.find_component(domain.name)
+        instance.find_component(param_name).domain = domain
+
     return instance
 
 
 def fix_variables(
     instance, dynamic_components, scenario_directory, subproblem, stage,
-    loaded_modules
+    loaded_modules, build_profile=None
 ):
     """
     :param instance: the compiled problem instance
@@ -486,6 +950,7 @@ def fix_variables(
     :param subproblem: str
     :param stage: str
     :param loaded_modules: list of imported GridPath modules as Python objects
+    :param build_profile: the BuildProfile object if profiling; None otherwise
     :return: the problem instance with the relevant variables fixed
 
     Iterate over the required GridPath modules and fix variables by calling
@@ -494,8 +959,9 @@ def fix_variables(
     """
     for m in loaded_modules:
         if hasattr(m, "fix_variables"):
-            m.fix_variables(instance, dynamic_components,
-                            scenario_directory, subproblem, stage)
+            with profile_module_step(build_profile, m, "fix_variables"):
+                m.fix_variables(instance, dynamic_components,
+                                scenario_directory, subproblem, stage)
         else:
             pass
 
@@ -515,13 +981,126 @@ def view_loaded_data(loaded_modules, instance):
             m.view_loaded_data(instance)
 
 
-def solve(instance, parsed_arguments):
+def solve(instance, parsed_arguments, solver_state=None):
     """
     :param instance: the compiled problem instance
     :param parsed_arguments: the user-defined arguments (parsed)
+    :param solver_state: the PersistentSolverState object if running in
+        persistent-solver mode; None otherwise
     :return: the problem results
 
     Send the compiled problem instance to the solver and solve.
+
+    In persistent-solver mode, we use the persistent interface of the
+    solver (see *get_persistent_solver*), which is created once and reused
+    for all subproblems and stages, pass the instance to it in memory
+    instead of writing a problem file, and warm-start it with the solution
+    of the previous (sub)problem.
+    """
+    solver_name, solver_options = get_solver_name_and_options(
+        parsed_arguments
+    )
+
+    # Get solver
+    if solver_state is not None:
+        solver = get_persistent_solver(
+            solver_name, solver_state, parsed_arguments
+        )
+    # If a solver executable is specified, pass it to Pyomo
+    elif parsed_arguments.solver_executable is not None:
+        solver = SolverFactory(solver_name,
+                               executable=parsed_arguments.solver_executable)
+    # Otherwise, only pass the solver name; Pyomo will look for the
+    # executable in the PATH
+    else:
+        solver = SolverFactory(solver_name)
+
+    # Apply the solver options (if any)
+    for opt in solver_options.keys():
+        if opt == "solver":
+            pass  # this is just the solver name, not actually an 'option'
+        else:
+            solver.options[opt] = solver_options[opt]
+
+    # Apply the thread budget unless the solver options already set the
+    # number of threads
+    if parsed_arguments.solver_threads is not None:
+        threads_option = SOLVER_THREADS_OPTIONS.get(solver_name)
+        if threads_option is None:
+            warnings.warn(
+                "Don't know how to set the number of threads for solver {}; "
+                "ignoring --solver_threads.".format(solver_name)
+            )
+        elif threads_option not in solver_options.keys():
+            solver.options[threads_option] = parsed_arguments.solver_threads
+
+    # Solve
+    # Note: Pyomo moves the results to the instance object by default.
+    # If you want the results to stay into a results object, set the
+    # load_solutions argument to False:
+    # >>> results = solver.solve(instance, load_solutions=False)
+    solve_start_time = time.time()
+    if isinstance(solver, PersistentSolver):
+        n_warm_started = solver_state.warm_start(instance)
+        solver.set_instance(
+            instance, symbolic_solver_labels=parsed_arguments.symbolic
+        )
+        set_instance_time = time.time() - solve_start_time
+        results = solver.solve(
+            tee=not parsed_arguments.mute_solver_output,
+            warmstart=solver.warm_start_capable() and n_warm_started > 0
+        )
+    else:
+        results = solver.solve(
+            instance,
+            tee=not parsed_arguments.mute_solver_output,
+            keepfiles=parsed_arguments.keepfiles,
+            symbolic_solver_labels=parsed_arguments.symbolic
+        )
+    total_solve_time = time.time() - solve_start_time
+
+    # Save the solution for warm-starting the next (sub)problem
+    if solver_state is not None:
+        solver_state.record_solution(instance)
+
+    # Report the time spent in the solver vs. passing the problem to the
+    # solver and loading the solution back; compare these with and without
+    # the persistent-solver mode to determine the time savings
+    if not parsed_arguments.quiet:
+        # Solvers report their time under different fields, if at all
+        solver_time = None
+        for time_field in ["wallclock_time", "time"]:
+            reported_time = getattr(results.solver, time_field, None)
+            if isinstance(reported_time, float):
+                solver_time = reported_time
+                break
+        print("Total solve time: {:.2f} seconds".format(total_solve_time))
+        if solver_time is not None:
+            print("--- time in solver: {:.2f} seconds".format(solver_time))
+            print("--- overhead (problem transfer and solution loading): "
+                  "{:.2f} seconds".format(total_solve_time - solver_time))
+        if isinstance(solver, PersistentSolver):
+            print("--- passing instance to persistent solver: {:.2f} "
+                  "seconds".format(set_instance_time))
+            print("--- variables warm-started from previous solution: "
+                  "{}".format(n_warm_started))
+
+    # Can optionally log infeasibilities but this has resulted in false
+    # positives due to rounding errors larger than the default tolerance
+    # of 1E-6.
+    # log_infeasible_constraints(instance)
+
+    return results
+
+
+def get_solver_name_and_options(parsed_arguments):
+    """
+    :param parsed_arguments: the user-defined arguments (parsed)
+    :return: the solver name and dictionary of the solver options
+
+    Get the solver name from the command line or the scenario's
+    solver_options.csv file (defaults to Cbc) and any user-requested solver
+    options from the solver_options.csv file.
     """
     # Start with solver name specified on command line
     solver_name = parsed_arguments.solver
@@ -559,46 +1138,93 @@ def solve(instance, parsed_arguments):
         if parsed_arguments.solver is None:
             solver_name = "cbc"
 
-    # Get solver
-    # If a solver executable is specified, pass it to Pyomo
-    if parsed_arguments.solver_executable is not None:
-        solver = SolverFactory(solver_name,
-                               executable=parsed_arguments.solver_executable)
-    # Otherwise, only pass the solver name; Pyomo will look for the
-    # executable in the PATH
-    else:
-        solver = SolverFactory(solver_name)
+    return solver_name, solver_options
 
-    # Apply the solver options (if any)
-    for opt in solver_options.keys():
-        if opt == "solver":
-            pass  # this is just the solver name, not actually an 'option'
-        else:
-            solver.options[opt] = solver_options[opt]
 
-    # Solve
-    # Note: Pyomo moves the results to the instance object by default.
-    # If you want the results to stay into a results object, set the
-    # load_solutions argument to False:
-    # >>> results = solver.solve(instance, load_solutions=False)
+def get_run_options(parsed_arguments):
+    """
+    :param parsed_arguments: the user-defined arguments (parsed)
+    :return: dictionary of the options that affect the results of a
+        subproblem/stage, which are saved in its run record
 
-    results = solver.solve(
-        instance,
-        tee=not parsed_arguments.mute_solver_output,
-        keepfiles=parsed_arguments.keepfiles,
-        symbolic_solver_labels=parsed_arguments.symbolic
+    The number of solver threads is not included, as it only affects
+    performance. Whether the state passed to the next subproblems and stages
+    was written to files is included, as the run records only track the
+    files.
+    """
+    solver_name, solver_options = get_solver_name_and_options(
+        parsed_arguments
     )
+    return {
+        "solver": solver_name,
+        "solver_options": solver_options,
+        "results_format": parsed_arguments.results_format,
+        "state_files": parsed_arguments.incremental
+        or not parsed_arguments.no_state_files
+    }
 
-    # Can optionally log infeasibilities but this has resulted in false
-    # positives due to rounding errors larger than the default tolerance
-    # of 1E-6.
-    # log_infeasible_constraints(instance)
 
-    return results
+def get_persistent_solver(solver_name, solver_state, parsed_arguments):
+    """
+    :param solver_name: the name of the solver requested by the user
+    :param solver_state: the PersistentSolverState object
+    :param parsed_arguments: the user-defined arguments (parsed)
+    :return: the solver object
+
+    Create the persistent interface of the solver on the first call and
+    return the same object on all subsequent calls. If the solver name is
+    already that of a persistent interface (e.g. gurobi_persistent) or of
+    an APPSI interface (e.g. appsi_highs), it is used as is; otherwise, we
+    look for a '<solver_name>_persistent' Pyomo interface. If the solver
+    doesn't have one, we warn the user and use the regular interface (but
+    still reuse the solver object).
+
+    APPSI interfaces are persistent too: when the same instance is solved
+    again (see the *--rolling_horizon* option), only the changes are passed
+    to the solver. They don't accept starting values, however, so we warn
+    the user that the subproblems won't be warm-started.
+    """
+    if solver_state.solver is not None \
+            and solver_state.solver_name == solver_name:
+        return solver_state.solver
+
+    if solver_name.startswith("appsi_"):
+        warnings.warn(
+            "WARNING: the APPSI interface of solver {} does not support "
+            "warm starts, so subproblems will not be warm-started with the "
+            "previous solution. Use a Pyomo persistent interface (e.g. "
+            "gurobi_persistent) for warm starts.".format(solver_name)
+        )
+        persistent_solver_name = solver_name
+    elif solver_name.endswith("_persistent"):
+        persistent_solver_name = solver_name
+    elif "{}_persistent".format(solver_name) in SolverFactory:
+        persistent_solver_name = "{}_persistent".format(solver_name)
+    else:
+        warnings.warn(
+            "WARNING: solver {} does not have a Pyomo persistent interface. "
+            "Using the regular solver interface.".format(solver_name)
+        )
+        persistent_solver_name = solver_name
+
+    # Persistent interfaces use the solver's Python bindings, so a solver
+    # executable only applies to the regular interface
+    if persistent_solver_name == solver_name \
+            and parsed_arguments.solver_executable is not None:
+        solver = SolverFactory(solver_name,
+                               executable=parsed_arguments.solver_executable)
+    else:
+        solver = SolverFactory(persistent_solver_name)
+
+    solver_state.solver = solver
+    solver_state.solver_name = solver_name
+
+    return solver
 
 
 def export_results(
-    scenario_directory, subproblem, stage, instance, dynamic_components
+    scenario_directory, subproblem, stage, instance, dynamic_components,
+    loaded_modules, build_profile=None
 ):
     """
     :param scenario_directory:
@@ -606,48 +1232,36 @@ def export_results(
     :param stage:
     :param instance:
     :param dynamic_components:
+    :param loaded_modules:
+    :param build_profile: the BuildProfile object if profiling; None otherwise
     :return:
 
     Export results for each loaded module (if applicable)
     """
-    # Determine/load modules and dynamic components
-    modules_to_use, loaded_modules = \
-        set_up_gridpath_modules(
-            scenario_directory=scenario_directory,
-            subproblem=subproblem, stage=stage
-        )
-
     for m in loaded_modules:
         if hasattr(m, "export_results"):
-            m.export_results(
-                scenario_directory, subproblem, stage, instance,
-                dynamic_components
-            )
+            with profile_module_step(build_profile, m, "export_results"):
+                m.export_results(
+                    scenario_directory, subproblem, stage, instance,
+                    dynamic_components
+                )
     else:
         pass
 
 
 def export_pass_through_inputs(
-        scenario_directory, subproblem, stage, instance
+        scenario_directory, subproblem, stage, instance, loaded_modules
 ):
     """
     :param scenario_directory:
     :param subproblem:
     :param stage:
     :param instance:
-    :param dynamic_components:
     :param loaded_modules:
     :return:
 
     Export pass through inputs for each loaded module (if applicable)
     """
-    # Determine/load modules and dynamic components
-    modules_to_use, loaded_modules = \
-        set_up_gridpath_modules(
-            scenario_directory=scenario_directory,
-            subproblem=subproblem, stage=stage
-        )
-
     for m in loaded_modules:
         if hasattr(m, "export_pass_through_inputs"):
             m.export_pass_through_inputs(
@@ -685,23 +1299,21 @@ def save_objective_function_value(scenario_directory, subproblem, stage,
         # objective_file.write(str(objective_function_value))
 
 
-def save_duals(scenario_directory, subproblem, stage, instance):
+def save_duals(scenario_directory, subproblem, stage, instance,
+               loaded_modules):
     """
     :param scenario_directory:
     :param subproblem:
     :param stage:
     :param instance:
+    :param loaded_modules:
     :return:
 
-    Save the duals of various constraints.
+    Save the duals of various constraints. The duals of each constraint the
+    modules registered in *constraint_indices* are looked up in bulk and
+    written in a single call; indices without a dual are skipped and
+    reported in a single warning.
     """
-    # Determine/load modules and dynamic components
-    modules_to_use, loaded_modules = \
-        set_up_gridpath_modules(
-            scenario_directory=scenario_directory,
-            subproblem=subproblem, stage=stage
-        )
-
     instance.constraint_indices = {}
     for m in loaded_modules:
         if hasattr(m, "save_duals"):
@@ -709,37 +1321,44 @@ def save_duals(scenario_directory, subproblem, stage, instance):
         else:
             pass
 
+    missing_duals = dict()
     for c in list(instance.constraint_indices.keys()):
-        constraint_object = getattr(instance, c)
+        (indices, duals, n_missing) = get_constraint_duals(
+            constraint=getattr(instance, c), dual_suffix=instance.dual
+        )
+        if n_missing > 0:
+            missing_duals[c] = n_missing
+
         with open(os.path.join(
             scenario_directory, subproblem, stage, "results", str(c) + ".csv"),
             "w", newline=""
         ) as duals_results_file:
             duals_writer = writer(duals_results_file)
             duals_writer.writerow(instance.constraint_indices[c])
-            for index in constraint_object:
-                try:
-                    duals_writer.writerow(list(index) +
-                                          [instance.dual[constraint_object[index]]]
-                                          )
-                # We get an error when trying to export duals with CPLEX
-                # when solving MIPs, so catch it here and ignore to avoid
-                # breaking the script, but throw a warning
-                except KeyError:
-                    warnings.warn("""
-                    KeyError caught when saving duals. Duals were not exported.
-                    This is expected if solving a MIP with CPLEX, 
-                    not otherwise.
-                    """)
-                    pass
-
-
-def summarize_results(scenario_directory, subproblem, stage, parsed_arguments):
+            duals_writer.writerows(
+                idx + (dual,) for (idx, dual) in zip(indices, duals.tolist())
+            )
+
+    # We don't get duals with CPLEX when solving MIPs, so warn rather than
+    # break the script
+    if missing_duals:
+        warnings.warn(
+            "Duals were not exported for some constraint indices ({}). This "
+            "is expected if solving a MIP with CPLEX, not otherwise.".format(
+                ", ".join("{}: {}".format(c, n)
+                          for (c, n) in missing_duals.items())
+            )
+        )
+
+
+def summarize_results(scenario_directory, subproblem, stage, parsed_arguments,
+                      loaded_modules):
     """
     :param scenario_directory:
     :param subproblem:
     :param stage:
     :param parsed_arguments:
+    :param loaded_modules:
     :return:
 
     Summarize results (after results export)
@@ -755,13 +1374,6 @@ def summarize_results(scenario_directory, subproblem, stage, parsed_arguments):
         if not parsed_arguments.quiet:
             print("Summarizing results...")
 
-        # Determine/load modules and dynamic components
-        modules_to_use, loaded_modules = \
-            set_up_gridpath_modules(
-                scenario_directory=scenario_directory,
-                subproblem=subproblem, stage=stage
-            )
-
         # Make the summary results file
         summary_results_file = os.path.join(
             scenario_directory, subproblem, stage, "results", "summary_results.txt"
@@ -784,13 +1396,16 @@ def summarize_results(scenario_directory, subproblem, stage, parsed_arguments):
         pass
 
 
-def set_up_gridpath_modules(scenario_directory, subproblem, stage):
+def set_up_gridpath_modules(scenario_directory):
     """
-    :return: list of the names of the modules the scenario uses, list of the
-        loaded modules, and the populated dynamic components for the scenario
+    :param scenario_directory: the main scenario directory
+    :return: list of the names of the modules the scenario uses and list of
+        the loaded modules
 
-    Set up the modules and dynamic components for a scenario run problem
-    instance.
+    Set up the modules for a scenario run. The modules depend only on the
+    scenario's features (and whether it has stages), so this is done once
+    per scenario and the loaded modules are passed to all subproblems and
+    stages.
     """
     # Determine and load modules
     modules_to_use = determine_modules(scenario_directory=scenario_directory)
@@ -846,9 +1461,13 @@ def main(args=None):
     # Parse arguments
     parsed_args = parse_arguments(args)
 
+    # Check that we can write results in the requested format before solving
+    check_results_format_dependencies(parsed_args.results_format)
+
     # Figure out the scenario structure (i.e. horizons and stages)
     scenario_structure = ScenarioStructure(parsed_args.scenario,
-                                           parsed_args.scenario_location)
+                                           parsed_args.scenario_location,
+                                           parsed_args.incremental)
 
     # Run the scenario (can be multiple optimization subproblems)
     expected_objective_values = run_scenario(
@@ -20,6 +20,7 @@ load-balance constraint.
 
 from pyomo.environ import Expression
 
+from gridpath.auxiliary.auxiliary import group_set_by_param_and_dimension
 from gridpath.auxiliary.dynamic_components import \
     load_balance_production_components
 
@@ -40,12 +41,15 @@ def add_model_components(m, d, scenario_directory, subproblem, stage):
     """
 
     # Add power generation to load balance constraint
-    # TODO: is this better done with a set intersection (all projects in the
-    #  zone intersected with all operational project sin the timepoint)
+    # The operational projects are grouped by (load zone, timepoint) once,
+    # so that each expression only iterates over its own projects
     def total_power_production_rule(mod, z, tmp):
         return sum(mod.Power_Provision_MW[g, tmp]
-                   for g in mod.OPR_PRJS_IN_TMP[tmp]
-                   if mod.load_zone[g] == z)
+                   for g in group_set_by_param_and_dimension(
+                       mod=mod, set_name="PRJ_OPR_TMPS",
+                       param_name="load_zone", key_position=1,
+                       member_position=0
+                   ).get((z, tmp), []))
     m.Power_Production_in_Zone_MW = \
         Expression(m.LOAD_ZONES, m.TMPS,
                    rule=total_power_production_rule)
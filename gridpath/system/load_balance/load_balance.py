@@ -176,7 +176,7 @@ def export_results(scenario_directory, subproblem, stage, m, d):
                     m.number_years_represented[m.period[tmp]],
                     m.tmp_weight[tmp],
                     m.hrs_in_tmp[tmp],
-                    m.static_load_mw[z, tmp],
+                    value(m.static_load_mw[z, tmp]),
                     value(m.Overgeneration_MW_Expression[z, tmp]),
                     value(m.Unserved_Energy_MW_Expression[z, tmp])
                 ]
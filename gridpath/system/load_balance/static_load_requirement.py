@@ -21,8 +21,9 @@ import csv
 import os.path
 from pyomo.environ import Param, NonNegativeReals
 
+from gridpath.auxiliary.auxiliary import get_param_dict_from_input_table
 from gridpath.auxiliary.dynamic_components import \
-    load_balance_consumption_components
+    load_balance_consumption_components, rolling_horizon
 
 
 def record_dynamic_components(dynamic_components):
@@ -49,7 +50,8 @@ def add_model_components(m, d, scenario_directory, subproblem, stage):
 
     # Static load
     m.static_load_mw = Param(m.LOAD_ZONES, m.TMPS,
-                             within=NonNegativeReals)
+                             within=NonNegativeReals,
+                             mutable=getattr(d, rolling_horizon))
 
     record_dynamic_components(dynamic_components=d)
 
@@ -65,11 +67,16 @@ def load_model_data(m, d, data_portal, scenario_directory, subproblem, stage):
     :param stage:
     :return:
     """
-    data_portal.load(
-        filename=os.path.join(
-            scenario_directory, subproblem, stage, "inputs", "load_mw.tab"
+    # The load profile is read directly into the param dictionary (from
+    # load_mw.tab or the binary load_mw.npz if inputs were written in that
+    # format)
+    data_portal.data()["static_load_mw"] = get_param_dict_from_input_table(
+        file_path=os.path.join(
+            scenario_directory, str(subproblem), str(stage), "inputs",
+            "load_mw.tab"
         ),
-        param=m.static_load_mw
+        index_positions=[0, 1],
+        param_position=2
     )
 
 
@@ -16,6 +16,8 @@ import csv
 import os.path
 from pyomo.environ import Param, Reals
 
+from gridpath.auxiliary.auxiliary import load_input_table
+
 
 def add_model_components(m, d, scenario_directory, subproblem, stage):
     """
@@ -34,7 +36,8 @@ def load_model_data(m, d, data_portal, scenario_directory, subproblem, stage):
 
     """
 
-    data_portal.load(
+    load_input_table(
+        data_portal=data_portal,
         filename=os.path.join(
             scenario_directory, str(subproblem), str(stage), "inputs",
             "market_prices.tab"
@@ -15,6 +15,9 @@
 import csv
 import os.path
 from pyomo.environ import Expression, Param, Constraint
+
+from gridpath.auxiliary.auxiliary import load_input_table
+
 Infinity = float('inf')
 
 
@@ -76,7 +79,8 @@ def add_model_components(m, d, scenario_directory, subproblem, stage):
 def load_model_data(
     m, d, data_portal, scenario_directory, subproblem, stage
 ):
-    data_portal.load(
+    load_input_table(
+        data_portal=data_portal,
         filename=os.path.join(
             scenario_directory, str(subproblem), str(stage), "inputs",
             "market_volume.tab"
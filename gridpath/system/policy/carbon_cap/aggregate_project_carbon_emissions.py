@@ -26,6 +26,7 @@ import os.path
 from pyomo.environ import Param, Set, Expression, value
 
 from db.common_functions import spin_on_database_lock
+from gridpath.auxiliary.auxiliary import group_set_by_params
 from gridpath.auxiliary.db_interface import setup_results_import
 from gridpath.auxiliary.dynamic_components import \
     carbon_cap_balance_emission_components
@@ -50,9 +51,11 @@ def add_model_components(m, d, scenario_directory, subproblem, stage):
         return sum(mod.Project_Carbon_Emissions[g, tmp]
                    * mod.hrs_in_tmp[tmp]
                    * mod.tmp_weight[tmp]
-                   for (g, tmp) in mod.CRBN_PRJ_OPR_TMPS
-                   if g in mod.CRBN_PRJS_BY_CARBON_CAP_ZONE[z]
-                   and tmp in mod.TMPS_IN_PRD[p]
+                   for (g, tmp) in group_set_by_params(
+                       mod=mod, set_name="CRBN_PRJ_OPR_TMPS",
+                       params_by_position=[("carbon_cap_zone", 0),
+                                           ("period", 1)]
+                   ).get((z, p), [])
                    )
 
     m.Total_Carbon_Cap_Project_Emissions = Expression(
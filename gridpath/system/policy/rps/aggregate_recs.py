@@ -19,6 +19,8 @@ the RPS zone - period level.
 
 from pyomo.environ import Param, Set, Expression, value
 
+from gridpath.auxiliary.auxiliary import group_set_by_params
+
 
 def add_model_components(m, d, scenario_directory, subproblem, stage):
     """
@@ -45,9 +47,10 @@ def add_model_components(m, d, scenario_directory, subproblem, stage):
                  + mod.Subhourly_RPS_Energy_MW[g,tmp])
                 * mod.hrs_in_tmp[tmp]
                 * mod.tmp_weight[tmp]
-                for (g, tmp) in mod.RPS_PRJ_OPR_TMPS
-                if g in mod.RPS_PRJS_BY_RPS_ZONE[z]
-                and tmp in mod.TMPS_IN_PRD[p]
+                for (g, tmp) in group_set_by_params(
+                    mod=mod, set_name="RPS_PRJ_OPR_TMPS",
+                    params_by_position=[("rps_zone", 0), ("period", 1)]
+                ).get((z, p), [])
                 )
 
     m.Total_Delivered_RPS_Energy_MWh = \
@@ -68,9 +71,10 @@ def add_model_components(m, d, scenario_directory, subproblem, stage):
                     mod.Subhourly_RPS_Energy_MW[g, tmp])
                    * mod.hrs_in_tmp[tmp]
                    * mod.tmp_weight[tmp]
-                   for (g, tmp) in mod.RPS_PRJ_OPR_TMPS
-                   if g in mod.RPS_PRJS_BY_RPS_ZONE[z]
-                   and tmp in mod.TMPS_IN_PRD[p]
+                   for (g, tmp) in group_set_by_params(
+                       mod=mod, set_name="RPS_PRJ_OPR_TMPS",
+                       params_by_position=[("rps_zone", 0), ("period", 1)]
+                   ).get((z, p), [])
                    )
     # TODO: is this only needed for export and, if so, should it be created on
     # export?
@@ -16,7 +16,9 @@ from __future__ import absolute_import
 
 from pyomo.environ import Set, Expression
 
-from .reserve_aggregation import generic_add_model_components
+from gridpath.auxiliary.auxiliary import group_set_by_param_and_dimension
+from .reserve_aggregation import generic_add_model_components, \
+    reserve_projects_operational_in_tmp
 
 
 def add_model_components(m, d, scenario_directory, subproblem, stage):
@@ -40,18 +42,19 @@ def add_model_components(m, d, scenario_directory, subproblem, stage):
     m.FREQUENCY_RESPONSE_PARTIAL_PROJECTS_OPERATIONAL_IN_TIMEPOINT = \
         Set(m.TMPS,
             initialize=lambda mod, tmp:
-            mod.FREQUENCY_RESPONSE_PARTIAL_PROJECTS &
-                mod.OPR_PRJS_IN_TMP[tmp])
+            reserve_projects_operational_in_tmp(
+                mod, "FREQUENCY_RESPONSE_PARTIAL_PROJECTS", tmp))
 
     # Reserve provision
     def total_partial_frequency_response_rule(mod, ba, tmp):
         return \
             sum(mod.Provide_Frequency_Response_MW[g, tmp]
-                for g in
-                mod.
-                FREQUENCY_RESPONSE_PARTIAL_PROJECTS_OPERATIONAL_IN_TIMEPOINT[
-                    tmp]
-                if mod.frequency_response_ba[g] == ba
+                for g in group_set_by_param_and_dimension(
+                    mod=mod, set_name="PRJ_OPR_TMPS",
+                    param_name="frequency_response_ba", key_position=1,
+                    member_position=0
+                ).get((ba, tmp), [])
+                if g in mod.FREQUENCY_RESPONSE_PARTIAL_PROJECTS
                    )
     m.Total_Partial_Frequency_Response_Provision_MW = \
         Expression(m.FREQUENCY_RESPONSE_BAS, m.TMPS,
@@ -15,6 +15,9 @@
 from builtins import str
 from pyomo.environ import Set, Expression
 
+from gridpath.auxiliary.auxiliary import group_set_by_dimension, \
+    group_set_by_param_and_dimension
+
 
 def generic_add_model_components(
         m,
@@ -46,15 +49,38 @@ def generic_add_model_components(
     setattr(m, op_set,
             Set(m.TMPS,
                 initialize=lambda mod, tmp:
-                getattr(mod, reserve_generator_set) &
-                    mod.OPR_PRJS_IN_TMP[tmp]))
+                reserve_projects_operational_in_tmp(
+                    mod, reserve_generator_set, tmp)))
 
     # Reserve provision
+    # The operational reserve projects are grouped by (balancing area,
+    # timepoint) once, so that each expression only iterates over its own
+    # projects
     def total_reserve_rule(mod, ba, tmp):
         return sum(getattr(mod, generator_reserve_provision_variable)[g, tmp]
-                   for g in getattr(mod, op_set)[tmp]
-                   if getattr(mod, reserve_zone_param)[g] == ba
+                   for g in group_set_by_param_and_dimension(
+                       mod=mod, set_name="PRJ_OPR_TMPS",
+                       param_name=reserve_zone_param, key_position=1,
+                       member_position=0
+                   ).get((ba, tmp), [])
                    )
     setattr(m, total_reserve_provision_expression,
             Expression(getattr(m, reserve_zone_set), m.TMPS,
                        rule=total_reserve_rule))
+
+
+def reserve_projects_operational_in_tmp(mod, reserve_generator_set, tmp):
+    """
+    Get the projects in the reserve generator set that are operational in
+    the timepoint. We look up the operational projects from the
+    (project, timepoint) set grouped by timepoint (built once per instance)
+    rather than intersecting two Pyomo sets for every timepoint.
+    """
+    reserve_projects = getattr(mod, reserve_generator_set)
+    return [
+        g for g in group_set_by_dimension(
+            mod=mod, set_name="PRJ_OPR_TMPS", key_position=1,
+            member_position=0
+        ).get(tmp, [])
+        if g in reserve_projects
+    ]
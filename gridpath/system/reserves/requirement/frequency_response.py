@@ -14,6 +14,7 @@
 
 from pyomo.environ import Param, NonNegativeReals
 
+from gridpath.auxiliary.dynamic_components import rolling_horizon
 from gridpath.system.reserves.requirement.reserve_requirements import \
     generic_get_inputs_from_database, generic_add_model_components, \
     generic_write_model_inputs, generic_load_model_data
@@ -43,7 +44,8 @@ def add_model_components(m, d, scenario_directory, subproblem, stage):
     m.frequency_response_requirement_partial_mw = Param(
         m.FREQUENCY_RESPONSE_BAS, m.TMPS,
         within=NonNegativeReals,
-        default=0
+        default=0,
+        mutable=getattr(d, rolling_horizon)
     )
 
 
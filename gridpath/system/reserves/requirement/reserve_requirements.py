@@ -17,6 +17,10 @@ import os.path
 from pyomo.environ import Param, Set, NonNegativeReals, PercentFraction, \
     Expression
 
+from gridpath.auxiliary.auxiliary import get_param_dict_from_input_table, \
+    input_file_exists
+from gridpath.auxiliary.dynamic_components import rolling_horizon
+
 
 def generic_add_model_components(
     m,
@@ -50,7 +54,8 @@ def generic_add_model_components(
     setattr(m, reserve_requirement_tmp_param,
             Param(getattr(m, reserve_zone_set), m.TMPS,
                   within=NonNegativeReals,
-                  default=0)
+                  default=0,
+                  mutable=getattr(d, rolling_horizon))
             )
 
     # Requirement as percentage of load
@@ -119,16 +124,21 @@ def generic_load_model_data(
         input_dir,
         "{}_tmp_requirement.tab".format(reserve_type)
     )
-    if os.path.exists(by_tmp_req_filename):
+    if input_file_exists(by_tmp_req_filename):
+        # The requirement profiles are read directly into the param
+        # dictionaries (from the .tab file or the binary .npz file if inputs
+        # were written in that format)
         tmp_params_to_load = \
-            (getattr(m, reserve_requirement_param),
-             m.frequency_response_requirement_partial_mw) \
+            [(reserve_requirement_param, 2),
+             ("frequency_response_requirement_partial_mw", 3)] \
             if reserve_type == "frequency_response" \
-            else getattr(m, reserve_requirement_param)
-        data_portal.load(
-            filename=by_tmp_req_filename,
-            param=tmp_params_to_load
-        )
+            else [(reserve_requirement_param, 2)]
+        for (param, position) in tmp_params_to_load:
+            data_portal.data()[param] = get_param_dict_from_input_table(
+                file_path=by_tmp_req_filename,
+                index_positions=[0, 1],
+                param_position=position
+            )
 
     # If we have a RPS zone to load zone map input file, load it and the
     # percent requirement; otherwise, initialize the set as an empty list (
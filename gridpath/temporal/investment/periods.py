@@ -39,7 +39,7 @@ import os.path
 
 from pyomo.environ import Set, Param, PositiveIntegers, NonNegativeReals
 
-from gridpath.auxiliary.auxiliary import cursor_to_df
+from gridpath.auxiliary.auxiliary import cursor_to_df, load_input_table
 from gridpath.auxiliary.validations import write_validation_to_database, \
     get_expected_dtypes, validate_dtypes, validate_values, validate_columns
 
@@ -234,7 +234,8 @@ def load_model_data(m, d, data_portal, scenario_directory, subproblem, stage):
                m.hours_in_full_period)
     )
 
-    data_portal.load(
+    load_input_table(
+        data_portal=data_portal,
         filename=os.path.join(scenario_directory, str(subproblem), str(stage),
                               "inputs", "timepoints.tab"),
         select=("timepoint", "period"),
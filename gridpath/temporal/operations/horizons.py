@@ -194,30 +194,27 @@ def add_model_components(m, d, scenario_directory, subproblem, stage):
     # Derived Params
     ###########################################################################
 
+    # These are derived in a single ordered pass over the timepoints of each
+    # horizon when loading the data (see load_model_data) and loaded as
+    # param data rather than initialized with per-index rules
     m.first_hrz_tmp = Param(
         m.BLN_TYPE_HRZS,
-        within=PositiveIntegers,
-        initialize=lambda mod, b, h:
-        list(mod.TMPS_BY_BLN_TYPE_HRZ[b, h])[0]
+        within=PositiveIntegers
     )
 
     m.last_hrz_tmp = Param(
         m.BLN_TYPE_HRZS,
-        within=PositiveIntegers,
-        initialize=lambda mod, b, h:
-        list(mod.TMPS_BY_BLN_TYPE_HRZ[b, h])[-1]
+        within=PositiveIntegers
     )
 
     m.prev_tmp = Param(
         m.TMPS, m.BLN_TYPES,
-        within=m.TMPS | {None},
-        initialize=prev_tmp_init
+        within=m.TMPS | {None}
     )
 
     m.next_tmp = Param(
         m.TMPS, m.BLN_TYPES,
-        within=m.TMPS | {None},
-        initialize=next_tmp_init
+        within=m.TMPS | {None}
     )
 
 
@@ -257,82 +254,61 @@ def horizons_by_balancing_type_init(mod, bt):
     return horizons_of_balancing_type
 
 
-# Param Rules
+# Param Data
 ###############################################################################
 
-def prev_tmp_init(mod, tmp, balancing_type_horizon):
+def derive_boundary_and_adjacent_tmps(tmps_on_horizon, boundary):
     """
-    **Param Name**: prev_tmp
-    **Defined Over**: TMPS x BLN_TYPES
-
-    Determine the previous timepoint for each timepoint. If the timepoint is
-    the first timepoint of a horizon and the horizon boundary is circular,
-    then the previous timepoint is the last timepoint of the respective
-    horizon (for each horizon type). If the timepoint is the first timepoint
-    of a horizon and the horizon boundary is linear, then no previous
-    timepoint is defined. In all other cases, the previous timepoints is the
-    one with an index of tmp-1.
+    :param tmps_on_horizon: dictionary with (balancing type, horizon) as keys
+        and the ordered list of timepoints on the horizon as values
+    :param boundary: dictionary with (balancing type, horizon) as keys and
+        the horizon boundary as values
+    :return: the first_hrz_tmp, last_hrz_tmp, prev_tmp, and next_tmp param
+        data as dictionaries
+
+    Determine the first and last timepoint of each horizon and the previous
+    and next timepoint for each timepoint in each balancing type in a single
+    ordered pass over the timepoints of each horizon.
+
+    If the timepoint is the first timepoint of a horizon and the horizon
+    boundary is circular, then the previous timepoint is the last timepoint
+    of the respective horizon (for each horizon type). If the timepoint is
+    the first timepoint of a horizon and the horizon boundary is linear or
+    linked, then no previous timepoint is defined. In all other cases, the
+    previous timepoint is the one preceding it on the horizon. The next
+    timepoint is determined in the same way for the last timepoint of each
+    horizon.
     """
-    prev_tmp_dict = {}
-    for (bt, hrz) in mod.BLN_TYPE_HRZS:
-        for tmp in mod.TMPS_BY_BLN_TYPE_HRZ[bt, hrz]:
-            if tmp == mod.first_hrz_tmp[bt, hrz]:
-                if mod.boundary[bt, hrz] == "circular":
-                    prev_tmp_dict[tmp, bt] = mod.last_hrz_tmp[bt, hrz]
-                elif mod.boundary[bt, hrz] in ["linear", "linked"]:
-                    prev_tmp_dict[tmp, bt] = None
-                else:
-                    raise ValueError(
-                        "Invalid boundary value '{}' for balancing type "
-                        "horizon '{} {}'".
-                        format(mod.boundary[bt, hrz], bt, hrz)
-                        + "\n" +
-                        "Horizon boundary must be 'circular,' 'linear,' "
-                        "or 'linked.'"
-                    )
-            else:
-                prev_tmp_dict[tmp, bt] = list(
-                    mod.TMPS_BY_BLN_TYPE_HRZ[bt, hrz]
-                )[list(mod.TMPS_BY_BLN_TYPE_HRZ[bt, hrz]).index(tmp) - 1]
-
-    return prev_tmp_dict
-
+    first_hrz_tmp = dict()
+    last_hrz_tmp = dict()
+    prev_tmp = dict()
+    next_tmp = dict()
+    for (bt, hrz) in tmps_on_horizon.keys():
+        tmps = tmps_on_horizon[bt, hrz]
+        first_hrz_tmp[bt, hrz] = tmps[0]
+        last_hrz_tmp[bt, hrz] = tmps[-1]
+
+        if boundary[bt, hrz] == "circular":
+            prev_tmp[tmps[0], bt] = tmps[-1]
+            next_tmp[tmps[-1], bt] = tmps[0]
+        elif boundary[bt, hrz] in ["linear", "linked"]:
+            prev_tmp[tmps[0], bt] = None
+            next_tmp[tmps[-1], bt] = None
+        else:
+            raise ValueError(
+                "Invalid boundary value '{}' for balancing type "
+                "horizon '{} {}'".
+                format(boundary[bt, hrz], bt, hrz)
+                + "\n" +
+                "Horizon boundary must be 'circular,' 'linear,' "
+                "or 'linked.'"
+            )
 
-def next_tmp_init(mod, tmp, balancing_type_horizon):
-    """
-    **Param Name**: next_tmp
-    **Defined Over**: TMPS x BLN_TYPES
-
-    Determine the next timepoint for each timepoint. If the timepoint is
-    the last timepoint of a horizon and the horizon boundary is circular,
-    then the next timepoint is the first timepoint of the respective
-    horizon. If the timepoint is the last timepoint of a horizon and the
-    horizon boundary is linear, then no next timepoint is defined. In all
-    other cases, the next timepoint is the one with an index of tmp+1.
-    """
-    next_tmp_dict = {}
-    for (bt, hrz) in mod.BLN_TYPE_HRZS:
-        for tmp in mod.TMPS_BY_BLN_TYPE_HRZ[bt, hrz]:
-            if tmp == mod.last_hrz_tmp[bt, hrz]:
-                if mod.boundary[bt, hrz] == "circular":
-                    next_tmp_dict[tmp, bt] = mod.first_hrz_tmp[bt, hrz]
-                elif mod.boundary[bt, hrz] in ["linear", "linked"]:
-                    next_tmp_dict[tmp, bt] = None
-                else:
-                    raise ValueError(
-                        "Invalid boundary value '{}' for balancing "
-                        "type horizon '{} {}'".
-                        format(mod.boundary[bt, hrz], bt, hrz)
-                        + "\n" +
-                        "Horizon boundary must be 'circular,' 'linear,' "
-                        "or 'linked.'"
-                    )
-            else:
-                next_tmp_dict[tmp, bt] = list(
-                    mod.TMPS_BY_BLN_TYPE_HRZ[bt, hrz]
-                )[list(mod.TMPS_BY_BLN_TYPE_HRZ[bt, hrz]).index(tmp) + 1]
+        for i in range(1, len(tmps)):
+            prev_tmp[tmps[i], bt] = tmps[i-1]
+            next_tmp[tmps[i-1], bt] = tmps[i]
 
-    return next_tmp_dict
+    return first_hrz_tmp, last_hrz_tmp, prev_tmp, next_tmp
 
 
 # Input-Output
@@ -364,8 +340,26 @@ def load_model_data(m, d, data_portal, scenario_directory, subproblem, stage):
 
             horizon_by_tmp[int(row[2]), row[1]] = int(row[0])
 
+    with open(os.path.join(scenario_directory, str(subproblem), str(stage),
+                           "inputs", "horizons.tab")
+              ) as f:
+        reader = csv.reader(f, delimiter="\t", lineterminator="\n")
+        next(reader)
+        boundary = dict()
+        for row in reader:
+            boundary[row[1], int(row[0])] = row[2]
+
+    first_hrz_tmp, last_hrz_tmp, prev_tmp, next_tmp = \
+        derive_boundary_and_adjacent_tmps(
+            tmps_on_horizon=tmps_on_horizon, boundary=boundary
+        )
+
     data_portal.data()["TMPS_BY_BLN_TYPE_HRZ"] = tmps_on_horizon
     data_portal.data()["horizon"] = horizon_by_tmp
+    data_portal.data()["first_hrz_tmp"] = first_hrz_tmp
+    data_portal.data()["last_hrz_tmp"] = last_hrz_tmp
+    data_portal.data()["prev_tmp"] = prev_tmp
+    data_portal.data()["next_tmp"] = next_tmp
 
 
 # Database
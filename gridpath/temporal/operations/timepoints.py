@@ -43,6 +43,7 @@ from pyomo.environ import Param, Set, NonNegativeReals, NonNegativeIntegers,\
     PositiveIntegers, NonPositiveIntegers, Any
 
 from db.common_functions import spin_on_database_lock
+from gridpath.auxiliary.auxiliary import load_input_table
 from gridpath.auxiliary.db_interface import \
     determine_table_subset_by_start_and_column
 
@@ -187,7 +188,8 @@ def load_model_data(m, d, data_portal, scenario_directory, subproblem, stage):
     :param stage: str
     :return:
     """
-    data_portal.load(
+    load_input_table(
+        data_portal=data_portal,
         filename=os.path.join(scenario_directory, str(subproblem), str(stage),
                               "inputs", "timepoints.tab"),
         index=m.TMPS,
@@ -332,11 +334,12 @@ def process_results(db, c, scenario_id, subscenarios, quiet):
             inputs_temporal.subproblem_id
             AND {}.stage_id = inputs_temporal.stage_id
             AND {}.timepoint = inputs_temporal.timepoint
-            );
+            )
+            WHERE scenario_id = ?;
             """.format(tbl, tbl, tbl, tbl)
 
         spin_on_database_lock(
-            conn=db, cursor=c, sql=sql, data=(scenario_id, ),
+            conn=db, cursor=c, sql=sql, data=(scenario_id, scenario_id),
             many=False
         )
 
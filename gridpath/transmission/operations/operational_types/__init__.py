@@ -97,7 +97,7 @@ def load_model_data(m, d, data_portal, scenario_directory, subproblem, stage):
 
 
 # TODO: move this into SubScenarios class?
-def get_required_tx_opchar_modules(scenario_id, c):
+def get_required_tx_opchar_modules(scenario_id, c, subscenarios=None):
     """
     Get the required tx operational type submodules based on the database inputs
     for the specified scenario_id. Required modules are the unique set of
@@ -113,20 +113,29 @@ def get_required_tx_opchar_modules(scenario_id, c):
 
     :param scenario_id: user-specified scenario ID
     :param c: database cursor
+    :param subscenarios: SubScenarios object with all subscenario info; if
+        specified, the subscenario IDs are taken from it instead of the
+        scenarios table
     :return: List of the required tx operational type submodules
     """
 
-    transmission_portfolio_scenario_id = c.execute(
-        """SELECT transmission_portfolio_scenario_id 
-        FROM scenarios 
-        WHERE scenario_id = {}""".format(scenario_id)
-    ).fetchone()[0]
-
-    transmission_opchars_scenario_id = c.execute(
-        """SELECT transmission_operational_chars_scenario_id 
-        FROM scenarios 
-        WHERE scenario_id = {}""".format(scenario_id)
-    ).fetchone()[0]
+    if subscenarios is not None:
+        transmission_portfolio_scenario_id = \
+            subscenarios.TRANSMISSION_PORTFOLIO_SCENARIO_ID
+        transmission_opchars_scenario_id = \
+            subscenarios.TRANSMISSION_OPERATIONAL_CHARS_SCENARIO_ID
+    else:
+        transmission_portfolio_scenario_id = c.execute(
+            """SELECT transmission_portfolio_scenario_id 
+            FROM scenarios 
+            WHERE scenario_id = {}""".format(scenario_id)
+        ).fetchone()[0]
+
+        transmission_opchars_scenario_id = c.execute(
+            """SELECT transmission_operational_chars_scenario_id 
+            FROM scenarios 
+            WHERE scenario_id = {}""".format(scenario_id)
+        ).fetchone()[0]
 
     required_tx_opchar_modules = [
         p[0] for p in c.execute(
@@ -168,7 +177,9 @@ def write_model_inputs(scenario_directory, scenario_id, subscenarios, subproblem
     # Load in the required operational modules
     c = conn.cursor()
 
-    required_tx_opchar_modules = get_required_tx_opchar_modules(scenario_id, c)
+    required_tx_opchar_modules = get_required_tx_opchar_modules(
+        scenario_id, c, subscenarios=subscenarios
+    )
     imported_tx_operational_modules = load_tx_operational_type_modules(
         required_tx_opchar_modules)
 
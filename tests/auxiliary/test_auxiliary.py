@@ -12,7 +12,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from pyomo.environ import AbstractModel
+import os
+import pandas as pd
+from pyomo.environ import AbstractModel, DataPortal, Param, Set, Any
+import tempfile
 import unittest
 
 import gridpath.auxiliary.auxiliary as auxiliary_module_to_test
@@ -96,6 +99,183 @@ class TestAuxiliary(unittest.TestCase):
         self.assertEqual(True, auxiliary_module_to_test.is_number(100.5))
         self.assertEqual(False, auxiliary_module_to_test.is_number("string"))
 
+    def test_get_input_table(self):
+        """
+        Check that input tables are parsed once, returned as independent
+        copies with the requested columns and types, and parsed again if the
+        file changes
+        """
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            input_file = os.path.join(tmp_dir, "projects.tab")
+            with open(input_file, "w") as f:
+                f.write("project\tcapacity_type\tstage\n"
+                        "Gas_CT\tgen_spec\t1\nWind\tgen_new_lin\t.\n")
+
+            self.assertListEqual(
+                ["project", "capacity_type", "stage"],
+                auxiliary_module_to_test.get_input_table_header(input_file)
+            )
+
+            df = auxiliary_module_to_test.get_input_table(
+                input_file, columns=["project", "stage"],
+                dtype={"stage": str}
+            )
+            self.assertListEqual(["project", "stage"], list(df.columns))
+            self.assertListEqual(["1", "."], df["stage"].tolist())
+
+            # Modifying the returned dataframe does not modify the cache
+            df["project"] = "changed"
+            self.assertListEqual(
+                ["Gas_CT", "Wind"],
+                auxiliary_module_to_test.get_input_table(
+                    input_file)["project"].tolist()
+            )
+
+            with self.assertRaises(ValueError):
+                auxiliary_module_to_test.get_input_table(
+                    input_file, columns=["project", "fuel"]
+                )
+
+            # Columns are parsed with the requested types, so text isn't
+            # converted to numbers first
+            zones_file = os.path.join(tmp_dir, "zones.tab")
+            with open(zones_file, "w") as f:
+                f.write("zone\tstage\n01\t1\n.\t\n")
+            df = auxiliary_module_to_test.get_input_table(
+                zones_file, dtype={"zone": str, "stage": str}
+            )
+            self.assertListEqual(["01", "."], df["zone"].tolist())
+            self.assertEqual("1", df["stage"][0])
+            self.assertTrue(pd.isna(df["stage"][1]))
+            self.assertListEqual(
+                [1.0, "."],
+                auxiliary_module_to_test.get_input_table(
+                    zones_file)["stage"].fillna(".").tolist()
+            )
+
+            # Changed files are parsed again
+            with open(input_file, "a") as f:
+                f.write("Solar\tgen_new_lin\t.\n")
+            self.assertListEqual(
+                ["Gas_CT", "Wind", "Solar"],
+                auxiliary_module_to_test.get_input_table(
+                    input_file)["project"].tolist()
+            )
+
+            auxiliary_module_to_test.clear_input_table_cache()
+            self.assertDictEqual(
+                {}, auxiliary_module_to_test.INPUT_TABLE_CACHE
+            )
+
+    def test_npz_input_tables(self):
+        """
+        Check that .tab files converted to the binary .npz format are read
+        back with the same data and loaded into param dictionaries
+        """
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            input_file = os.path.join(tmp_dir, "load_mw.tab")
+            with open(input_file, "w") as f:
+                f.write("LOAD_ZONES\ttimepoint\tload_mw\n"
+                        "Zone1\t20200101\t10.5\nZone1\t20200102\t.\n"
+                        "Zone2\t20200101\t7\n")
+            expected_df = auxiliary_module_to_test.get_input_table(input_file)
+            expected_dict = {
+                ("Zone1", 20200101): 10.5, ("Zone2", 20200101): 7
+            }
+            self.assertDictEqual(
+                expected_dict,
+                auxiliary_module_to_test.get_param_dict_from_input_table(
+                    input_file, [0, 1], 2
+                )
+            )
+
+            auxiliary_module_to_test.write_input_table_as_npz(input_file)
+            self.assertFalse(os.path.exists(input_file))
+            self.assertTrue(
+                auxiliary_module_to_test.input_file_exists(input_file)
+            )
+
+            actual_df = auxiliary_module_to_test.get_input_table(input_file)
+            self.assertListEqual(
+                list(expected_df.columns), list(actual_df.columns)
+            )
+            for column in expected_df.columns:
+                self.assertListEqual(
+                    expected_df[column].tolist(), actual_df[column].tolist()
+                )
+
+    def test_npz_input_tables_missing_values(self):
+        """
+        Check that missing values in text and numeric columns are read back
+        from .npz files as NaN, as they are from .tab files
+        """
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            input_file = os.path.join(tmp_dir, "profiles.tab")
+            with open(input_file, "w") as f:
+                f.write("project\ttimepoint\tnote\tcap_factor\n"
+                        "Wind\t1\t\t0.5\nWind\t2\tnan\t\nSolar\t1\tok\t0\n")
+            expected_df = auxiliary_module_to_test.get_input_table(input_file)
+
+            auxiliary_module_to_test.write_input_table_as_npz(input_file)
+            actual_df = auxiliary_module_to_test.get_input_table(input_file)
+
+            self.assertListEqual(
+                list(expected_df.columns), list(actual_df.columns)
+            )
+            self.assertListEqual(
+                expected_df.isna().values.tolist(),
+                actual_df.isna().values.tolist()
+            )
+            self.assertListEqual(
+                expected_df.fillna("missing").values.tolist(),
+                actual_df.fillna("missing").values.tolist()
+            )
+
+    def test_load_input_table(self):
+        """
+        Check that params loaded directly into the DataPortal's data have
+        the same values as when loaded with DataPortal.load, with and
+        without selecting columns
+        """
+        m = AbstractModel()
+        m.TMPS = Set()
+        m.tmp_weight = Param(m.TMPS)
+        m.prev_stage_tmp_map = Param(m.TMPS, within=Any, default=".")
+        m.MARKETS = Set(initialize=["Market_Hub_1"])
+        m.market_price = Param(m.MARKETS, m.TMPS)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            timepoints_file = os.path.join(tmp_dir, "timepoints.tab")
+            with open(timepoints_file, "w") as f:
+                f.write("timepoint\tperiod\ttimepoint_weight\t"
+                        "previous_stage_timepoint_map\n"
+                        "1\t2020\t1.0\t.\n2\t2020\t2.5\t11\n")
+            prices_file = os.path.join(tmp_dir, "market_prices.tab")
+            with open(prices_file, "w") as f:
+                f.write("market\ttimepoint\tmarket_price\n"
+                        "Market_Hub_1\t1\t20\nMarket_Hub_1\t2\t25.5\n")
+
+            instances = list()
+            for load in [
+                DataPortal.load,
+                auxiliary_module_to_test.load_input_table
+            ]:
+                data = DataPortal()
+                load(data, filename=timepoints_file, index=m.TMPS,
+                     param=(m.tmp_weight, m.prev_stage_tmp_map),
+                     select=("timepoint", "timepoint_weight",
+                             "previous_stage_timepoint_map"))
+                load(data, filename=prices_file, param=m.market_price)
+                instances.append(m.create_instance(data))
+
+            (expected, actual) = instances
+            self.assertListEqual([1, 2], list(actual.TMPS))
+            for p in ["tmp_weight", "prev_stage_tmp_map", "market_price"]:
+                self.assertDictEqual(
+                    getattr(expected, p).extract_values(),
+                    getattr(actual, p).extract_values()
+                )
+
 
 if __name__ == "__main__":
     unittest.main()
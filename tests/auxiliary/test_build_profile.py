@@ -0,0 +1,121 @@
+# Copyright 2016-2020 Blue Marble Analytics LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import logging
+import os
+import tempfile
+import types
+import unittest
+
+from pyomo.environ import AbstractModel, Set, Param, Var, Constraint, \
+    Expression
+
+from gridpath.auxiliary.build_profile import BuildProfile, \
+    profile_construction, profile_module_step, CONSTRUCTION_LOGGER
+
+
+def add_timepoints(m):
+    m.TMPS = Set(initialize=[1, 2, 3])
+    m.tmp_weight = Param(m.TMPS, initialize=1)
+
+
+def add_dispatch(m):
+    m.Dispatch = Var(m.TMPS)
+    m.Total_Dispatch = Expression(
+        m.TMPS, rule=lambda mod, tmp: mod.tmp_weight[tmp] * mod.Dispatch[tmp]
+    )
+    m.Max_Dispatch_Constraint = Constraint(
+        m.TMPS, rule=lambda mod, tmp: mod.Dispatch[tmp] <= 10
+    )
+
+
+class TestBuildProfile(unittest.TestCase):
+    """
+
+    """
+    def test_build_profile(self):
+        """
+        Components are attributed to the module that added them, with their
+        size and construction time, and the profile is written to the logs
+        directory
+        """
+        modules = [
+            types.ModuleType("timepoints"), types.ModuleType("dispatch")
+        ]
+        build_profile = BuildProfile()
+        m = AbstractModel()
+        for (module, add_components) in zip(
+            modules, [add_timepoints, add_dispatch]
+        ):
+            with profile_module_step(
+                build_profile, module, "add_model_components", model=m
+            ):
+                add_components(m)
+
+        logger = logging.getLogger(CONSTRUCTION_LOGGER)
+        level = logger.level
+        with profile_construction(build_profile):
+            m.create_instance()
+        self.assertEqual(level, logger.level)
+
+        components = build_profile.components
+        self.assertEqual("timepoints", components["tmp_weight"]["module"])
+        self.assertEqual("dispatch", components["Dispatch"]["module"])
+        self.assertEqual("Constraint",
+                         components["Max_Dispatch_Constraint"]["type"])
+        self.assertEqual(3, components["Total_Dispatch"]["size"])
+
+        summaries = {
+            s["module"]: s for s in build_profile.get_module_summaries()
+        }
+        self.assertEqual(1, summaries["timepoints"]["n_set"])
+        self.assertEqual(3, summaries["timepoints"]["set_size"])
+        self.assertEqual(1, summaries["dispatch"]["n_constraint"])
+        self.assertEqual(3, summaries["dispatch"]["var_size"])
+        self.assertGreater(
+            summaries["dispatch"]["construct_components_seconds"], 0
+        )
+
+        with tempfile.TemporaryDirectory() as logs_directory:
+            build_profile.write(logs_directory, "build_profile")
+            with open(os.path.join(logs_directory,
+                                   "build_profile.json")) as f:
+                profile = json.load(f)
+            self.assertEqual(
+                ["timepoints", "dispatch"],
+                [s["module"] for s in profile["modules"]]
+            )
+            for suffix in ["modules", "components"]:
+                self.assertTrue(os.path.exists(os.path.join(
+                    logs_directory, "build_profile_{}.csv".format(suffix)
+                )))
+
+    def test_no_profile(self):
+        """
+        Nothing is recorded if not profiling
+        """
+        m = AbstractModel()
+        with profile_module_step(
+            None, types.ModuleType("timepoints"), "add_model_components",
+            model=m
+        ):
+            add_timepoints(m)
+        with profile_construction(None):
+            instance = m.create_instance()
+        self.assertListEqual([1, 2, 3], list(instance.TMPS))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+# Copyright 2016-2020 Blue Marble Analytics LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from types import SimpleNamespace
+import sqlite3
+import unittest
+
+from db import create_database
+from gridpath.auxiliary.db_interface import \
+    get_project_operational_timepoints_sql
+
+
+def create_subscenarios(specified_capacity, new_cost):
+    return SimpleNamespace(
+        PROJECT_PORTFOLIO_SCENARIO_ID=1,
+        PROJECT_OPERATIONAL_CHARS_SCENARIO_ID=2,
+        PROJECT_SPECIFIED_CAPACITY_SCENARIO_ID=specified_capacity,
+        PROJECT_NEW_COST_SCENARIO_ID=new_cost,
+        TEMPORAL_SCENARIO_ID=3
+    )
+
+
+class TestDBInterface(unittest.TestCase):
+    """
+
+    """
+    def test_get_project_operational_timepoints_sql(self):
+        """
+        The materialized project operational timepoints are only queried if
+        they were materialized with exactly the scenario's subscenario IDs
+        """
+        conn = sqlite3.connect(":memory:")
+        create_database.create_database_schema(
+            conn=conn,
+            parsed_arguments=create_database.parse_arguments(arguments=[])
+        )
+        conn.execute(
+            """INSERT INTO scenario_project_operational_timepoints_subscenarios
+            VALUES (1, 1, 2, 4, NULL, 3);"""
+        )
+
+        for (subscenarios, materialized) in [
+            (create_subscenarios(4, "NULL"), True),
+            (create_subscenarios(5, "NULL"), False),
+            (create_subscenarios(4, 6), False)
+        ]:
+            sql = get_project_operational_timepoints_sql(
+                conn=conn, scenario_id=1, subscenarios=subscenarios,
+                subproblem=1, stage=1
+            )
+            self.assertEqual(
+                materialized,
+                "FROM scenario_project_operational_timepoints" in sql
+            )
+
+        conn.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
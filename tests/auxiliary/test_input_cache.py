@@ -0,0 +1,168 @@
+# Copyright 2016-2020 Blue Marble Analytics LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import tempfile
+import types
+import unittest
+
+from gridpath.auxiliary.input_cache import InputCache
+
+
+class FakeSubScenarios(object):
+    """
+    Stand-in for the SubScenarios object with only the subscenario IDs
+    """
+    def __init__(self, **subscenario_ids):
+        for (name, value) in subscenario_ids.items():
+            setattr(self, name, value)
+
+
+def make_module(name, write_model_inputs):
+    """
+    :return: a module object with the given write_model_inputs method
+    """
+    module = types.ModuleType(name)
+    module.write_model_inputs = write_model_inputs
+    module.calls = 0
+    return module
+
+
+def write_projects(scenario_directory, scenario_id, subscenarios,
+                   subproblem, stage, conn):
+    projects.calls += 1
+    with open(os.path.join(scenario_directory, "projects.tab"), "w") as f:
+        f.write("project\tportfolio\n")
+        f.write("gas\t{}\n".format(subscenarios.PROJECT_PORTFOLIO_SCENARIO_ID))
+
+
+def write_fuel_prices(scenario_directory, scenario_id, subscenarios,
+                      subproblem, stage, conn):
+    fuel_prices.calls += 1
+    with open(os.path.join(scenario_directory, "fuel_prices.tab"), "w") as f:
+        f.write("fuel\tprice\n")
+        f.write("gas\t{}\n".format(subscenarios.FUEL_PRICE_SCENARIO_ID))
+
+
+def add_heat_rate_column(scenario_directory, scenario_id, subscenarios,
+                         subproblem, stage, conn):
+    heat_rates.calls += 1
+    path = os.path.join(scenario_directory, "projects.tab")
+    with open(path) as f:
+        lines = f.read().splitlines()
+    lines[0] += "\theat_rate"
+    lines[1] += "\t{}".format(subscenarios.PROJECT_HEAT_RATE_SCENARIO_ID)
+    with open(path, "w") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+projects = make_module("projects", write_projects)
+fuel_prices = make_module("fuel_prices", write_fuel_prices)
+heat_rates = make_module("heat_rates", add_heat_rate_column)
+MODULES = [projects, fuel_prices, heat_rates]
+
+
+class TestInputCache(unittest.TestCase):
+    """
+
+    """
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache_directory = os.path.join(self.tmp.name, "cache")
+        for m in MODULES:
+            m.calls = 0
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write_inputs(self, scenario, subscenarios):
+        """
+        Write the inputs of all modules for a scenario through the cache
+        :return: dictionary of the input files with their contents
+        """
+        inputs_directory = os.path.join(self.tmp.name, scenario)
+        os.makedirs(inputs_directory)
+        input_cache = InputCache(
+            cache_directory=self.cache_directory,
+            inputs_directory=inputs_directory
+        )
+        for m in MODULES:
+            input_cache.write_module_inputs(
+                module=m, scenario_directory=inputs_directory,
+                scenario_id=1, subscenarios=subscenarios, subproblem="",
+                stage="", conn=None
+            )
+        contents = dict()
+        for f in os.listdir(inputs_directory):
+            with open(os.path.join(inputs_directory, f)) as fh:
+                contents[f] = fh.read()
+        return contents
+
+    def test_fuel_price_sensitivity(self):
+        """
+        Only the fuel price inputs are re-written when only the fuel price
+        scenario changes; unchanged inputs are linked from the cache and
+        have the same contents as if written directly
+        """
+        base = self.write_inputs(
+            "base", FakeSubScenarios(PROJECT_PORTFOLIO_SCENARIO_ID=1,
+                                     FUEL_PRICE_SCENARIO_ID=1,
+                                     PROJECT_HEAT_RATE_SCENARIO_ID=1)
+        )
+        self.assertEqual([m.calls for m in MODULES], [1, 1, 1])
+        self.assertEqual(base["projects.tab"],
+                         "project\tportfolio\theat_rate\ngas\t1\t1\n")
+
+        sensitivity = self.write_inputs(
+            "fuel_sensitivity",
+            FakeSubScenarios(PROJECT_PORTFOLIO_SCENARIO_ID=1,
+                             FUEL_PRICE_SCENARIO_ID=2,
+                             PROJECT_HEAT_RATE_SCENARIO_ID=1)
+        )
+        self.assertEqual([m.calls for m in MODULES], [1, 2, 1])
+        self.assertEqual(sensitivity["projects.tab"], base["projects.tab"])
+        self.assertEqual(sensitivity["fuel_prices.tab"], "fuel\tprice\ngas\t2\n")
+        self.assertGreater(
+            os.stat(os.path.join(self.tmp.name, "fuel_sensitivity",
+                                 "projects.tab")).st_nlink, 1
+        )
+
+    def test_modified_inputs_in_key(self):
+        """
+        A module that modifies an existing input file is re-run when the
+        file's contents differ, even if its own subscenario IDs don't
+        """
+        self.write_inputs(
+            "base", FakeSubScenarios(PROJECT_PORTFOLIO_SCENARIO_ID=1,
+                                     FUEL_PRICE_SCENARIO_ID=1,
+                                     PROJECT_HEAT_RATE_SCENARIO_ID=1)
+        )
+        portfolio = self.write_inputs(
+            "portfolio_sensitivity",
+            FakeSubScenarios(PROJECT_PORTFOLIO_SCENARIO_ID=2,
+                             FUEL_PRICE_SCENARIO_ID=1,
+                             PROJECT_HEAT_RATE_SCENARIO_ID=1)
+        )
+        self.assertEqual([m.calls for m in MODULES], [2, 1, 2])
+        self.assertEqual(portfolio["projects.tab"],
+                         "project\tportfolio\theat_rate\ngas\t2\t1\n")
+
+        # The cached base files were not modified in place
+        with open(os.path.join(self.tmp.name, "base", "projects.tab")) as f:
+            self.assertEqual(f.read(),
+                             "project\tportfolio\theat_rate\ngas\t1\t1\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
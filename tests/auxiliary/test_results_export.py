@@ -0,0 +1,169 @@
+# Copyright 2016-2020 Blue Marble Analytics LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import csv
+import os
+from pyomo.environ import ConcreteModel, Set, Var, Expression, Param, \
+    Constraint, Suffix
+import tempfile
+import unittest
+
+from gridpath.auxiliary.dynamic_components import DynamicComponents
+import gridpath.auxiliary.results_export as module_to_test
+
+
+class TestResultsExport(unittest.TestCase):
+    """
+
+    """
+    def setUp(self):
+        m = ConcreteModel()
+        m.PRJ_TMPS = Set(dimen=2, initialize=[("A", 1), ("A", 2), ("B", 1)],
+                         ordered=True)
+        m.Power = Var(m.PRJ_TMPS, initialize={("A", 1): 1.5, ("A", 2): 2})
+        m.Double_Power = Expression(
+            m.PRJ_TMPS, rule=lambda mod, p, tmp: 2 * mod.Power[p, tmp]
+        )
+        m.size = Param(["A", "B"], initialize={"A": 10, "B": 20})
+        self.m = m
+
+    def test_get_component_values(self):
+        """
+        Check that values are extracted in index order with their original
+        types, with None for masked indices, and that uninitialized
+        variables raise an error
+        """
+        index = list(self.m.PRJ_TMPS)
+        power = module_to_test.get_component_values(
+            self.m.Power, index, mask=[True, True, False]
+        )
+        self.assertListEqual([1.5, 2, None], power.tolist())
+        self.assertIsInstance(power[1], int)
+
+        with self.assertRaises(ValueError):
+            module_to_test.get_component_values(self.m.Power, index)
+
+        masked_values = module_to_test.get_component_values(
+            self.m.Double_Power, index, mask=[True, False, False]
+        )
+        self.assertListEqual([3.0, None, None], masked_values.tolist())
+        self.assertListEqual(
+            [10, 20],
+            module_to_test.get_component_values(
+                self.m.size, ["A", "B"]).tolist()
+        )
+        self.assertIsInstance(
+            module_to_test.get_component_values(self.m.size, ["A"])[0], int
+        )
+
+    def test_get_clipped_component_values(self):
+        """
+        Check that values are limited to the bounds and that values within
+        the bounds are kept as they are
+        """
+        m = self.m
+        m.Commit = Var(m.PRJ_TMPS, initialize={
+            ("A", 1): -1e-9, ("A", 2): 1, ("B", 1): 1.0000001
+        })
+        index = list(m.PRJ_TMPS)
+        self.assertListEqual(
+            [0, 1, 1],
+            module_to_test.get_clipped_component_values(
+                m.Commit, index, upper=1)
+        )
+        self.assertListEqual(
+            [0, 1, 1.0000001],
+            module_to_test.get_clipped_component_values(m.Commit, index)
+        )
+        self.assertIsInstance(
+            module_to_test.get_clipped_component_values(m.Commit, index)[1],
+            int
+        )
+
+    def test_get_constraint_duals(self):
+        """
+        Check that duals are returned in index order and that indices with
+        no dual are skipped and counted
+        """
+        m = self.m
+        m.Power_Constraint = Constraint(
+            m.PRJ_TMPS, rule=lambda mod, p, tmp: mod.Power[p, tmp] <= 5
+        )
+        m.dual = Suffix(direction=Suffix.IMPORT)
+        m.dual[m.Power_Constraint["A", 1]] = 0.5
+        m.dual[m.Power_Constraint["B", 1]] = -1
+
+        (indices, duals, n_missing) = module_to_test.get_constraint_duals(
+            m.Power_Constraint, m.dual
+        )
+        self.assertListEqual([("A", 1), ("B", 1)], indices)
+        self.assertListEqual([0.5, -1.0], duals.tolist())
+        self.assertEqual(1, n_missing)
+
+    def test_write_results_table(self):
+        """
+        Check the CSV results table, including empty fields for missing
+        values
+        """
+        index = list(self.m.PRJ_TMPS)
+        with tempfile.TemporaryDirectory() as scenario_directory:
+            os.makedirs(os.path.join(scenario_directory, "results"))
+            module_to_test.write_results_table(
+                scenario_directory, "", "", "dispatch.csv",
+                [("project", [p for (p, tmp) in index]),
+                 ("timepoint", [tmp for (p, tmp) in index]),
+                 ("power_mw",
+                  module_to_test.get_component_values(
+                      self.m.Power, index, mask=[True, True, False]))],
+                DynamicComponents()
+            )
+            with open(os.path.join(scenario_directory, "results",
+                                   "dispatch.csv")) as f:
+                rows = list(csv.reader(f))
+
+        self.assertListEqual(
+            [["project", "timepoint", "power_mw"],
+             ["A", "1", "1.5"], ["A", "2", "2"], ["B", "1", ""]],
+            rows
+        )
+
+    def test_write_linked_timepoint_params(self):
+        """
+        Check the linked timepoint params table, with the timepoints
+        relabeled to their linked timepoint IDs
+        """
+        index = [("A", 2), ("B", 1)]
+        with tempfile.TemporaryDirectory() as inputs_directory:
+            file_path = os.path.join(
+                inputs_directory, "linked_timepoint_params.tab"
+            )
+            module_to_test.write_linked_timepoint_params(
+                file_path=file_path, index=index,
+                tmp_linked_tmp_dict={1: -1, 2: 0},
+                columns=[("linked_size",
+                          module_to_test.get_component_values(
+                              self.m.size, [p for (p, tmp) in index]))]
+            )
+            with open(file_path) as f:
+                rows = list(csv.reader(f, delimiter="\t"))
+
+        self.assertListEqual(
+            [["project", "linked_timepoint", "linked_size"],
+             ["A", "0", "10"], ["B", "-1", "20"]],
+            rows
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,147 @@
+# Copyright 2016-2020 Blue Marble Analytics LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+import warnings
+
+from pyomo.environ import AbstractModel, DataPortal, Set, Param, Var, \
+    Constraint, Suffix, NonNegativeReals, Any, value
+
+from gridpath.auxiliary.rolling_horizon import RollingHorizonState
+
+
+def create_model():
+    m = AbstractModel()
+    m.TMPS = Set(ordered=True)
+    m.tmp_weight = Param(m.TMPS)
+    m.prev_tmp = Param(m.TMPS, within=Any)
+    m.load_mw = Param(m.TMPS, within=NonNegativeReals, mutable=True)
+    m.requirement_mw = Param(m.TMPS, within=NonNegativeReals, default=0,
+                             mutable=True)
+    m.Provide_Power_MW = Var(m.TMPS, within=NonNegativeReals)
+    m.Meet_Load_Constraint = Constraint(
+        m.TMPS,
+        rule=lambda mod, tmp: mod.Provide_Power_MW[tmp]
+        >= mod.load_mw[tmp] + mod.requirement_mw[tmp]
+    )
+    m.dual = Suffix(direction=Suffix.IMPORT)
+    return m
+
+
+def load_data(tmps, load, requirement, weight=1):
+    data_portal = DataPortal()
+    data_portal["TMPS"] = {None: tmps}
+    data_portal["tmp_weight"] = {tmp: weight for tmp in tmps}
+    data_portal["prev_tmp"] = {
+        tmp: prev_tmp for (tmp, prev_tmp) in zip(tmps, ["."] + tmps[:-1])
+    }
+    data_portal["load_mw"] = load
+    data_portal["requirement_mw"] = requirement
+    return data_portal
+
+
+class TestRollingHorizon(unittest.TestCase):
+    """
+
+    """
+    def setUp(self):
+        self.state = RollingHorizonState()
+        model = create_model()
+        data_portal = load_data([1, 2], {1: 10, 2: 20}, {1: 1, 2: 2})
+        self.instance = model.create_instance(data_portal)
+        self.state.set_instance(self.instance)
+        self.instance.Provide_Power_MW[1].fix(11)
+        self.instance.dual[self.instance.Meet_Load_Constraint[1]] = 1.0
+
+    def test_update_instance(self):
+        """
+        If only the mutable params change, their values are updated on the
+        instance (and reset to the default if they no longer have data),
+        the fixed variables are unfixed, and the duals are cleared
+        """
+        instance = self.state.update_instance(
+            create_model(), load_data([1, 2], {1: 15, 2: 25}, {2: 3})
+        )
+        self.assertIs(self.instance, instance)
+        self.assertListEqual(
+            [15, 28],
+            [value(instance.Meet_Load_Constraint[tmp].lower)
+             for tmp in [1, 2]]
+        )
+        self.assertListEqual(
+            [0, 3], [value(instance.requirement_mw[tmp]) for tmp in [1, 2]]
+        )
+        self.assertFalse(instance.Provide_Power_MW[1].fixed)
+        self.assertEqual(0, len(instance.dual))
+
+    def test_relabel_instance(self):
+        """
+        If the timepoints of the next subproblem have different IDs, the
+        instance is relabeled with the new IDs, including the values of
+        params that are IDs
+        """
+        instance = self.state.update_instance(
+            create_model(),
+            load_data([20200201, 20200202], {20200201: 15, 20200202: 25},
+                      {20200201: 1})
+        )
+        self.assertIs(self.instance, instance)
+        self.assertListEqual([20200201, 20200202], list(instance.TMPS))
+        self.assertListEqual(
+            [".", 20200201],
+            [instance.prev_tmp[tmp] for tmp in instance.TMPS]
+        )
+        self.assertListEqual(
+            [16, 25],
+            [value(instance.Meet_Load_Constraint[tmp].lower)
+             for tmp in instance.TMPS]
+        )
+        self.assertEqual(
+            20200201, instance.Meet_Load_Constraint[20200201].index()
+        )
+        self.assertNotIn(1, instance.Provide_Power_MW)
+        self.assertFalse(instance.Provide_Power_MW[20200201].fixed)
+
+    def test_structure_changed(self):
+        """
+        The instance is not reused, with a warning, if the sets or
+        non-mutable params change, if a mutable param without a default is
+        missing values, or if the model components change
+        """
+        for data_portal in [
+            load_data([1, 2, 3], {1: 10, 2: 20, 3: 30}, {}),
+            load_data([1, 2], {1: 10, 2: 20}, {}, weight=2),
+            load_data([1, 2], {1: 10}, {})
+        ]:
+            with warnings.catch_warnings(record=True) as w:
+                warnings.simplefilter("always")
+                self.assertIsNone(
+                    self.state.update_instance(create_model(), data_portal)
+                )
+            self.assertEqual(1, len(w))
+
+        model = create_model()
+        model.Max_Power_Constraint = Constraint(
+            model.TMPS, rule=lambda mod, tmp: mod.Provide_Power_MW[tmp] <= 50
+        )
+        with warnings.catch_warnings(record=True) as w:
+            warnings.simplefilter("always")
+            self.assertIsNone(self.state.update_instance(
+                model, load_data([1, 2], {1: 10, 2: 20}, {})
+            ))
+        self.assertEqual(1, len(w))
+
+
+if __name__ == "__main__":
+    unittest.main()
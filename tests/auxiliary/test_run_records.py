@@ -0,0 +1,203 @@
+# Copyright 2016-2020 Blue Marble Analytics LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import tempfile
+import unittest
+
+import gridpath.auxiliary.run_records as module_to_test
+
+OPTIONS = {"solver": "cbc", "solver_options": {}, "results_format": "csv"}
+
+
+class TestRunRecords(unittest.TestCase):
+    """
+
+    """
+    def setUp(self):
+        """
+        Make a scenario with two linked subproblems with two stages each
+        """
+        self.tmp = tempfile.TemporaryDirectory()
+        self.scenario_directory = self.tmp.name
+        with open(os.path.join(self.scenario_directory,
+                               "linked_subproblems_map.csv"), "w") as f:
+            f.write("subproblem,stage,timepoint,linked_timepoint\n")
+        for subproblem in ["1", "2"]:
+            for stage in ["1", "2"]:
+                for d in ["inputs", "results"]:
+                    os.makedirs(os.path.join(
+                        self.scenario_directory, subproblem, stage, d
+                    ))
+                self.write_file([subproblem, stage, "inputs", "loads.tab"],
+                                "timepoint\tload\n1\t10\n")
+            os.makedirs(os.path.join(self.scenario_directory, subproblem,
+                                     "pass_through_inputs"))
+            self.write_file(
+                [subproblem, "pass_through_inputs", "fixed_commitment.tab"],
+                "project\ttimepoint\tstage\tcommitment\n"
+            )
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write_file(self, path, contents, mode="w"):
+        with open(os.path.join(self.scenario_directory, *path), mode) as f:
+            f.write(contents)
+
+    def run_stage(self, subproblem, stage, commitment="1.0"):
+        """
+        Mimic running a stage: export its results, pass-through inputs, and
+        linked inputs, and write its run record
+        """
+        fingerprint = module_to_test.get_inputs_fingerprint(
+            self.scenario_directory, subproblem, stage, ["1", "2"]
+        )
+        linked_inputs_directory = module_to_test.get_linked_inputs_directory(
+            self.scenario_directory, subproblem, stage
+        )
+        before = module_to_test.get_files_state(linked_inputs_directory)
+        self.write_file([subproblem, stage, "results", "dispatch.csv"],
+                        "project,dispatch\ngas,{}\n".format(commitment))
+        self.write_file(
+            [subproblem, "pass_through_inputs", "fixed_commitment.tab"],
+            "gas\t1\t{}\t{}\n".format(stage, commitment), mode="a"
+        )
+        if linked_inputs_directory is not None:
+            self.write_file([str(int(subproblem) + 1), stage, "inputs",
+                             "linked_params.tab"],
+                            "project\tcommit\ngas\t{}\n".format(commitment))
+        linked_files = [
+            f for (f, state)
+            in module_to_test.get_files_state(linked_inputs_directory).items()
+            if before.get(f) != state
+        ]
+        module_to_test.write_run_record(
+            self.scenario_directory, subproblem, stage,
+            {
+                "inputs_fingerprint": fingerprint,
+                "options": OPTIONS,
+                "solver_status": "ok",
+                "termination_condition": "optimal",
+                "objective_function_value": 1.0,
+                "downstream_inputs": module_to_test.get_downstream_inputs(
+                    self.scenario_directory, subproblem, stage, linked_files
+                )
+            }
+        )
+
+    def is_current(self, subproblem, stage, options=OPTIONS):
+        return module_to_test.check_run_is_current(
+            self.scenario_directory, subproblem, stage,
+            module_to_test.read_run_record(
+                self.scenario_directory, subproblem, stage
+            ),
+            module_to_test.get_inputs_fingerprint(
+                self.scenario_directory, subproblem, stage, ["1", "2"]
+            ),
+            options
+        )
+
+    def run_all(self):
+        for subproblem in ["1", "2"]:
+            for stage in ["1", "2"]:
+                self.run_stage(subproblem, stage)
+
+    def test_unchanged_run_is_current(self):
+        """
+        All subproblems/stages are current after a complete run, but not
+        with different solver options
+        """
+        self.assertFalse(self.is_current("1", "1"))
+        self.run_all()
+        for subproblem in ["1", "2"]:
+            for stage in ["1", "2"]:
+                self.assertTrue(self.is_current(subproblem, stage))
+        self.assertFalse(self.is_current(
+            "1", "1", dict(OPTIONS, solver_options={"mipgap": "0.01"})
+        ))
+
+    def test_changed_inputs(self):
+        """
+        A subproblem/stage whose inputs changed is not current
+        """
+        self.run_all()
+        self.write_file(["2", "1", "inputs", "loads.tab"],
+                        "timepoint\tload\n1\t20\n")
+        self.assertTrue(self.is_current("1", "1"))
+        self.assertFalse(self.is_current("2", "1"))
+
+    def test_incomplete_results(self):
+        """
+        A subproblem/stage with missing results or run record is not current
+        """
+        self.run_all()
+        os.remove(os.path.join(self.scenario_directory, "1", "2", "results",
+                               "dispatch.csv"))
+        self.assertFalse(self.is_current("1", "2"))
+        module_to_test.delete_run_record(self.scenario_directory, "2", "2")
+        self.assertFalse(self.is_current("2", "2"))
+
+    def test_downstream_inputs(self):
+        """
+        A subproblem whose linked inputs to the next subproblem were deleted
+        (e.g. when its inputs were written again) is not current; a stage
+        whose pass-through inputs changed is not current, and neither is
+        the next stage, whose inputs changed
+        """
+        self.run_all()
+        os.remove(os.path.join(self.scenario_directory, "2", "1", "inputs",
+                               "linked_params.tab"))
+        self.assertFalse(self.is_current("1", "1"))
+        self.assertTrue(self.is_current("1", "2"))
+
+        module_to_test.remove_pass_through_rows(
+            self.scenario_directory, "2", ["1", "2"]
+        )
+        self.write_file(
+            ["2", "pass_through_inputs", "fixed_commitment.tab"],
+            "gas\t1\t1\t0.0\n", mode="a"
+        )
+        self.assertFalse(self.is_current("2", "1"))
+        self.assertFalse(self.is_current("2", "2"))
+
+    def test_pass_through_rows_hash(self):
+        """
+        The hash of the pass-through rows only depends on the rows of the
+        requested stages, not on their order
+        """
+        self.write_file(
+            ["1", "pass_through_inputs", "fixed_commitment.tab"],
+            "gas\t1\t1\t1.0\ncoal\t1\t1\t0.0\ngas\t1\t2\t1.0\n", mode="a"
+        )
+        hash_1 = module_to_test.get_pass_through_rows_hash(
+            self.scenario_directory, "1", ["1"]
+        )
+        module_to_test.remove_pass_through_rows(
+            self.scenario_directory, "1", ["1", "2"]
+        )
+        self.write_file(
+            ["1", "pass_through_inputs", "fixed_commitment.tab"],
+            "coal\t1\t1\t0.0\ngas\t1\t1\t1.0\n", mode="a"
+        )
+        self.assertDictEqual(
+            hash_1,
+            module_to_test.get_pass_through_rows_hash(
+                self.scenario_directory, "1", ["1"]
+            )
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
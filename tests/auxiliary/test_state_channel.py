@@ -0,0 +1,105 @@
+# Copyright 2016-2020 Blue Marble Analytics LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import tempfile
+import unittest
+
+from gridpath.auxiliary.auxiliary import get_input_table, input_file_exists
+import gridpath.auxiliary.state_channel as module_to_test
+
+COLUMNS = ["project", "timepoint", "stage", "commitment"]
+
+
+class TestStateChannel(unittest.TestCase):
+    """
+
+    """
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.linked_file = os.path.join(self.tmp.name, "linked_params.tab")
+        self.pass_through_file = os.path.join(
+            self.tmp.name, "fixed_commitment.tab"
+        )
+        with open(self.pass_through_file, "w") as f:
+            f.write("\t".join(COLUMNS) + "\n")
+
+    def tearDown(self):
+        module_to_test.close_state_channel()
+        self.tmp.cleanup()
+
+    def test_closed_channel(self):
+        """
+        If the channel is closed, the tables are only written to files
+        """
+        module_to_test.write_state_table(
+            self.linked_file, COLUMNS, [["gas", 1, "1", 1.0]]
+        )
+        module_to_test.write_state_table(
+            self.pass_through_file, COLUMNS, [["gas", 1, "1", 0.5]],
+            append=True
+        )
+        self.assertIsNone(module_to_test.get_state_table(self.linked_file))
+        with open(self.linked_file) as f:
+            self.assertEqual(
+                "project\ttimepoint\tstage\tcommitment\ngas\t1\t1\t1.0\n",
+                f.read()
+            )
+        self.assertListEqual(
+            [["gas", 1, 1, 0.5]],
+            get_input_table(self.pass_through_file).values.tolist()
+        )
+
+    def test_open_channel(self):
+        """
+        If the channel is open, the tables are passed in memory and the
+        files are only written if requested; appended rows are added to the
+        rows in the file
+        """
+        module_to_test.open_state_channel(write_files=False)
+        module_to_test.write_state_table(
+            self.linked_file, COLUMNS, [["gas", 1, "1", 1.0]]
+        )
+        for stage in ["1", "2"]:
+            module_to_test.write_state_table(
+                self.pass_through_file, COLUMNS, [["gas", 1, stage, 0.5]],
+                append=True
+            )
+
+        self.assertFalse(os.path.exists(self.linked_file))
+        self.assertTrue(input_file_exists(self.linked_file))
+        self.assertListEqual(
+            [["gas", 1, "1", 1.0]],
+            get_input_table(self.linked_file).values.tolist()
+        )
+        self.assertListEqual(
+            ["1", "2"],
+            get_input_table(self.pass_through_file,
+                            dtype={"stage": str})["stage"].tolist()
+        )
+        with open(self.pass_through_file) as f:
+            self.assertEqual(1, len(f.readlines()))
+
+        module_to_test.close_state_channel()
+        self.assertFalse(input_file_exists(self.linked_file))
+
+        module_to_test.open_state_channel(write_files=True)
+        module_to_test.write_state_table(
+            self.linked_file, COLUMNS, [["coal", 2, "1", 0.0]]
+        )
+        self.assertTrue(os.path.exists(self.linked_file))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -15,11 +15,12 @@
 from __future__ import print_function
 
 from importlib import import_module
+import types
 import unittest
 
 
 NAME_OF_MODULE_BEING_TESTED = \
-    "project.capacity.capacity_types.gen_new_lin"
+    "project.capacity.capacity_types.common_methods"
 # Import the module we'll test
 try:
     MODULE_BEING_TESTED = import_module("." + NAME_OF_MODULE_BEING_TESTED,
@@ -98,7 +99,7 @@ class TestCapacityTypeCommonMethods(unittest.TestCase):
         self.assertListEqual(expected_project_operational_periods,
                              actual_project_operational_periods)
 
-    def test_project_vintages_operational_in_period(self):
+    def test_project_vintages_operational_by_period(self):
         """
         G1 has lifetime of 30 years, G2 has lifetime of 10 years,
         G3 has lifetime of 100 years
@@ -123,20 +124,82 @@ class TestCapacityTypeCommonMethods(unittest.TestCase):
             2050: [("G1", 2030), ("G1", 2040), ("G1", 2050), ("G3", 2020)]
         }
 
+        mod = types.SimpleNamespace(
+            PRJ_VNTS=project_vintages,
+            OPR_PRDS_BY_PRJ_VNT=operational_periods_by_project_vintage
+        )
+        actual_project_vintages_by_period = \
+            MODULE_BEING_TESTED.project_vintages_operational_by_period(
+                mod=mod, project_vintages_set="PRJ_VNTS",
+                operational_periods_by_project_vintage_set=
+                "OPR_PRDS_BY_PRJ_VNT"
+            )
+
         for p in [2020, 2030, 2040, 2050]:
             expected_project_vintages = \
                 sorted(expected_project_vintages_by_period[p])
-            actual_project_vintages = sorted(
-                MODULE_BEING_TESTED.project_vintages_operational_in_period(
-                    project_vintage_set=project_vintages,
-                    operational_periods_by_project_vintage_set=
-                    operational_periods_by_project_vintage,
-                    period=p
-                )
-            )
+            actual_project_vintages = \
+                sorted(actual_project_vintages_by_period[p])
             self.assertListEqual(expected_project_vintages,
                                  actual_project_vintages)
 
+    def test_vintages_operational_by_project_period(self):
+        """
+        The vintages operational in each project's operational periods and
+        the project-vintages operational in each period are indexed in one
+        pass and cached on the model
+        """
+        project_vintages = [
+            ("G1", 2020), ("G1", 2030), ("G2", 2030), ("G2", 2040)
+        ]
+        operational_periods_by_project_vintage = {
+            ("G1", 2020): [2020, 2030], ("G1", 2030): [2030, 2040],
+            ("G2", 2030): [2030], ("G2", 2040): [2040]
+        }
+        mod = types.SimpleNamespace(
+            PRJ_VNTS=project_vintages,
+            OPR_PRDS_BY_PRJ_VNT=operational_periods_by_project_vintage
+        )
+
+        expected_vintages = {
+            ("G1", 2020): [2020], ("G1", 2030): [2020, 2030],
+            ("G1", 2040): [2030], ("G2", 2030): [2030],
+            ("G2", 2040): [2040]
+        }
+        self.assertDictEqual(
+            expected_vintages,
+            MODULE_BEING_TESTED.vintages_operational_by_project_period(
+                mod=mod, project_vintages_set="PRJ_VNTS",
+                operational_periods_by_project_vintage_set=
+                "OPR_PRDS_BY_PRJ_VNT"
+            )
+        )
+
+        expected_project_vintages_by_period = {
+            2020: [("G1", 2020)],
+            2030: [("G1", 2020), ("G1", 2030), ("G2", 2030)],
+            2040: [("G1", 2030), ("G2", 2040)]
+        }
+        self.assertDictEqual(
+            expected_project_vintages_by_period,
+            MODULE_BEING_TESTED.project_vintages_operational_by_period(
+                mod=mod, project_vintages_set="PRJ_VNTS",
+                operational_periods_by_project_vintage_set=
+                "OPR_PRDS_BY_PRJ_VNT"
+            )
+        )
+
+        # The index is cached on the model
+        mod.PRJ_VNTS = []
+        self.assertDictEqual(
+            expected_vintages,
+            MODULE_BEING_TESTED.vintages_operational_by_project_period(
+                mod=mod, project_vintages_set="PRJ_VNTS",
+                operational_periods_by_project_vintage_set=
+                "OPR_PRDS_BY_PRJ_VNT"
+            )
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
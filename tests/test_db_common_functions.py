@@ -0,0 +1,243 @@
+# Copyright 2016-2020 Blue Marble Analytics LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import sqlite3
+import tempfile
+import threading
+import unittest
+
+from db.common_functions import connect_to_database, \
+    spin_on_database_lock, SingleTransactionConnection, DatabaseWriteRecorder
+
+
+class TestConnectToDatabase(unittest.TestCase):
+    """
+
+    """
+    def test_journal_mode(self):
+        """
+        Databases are switched to WAL mode once; connecting to a database
+        that is already in WAL mode doesn't need a lock
+        """
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            db_path = os.path.join(tmp_dir, "io.db")
+            conn = sqlite3.connect(db_path, check_same_thread=False)
+            conn.execute("CREATE TABLE results (id INTEGER PRIMARY KEY);")
+            conn.commit()
+            self.assertEqual(
+                "delete",
+                conn.execute("PRAGMA journal_mode;").fetchone()[0]
+            )
+
+            # Switching the journal mode waits for other connections to
+            # release the database
+            conn.execute("BEGIN;")
+            conn.execute("SELECT * FROM results;").fetchall()
+            timer = threading.Timer(0.2, conn.commit)
+            timer.start()
+            wal_conn = connect_to_database(db_path=db_path, timeout=0)
+            timer.join()
+            conn.close()
+            self.assertEqual(
+                "wal",
+                wal_conn.execute("PRAGMA journal_mode;").fetchone()[0]
+            )
+
+            # Another connection is writing to the database
+            wal_conn.execute("BEGIN EXCLUSIVE;")
+            wal_conn.execute("INSERT INTO results VALUES (1);")
+            other_conn = connect_to_database(db_path=db_path, timeout=0)
+            self.assertListEqual(
+                [], other_conn.execute("SELECT * FROM results;").fetchall()
+            )
+            other_conn.close()
+            wal_conn.commit()
+            wal_conn.close()
+
+
+class TestSingleTransactionConnection(unittest.TestCase):
+    """
+
+    """
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp_dir.name, "io.db")
+        conn = sqlite3.connect(self.db_path)
+        conn.execute(
+            "CREATE TABLE results (id INTEGER PRIMARY KEY, value FLOAT);"
+        )
+        conn.commit()
+        conn.close()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def get_rows(self):
+        conn = connect_to_database(db_path=self.db_path, read_only=True)
+        rows = conn.execute("SELECT id, value FROM results;").fetchall()
+        conn.close()
+        return rows
+
+    def test_commit(self):
+        """
+        The writes are committed together when the block exits
+        """
+        conn = connect_to_database(db_path=self.db_path)
+        with SingleTransactionConnection(conn=conn) as stage_conn:
+            spin_on_database_lock(
+                conn=stage_conn, cursor=conn.cursor(),
+                sql="INSERT INTO results VALUES (?, ?);",
+                data=[(1, 0.5), (2, 1.5)]
+            )
+            # The commit requested by spin_on_database_lock is deferred
+            self.assertTrue(conn.in_transaction)
+            self.assertListEqual([], self.get_rows())
+
+        self.assertFalse(conn.in_transaction)
+        self.assertListEqual([(1, 0.5), (2, 1.5)], self.get_rows())
+        conn.close()
+
+    def test_rollback(self):
+        """
+        The writes are rolled back if the block fails, including when
+        spin_on_database_lock exits on a non-lock error
+        """
+        conn = connect_to_database(db_path=self.db_path)
+        with self.assertRaises(sqlite3.IntegrityError):
+            with SingleTransactionConnection(conn=conn) as stage_conn:
+                spin_on_database_lock(
+                    conn=stage_conn, cursor=conn.cursor(),
+                    sql="INSERT INTO results VALUES (?, ?);",
+                    data=[(1, 0.5)]
+                )
+                # Primary key violation
+                spin_on_database_lock(
+                    conn=stage_conn, cursor=conn.cursor(),
+                    sql="INSERT INTO results VALUES (?, ?);",
+                    data=[(1, 1.5)]
+                )
+
+        self.assertFalse(conn.in_transaction)
+        self.assertListEqual([], self.get_rows())
+
+        with self.assertRaises(SystemExit):
+            with SingleTransactionConnection(conn=conn) as stage_conn:
+                spin_on_database_lock(
+                    conn=stage_conn, cursor=conn.cursor(),
+                    sql="INSERT INTO results VALUES (?, ?);",
+                    data=[(1, 0.5)]
+                )
+                spin_on_database_lock(
+                    conn=stage_conn, cursor=conn.cursor(),
+                    sql="INSERT INTO missing_table VALUES (?, ?);",
+                    data=[(1, 1.5)]
+                )
+
+        self.assertFalse(conn.in_transaction)
+        self.assertListEqual([], self.get_rows())
+
+        # The connection can still be used (and isn't holding the lock)
+        with self.assertRaises(ValueError):
+            with SingleTransactionConnection(conn=conn) as stage_conn:
+                conn.execute("INSERT INTO results VALUES (3, 2.5);")
+                raise ValueError
+        self.assertListEqual([], self.get_rows())
+
+        other_conn = connect_to_database(db_path=self.db_path, timeout=0)
+        other_conn.execute("INSERT INTO results VALUES (4, 3.5);")
+        other_conn.commit()
+        other_conn.close()
+        self.assertListEqual([(4, 3.5)], self.get_rows())
+        conn.close()
+
+
+class TestDatabaseWriteRecorder(unittest.TestCase):
+    """
+
+    """
+    def test_record_and_submit(self):
+        """
+        Queries run on the read-only connection; the writes are recorded
+        and executed in a single transaction on exit, or discarded if the
+        block fails
+        """
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            db_path = os.path.join(tmp_dir, "io.db")
+            conn = sqlite3.connect(db_path)
+            conn.execute(
+                "CREATE TABLE results (id INTEGER PRIMARY KEY, value FLOAT);"
+            )
+            conn.execute("INSERT INTO results VALUES (1, 0.5);")
+            conn.commit()
+            conn.close()
+
+            read_conn = connect_to_database(db_path=db_path, read_only=True)
+            with DatabaseWriteRecorder(
+                conn=read_conn, db_path=db_path
+            ) as recorder:
+                c = recorder.cursor()
+                self.assertListEqual(
+                    [(1, 0.5)],
+                    c.execute("SELECT id, value FROM results;").fetchall()
+                )
+                spin_on_database_lock(
+                    conn=recorder, cursor=c,
+                    sql="INSERT INTO results VALUES (?, ?);",
+                    data=[(2, 1.5), (3, 2.5)]
+                )
+                spin_on_database_lock(
+                    conn=recorder, cursor=c,
+                    sql="DELETE FROM results WHERE id = ?;",
+                    data=(1,), many=False
+                )
+                self.assertEqual(2, len(recorder.statements))
+                # Nothing is written until the writes are submitted
+                self.assertEqual(
+                    1, read_conn.execute(
+                        "SELECT COUNT(*) FROM results;").fetchone()[0]
+                )
+
+            self.assertListEqual(
+                [(2, 1.5), (3, 2.5)],
+                read_conn.execute("SELECT id, value FROM results;").fetchall()
+            )
+
+            with self.assertRaises(ValueError):
+                with DatabaseWriteRecorder(
+                    conn=read_conn, db_path=db_path
+                ) as recorder:
+                    recorder.execute("DELETE FROM results;")
+                    raise ValueError
+            self.assertEqual(
+                2, read_conn.execute(
+                    "SELECT COUNT(*) FROM results;").fetchone()[0]
+            )
+
+            # A failed statement rolls back the whole transaction
+            with self.assertRaises(sqlite3.IntegrityError):
+                with DatabaseWriteRecorder(
+                    conn=read_conn, db_path=db_path
+                ) as recorder:
+                    recorder.execute("DELETE FROM results WHERE id = 2;")
+                    recorder.execute("INSERT INTO results VALUES (3, 0);")
+            self.assertEqual(
+                2, read_conn.execute(
+                    "SELECT COUNT(*) FROM results;").fetchone()[0]
+            )
+            read_conn.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+# Copyright 2016-2020 Blue Marble Analytics LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from db import create_database
+from db.utilities.results_indexes import RESULTS_INDEXES, get_index_name
+from gridpath.import_scenario_results import prepare_results_import, \
+    finish_results_import
+
+
+class TestResultsIndexes(unittest.TestCase):
+    """
+
+    """
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp.name, "io.db")
+        conn = sqlite3.connect(self.db_path)
+        create_database.create_database_schema(
+            conn=conn,
+            parsed_arguments=create_database.parse_arguments(arguments=[])
+        )
+        conn.close()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def get_results_indexes(self):
+        conn = sqlite3.connect(self.db_path)
+        indexes = [
+            name for (name, ) in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'index';"
+            )
+            if name in [get_index_name(table, columns)
+                        for (table, columns) in RESULTS_INDEXES]
+        ]
+        conn.close()
+        return sorted(indexes)
+
+    def test_results_indexes(self):
+        """
+        The results indexes are created after the first import and kept by
+        later imports, unless they are bulk imports
+        """
+        all_indexes = sorted(
+            get_index_name(table, columns)
+            for (table, columns) in RESULTS_INDEXES
+        )
+        self.assertListEqual([], self.get_results_indexes())
+
+        # First import
+        prepare_results_import(
+            db_path=self.db_path, scenario_id=1, shard_results=False,
+            bulk_import=False
+        )
+        finish_results_import(
+            db_path=self.db_path, scenario_id=1, shard_results=False
+        )
+        self.assertListEqual(all_indexes, self.get_results_indexes())
+
+        # Later imports keep the indexes
+        prepare_results_import(
+            db_path=self.db_path, scenario_id=2, shard_results=False,
+            bulk_import=False
+        )
+        self.assertListEqual(all_indexes, self.get_results_indexes())
+
+        # Bulk imports drop and re-create them
+        prepare_results_import(
+            db_path=self.db_path, scenario_id=3, shard_results=False,
+            bulk_import=True
+        )
+        self.assertListEqual([], self.get_results_indexes())
+        finish_results_import(
+            db_path=self.db_path, scenario_id=3, shard_results=False
+        )
+        self.assertListEqual(all_indexes, self.get_results_indexes())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,188 @@
+# Copyright 2016-2020 Blue Marble Analytics LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from db.common_functions import connect_to_database, create_results_shard, \
+    attach_results_shards, get_results_shard_path, \
+    get_scenarios_with_results_shards
+from db.utilities.scenario import delete_scenario_results
+
+SCHEMA = """
+    CREATE TABLE scenarios (
+    scenario_id INTEGER PRIMARY KEY,
+    scenario_name VARCHAR(64)
+    );
+    CREATE TABLE results_project_capacity (
+    scenario_id INTEGER,
+    project VARCHAR(64),
+    capacity_mw FLOAT,
+    PRIMARY KEY (scenario_id, project),
+    FOREIGN KEY (scenario_id) REFERENCES scenarios (scenario_id)
+    );
+    CREATE VIEW results_capacity_total AS
+    SELECT scenario_id, SUM(capacity_mw) AS capacity_mw
+    FROM results_project_capacity
+    GROUP BY scenario_id;
+    INSERT INTO scenarios VALUES (1, 'base'), (2, 'high_load');
+    INSERT INTO results_project_capacity VALUES (1, 'gas', 10);
+"""
+
+
+class TestResultsShards(unittest.TestCase):
+    """
+
+    """
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp.name, "io.db")
+        conn = sqlite3.connect(self.db_path)
+        conn.executescript(SCHEMA)
+        conn.close()
+        self.conn = connect_to_database(db_path=self.db_path)
+
+    def tearDown(self):
+        self.conn.close()
+        self.tmp.cleanup()
+
+    def import_shard(self):
+        shard_conn = create_results_shard(conn=self.conn, scenario_id=2)
+        # The scenarios table is queried from the attached database
+        shard_conn.execute(
+            """INSERT INTO results_project_capacity
+            SELECT scenario_id, 'wind', 20 FROM scenarios
+            WHERE scenario_name = 'high_load';"""
+        )
+        shard_conn.commit()
+        shard_conn.close()
+
+    def test_create_and_attach_results_shard(self):
+        """
+        The shard's results are only in the shard, and queries of the
+        results tables and views include them once the shard is attached
+        """
+        self.import_shard()
+        self.assertEqual(
+            os.path.join(self.tmp.name, "io_results", "scenario_2.db"),
+            get_results_shard_path(self.db_path, 2)
+        )
+        self.assertListEqual(
+            [2], get_scenarios_with_results_shards(self.db_path)
+        )
+
+        sql = "SELECT * FROM results_capacity_total ORDER BY scenario_id;"
+        self.assertListEqual([(1, 10.0)], self.conn.execute(sql).fetchall())
+        self.assertListEqual(
+            [], attach_results_shards(conn=self.conn, scenario_ids=[1])
+        )
+        self.assertListEqual([(1, 10.0)], self.conn.execute(sql).fetchall())
+
+        self.assertListEqual([2], attach_results_shards(conn=self.conn))
+        self.assertListEqual(
+            [(1, 10.0), (2, 20.0)], self.conn.execute(sql).fetchall()
+        )
+        self.assertListEqual(
+            [(2, "high_load", "wind")],
+            self.conn.execute(
+                """SELECT scenario_id, scenario_name, project
+                FROM results_project_capacity
+                JOIN scenarios USING (scenario_id)
+                WHERE scenario_id = 2;"""
+            ).fetchall()
+        )
+
+        # Attaching again doesn't change the results
+        self.assertListEqual(
+            [2], attach_results_shards(conn=self.conn, scenario_ids=["2"])
+        )
+        self.assertListEqual(
+            [(1, 10.0), (2, 20.0)], self.conn.execute(sql).fetchall()
+        )
+
+    def test_copy_results_shards(self):
+        """
+        If there are more shards than can be attached to the connection,
+        their results are copied into temporary tables in batches and
+        included in the queries of the results tables and views
+        """
+        self.conn.executemany(
+            "INSERT INTO scenarios VALUES (?, ?);",
+            [(scenario_id, "scenario_{}".format(scenario_id))
+             for scenario_id in range(3, 6)]
+        )
+        self.conn.commit()
+        for scenario_id in range(2, 6):
+            shard_conn = create_results_shard(
+                conn=self.conn, scenario_id=scenario_id
+            )
+            shard_conn.execute(
+                "INSERT INTO results_project_capacity VALUES (?, 'wind', ?);",
+                (scenario_id, 10 * scenario_id)
+            )
+            shard_conn.commit()
+            shard_conn.close()
+
+        self.conn.setlimit(sqlite3.SQLITE_LIMIT_ATTACHED, 3)
+        self.assertListEqual(
+            [2], attach_results_shards(conn=self.conn, scenario_ids=[2])
+        )
+        self.assertListEqual(
+            [2, 3, 4, 5], attach_results_shards(conn=self.conn)
+        )
+        expected = [(1, 10.0), (2, 20.0), (3, 30.0), (4, 40.0), (5, 50.0)]
+        sql = "SELECT * FROM results_capacity_total ORDER BY scenario_id;"
+        self.assertListEqual(expected, self.conn.execute(sql).fetchall())
+        self.assertListEqual(
+            ["main", "temp", "shard_2"],
+            [name for (seq, name, path)
+             in self.conn.execute("PRAGMA database_list;")]
+        )
+
+        # Copying again doesn't change the results
+        self.assertListEqual(
+            [2, 3, 4, 5], attach_results_shards(conn=self.conn)
+        )
+        self.assertListEqual(expected, self.conn.execute(sql).fetchall())
+
+    def test_delete_results_shard(self):
+        """
+        Deleting the results of a scenario with a shard deletes the shard
+        file and leaves the database's results tables alone
+        """
+        self.import_shard()
+        delete_scenario_results(conn=self.conn, scenario_id=2)
+        self.assertFalse(
+            os.path.exists(get_results_shard_path(self.db_path, 2))
+        )
+        self.assertListEqual(
+            [(1, "gas", 10.0)],
+            self.conn.execute(
+                "SELECT * FROM results_project_capacity;"
+            ).fetchall()
+        )
+
+        delete_scenario_results(conn=self.conn, scenario_id=1)
+        self.assertListEqual(
+            [],
+            self.conn.execute(
+                "SELECT * FROM results_project_capacity;"
+            ).fetchall()
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,131 @@
+# Copyright 2016-2020 Blue Marble Analytics LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import sys
+import unittest
+from unittest import mock
+
+from db.common_functions import DatabaseWriterManager, submit_database_write
+from gridpath import run_end_to_end_batch
+
+
+def get_process_id():
+    return os.getpid()
+
+
+def run_end_to_end_main(args):
+    """
+    Stand-in for run_end_to_end.main: scenario 'fail' fails, scenario
+    'stop' exits without a code, scenario 'crash' kills its worker, and the
+    other scenarios fail unless their database writes run in the database
+    writer process
+    """
+    scenario = args[args.index("--scenario") + 1]
+    if scenario == "fail":
+        sys.exit(1)
+    elif scenario == "stop":
+        sys.exit()
+    elif scenario == "crash":
+        os._exit(1)
+    elif submit_database_write(get_process_id) == os.getpid():
+        sys.exit(1)
+
+
+class TestRunEndToEndBatch(unittest.TestCase):
+    """
+
+    """
+    def test_determine_solver_threads(self):
+        """
+        The total solver threads are split among the parallel scenarios
+        unless the threads per solver are specified
+        """
+        self.assertEqual(
+            4, run_end_to_end_batch.determine_solver_threads(
+                solver_threads=None, total_solver_threads=16,
+                n_parallel_scenarios=4
+            )
+        )
+        self.assertEqual(
+            2, run_end_to_end_batch.determine_solver_threads(
+                solver_threads=None, total_solver_threads=7,
+                n_parallel_scenarios=3
+            )
+        )
+        self.assertEqual(
+            1, run_end_to_end_batch.determine_solver_threads(
+                solver_threads=None, total_solver_threads=2,
+                n_parallel_scenarios=4
+            )
+        )
+        self.assertEqual(
+            3, run_end_to_end_batch.determine_solver_threads(
+                solver_threads=3, total_solver_threads=2,
+                n_parallel_scenarios=4
+            )
+        )
+        with mock.patch("os.cpu_count", return_value=8):
+            self.assertEqual(
+                4, run_end_to_end_batch.determine_solver_threads(
+                    solver_threads=None, total_solver_threads=None,
+                    n_parallel_scenarios=2
+                )
+            )
+
+    def test_run_scenarios_in_parallel(self):
+        """
+        The workers submit their database writes to the writer they are
+        given, and failed or crashed workers are reported as failed runs
+        """
+        manager = DatabaseWriterManager()
+        manager.start()
+        try:
+            with mock.patch.object(
+                run_end_to_end_batch.run_end_to_end, "main",
+                run_end_to_end_main
+            ):
+                success = run_end_to_end_batch.run_scenarios_in_parallel(
+                    scenarios=["s1", "crash", "s2", "fail", "stop", "s3"],
+                    e2e_args=[], n_parallel_scenarios=2,
+                    database_writer=manager.DatabaseWriter()
+                )
+        finally:
+            manager.shutdown()
+
+        self.assertDictEqual(
+            {"s1": True, "crash": False, "s2": True, "fail": False,
+             "stop": False, "s3": True},
+            success
+        )
+
+    def test_parse_arguments(self):
+        """
+        The batch arguments are separated from the run_end_to_end.py
+        arguments
+        """
+        (parsed_args, e2e_args) = run_end_to_end_batch.parse_arguments(
+            ["--database", "io.db", "--scenarios", "s1", "s2",
+             "--n_parallel_scenarios", "2", "--total_solver_threads", "8",
+             "--solver", "cbc", "--log"]
+        )
+        self.assertListEqual(["s1", "s2"], parsed_args.scenarios)
+        self.assertEqual(2, parsed_args.n_parallel_scenarios)
+        self.assertEqual(8, parsed_args.total_solver_threads)
+        self.assertIsNone(parsed_args.solver_threads)
+        self.assertListEqual(["--solver", "cbc", "--log"], e2e_args)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+# Copyright 2016-2020 Blue Marble Analytics LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+from pyomo.environ import ConcreteModel, Set, Var
+
+from gridpath.run_scenario import PersistentSolverState
+
+
+def create_instance(tmps, hrz):
+    m = ConcreteModel()
+    m.TMPS = Set(initialize=tmps, ordered=True)
+    m.Commit = Var(["gas"], m.TMPS)
+    m.Budget = Var([hrz])
+    return m
+
+
+class TestPersistentSolverState(unittest.TestCase):
+    """
+
+    """
+    def test_warm_start(self):
+        """
+        Timepoints are matched by their position in the subproblem, other
+        indices by value; fixed variables are not warm-started
+        """
+        previous_instance = create_instance([20200101, 20200102], 1)
+        for (tmp, value) in zip(previous_instance.TMPS, [0.25, 0.75]):
+            previous_instance.Commit["gas", tmp].value = value
+        previous_instance.Budget[1].value = 10
+
+        state = PersistentSolverState()
+        state.record_solution(previous_instance)
+
+        instance = create_instance([20200201, 20200202], 2)
+        instance.Commit["gas", 20200202].fix(1)
+        self.assertEqual(1, state.warm_start(instance))
+        self.assertEqual(0.25, instance.Commit["gas", 20200201].value)
+        self.assertEqual(1, instance.Commit["gas", 20200202].value)
+        self.assertIsNone(instance.Budget[2].value)
+
+
+if __name__ == "__main__":
+    unittest.main()
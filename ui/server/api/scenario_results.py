@@ -371,19 +371,16 @@ def create_data_table_api(
         """SELECT caption FROM ui_scenario_results_table_metadata
         WHERE results_table = '{}';""".format(table.replace("-", "_"))
     ).fetchone()[0]
+    conn.close()
 
-    data_table_api['columns'] = get_table_data(
+    # Only the scenario's results shard (if any) is attached
+    table_data = get_table_data(
         db_path=db_path,
         table=table.replace("-", "_"),
         scenario_id=scenario_id,
         other_scenarios=[]
-    )['columns']
-
-    data_table_api['rowsData'] = get_table_data(
-        db_path=db_path,
-        table=table.replace("-", "_"),
-        scenario_id=scenario_id,
-        other_scenarios=[]
-    )['rowsData']
+    )
+    data_table_api['columns'] = table_data['columns']
+    data_table_api['rowsData'] = table_data['rowsData']
 
     return data_table_api
@@ -14,7 +14,8 @@
 
 from flask_restful import Resource
 
-from db.common_functions import connect_to_database
+from db.common_functions import connect_to_database, \
+    attach_results_shards
 
 
 class ViewDataAPI(Resource):
@@ -51,6 +52,9 @@ def get_table_data(scenario_id, other_scenarios, table, db_path):
     """
 
     conn = connect_to_database(db_path=db_path)
+    attach_results_shards(
+        conn=conn, scenario_ids=[scenario_id] + list(other_scenarios)
+    )
     c = conn.cursor()
 
     query_for_column_names = c.execute(
@@ -93,6 +97,8 @@ def get_table_data(scenario_id, other_scenarios, table, db_path):
         row_dict = dict(zip(column_names, row_values))
         rows_data.append(row_dict)
 
+    conn.close()
+
     data_table_api = {
         'columns': column_names,
         'rowsData': rows_data
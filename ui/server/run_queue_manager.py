@@ -25,7 +25,7 @@ def exit_gracefully():
     )
 
 
-def manage_queue(db_path):
+def manage_queue(db_path, n_parallel_scenarios=1):
     while True:
         try:
             # Check if server is running
@@ -39,17 +39,15 @@ def manage_queue(db_path):
             scenarios_in_queue = get_scenarios_in_queue(c=c)
             running_scenarios = get_running_scenarios(c=c)
 
-            # If there are scenarios in the queue and none of them are running,
-            # get the next scenarios to run and launch it
+            # If there are scenarios in the queue and fewer than
+            # n_parallel_scenarios of them are running, get the next
+            # scenario to run and launch it
             if scenarios_in_queue:  # there are scenarios in the queue
-                if not running_scenarios:  # none of them is 'running'
-                    next_scenario_to_run = c.execute("""
-                        SELECT scenario_id, MIN(queue_order_id)
-                        FROM scenarios
-                        WHERE queue_order_id IS NOT NULL
-                        GROUP BY scenario_id
-                    """).fetchone()
-
+                next_scenario_to_run = get_next_scenario_to_run(
+                    c=c, running_scenarios=running_scenarios,
+                    n_parallel_scenarios=n_parallel_scenarios
+                )
+                if next_scenario_to_run is not None:
                     # Get the requested solver
                     solver_options_id = c.execute("""
                         SELECT solver_options_id
@@ -144,6 +142,24 @@ def get_running_scenarios(c):
     return running_scenarios
 
 
+def get_next_scenario_to_run(c, running_scenarios, n_parallel_scenarios):
+    # Get the first scenario in the queue that is waiting to run, unless
+    # n_parallel_scenarios scenarios are already running
+    if len(running_scenarios) >= n_parallel_scenarios:
+        return None
+
+    next_scenario_to_run = c.execute("""
+        SELECT scenario_id, queue_order_id
+        FROM scenarios
+        WHERE queue_order_id IS NOT NULL
+        AND run_status_id = 5
+        ORDER BY queue_order_id
+        LIMIT 1;
+    """).fetchone()
+
+    return next_scenario_to_run
+
+
 def get_max_queue_order_id(c):
     max_queue_id = c.execute("""
         SELECT max(queue_order_id)
@@ -205,6 +221,9 @@ def parse_arguments(args):
     parser.add_argument("--database", default="../db/io.db",
                         help="The database file path. Defaults to ../db/io.db "
                              "if not specified")
+    parser.add_argument("--n_parallel_scenarios", default=1, type=int,
+                        help="The maximum number of queued scenarios to run "
+                             "at the same time. Defaults to 1.")
 
     parsed_arguments = parser.parse_args(args=args)
 
@@ -217,7 +236,8 @@ def main(args=None):
 
     parsed_args = parse_arguments(args)
 
-    manage_queue(db_path=parsed_args.database)
+    manage_queue(db_path=parsed_args.database,
+                 n_parallel_scenarios=parsed_args.n_parallel_scenarios)
 
 
 if __name__ == "__main__":
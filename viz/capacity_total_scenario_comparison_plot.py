@@ -25,7 +25,8 @@ import pandas as pd
 import sys
 
 # GridPath modules
-from db.common_functions import connect_to_database
+from db.common_functions import connect_to_database, \
+    attach_results_shards
 from viz.common_functions import create_stacked_bar_plot, show_plot, \
     get_parent_parser, get_tech_colors, get_tech_plotting_order, get_unit, \
     process_stacked_plot_data, get_capacity_data
@@ -84,6 +85,7 @@ def main(args=None):
     parsed_args = parse_arguments(arguments=args)
 
     conn = connect_to_database(db_path=parsed_args.database)
+    attach_results_shards(conn=conn)
 
     tech_colors = get_tech_colors(conn.cursor())
     tech_plotting_order = get_tech_plotting_order(conn.cursor())
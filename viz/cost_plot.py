@@ -23,7 +23,8 @@ import pandas as pd
 import sys
 
 # GridPath modules
-from db.common_functions import connect_to_database
+from db.common_functions import connect_to_database, \
+    attach_results_shards
 from gridpath.auxiliary.db_interface import get_scenario_id_and_name
 from viz.common_functions import create_stacked_bar_plot, show_plot, \
     get_parent_parser, get_unit, process_stacked_plot_data
@@ -142,6 +143,7 @@ def main(args=None):
         c=c,
         script="cost_plot"
     )
+    attach_results_shards(conn=conn, scenario_ids=[scenario_id])
 
     cost_unit = "million " + get_unit(c, "cost")
 
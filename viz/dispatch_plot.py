@@ -38,7 +38,8 @@ import pandas as pd
 import sys
 
 # GridPath modules
-from db.common_functions import connect_to_database
+from db.common_functions import connect_to_database, \
+    attach_results_shards
 from gridpath.auxiliary.db_interface import get_scenario_id_and_name
 from viz.common_functions import show_hide_legend, show_plot, \
     get_parent_parser, get_tech_colors, get_tech_plotting_order, get_unit
@@ -534,6 +535,7 @@ def main(args=None):
         c=c,
         script="dispatch_plot"
     )
+    attach_results_shards(conn=conn, scenario_ids=[scenario_id])
 
     tech_colors = get_tech_colors(c)
     tech_plotting_order = get_tech_plotting_order(c)
@@ -32,7 +32,8 @@ import pandas as pd
 import sys
 
 # GridPath modules
-from db.common_functions import connect_to_database
+from db.common_functions import connect_to_database, \
+    attach_results_shards
 from gridpath.auxiliary.db_interface import get_scenario_id_and_name
 from viz.common_functions import show_hide_legend, show_plot, \
     get_parent_parser, get_unit
@@ -261,6 +262,7 @@ def main(args=None):
         c=c,
         script="rps_plot"
     )
+    attach_results_shards(conn=conn, scenario_ids=[scenario_id])
 
     energy_unit = get_unit(c, "energy")
     cost_unit = get_unit(c, "cost")